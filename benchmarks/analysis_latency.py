@@ -0,0 +1,183 @@
+"""
+Time the resume analysis pipeline offline, against the fake LLM server.
+
+Starts benchmarks/fake_llm_server.py in-process, points the OpenAI and Ollama
+clients at it and runs `extract_info_and_keywords` to measure:
+
+- end-to-end latency of an uncached analysis (p50/p95 over --runs),
+- the speedup of --concurrency analyses running at once over running them
+  one after another,
+- the latency of a repeated analysis that is answered by the stage cache,
+  and the LLM requests it still makes.
+
+    uv run benchmarks/analysis_latency.py --provider openai --latency-ms 300
+    uv run benchmarks/analysis_latency.py --provider ollama --tokens-per-s 40
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "..", "src"))
+
+from fake_llm_server import FakeLLMServer  # noqa: E402
+
+SAMPLE_RESUME = """Jane Doe
+Berlin, Germany | jane.doe@example.com
+
+EXPERIENCE
+Senior Data Scientist, Acme Analytics - March 2019 to Present
+Built forecasting and ranking models in Python and PyTorch; ran A/B tests.
+
+Machine Learning Engineer, Globex - June 2016 to February 2019
+Deployed Spark pipelines and model services on Kubernetes.
+
+SKILLS
+Python, SQL, PyTorch, Spark, Kubernetes, Statistics
+"""
+
+
+def _latency_stats(latencies: List[float]) -> Dict[str, float]:
+    from agent.metrics import percentile
+
+    values = sorted(latencies)
+    return {
+        "p50_s": round(percentile(values, 0.50), 3),
+        "p95_s": round(percentile(values, 0.95), 3),
+        "max_s": round(values[-1], 3) if values else 0.0,
+    }
+
+
+def run_benchmark(args: argparse.Namespace, resume_text: str) -> Dict[str, Any]:
+    server = FakeLLMServer(
+        latency_ms=args.latency_ms,
+        tokens_per_s=args.tokens_per_s,
+        error_rate=args.error_rate,
+        truncate_rate=args.truncate_rate,
+    ).start()
+    # The clients read their endpoints when agent.llm is first imported
+    os.environ.update(server.env())
+
+    from agent import cache as stage_cache
+    from agent.intelligence import extract_info_and_keywords
+
+    # Keep the benchmark's cache entries in memory, away from data/cache
+    stage_cache._DEFAULT_CACHE = stage_cache.StageCache(cache_dir=None)
+
+    def analyze(use_cache: bool = False) -> float:
+        started = time.perf_counter()
+        extract_info_and_keywords(
+            resume_text, k=args.k, provider=args.provider, use_cache=use_cache
+        )
+        return time.perf_counter() - started
+
+    def timed_runs(use_cache: bool = False) -> List[float]:
+        latencies, failures = [], 0
+        for _ in range(args.runs):
+            try:
+                latencies.append(analyze(use_cache))
+            except Exception as e:
+                failures += 1
+                print(f"\n⚠️  [BENCH] Analysis failed: {e}")
+        result["failures"] += failures
+        return latencies
+
+    result: Dict[str, Any] = {"failures": 0}
+    try:
+        analyze()  # Warm up the clients' connections and imports
+        requests_before = server.stats()["requests"]
+        sequential_started = time.perf_counter()
+        result["uncached"] = _latency_stats(timed_runs())
+        sequential_s = time.perf_counter() - sequential_started
+        requests = server.stats()["requests"] - requests_before
+        requests_per_analysis = requests / args.runs
+
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            concurrent_started = time.perf_counter()
+            futures = [pool.submit(analyze) for _ in range(args.runs)]
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    result["failures"] += 1
+                    print(f"\n⚠️  [BENCH] Analysis failed: {e}")
+            concurrent_s = time.perf_counter() - concurrent_started
+        result["concurrency"] = {
+            "workers": args.concurrency,
+            "sequential_s": round(sequential_s, 3),
+            "concurrent_s": round(concurrent_s, 3),
+            "speedup": round(sequential_s / concurrent_s, 2) if concurrent_s else None,
+            "max_in_flight": server.stats()["max_in_flight"],
+        }
+
+        analyze(use_cache=True)  # Fill the cache
+        requests_before = server.stats()["requests"]
+        result["cached"] = _latency_stats(timed_runs(use_cache=True))
+        result["cached"]["llm_requests"] = server.stats()["requests"] - requests_before
+    finally:
+        server.stop()
+
+    result["llm_requests_per_analysis"] = round(requests_per_analysis, 2)
+    result["server"] = server.stats()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--resume", help="A resume PDF or text file (default: a built-in sample)"
+    )
+    parser.add_argument(
+        "--provider", choices=["openai", "ollama", "auto"], default="openai"
+    )
+    parser.add_argument("--k", type=int, default=10, help="Keyword sets per analysis")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--tokens-per-s", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="Also write the result to this JSON file")
+    args = parser.parse_args()
+
+    resume_text = SAMPLE_RESUME
+    if args.resume and args.resume.lower().endswith(".pdf"):
+        from automation.resume_parser import pdf_to_text
+
+        resume_text = pdf_to_text(args.resume)
+    elif args.resume:
+        with open(args.resume, "r") as f:
+            resume_text = f.read()
+
+    result = run_benchmark(args, resume_text)
+
+    uncached, cached = result["uncached"], result["cached"]
+    concurrency = result["concurrency"]
+    print(f"\n🏁 [BENCH] {args.runs} analyses with provider={args.provider}")
+    print(
+        f"   uncached:    p50 {uncached['p50_s']:.2f}s / p95 {uncached['p95_s']:.2f}s,"
+        f" {result['llm_requests_per_analysis']} LLM requests each"
+    )
+    print(
+        f"   concurrent:  {concurrency['speedup']}x faster with "
+        f"{concurrency['workers']} workers ({concurrency['sequential_s']:.2f}s -> "
+        f"{concurrency['concurrent_s']:.2f}s)"
+    )
+    print(
+        f"   cached:      p50 {cached['p50_s']:.3f}s / p95 {cached['p95_s']:.3f}s,"
+        f" {cached['llm_requests']} LLM requests"
+    )
+    print(f"   failures:    {result['failures']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
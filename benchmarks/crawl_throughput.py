@@ -0,0 +1,285 @@
+"""
+Offline crawl throughput benchmark against a local LinkedIn-like fixture site.
+
+Serves synthetic search pages (see benchmarks/fixture_site.py), runs
+LinkedInAutomation.gather_job_listings on them in a headless Chromium launched
+by Playwright (no Chrome profile or LinkedIn account needed), and reports
+jobs/s, HTTP requests and Playwright protocol messages per job, peak memory
+and how many of the served jobs were found. The scraper's fixed sleeps are
+scaled by --delay-scale so the run measures the crawl itself, not the pauses.
+
+Results are compared with a stored baseline; the script exits with status 1
+when a metric is worse than the baseline by more than --tolerance:
+
+    uv run playwright install chromium
+    uv run benchmarks/crawl_throughput.py --searches 5 --latency-ms 50
+    uv run benchmarks/crawl_throughput.py --update-baseline
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "..", "src"))
+
+import automation.linkedin as linkedin  # noqa: E402
+from automation.linkedin import LinkedInAutomation  # noqa: E402
+from fixture_site import FixtureSite  # noqa: E402
+from utils.tracing import count_protocol_messages  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, "baselines", "crawl_throughput.json")
+
+# Metrics compared with the baseline, and whether higher values are better
+COMPARED_METRICS = {
+    "jobs_per_s": True,
+    "completeness": True,
+    "http_requests_per_job": False,
+    "protocol_messages_per_job": False,
+    "peak_python_mb": False,
+    "max_js_heap_mb": False,
+}
+
+
+class _ScaledTime:
+    """The time module, with sleeps scaled by `scale`."""
+
+    def __init__(self, scale: float):
+        self.scale = scale
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds * self.scale)
+
+    def __getattr__(self, name: str):
+        return getattr(time, name)
+
+
+class _ScaledRandom:
+    """The random module, with randint (used for pause lengths) scaled."""
+
+    def __init__(self, scale: float):
+        self.scale = scale
+
+    def randint(self, a: int, b: int) -> float:
+        return random.randint(a, b) * self.scale
+
+    def __getattr__(self, name: str):
+        return getattr(random, name)
+
+
+@contextmanager
+def scaled_delays(scale: float) -> Iterator[None]:
+    """Scale the scraper's sleeps and pauses between searches."""
+    original_time, original_random = linkedin.time, linkedin.random
+    linkedin.time = _ScaledTime(scale)
+    linkedin.random = _ScaledRandom(scale)
+    try:
+        yield
+    finally:
+        linkedin.time, linkedin.random = original_time, original_random
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    site = FixtureSite(
+        cards_per_page=args.cards_per_page,
+        initial_cards=args.initial_cards,
+        cards_per_load=args.cards_per_load,
+        latency_ms=args.latency_ms,
+        overlap=args.overlap,
+    ).start()
+    search_urls = site.search_urls(args.searches)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        li_auto = LinkedInAutomation(
+            headless=True,
+            user_data={},
+            data_dir=data_dir,
+            record_failures=not args.no_trace,
+            launch_browser=True,
+        )
+        li_auto.base_platform_url = f"{site.url}/jobs/"
+        li_auto.search_url_list = search_urls
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            with scaled_delays(args.delay_scale), count_protocol_messages() as counts:
+                jobs = li_auto.gather_job_listings(search_rate_limit=args.searches)
+            elapsed = time.perf_counter() - started
+            _, peak_python_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            li_auto.close()
+            site.stop()
+
+    page_summary = li_auto.page_metrics.summary()
+    js_heaps = [
+        stats["js_heap_used_bytes"]["max"]
+        for stats in page_summary["searches"].values()
+        if "js_heap_used_bytes" in stats
+    ]
+    expected_ids = site.expected_job_ids(search_urls)
+    found_ids = {job["job_id"] for job in jobs}
+    http_requests = sum(site.request_counts.values())
+    protocol_messages = sum(counts.values()) if counts is not None else None
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    maxrss_unit = 1 if sys.platform == "darwin" else 1024
+
+    return {
+        "config": {
+            "searches": args.searches,
+            "cards_per_page": args.cards_per_page,
+            "initial_cards": args.initial_cards,
+            "cards_per_load": args.cards_per_load,
+            "latency_ms": args.latency_ms,
+            "overlap": args.overlap,
+            "delay_scale": args.delay_scale,
+            "trace": not args.no_trace,
+        },
+        "jobs": len(jobs),
+        "elapsed_s": round(elapsed, 3),
+        "jobs_per_s": round(len(jobs) / elapsed, 3) if elapsed else 0.0,
+        "completeness": round(len(found_ids & expected_ids) / len(expected_ids), 3),
+        "http_requests": dict(site.request_counts),
+        "http_requests_per_job": round(http_requests / max(len(jobs), 1), 3),
+        "protocol_messages": protocol_messages,
+        "protocol_messages_per_job": round(protocol_messages / max(len(jobs), 1), 3)
+        if protocol_messages is not None
+        else None,
+        "top_protocol_methods": dict(counts.most_common(8)) if counts else {},
+        "peak_python_mb": round(peak_python_bytes / 1e6, 2),
+        "max_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * maxrss_unit / 1e6, 1
+        ),
+        "max_js_heap_mb": round(max(js_heaps) / 1e6, 2) if js_heaps else None,
+        "phases_s": {
+            search: stats["phases_s"]
+            for search, stats in page_summary["searches"].items()
+        },
+    }
+
+
+def compare_with_baseline(
+    result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Relative change of every compared metric against the baseline.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: metric -> {"baseline", "current", "change",
+        "regression"}; "change" is positive when the metric got worse.
+    """
+    comparison = {}
+    for metric, higher_is_better in COMPARED_METRICS.items():
+        current, previous = result.get(metric), baseline.get(metric)
+        if current is None or not previous:
+            continue
+        change = (current - previous) / previous
+        if higher_is_better:
+            change = -change
+        comparison[metric] = {
+            "baseline": previous,
+            "current": current,
+            "change": round(change, 3),
+            "regression": change > tolerance,
+        }
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--searches", type=int, default=3)
+    parser.add_argument("--cards-per-page", type=int, default=25)
+    parser.add_argument(
+        "--initial-cards",
+        type=int,
+        default=7,
+        help="Cards rendered with the page; the rest load while scrolling",
+    )
+    parser.add_argument("--cards-per-load", type=int, default=6)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument(
+        "--overlap",
+        type=float,
+        default=0.2,
+        help="Share of jobs that appear in every search",
+    )
+    parser.add_argument(
+        "--delay-scale",
+        type=float,
+        default=0.05,
+        help="Factor applied to the scraper's sleeps and pauses between searches",
+    )
+    parser.add_argument(
+        "--no-trace", action="store_true", help="Disable the failure recorder"
+    )
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store this run as the new baseline instead of comparing",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed relative regression per metric (0.2 = 20%%)",
+    )
+    parser.add_argument("--output", help="Also write the result to this JSON file")
+    args = parser.parse_args()
+
+    result = run_benchmark(args)
+
+    print(f"\n🏁 [BENCH] {result['jobs']} jobs in {result['elapsed_s']:.1f}s")
+    print(f"   jobs/s:                 {result['jobs_per_s']:.2f}")
+    print(f"   completeness:           {result['completeness']:.1%}")
+    print(f"   HTTP requests per job:  {result['http_requests_per_job']:.2f}")
+    print(f"   protocol msgs per job:  {result['protocol_messages_per_job']}")
+    print(f"   peak Python memory:     {result['peak_python_mb']:.1f} MB")
+    print(f"   max RSS:                {result['max_rss_mb']:.1f} MB")
+    print(f"   max JS heap:            {result['max_js_heap_mb']} MB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\n💾 [BENCH] Baseline saved at: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\n⚠️  [BENCH] No baseline yet at {args.baseline}")
+        return
+
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    if baseline.get("config") != result["config"]:
+        print("\n⚠️  [BENCH] The baseline was recorded with other settings:")
+        print(f"   {baseline.get('config')}")
+
+    comparison = compare_with_baseline(result, baseline, args.tolerance)
+    print("\n📊 [BENCH] Against the baseline (positive = worse):")
+    for metric, values in comparison.items():
+        flag = "❌" if values["regression"] else "✅"
+        print(
+            f"   {flag} {metric:<26} {values['baseline']} -> {values['current']}"
+            f" ({values['change']:+.1%})"
+        )
+
+    if any(values["regression"] for values in comparison.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,468 @@
+"""
+A local stand-in for the OpenAI and Ollama chat APIs, for offline benchmarks.
+
+Answers POST /v1/chat/completions (OpenAI) and POST /api/chat (Ollama), with
+and without streaming, with canned responses that are valid for every prompt
+in src/agent/prompts.py (the prompt is recognized by its system message, and
+the number of keyword sets asked for is honoured). Latency (time to first
+token and tokens per second), failed requests and truncated streams can be
+configured, so the analysis pipeline can be timed without an API key or a
+local model:
+
+    uv run benchmarks/fake_llm_server.py --port 8787 --latency-ms 300
+
+and point the clients at it:
+
+    export OPENAI_API_KEY=fake OPENAI_BASE_URL=http://127.0.0.1:8787/v1
+    export OLLAMA_HOST=http://127.0.0.1:8787
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from agent.metrics import prompt_name_for  # noqa: E402
+
+DEFAULT_LOCATION = "Berlin, Germany"
+
+DEFAULT_WORK_HISTORY = {
+    "Acme Analytics": {
+        "Positions": ["Senior Data Scientist", "Data Scientist"],
+        "Start Date": "March 2019",
+        "End Date": "Present",
+        "Relevant Skills": ["Python", "PyTorch", "SQL", "A/B Testing"],
+    },
+    "Globex": {
+        "Positions": ["Machine Learning Engineer"],
+        "Start Date": "June 2016",
+        "End Date": "February 2019",
+        "Relevant Skills": ["Python", "Spark", "Kubernetes"],
+    },
+}
+
+# Keyword sets handed out (cycled) for however many sets a prompt asks for
+KEYWORD_SETS = [
+    "Data Scientist, Python, Machine Learning, SQL",
+    "Machine Learning Engineer, PyTorch, MLOps, Kubernetes",
+    "Senior Data Scientist, A/B Testing, Statistics, Python",
+    "Data Engineer, Spark, Airflow, SQL",
+    "Applied Scientist, Deep Learning, NLP, Python",
+    "ML Platform Engineer, Kubernetes, Docker, MLOps",
+    "Analytics Engineer, dbt, SQL, Data Modeling",
+    "AI Engineer, LLM, Python, Retrieval",
+]
+
+# Matches the number of keyword sets in the keyword generation prompts
+K_PATTERN = re.compile(r"(?:Generate|produce) exactly (\d+) sets")
+TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
+def _keyword_sets(k: int) -> List[str]:
+    return [KEYWORD_SETS[i % len(KEYWORD_SETS)] for i in range(k)]
+
+
+def canned_response(system_prompt: str, user_prompt: str) -> str:
+    """A response in the format the given prompt asks for."""
+    prompt_name = prompt_name_for(system_prompt)
+    k_match = K_PATTERN.search(user_prompt)
+    k = int(k_match.group(1)) if k_match else 5
+
+    if prompt_name == "SMALL_LOCATION_EXTRACTOR_SYSTEM_PROMPT":
+        return json.dumps({"current_location": DEFAULT_LOCATION})
+    if prompt_name == "SMALL_INFO_EXTRACTOR_SYSTEM_PROMPT":
+        return json.dumps({"company_names": DEFAULT_WORK_HISTORY}, indent=2)
+    if prompt_name == "KEYWORD_GEN_SYSTEM_PROMPT":
+        return json.dumps({"keyword_sets": _keyword_sets(k)}, indent=2)
+    if prompt_name == "RESUME_INFO_EXTRACTOR_SYSTEM_PROMPT":
+        positions = [
+            position
+            for job in DEFAULT_WORK_HISTORY.values()
+            for position in job["Positions"]
+        ]
+        skills = sorted(
+            {
+                skill
+                for job in DEFAULT_WORK_HISTORY.values()
+                for skill in job["Relevant Skills"]
+            }
+        )
+        keyword_lines = "\n".join(
+            f"{i}) {keyword_set}" for i, keyword_set in enumerate(_keyword_sets(k), 1)
+        )
+        return (
+            f"{{current_location}}: {DEFAULT_LOCATION}\n"
+            f"{{years_experience}}: 8 years\n"
+            f"{{positions}}: {', '.join(positions)}\n"
+            f"{{skills}}: {', '.join(skills)}\n\n"
+            f"<Keywords>\n{keyword_lines}\n<\\Keywords>"
+        )
+    if prompt_name in (
+        "SMALL_EXTRACTOR_SYSTEM_PROPMPT",
+        "SMALL_DATE_EXTRACTOR_SYSTEM_PROMPT",
+    ):
+        return "\n".join(
+            f"* {job['Positions'][0]} - {job['Start Date']} - {job['End Date']}"
+            for job in DEFAULT_WORK_HISTORY.values()
+        )
+    if prompt_name == "SMALL_SUMMARIZER_SYSTEM_PROMPT":
+        return "\n".join(
+            f"{', '.join(job['Positions'])} at {company} "
+            f"({job['Start Date']} - {job['End Date']}), working with "
+            f"{', '.join(job['Relevant Skills'])}."
+            for company, job in DEFAULT_WORK_HISTORY.items()
+        )
+    return "OK"
+
+
+def _count_tokens(text: str) -> int:
+    # Roughly 4 characters per token, like the chunker's fallback estimate
+    return max(1, len(text) // 4)
+
+
+class FakeLLMServer:
+    """
+    Serves the fake chat APIs from a background thread.
+
+    Args:
+        latency_ms (float): Time to the first token of every response.
+        tokens_per_s (float): Generation speed after the first token (0 sends
+            the whole response at once).
+        error_rate (float): Share of requests answered with `error_status`.
+        error_status (int): HTTP status of injected errors (e.g. 429 or 500).
+        truncate_rate (float): Share of streamed responses cut off halfway.
+        seed (int): Seed of the error/truncation draws.
+        port (int): Port to listen on (0 picks a free one).
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 300.0,
+        tokens_per_s: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        truncate_rate: float = 0.0,
+        seed: int = 0,
+        port: int = 0,
+    ):
+        self.latency_ms = latency_ms
+        self.tokens_per_s = tokens_per_s
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.truncate_rate = truncate_rate
+        self.port = port
+        self.requests: Counter = Counter()
+        self.errors = 0
+        self.truncated = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that point the OpenAI and Ollama clients here."""
+        return {
+            "OPENAI_API_KEY": "fake",
+            "OPENAI_BASE_URL": f"{self.url}/v1",
+            "OLLAMA_HOST": self.url,
+        }
+
+    def start(self) -> "FakeLLMServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                server._handle_post(self)
+
+            def do_GET(self):
+                server._handle_get(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(
+            target=self._server.serve_forever, name="fake-llm-server", daemon=True
+        ).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": sum(self.requests.values()),
+                "by_prompt": dict(self.requests),
+                "errors": self.errors,
+                "truncated": self.truncated,
+                "max_in_flight": self.max_in_flight,
+            }
+
+    def _draw(self, rate: float) -> bool:
+        with self._lock:
+            return rate > 0 and self._random.random() < rate
+
+    def _tokens(self, text: str) -> Iterator[str]:
+        """The response in token-sized pieces, paced by `tokens_per_s`."""
+        time.sleep(self.latency_ms / 1000)
+        if not self.tokens_per_s:
+            yield text
+            return
+        for piece in TOKEN_PATTERN.findall(text):
+            yield piece
+            time.sleep(1 / self.tokens_per_s)
+
+    def _handle_get(self, request: BaseHTTPRequestHandler):
+        if request.path.rstrip("/") == "/v1/models":
+            body = {"object": "list", "data": [{"id": "fake", "object": "model"}]}
+        elif request.path == "/api/tags":
+            body = {"models": [{"name": "fake", "model": "fake"}]}
+        elif request.path == "/api/version":
+            body = {"version": "0.0.0-fake"}
+        else:
+            body = None
+        self._send_json(request, 200 if body else 404, body or {"error": "not found"})
+
+    def _handle_post(self, request: BaseHTTPRequestHandler):
+        length = int(request.headers.get("Content-Length") or 0)
+        payload = json.loads(request.rfile.read(length) or b"{}")
+        if request.path == "/v1/chat/completions":
+            api = "openai"
+        elif request.path == "/api/chat":
+            api = "ollama"
+        else:
+            self._send_json(request, 404, {"error": "not found"})
+            return
+
+        messages = payload.get("messages", [])
+        system_prompt = next(
+            (m["content"] for m in messages if m.get("role") == "system"), None
+        )
+        user_prompt = next(
+            (m["content"] for m in reversed(messages) if m.get("role") == "user"), ""
+        )
+        with self._lock:
+            self.requests[prompt_name_for(system_prompt)] += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        try:
+            if self._draw(self.error_rate):
+                with self._lock:
+                    self.errors += 1
+                time.sleep(self.latency_ms / 1000)
+                message = "Injected error from the fake LLM server"
+                error = (
+                    {"error": {"message": message, "type": "server_error"}}
+                    if api == "openai"
+                    else {"error": message}
+                )
+                self._send_json(request, self.error_status, error)
+                return
+
+            text = canned_response(system_prompt, user_prompt)
+            model = payload.get("model", "fake")
+            usage = (
+                _count_tokens(system_prompt or "") + _count_tokens(user_prompt),
+                _count_tokens(text),
+            )
+            # Ollama streams unless asked not to, OpenAI only when asked to
+            stream = payload.get("stream", api == "ollama")
+            if api == "openai" and stream:
+                include_usage = (payload.get("stream_options") or {}).get(
+                    "include_usage", False
+                )
+                self._stream_openai(request, model, text, usage, include_usage)
+            elif api == "openai":
+                body = self._openai_completion(model, text, usage)
+                self._send_json(request, 200, body)
+            elif stream:
+                self._stream_ollama(request, model, text, usage)
+            else:
+                body = self._ollama_response(model, text, usage)
+                self._send_json(request, 200, body)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _maybe_truncate(self, text: str) -> Tuple[str, bool]:
+        """Cut a `truncate_rate` share of the streams off halfway."""
+        if not self._draw(self.truncate_rate):
+            return text, False
+        with self._lock:
+            self.truncated += 1
+        return text[: len(text) // 2], True
+
+    def _openai_completion(self, model: str, text: str, usage) -> Dict[str, Any]:
+        for _ in self._tokens(text):
+            pass
+        return {
+            "id": f"chatcmpl-fake-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": usage[0],
+                "completion_tokens": usage[1],
+                "total_tokens": sum(usage),
+            },
+        }
+
+    def _stream_openai(
+        self, request, model: str, text: str, usage, include_usage: bool
+    ):
+        completion_id = f"chatcmpl-fake-{uuid.uuid4().hex[:12]}"
+
+        def chunk(choices, **extra) -> bytes:
+            body = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+            return f"data: {json.dumps(body)}\n\n".encode("utf-8")
+
+        text, truncated = self._maybe_truncate(text)
+        self._start_stream(request, "text/event-stream")
+        for piece in self._tokens(text):
+            request.wfile.write(
+                chunk(
+                    [
+                        {
+                            "index": 0,
+                            "delta": {"role": "assistant", "content": piece},
+                            "finish_reason": None,
+                        }
+                    ]
+                )
+            )
+            request.wfile.flush()
+        if truncated:
+            return  # The connection closes without a finish_reason
+        request.wfile.write(
+            chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        )
+        if include_usage:
+            usage_body = {
+                "prompt_tokens": usage[0],
+                "completion_tokens": usage[1],
+                "total_tokens": sum(usage),
+            }
+            request.wfile.write(chunk([], usage=usage_body))
+        request.wfile.write(b"data: [DONE]\n\n")
+
+    def _ollama_message(
+        self, model: str, text: str, usage, done: bool = True
+    ) -> Dict[str, Any]:
+        return {
+            "model": model,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "message": {"role": "assistant", "content": text},
+            "done": done,
+            **(
+                {
+                    "done_reason": "stop",
+                    "prompt_eval_count": usage[0],
+                    "eval_count": usage[1],
+                }
+                if done
+                else {}
+            ),
+        }
+
+    def _ollama_response(self, model: str, text: str, usage) -> Dict[str, Any]:
+        for _ in self._tokens(text):
+            pass
+        return self._ollama_message(model, text, usage)
+
+    def _stream_ollama(self, request, model: str, text: str, usage):
+        text, truncated = self._maybe_truncate(text)
+        self._start_stream(request, "application/x-ndjson")
+        for piece in self._tokens(text):
+            message = self._ollama_message(model, piece, usage, done=False)
+            request.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+            request.wfile.flush()
+        if truncated:
+            return  # The connection closes without the done message
+        message = self._ollama_message(model, "", usage)
+        request.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+
+    @staticmethod
+    def _start_stream(request, content_type: str):
+        request.send_response(200)
+        request.send_header("Content-Type", content_type)
+        request.send_header("Cache-Control", "no-cache")
+        request.end_headers()
+
+    @staticmethod
+    def _send_json(request, status: int, body: Dict[str, Any]):
+        payload = json.dumps(body).encode("utf-8")
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--tokens-per-s", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(
+        latency_ms=args.latency_ms,
+        tokens_per_s=args.tokens_per_s,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        truncate_rate=args.truncate_rate,
+        port=args.port,
+    ).start()
+    print(f"\n🤖 [FAKE LLM] Serving on {server.url}, point the clients at it with:")
+    for name, value in server.env().items():
+        print(f"   export {name}={value}")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f"\n🤖 [FAKE LLM] {server.stats()}")
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
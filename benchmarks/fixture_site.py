@@ -0,0 +1,282 @@
+"""
+A local, LinkedIn-like job search site for offline scraper benchmarks.
+
+Search pages mimic the DOM the scraper relies on (src/automation/linkedin.py):
+a scrollable results container that lazily loads more `.job-card-container`
+cards over an API call when it is scrolled, job cards with the same title /
+company / location / benefits / footer markup, and pagination links. Jobs are
+generated deterministically from the search keywords, with a configurable
+share of jobs that also appear in other searches.
+
+    site = FixtureSite(cards_per_page=25, latency_ms=50).start()
+    urls = site.search_urls(3)
+    ...
+    print(site.request_counts)
+    site.stop()
+"""
+
+import hashlib
+import html
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+# Class of the scrollable results list the scraper looks for
+SCROLL_CONTAINER_CLASS = "UwxpnwBISmOFPIwyYXZPiisFfsyZrfpAIsaVTI"
+
+TITLES = [
+    "Data Scientist",
+    "Senior Data Scientist",
+    "Machine Learning Engineer",
+    "Data Engineer",
+    "Data Analyst",
+    "Backend Engineer",
+    "Software Engineer",
+    "MLOps Engineer",
+]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries"]
+LOCATIONS = ["Berlin, Germany", "Munich, Germany", "Remote", "Hamburg (Hybrid)"]
+BENEFITS = ["", "Medical, Vision, Dental", "401(k) benefit", "Flexible hours"]
+FOOTER_TAGS = [["Easy Apply"], ["Promoted", "Easy Apply"], ["Actively recruiting"]]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<title>{title}</title>
+<style>
+  .{container} {{ height: 600px; overflow-y: auto; border: 1px solid #ccc; }}
+  .job-card-container {{ height: 110px; border-bottom: 1px solid #eee; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<div class="{container}" data-query="{query}" data-loaded="{loaded}"
+     data-total="{total}">
+{cards}
+</div>
+<ul class="artdeco-pagination__pages">{pagination}</ul>
+<script>
+  const container = document.querySelector(".{container}");
+  let loading = false;
+  container.addEventListener("scroll", async () => {{
+    const loaded = Number(container.dataset.loaded);
+    const total = Number(container.dataset.total);
+    const nearBottom =
+      container.scrollTop + container.clientHeight >= container.scrollHeight - 200;
+    if (loading || loaded >= total || !nearBottom) return;
+    loading = true;
+    const response = await fetch(
+      "/api/cards?" + container.dataset.query + "&offset=" + loaded
+    );
+    container.insertAdjacentHTML("beforeend", await response.text());
+    const cards = container.querySelectorAll(".job-card-container");
+    container.dataset.loaded = cards.length;
+    loading = false;
+  }});
+</script>
+</body>
+</html>
+"""
+
+CARD_TEMPLATE = """<div class="job-card-container" data-job-id="{job_id}">
+  <a class="job-card-container__link" href="/jobs/view/{job_id}/">{title}</a>
+  <div class="artdeco-entity-lockup__subtitle"><span>{company}</span></div>
+  <div class="artdeco-entity-lockup__caption">
+    <ul class="job-card-container__metadata-wrapper"><li>{location}</li></ul>
+  </div>
+  <div class="mt1">
+    <ul class="job-card-container__metadata-wrapper"><li>{benefits}</li></ul>
+  </div>
+  <ul class="job-card-list__footer-wrapper">{tags}</ul>
+</div>
+"""
+FOOTER_ITEM_TEMPLATE = '<li class="job-card-container__footer-item">{tag}</li>'
+PAGE_LINK_TEMPLATE = '<li><a href="/jobs/search/?{query}"{current}>{number}</a></li>'
+
+
+def _stable_int(*parts) -> int:
+    digest = hashlib.sha256(":".join(str(part) for part in parts).encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+class FixtureSite:
+    """
+    Serves the synthetic job search site from a background thread.
+
+    Args:
+        cards_per_page (int): Job cards on one search results page.
+        initial_cards (int): Cards rendered with the page; the rest are loaded
+            by scrolling, a few at a time.
+        cards_per_load (int): Cards returned by one scroll-triggered API call.
+        pages_per_search (int): Result pages (pagination links) per search.
+        latency_ms (float): Delay added to every response.
+        overlap (float): Share of jobs that are shared between all searches.
+        port (int): Port to listen on (0 picks a free one).
+    """
+
+    def __init__(
+        self,
+        cards_per_page: int = 25,
+        initial_cards: int = 7,
+        cards_per_load: int = 6,
+        pages_per_search: int = 4,
+        latency_ms: float = 50.0,
+        overlap: float = 0.2,
+        port: int = 0,
+    ):
+        self.cards_per_page = cards_per_page
+        self.initial_cards = initial_cards
+        self.cards_per_load = cards_per_load
+        self.pages_per_search = pages_per_search
+        self.latency_ms = latency_ms
+        self.overlap = overlap
+        self.port = port
+        self.request_counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> "FixtureSite":
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fixture-site", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def search_urls(self, n_searches: int, page: int = 0) -> List[str]:
+        """One search results URL per keyword set, like build_linkedin_url."""
+        return [
+            f"{self.url}/jobs/search/?"
+            + self._search_query(f"benchmark search {i}", page)
+            for i in range(n_searches)
+        ]
+
+    def expected_job_ids(self, urls: List[str]) -> set:
+        """The job ids a complete scrape of `urls` finds."""
+        job_ids = set()
+        for url in urls:
+            query = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+            keywords = query.get("keywords", [""])[0]
+            start = int(query.get("start", ["0"])[0])
+            jobs = self.jobs(keywords, start, self.cards_per_page)
+            job_ids.update(job["job_id"] for job in jobs)
+        return job_ids
+
+    def jobs(self, keywords: str, start: int, count: int) -> List[Dict[str, str]]:
+        """The jobs at result positions start..start+count of a search."""
+        jobs = []
+        for index in range(start, start + count):
+            # Shared jobs have the same id (and content) in every search
+            if _stable_int("shared", keywords, index) % 1000 < self.overlap * 1000:
+                seed = _stable_int("shared", index)
+            else:
+                seed = _stable_int(keywords, index)
+            jobs.append(
+                {
+                    "job_id": str(4_000_000_000 + seed % 1_000_000_000),
+                    "title": TITLES[seed % len(TITLES)],
+                    "company": COMPANIES[(seed >> 8) % len(COMPANIES)],
+                    "location": LOCATIONS[(seed >> 16) % len(LOCATIONS)],
+                    "benefits": BENEFITS[(seed >> 24) % len(BENEFITS)],
+                    "footer_tags": FOOTER_TAGS[(seed >> 32) % len(FOOTER_TAGS)],
+                }
+            )
+        return jobs
+
+    def _search_query(self, keywords: str, page: int) -> str:
+        start = page * self.cards_per_page
+        return urllib.parse.urlencode({"keywords": keywords, "start": start})
+
+    def _render_cards(
+        self, keywords: str, start: int, offset: int, count: int
+    ) -> str:
+        count = max(min(count, self.cards_per_page - offset), 0)
+        return "".join(
+            CARD_TEMPLATE.format(
+                job_id=job["job_id"],
+                title=html.escape(job["title"]),
+                company=html.escape(job["company"]),
+                location=html.escape(job["location"]),
+                benefits=html.escape(job["benefits"]),
+                tags="".join(
+                    FOOTER_ITEM_TEMPLATE.format(tag=html.escape(tag))
+                    for tag in job["footer_tags"]
+                ),
+            )
+            for job in self.jobs(keywords, start + offset, count)
+        )
+
+    def _render_search_page(self, keywords: str, start: int) -> str:
+        current_page = start // self.cards_per_page
+        pagination = "".join(
+            PAGE_LINK_TEMPLATE.format(
+                query=html.escape(self._search_query(keywords, page)),
+                current=' aria-current="true"' if page == current_page else "",
+                number=page + 1,
+            )
+            for page in range(self.pages_per_search)
+        )
+        return PAGE_TEMPLATE.format(
+            title=html.escape(f"{keywords} jobs"),
+            container=SCROLL_CONTAINER_CLASS,
+            query=html.escape(self._search_query(keywords, current_page)),
+            loaded=min(self.initial_cards, self.cards_per_page),
+            total=self.cards_per_page,
+            cards=self._render_cards(keywords, start, 0, self.initial_cards),
+            pagination=pagination,
+        )
+
+    def _handle(self, request: BaseHTTPRequestHandler):
+        parsed = urllib.parse.urlparse(request.path)
+        query = urllib.parse.parse_qs(parsed.query)
+        keywords = query.get("keywords", [""])[0]
+        start = int(query.get("start", ["0"])[0])
+
+        if parsed.path.startswith("/jobs/search"):
+            kind, body = "search_page", self._render_search_page(keywords, start)
+        elif parsed.path == "/api/cards":
+            offset = int(query.get("offset", ["0"])[0])
+            kind = "card_api"
+            body = self._render_cards(keywords, start, offset, self.cards_per_load)
+        elif parsed.path.startswith("/jobs"):
+            kind, body = "other_page", "<html><body><h1>Jobs</h1></body></html>"
+        else:
+            request.send_response(404)
+            request.end_headers()
+            return
+
+        with self._lock:
+            self.request_counts[kind] += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        payload = body.encode("utf-8")
+        request.send_response(200)
+        request.send_header("Content-Type", "text/html; charset=utf-8")
+        request.send_header("Content-Length", str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
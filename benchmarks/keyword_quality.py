@@ -0,0 +1,198 @@
+"""
+Compare the offline keyword extractor (provider="local") with an LLM provider.
+
+For every resume in a directory both pipelines are run (or the LLM side is read
+from a `src/automation/batch.py` output file with --reference), and the
+user_data fields are compared term by term:
+
+    uv run benchmarks/keyword_quality.py path/to/resumes --provider openai
+    uv run benchmarks/keyword_quality.py path/to/resumes --reference data/resumes.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Set
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from agent.intelligence import extract_info_and_keywords  # noqa: E402
+from automation.batch import find_resumes  # noqa: E402
+from automation.resume_parser import build_user_data, pdf_to_text  # noqa: E402
+
+# user_data fields compared as sets of comma separated terms
+TERM_FIELDS = ["positions", "skills", "keyword_combinations"]
+
+
+def _terms(value: str) -> Set[str]:
+    return {
+        term.strip().lower()
+        for line in str(value or "").splitlines()
+        for term in line.split(",")
+        if term.strip()
+    }
+
+
+def compare_user_data(local: Dict[str, Any], reference: Dict[str, Any]) -> Dict[str, Any]:
+    """Precision/recall/F1 of the local terms against the reference terms per field."""
+    scores = {}
+    for field in TERM_FIELDS:
+        local_terms, reference_terms = _terms(local.get(field)), _terms(reference.get(field))
+        overlap = len(local_terms & reference_terms)
+        precision = overlap / len(local_terms) if local_terms else 0.0
+        recall = overlap / len(reference_terms) if reference_terms else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if overlap else 0.0
+        scores[field] = {
+            "precision": round(precision, 3),
+            "recall": round(recall, 3),
+            "f1": round(f1, 3),
+        }
+
+    local_location = str(local.get("location", "")).lower()
+    reference_location = str(reference.get("location", "")).lower()
+    scores["location_match"] = bool(local_location) and (
+        local_location in reference_location or reference_location in local_location
+    )
+    scores["years_abs_diff"] = abs(
+        int(local.get("years_experience") or 0)
+        - int(reference.get("years_experience") or 0)
+    )
+    return scores
+
+
+def _load_reference(path: str) -> Dict[str, Dict[str, Any]]:
+    reference = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            row = json.loads(line)
+            if row.get("status") == "ok":
+                reference[os.path.abspath(row["path"])] = row["user_data"]
+    return reference
+
+
+def _read_resume(path: str) -> str:
+    if path.lower().endswith(".pdf"):
+        return pdf_to_text(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _analyze(text: str, **kwargs) -> tuple:
+    started = time.perf_counter()
+    results = extract_info_and_keywords(resume_text=text, **kwargs)
+    return build_user_data(results), time.perf_counter() - started
+
+
+def _mean(values: List[float]) -> float:
+    return round(sum(values) / len(values), 3) if values else 0.0
+
+
+def run_comparison(
+    resume_paths: List[str],
+    k: int,
+    main_job_search_focus: str,
+    provider: str,
+    openai_model: str,
+    reference_path: str = None,
+) -> Dict[str, Any]:
+    reference = _load_reference(reference_path) if reference_path else {}
+    rows = []
+
+    for path in resume_paths:
+        try:
+            text = _read_resume(path)
+        except Exception as e:
+            print(f"⚠️  Could not read {path}: {e}")
+            continue
+        local, local_s = _analyze(
+            text, k=k, provider="local", main_job_search_focus=main_job_search_focus
+        )
+        if reference_path:
+            if os.path.abspath(path) not in reference:
+                print(f"⚠️  No reference row for {path}, skipping")
+                continue
+            llm, llm_s = reference[os.path.abspath(path)], None
+        else:
+            llm, llm_s = _analyze(
+                text,
+                k=k,
+                provider=provider,
+                openai_model=openai_model,
+                main_job_search_focus=main_job_search_focus,
+            )
+
+        scores = compare_user_data(local, llm)
+        scores.update(
+            {"path": path, "local_s": round(local_s, 4), "llm_s": llm_s and round(llm_s, 2)}
+        )
+        rows.append(scores)
+
+    summary = {
+        field: {
+            metric: _mean([row[field][metric] for row in rows])
+            for metric in ("precision", "recall", "f1")
+        }
+        for field in TERM_FIELDS
+    }
+    summary["location_match_rate"] = _mean([float(row["location_match"]) for row in rows])
+    summary["years_mean_abs_diff"] = _mean([row["years_abs_diff"] for row in rows])
+    summary["local_mean_s"] = _mean([row["local_s"] for row in rows])
+    llm_times = [row["llm_s"] for row in rows if row["llm_s"] is not None]
+    summary["llm_mean_s"] = _mean(llm_times) if llm_times else None
+    summary["resumes"] = len(rows)
+    return {"summary": summary, "resumes": rows}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("input_dir", help="Directory of PDF (or .txt) resumes")
+    arg_parser.add_argument("-k", type=int, default=20, help="Keyword sets per resume")
+    arg_parser.add_argument("--focus", default="Software Engineering")
+    arg_parser.add_argument("--provider", default="openai")
+    arg_parser.add_argument("--openai-model", default="gpt-4")
+    arg_parser.add_argument(
+        "--reference", default=None, help="batch.py JSONL output to compare against"
+    )
+    arg_parser.add_argument("--output", default=None, help="Write the report as JSON")
+    args = arg_parser.parse_args()
+
+    resume_paths = find_resumes(args.input_dir) + sorted(
+        os.path.join(args.input_dir, name)
+        for name in os.listdir(args.input_dir)
+        if name.lower().endswith(".txt")
+    )
+    report = run_comparison(
+        resume_paths,
+        k=args.k,
+        main_job_search_focus=args.focus,
+        provider=args.provider,
+        openai_model=args.openai_model,
+        reference_path=args.reference,
+    )
+
+    summary = report["summary"]
+    print(f"\n📏 Local extractor vs {args.reference or args.provider}, {summary['resumes']} resumes")
+    print(f"{'field':<22} {'precision':>9} {'recall':>7} {'f1':>6}")
+    for field in TERM_FIELDS:
+        stats = summary[field]
+        print(
+            f"{field:<22} {stats['precision']:>9.3f} {stats['recall']:>7.3f} "
+            f"{stats['f1']:>6.3f}"
+        )
+    print(f"location match rate    {summary['location_match_rate']:.3f}")
+    print(f"years mean abs diff    {summary['years_mean_abs_diff']:.2f}")
+    llm_mean = summary["llm_mean_s"]
+    print(
+        f"mean latency local/llm {summary['local_mean_s']:.3f}s / "
+        + (f"{llm_mean:.2f}s" if llm_mean is not None else "n/a")
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+import sys
+import os
+
+
+def main():
+    args = " ".join(sys.argv[1:])
+    if sys.platform == "win32":
+        os.system(f"uv run src\\automation\\scheduler.py {args}")
+    else:
+        os.system(f"uv run src/automation/scheduler.py {args}")
+
+
+if __name__ == "__main__":
+    main()
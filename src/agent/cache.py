@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Union
+
+from agent.metrics import current_run
+from utils.helpers import atomic_write_json
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(CURRENT_DIR, "..", "data", "cache", "stages")
+
+# Number of stage results kept in memory; older entries are still on disk
+MAX_MEMORY_ENTRIES = 256
+
+
+def content_hash(content: Union[str, bytes]) -> str:
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_hash(path: str) -> str:
+    """sha256 of a file's bytes, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    Memoizes the results of the resume analysis stages (PDF text and sections,
+    location, work history, keyword sets), keyed by a hash of each stage's inputs.
+
+    Results live in a small in-memory LRU and are persisted as JSON files under
+    data/cache/stages/<stage>/, so they also survive app restarts. Values must
+    be JSON serializable and never None (None means "not cached").
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, None] = CACHE_DIR,
+        max_memory_entries: int = MAX_MEMORY_ENTRIES,
+    ):
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max_memory_entries
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(stage: str, inputs: Dict[str, Any]) -> str:
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        return content_hash(f"{stage}:{payload}")
+
+    def get(self, stage: str, inputs: Dict[str, Any]) -> Any:
+        """Return the cached result of `stage` for `inputs`, or None."""
+        key = self.key(stage, inputs)
+        value = self._get_from_memory(stage, key)
+        if value is None:
+            value = self._get_from_disk(stage, key)
+            if value is not None:
+                self._set_in_memory(stage, key, value)
+
+        current_run().record_stage_cache(stage, hit=value is not None)
+        if value is not None:
+            print(f"\n♻️  [CACHE] Reusing cached {stage} result")
+        return value
+
+    def set(self, stage: str, inputs: Dict[str, Any], value: Any):
+        key = self.key(stage, inputs)
+        self._set_in_memory(stage, key, value)
+
+        if self.cache_dir is None:
+            return
+        # Other processes (the app, batch runs, the CLI) may share the cache
+        # directory, so readers must never see half a file
+        atomic_write_json(os.path.join(self.cache_dir, stage, f"{key}.json"), value)
+
+    def get_or_compute(
+        self, stage: str, inputs: Dict[str, Any], compute: Callable[[], Any]
+    ) -> Any:
+        value = self.get(stage, inputs)
+        if value is None:
+            value = compute()
+            self.set(stage, inputs, value)
+        return value
+
+    def clear(self):
+        """Drop the in-memory entries (files on disk are kept)."""
+        with self._lock:
+            self._memory.clear()
+
+    def _get_from_memory(self, stage: str, key: str) -> Any:
+        with self._lock:
+            value = self._memory.get((stage, key))
+            if value is not None:
+                self._memory.move_to_end((stage, key))
+            return value
+
+    def _set_in_memory(self, stage: str, key: str, value: Any):
+        with self._lock:
+            self._memory[(stage, key)] = value
+            self._memory.move_to_end((stage, key))
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def _get_from_disk(self, stage: str, key: str) -> Any:
+        if self.cache_dir is None:
+            return None
+        path = os.path.join(self.cache_dir, stage, f"{key}.json")
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+
+_DEFAULT_CACHE: Union[StageCache, None] = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def default_stage_cache() -> StageCache:
+    global _DEFAULT_CACHE
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = StageCache()
+        return _DEFAULT_CACHE
@@ -0,0 +1,190 @@
+import math
+import re
+from collections import deque
+from typing import Iterable, Iterator, List, Union
+
+# Approximate token budget for the resume text of a single prompt, per model
+# (prefix match). This leaves room for the system/user prompt and the answer.
+MODEL_TOKEN_BUDGETS = {
+    "llama3.2": 1500,
+    "mistral": 1500,
+    "gpt-4o": 12000,
+    "gpt-4.1": 12000,
+    "gpt-4": 3000,
+}
+DEFAULT_TOKEN_BUDGET = 1500
+
+# Average characters per token for English text with GPT/Llama tokenizers
+CHARS_PER_TOKEN = 4
+
+# A new section heading closes the current chunk if it is at least this full,
+# so sections are not split between chunks unless they have to be.
+SECTION_BREAK_FILL = 0.5
+
+SECTION_HEADINGS = {
+    "experience",
+    "work experience",
+    "professional experience",
+    "employment history",
+    "work history",
+    "education",
+    "skills",
+    "technical skills",
+    "projects",
+    "summary",
+    "profile",
+    "certifications",
+    "publications",
+    "languages",
+    "contact",
+}
+
+# A segment ends at a sentence terminator followed by whitespace, or at a
+# newline (resume bullets and headings rarely end with a period).
+SEGMENT_PATTERN = re.compile(r"[^\n]*?(?:[.!?](?=\s)|\n)")
+
+
+def token_budget_for_model(model: Union[str, None]) -> int:
+    if model:
+        for prefix, budget in MODEL_TOKEN_BUDGETS.items():
+            if model.startswith(prefix):
+                return budget
+    return DEFAULT_TOKEN_BUDGET
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _is_heading(segment: str) -> bool:
+    stripped = segment.strip().rstrip(":")
+    if not stripped or len(stripped) > 40:
+        return False
+    return stripped.lower() in SECTION_HEADINGS or (
+        stripped.isupper() and len(stripped.split()) <= 4
+    )
+
+
+def _iter_segments(pieces: Iterable[str]) -> Iterator[str]:
+    """Split a stream of text pieces (e.g. PDF pages) into sentences/lines."""
+    leftover = ""
+    for piece in pieces:
+        buffer = leftover + piece
+        last_end = 0
+        for match in SEGMENT_PATTERN.finditer(buffer):
+            if match.end() > match.start():
+                yield match.group(0)
+            last_end = match.end()
+        # The unterminated tail may continue in the next piece
+        leftover = buffer[last_end:]
+
+    if leftover:
+        yield leftover
+
+
+def _split_oversized(segment: str, max_tokens: int) -> Iterator[str]:
+    """Split a single segment that is larger than the budget on word boundaries."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    start = 0
+    while start < len(segment):
+        end = start + max_chars
+        if end < len(segment):
+            space = segment.rfind(" ", start, end)
+            if space > start:
+                end = space + 1
+        yield segment[start:end]
+        start = end
+
+
+def iter_chunks(
+    pieces: Iterable[str],
+    max_tokens: int = DEFAULT_TOKEN_BUDGET,
+    overlap_tokens: int = 0,
+) -> Iterator[str]:
+    """
+    Pack a stream of text into chunks of at most `max_tokens` tokens.
+
+    Chunks only break between sentences/lines, and preferably right before a
+    section heading. The last sentences of a chunk (up to `overlap_tokens`)
+    are repeated at the start of the next one. `pieces` is consumed lazily,
+    so chunks are produced while later pages are still being read. Every
+    segment is measured once, which keeps the whole pass linear in the input.
+
+    Args:
+        pieces (Iterable[str]): The text, in one or more consecutive pieces.
+        max_tokens (int): Token budget per chunk.
+        overlap_tokens (int): Tokens of context shared by consecutive chunks.
+
+    Yields:
+        str: The chunks, in document order.
+    """
+    if overlap_tokens >= max_tokens:
+        raise ValueError("overlap_tokens must be smaller than max_tokens.")
+
+    window = deque()  # (segment, tokens)
+    window_tokens = 0
+    # Number of segments in `window` that were carried over as overlap
+    carried = 0
+
+    def flush(keep_overlap: bool) -> str:
+        nonlocal window_tokens, carried
+        chunk = "".join(segment for segment, _ in window).strip()
+        if not keep_overlap:
+            window.clear()
+            window_tokens = 0
+        else:
+            while window and window_tokens > overlap_tokens:
+                _, tokens = window.popleft()
+                window_tokens -= tokens
+        carried = len(window)
+        return chunk
+
+    for segment in _iter_segments(pieces):
+        tokens = estimate_tokens(segment)
+
+        if tokens > max_tokens:
+            parts = list(_split_oversized(segment, max_tokens))
+        else:
+            parts = [segment]
+
+        for part in parts:
+            part_tokens = estimate_tokens(part) if len(parts) > 1 else tokens
+            has_new_content = len(window) > carried
+
+            if (
+                has_new_content
+                and _is_heading(part)
+                and window_tokens >= max_tokens * SECTION_BREAK_FILL
+            ):
+                yield flush(keep_overlap=False)
+            elif window_tokens + part_tokens > max_tokens:
+                if has_new_content:
+                    yield flush(keep_overlap=True)
+                # Drop overlap until the new segment fits
+                while window and window_tokens + part_tokens > max_tokens:
+                    _, dropped_tokens = window.popleft()
+                    window_tokens -= dropped_tokens
+                carried = len(window)
+
+            window.append((part, part_tokens))
+            window_tokens += part_tokens
+
+    if len(window) > carried:
+        chunk = flush(keep_overlap=False)
+        if chunk:
+            yield chunk
+
+
+def chunk_text(
+    text: str,
+    max_tokens: Union[int, None] = None,
+    model: Union[str, None] = None,
+    overlap_tokens: int = 0,
+) -> List[str]:
+    """
+    Split `text` into sentence-preserving chunks that fit the token budget of
+    `model` (or `max_tokens` if given). See `iter_chunks`.
+    """
+    if max_tokens is None:
+        max_tokens = token_budget_for_model(model)
+    return list(iter_chunks([text], max_tokens=max_tokens, overlap_tokens=overlap_tokens))
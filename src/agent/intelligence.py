@@ -1,13 +1,12 @@
 # Local imports
-import json
 import re
+import threading
 import time
-from typing import Any, Dict, List, Union
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Tuple, Union
 
 import urllib
 from agent.prompts import (
-    RESUME_INFO_EXTRACTOR_SYSTEM_PROMPT,
-    RESUME_INFO_EXTRACTOR_USER_PROMPT,
     KEYWORD_GEN_SYSTEM_PROMPT,
     KEYWORD_GEN_USER_PROMPT,
     SMALL_INFO_EXTRACTOR_SYSTEM_PROMPT,
@@ -15,13 +14,21 @@ from agent.prompts import (
     SMALL_LOCATION_EXTRACTOR_SYSTEM_PROMPT,
     SMALL_LOCATION_EXTRACTOR_USER_PROMPT,
 )
-from agent.llm import call_llm
-import nltk
+from agent.cache import content_hash, default_stage_cache
+from agent.chunking import chunk_text
+from agent.json_parser import IncrementalJSONParser, parse_json_lenient
+from agent.lexicon import find_skills, find_titles
+from agent.llm import call_llm, stream_llm
+from agent.schemas import KEYWORD_SETS_SCHEMA, LOCATION_SCHEMA, WORK_HISTORY_SCHEMA
 
-nltk.download("punkt")
+# Tokens of context repeated between consecutive resume chunks, so an entry
+# cut at a chunk boundary is still seen whole in one of them
+CHUNK_OVERLAP_TOKENS = 100
 
-WORD_TOKENIZER = nltk.tokenize.TreebankWordTokenizer()
-MAX_WORDS_PER_CHUNK = 300
+# Providers whose resume analysis runs on token-budgeted chunks
+CHUNKED_PROVIDERS = ("ollama", "auto")
+
+YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
 
 # Fields we expect in the final extracted text
 EXTRACTION_FIELDS = ["positions", "current_location", "years_experience", "skills"]
@@ -74,7 +81,8 @@ def parse_gpt_keyword_sets(extracted_text: str, k: int) -> List[str]:
     pattern_block = r"<Keywords>(.*?)<\\Keywords>"
     block_match = re.search(pattern_block, extracted_text, re.DOTALL)
     if not block_match:
-        return []
+        # The model ignored the block format; accept a JSON "keyword_sets" list
+        return parse_mhop_keywords_sets(extracted_text)[:k]
 
     keywords_block = block_match.group(1).strip()
     # Now parse each line that starts with "digit)" or something similar.
@@ -102,14 +110,13 @@ def parse_llm_json_output(llm_output: str) -> Union[Dict[str, Any], None]:
     Parse the JSON output from the LLM API call.
     We expect a JSON object with the following keys:
       - "company_names": {company: {job_title, start_date, end_date}}
-    """
 
-    json_start = llm_output.find("{")
-    json_end = llm_output.rfind("}")
-    if json_start == -1 or json_end == -1:
+    Prose around the JSON, trailing commas and truncated output are tolerated
+    (see agent/json_parser.py). Returns None if no JSON object can be recovered.
+    """
+    extracted_dict = parse_json_lenient(llm_output)
+    if not isinstance(extracted_dict, dict):
         return None
-    extracted_dict: str = llm_output[json_start : json_end + 1]
-    extracted_dict: dict = json.loads(extracted_dict)
 
     return extracted_dict
 
@@ -120,7 +127,7 @@ def parse_mhop_location_info(llm_output: str) -> Dict[str, str]:
     The LLM response should be a JSON object with the following keys:
       - "current_location": ...
     """
-    extracted_info = parse_llm_json_output(llm_output)
+    extracted_info = parse_llm_json_output(llm_output) or {}
 
     current_location = extracted_info.get("current_location", "")
 
@@ -133,15 +140,45 @@ def parse_mhop_keywords_sets(llm_output: str) -> List[str]:
     The LLM response should be a JSON object with the following keys:
       - "keyword_sets": ...
     """
-    extracted_info = parse_llm_json_output(llm_output)
+    extracted_info = parse_llm_json_output(llm_output) or {}
 
     keyword_sets = extracted_info.get("keyword_sets", [])
 
     return keyword_sets
 
 
+def _parse_year(date_str: str) -> Union[int, None]:
+    """Extract the year from dates like "01/2020", "January 2020" or "2020"."""
+    year_match = YEAR_PATTERN.search(date_str or "")
+    return int(year_match.group(0)) if year_match else None
+
+
+def _years_of_experience(work_history: List[Dict[str, Any]]) -> int:
+    """Years between the earliest start and the latest end date of the jobs."""
+    work_history_start_year = 3000
+    work_history_end_year = 0
+
+    for job in work_history:
+        start_date = job.get("Start Date", "")
+        end_date = job.get("End Date", "")
+
+        job_start_year = _parse_year(start_date)
+        if job_start_year:
+            work_history_start_year = min(work_history_start_year, job_start_year)
+        if end_date:
+            if end_date.lower() == "present":
+                work_history_end_year = time.localtime().tm_year
+            else:
+                job_end_year = _parse_year(end_date)
+                if job_end_year:
+                    work_history_end_year = max(work_history_end_year, job_end_year)
+
+    return max(work_history_end_year - work_history_start_year, 0)
+
+
 def parse_mhop_extracted_info(llm_outputs: List[str]) -> Dict[str, Any]:
     work_history = []
+    jobs_by_company = {}
 
     for i, llm_output in enumerate(llm_outputs):
         extracted_dict = parse_llm_json_output(llm_output)
@@ -153,6 +190,8 @@ def parse_mhop_extracted_info(llm_outputs: List[str]) -> Dict[str, Any]:
 
         work_history_current_chunk = []
         for company in companies:
+            if not isinstance(companies_info[company], dict):
+                continue
             job_info = {
                 "Company": company,
                 "Positions": companies_info[company].get("Positions", []),
@@ -160,28 +199,24 @@ def parse_mhop_extracted_info(llm_outputs: List[str]) -> Dict[str, Any]:
                 "End Date": companies_info[company].get("End Date", ""),
                 "Relevant Skills": companies_info[company].get("Relevant Skills", []),
             }
+
+            # Overlapping chunks can report the same company twice
+            if company in jobs_by_company:
+                seen_job = jobs_by_company[company]
+                for key in ("Positions", "Relevant Skills"):
+                    seen_job[key].extend(
+                        item for item in job_info[key] if item not in seen_job[key]
+                    )
+                for key in ("Start Date", "End Date"):
+                    seen_job[key] = seen_job[key] or job_info[key]
+                continue
+
+            jobs_by_company[company] = job_info
             work_history_current_chunk.append(job_info)
 
         work_history.extend(work_history_current_chunk)
 
-    work_history_start_year = 3000
-    work_history_end_year = 0
-
-    for job in work_history:
-        start_date = job.get("Start Date", "")
-        end_date = job.get("End Date", "")
-
-        if start_date:
-            job_start_year = int(start_date.split("/")[-1])
-            work_history_start_year = min(work_history_start_year, job_start_year)
-        if end_date:
-            if end_date.lower() == "present":
-                work_history_end_year = time.localtime().tm_year
-            else:
-                job_end_year = int(end_date.split("/")[-1])
-                work_history_end_year = max(work_history_end_year, job_end_year)
-
-    total_experience = work_history_end_year - work_history_start_year
+    total_experience = _years_of_experience(work_history)
 
     return (work_history, total_experience)
 
@@ -228,132 +263,546 @@ def build_linkedin_url(
     return final_url
 
 
-def extract_info_and_keywords(
+# --- Offline fast path (provider="local") ---------------------------------
+
+MONTH_PATTERN = (
+    r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+)
+DATE_PATTERN = rf"(?:{MONTH_PATTERN}\s+|\d{{1,2}}[/.])?(?:19|20)\d{{2}}"
+DATE_RANGE_PATTERN = re.compile(
+    rf"({DATE_PATTERN})\s*(?:-|–|—|to|until)\s*"
+    rf"({DATE_PATTERN}|present|current|now|today)",
+    re.IGNORECASE,
+)
+
+# "City, Country" / "City, ST" lines in the resume header
+LOCATION_PATTERN = re.compile(
+    r"^([A-Z][A-Za-zÀ-ÿ'.-]+(?: [A-Z][A-Za-zÀ-ÿ'.-]+){0,2}),\s*"
+    r"([A-Z][A-Za-zÀ-ÿ'.-]+(?: [A-Z][A-Za-zÀ-ÿ'.-]+){0,2})$"
+)
+HEADER_LINES = 15
+
+# Separators between the fields of one resume line, e.g. "Title | Company"
+FIELD_SEPARATOR_PATTERN = re.compile(r"\s*(?:\||•|·|–|—|,|\s-\s|\bat\b|@)\s*")
+
+RAKE_STOPWORDS = frozenset(
+    """a about above across after again against all also am an and any are as at
+    be been before being below between both but by can could did do does doing
+    during each few for from further had has have having he her here hers him his
+    how i if in into is it its itself just me more most my no nor not of off on
+    once only or other our ours out over own same she should so some such than
+    that the their them then there these they this those through to too under
+    until up using very via was we were what when where which while who whom why
+    will with within would you your years year responsible worked working
+    including various new""".split()
+)
+RAKE_WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9+#.\-/]*")
+RAKE_SPLIT_PATTERN = re.compile(r"[\n.,;:!?()\[\]|•·\"]+")
+
+# Terms per keyword set besides the job title
+LOCAL_SKILLS_PER_SET = 3
+
+
+def rake_phrases(text: str, max_words: int = 3) -> List[Tuple[str, float]]:
+    """
+    Rank candidate key phrases with RAKE (Rapid Automatic Keyword Extraction):
+    phrases are the runs of words between stopwords and punctuation, and each
+    word scores degree / frequency over all phrases.
+
+    Returns:
+        List[Tuple[str, float]]: (phrase, score) pairs, best first.
+    """
+    phrases = []
+    for fragment in RAKE_SPLIT_PATTERN.split(text):
+        phrase = []
+        for word in RAKE_WORD_PATTERN.findall(fragment):
+            if word.lower() in RAKE_STOPWORDS:
+                if phrase:
+                    phrases.append(phrase)
+                phrase = []
+            else:
+                phrase.append(word)
+        if phrase:
+            phrases.append(phrase)
+
+    phrases = [phrase for phrase in phrases if len(phrase) <= max_words]
+    frequency = Counter()
+    degree = Counter()
+    for phrase in phrases:
+        for word in phrase:
+            frequency[word.lower()] += 1
+            degree[word.lower()] += len(phrase)
+
+    scores = {}
+    for phrase in phrases:
+        key = " ".join(phrase)
+        scores[key] = sum(degree[w.lower()] / frequency[w.lower()] for w in phrase)
+
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def extract_location_local(resume_text: str) -> str:
+    """Find a "City, Country" line (or line part) in the resume header."""
+    for line in resume_text.splitlines()[:HEADER_LINES]:
+        for part in re.split(r"\s*(?:\||•|·|\t)\s*", line.strip()):
+            if "@" in part or any(char.isdigit() for char in part):
+                continue
+            location_match = LOCATION_PATTERN.match(part)
+            if location_match and not find_titles(part):
+                return location_match.group(0)
+    return ""
+
+
+def extract_work_history_local(
     resume_text: str,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Deterministic version of `extract_work_history`: every date range with a
+    known job title next to it starts a job entry, the remaining text around
+    the title is taken as the company, and the lexicon skills mentioned until
+    the next date range are the job's relevant skills.
+    """
+    lines = [line.strip() for line in resume_text.splitlines()]
+    date_lines = [
+        (i, date_match)
+        for i, line in enumerate(lines)
+        if (date_match := DATE_RANGE_PATTERN.search(line))
+    ]
+
+    # An entry starts at the first of the two lines above its date range
+    # that names a job title ("Data Scientist | Acme" above "2019 - Present"),
+    # or at the date line itself
+    entry_starts = []
+    previous_date_line = -1
+    for i, _ in date_lines:
+        start = i
+        for j in (i - 2, i - 1):
+            if j > previous_date_line and find_titles(lines[j]):
+                start = j
+                break
+        entry_starts.append(start)
+        previous_date_line = i
+
+    work_history = []
+    jobs_by_company = {}
+    for n, (i, date_match) in enumerate(date_lines):
+        # The entry ends where the header of the next one starts
+        block_end = (
+            max(entry_starts[n + 1], i + 1) if n + 1 < len(date_lines) else len(lines)
+        )
+        # The header of an entry is the date line and the two lines around it
+        header = [
+            DATE_RANGE_PATTERN.sub("", lines[j])
+            for j in (i, i - 1, i + 1, i - 2)
+            if 0 <= j < len(lines)
+        ]
+
+        titles = [title for line in header for title in find_titles(line)]
+        if not titles:
+            # Education, certificates, ...
+            continue
+
+        company = ""
+        for line in header:
+            for field in FIELD_SEPARATOR_PATTERN.split(line):
+                field = field.strip(" :-")
+                if (
+                    field
+                    and len(field.split()) <= 6
+                    and not find_titles(field)
+                    and not LOCATION_PATTERN.match(field)
+                ):
+                    company = field
+                    break
+            if company:
+                break
+
+        end_date = date_match.group(2)
+        if end_date.lower() in ("present", "current", "now", "today"):
+            end_date = "Present"
+
+        block = "\n".join(lines[entry_starts[n] : block_end])
+        job_info = {
+            "Company": company,
+            "Positions": list(dict.fromkeys(titles)),
+            "Start Date": date_match.group(1),
+            "End Date": end_date,
+            "Relevant Skills": list(find_skills(block)),
+        }
+
+        if company and company in jobs_by_company:
+            seen_job = jobs_by_company[company]
+            for key in ("Positions", "Relevant Skills"):
+                seen_job[key].extend(
+                    item for item in job_info[key] if item not in seen_job[key]
+                )
+            continue
+
+        jobs_by_company[company] = job_info
+        work_history.append(job_info)
+
+    return work_history, _years_of_experience(work_history)
+
+
+def generate_keyword_sets_local(
+    resume_text: str,
+    work_history: List[Dict[str, Any]],
     k: int = 20,
-    provider: str = "openai",
-    ollama_model: str = "llama3.2",
-    openai_model: str = "gpt-4",
     main_job_search_focus: str = "Software Engineering",
-) -> Dict[str, any]:
+) -> List[str]:
     """
-    Single-pass LLM call:
-      - Extract the 4 fields from the resume
-      - Generate exactly k sets of keyword combos
-      - Build LinkedIn URLs for each set
-
-    Returns a dict with:
-      {
-        "user_data": {
-           "work_history": List[Dict[str, str]],
-           "current_location": str,
-           "years_experience": str,
-        },
-        "keyword_sets": [list of str],  # e.g. ["1) Software Engineer, Python", "2) ..."]
-        "keyword_urls": [list of str],  # corresponding LinkedIn URLs
-      }
+    Deterministic version of `stream_keyword_sets`: every set is one job title
+    (the search focus and the resume's positions, most recent first) followed
+    by the resume's most frequent lexicon skills, rotated so that the sets
+    differ. RAKE phrases fill in when the resume mentions few known skills.
     """
+    titles = [main_job_search_focus] if main_job_search_focus else []
+    for job in work_history:
+        titles.extend(job["Positions"])
+    titles.extend(title for title, _ in find_titles(resume_text).most_common())
+    titles = list({title.lower(): title for title in reversed(titles)}.values())[
+        ::-1
+    ]
 
-    # Format the user prompt with the correct K and resume text
+    skill_counts = find_skills(resume_text)
+    for job in work_history:
+        # Skills used in a job count extra
+        skill_counts.update(job["Relevant Skills"])
+    skills = [skill for skill, _ in skill_counts.most_common()]
+
+    if len(skills) < LOCAL_SKILLS_PER_SET * 2:
+        known_terms = {term.lower() for term in titles + skills}
+        for phrase, _ in rake_phrases(resume_text):
+            if phrase.lower() not in known_terms and len(phrase) > 2:
+                skills.append(phrase)
+                known_terms.add(phrase.lower())
+            if len(skills) >= LOCAL_SKILLS_PER_SET * 4:
+                break
+
+    if not titles:
+        titles = skills[:1]
+    if not titles:
+        return []
 
-    user_data = {}
-    print("\n🔍 [AGENT] Extracting resume fields...")
+    keyword_sets = []
+    seen_sets = set()
+    n_skills = len(skills)
+    per_set = min(LOCAL_SKILLS_PER_SET, n_skills)
+    # Walk through (title, skill window) combinations until k distinct sets
+    for i in range(k * max(len(titles), 1) * max(n_skills, 1)):
+        title = titles[i % len(titles)]
+        offset = (i // len(titles)) * per_set
+        window = [skills[(offset + j) % n_skills] for j in range(per_set)]
+        keyword_set = ", ".join(dict.fromkeys([title] + window))
+        if keyword_set not in seen_sets:
+            seen_sets.add(keyword_set)
+            keyword_sets.append(keyword_set)
+        if len(keyword_sets) >= k:
+            break
 
-    if provider == "openai":
-        location_response = call_llm(
-            system_prompt=SMALL_LOCATION_EXTRACTOR_SYSTEM_PROMPT,
-            user_prompt=SMALL_LOCATION_EXTRACTOR_USER_PROMPT.format(
-                resume_text=resume_text
-            ),
-            provider=provider,
-            ollama_model=ollama_model,
+    return keyword_sets
+
+
+def _prompt_version(*prompts: str) -> str:
+    """Short hash of a stage's prompts, so editing a prompt invalidates its cache."""
+    return content_hash("".join(prompts))[:12]
+
+
+def extract_location(
+    resume_text: str,
+    provider: str = "openai",
+    ollama_model: str = "llama3.2",
+) -> str:
+    """
+    Stage 1: extract the candidate's current location. Chunked providers only
+    see the first chunk, where the contact details are.
+    """
+    if provider == "local":
+        return extract_location_local(resume_text)
+
+    if provider in CHUNKED_PROVIDERS:
+        resume_chunks = chunk_text(
+            resume_text, model=ollama_model, overlap_tokens=CHUNK_OVERLAP_TOKENS
         )
+        resume_text = resume_chunks[0] if resume_chunks else resume_text
+
+    location_response = call_llm(
+        system_prompt=SMALL_LOCATION_EXTRACTOR_SYSTEM_PROMPT,
+        user_prompt=SMALL_LOCATION_EXTRACTOR_USER_PROMPT.format(
+            resume_text=resume_text
+        ),
+        provider=provider,
+        ollama_model=ollama_model,
+        response_schema=LOCATION_SCHEMA,
+    )
+    return parse_mhop_location_info(location_response)
+
 
-        current_location = parse_mhop_location_info(location_response)
-        user_data["current_location"] = current_location
+def extract_work_history(
+    resume_text: str,
+    provider: str = "openai",
+    ollama_model: str = "llama3.2",
+    openai_model: str = "gpt-4",
+    cancel_event: Union[threading.Event, None] = None,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Stage 2: extract the work history and the total years of experience.
+    Chunked providers stop before the next chunk once `cancel_event` is set.
 
-        print("\n📝  [AGENT] Location extracted")
+    Returns:
+        Tuple[List[Dict[str, Any]], int]: The jobs found in the resume and the
+        years between the earliest start and the latest end date.
+    """
+    if provider == "local":
+        return extract_work_history_local(resume_text)
 
+    if provider not in CHUNKED_PROVIDERS:
         llm_response = call_llm(
             system_prompt=SMALL_INFO_EXTRACTOR_SYSTEM_PROMPT,
             user_prompt=SMALL_INFO_EXTRACTOR_USER_PROMPT.format(resume_text),
             provider=provider,
             ollama_model=ollama_model,
             openai_model=openai_model,
+            response_schema=WORK_HISTORY_SCHEMA,
         )
+        return parse_mhop_extracted_info([llm_response])
 
-        work_history, total_experience = parse_mhop_extracted_info([llm_response])
-        user_data["work_history"] = work_history
-        print("\n📝  [AGENT] Work history extracted")
-        user_data["years_experience"] = total_experience
-        print("\n📝  [AGENT] Years of experience extracted")
-    # TODO: Add support for Ollama
-    elif provider == "ollama":
-        tokenized_spans = list(WORD_TOKENIZER.span_tokenize(resume_text))
-        num_chunks = len(tokenized_spans) // MAX_WORDS_PER_CHUNK
-        resume_chunks = []
-
-        for i in range(num_chunks):
-            start, end = (
-                tokenized_spans[i * MAX_WORDS_PER_CHUNK][0],
-                tokenized_spans[(i + 1) * MAX_WORDS_PER_CHUNK][1],
-            )
-            resume_chunks.append(resume_text[start:end])
-
-        # Add the last chunk
-        resume_chunks.append(resume_text[end:])
-        llm_outputs = []
+    # Local models have small context windows, so the resume is processed
+    # in chunks that fit the model's token budget. With "auto" the router
+    # may pick Ollama, so the same chunking is used.
+    resume_chunks = chunk_text(
+        resume_text, model=ollama_model, overlap_tokens=CHUNK_OVERLAP_TOKENS
+    )
+    llm_outputs = []
 
-        for i, chunk in enumerate(resume_chunks):
-            print(f"🧩 [CHUNK {i}]\n {chunk}")
+    for i, chunk in enumerate(resume_chunks):
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        print(f"🧩 [CHUNK {i}]\n {chunk}")
 
-            if i == 0:
-                location_response = call_llm(
-                    system_prompt=SMALL_LOCATION_EXTRACTOR_SYSTEM_PROMPT,
-                    user_prompt=SMALL_LOCATION_EXTRACTOR_USER_PROMPT.format(chunk),
-                    provider=provider,
-                    ollama_model=ollama_model,
-                )
+        response = call_llm(
+            system_prompt=SMALL_INFO_EXTRACTOR_SYSTEM_PROMPT,
+            user_prompt=SMALL_INFO_EXTRACTOR_USER_PROMPT.format(chunk),
+            provider=provider,
+            ollama_model=ollama_model,
+            response_schema=WORK_HISTORY_SCHEMA,
+        )
+        print("#" * 20 + "\nWORK EXPERIENCE\n" + "#" * 20)
+        print(response)
 
-                print("#" * 20 + "\nLOCATION\n" + "#" * 20)
-                print(location_response)
-                llm_outputs.append(location_response)
+        llm_outputs.append(response)
 
-            response = call_llm(
-                system_prompt=RESUME_INFO_EXTRACTOR_SYSTEM_PROMPT,
-                user_prompt=RESUME_INFO_EXTRACTOR_USER_PROMPT.format(chunk),
-                provider=provider,
-                ollama_model=ollama_model,
-            )
-            print("#" * 20 + "\nWORK EXPERIENCE\n" + "#" * 20)
-            print(response)
+    return parse_mhop_extracted_info(llm_outputs)
 
-            llm_outputs.append(response)
 
-        llm_response = parse_mhop_extracted_info(llm_outputs)
+def stream_keyword_sets(
+    work_history: List[Dict[str, Any]],
+    k: int = 20,
+    provider: str = "openai",
+    openai_model: str = "gpt-4",
+    main_job_search_focus: str = "Software Engineering",
+    resume_text: str = "",
+    ollama_model: str = "llama3.2",
+) -> Iterator[List[str]]:
+    """
+    Stage 3: generate k keyword sets for the job search from the work history.
 
-    # Debug
-    print("\n📝  [AGENT] User info extracted")
+    Yields the growing list of keyword sets while the LLM is still generating
+    (each set as soon as its closing quote has arrived). The last yielded list
+    is the final, fully parsed result. The "local" provider also draws skills
+    from `resume_text` and yields all sets at once.
+    """
+    if provider == "local":
+        yield generate_keyword_sets_local(
+            resume_text, work_history, k=k, main_job_search_focus=main_job_search_focus
+        )
+        return
 
-    print("\n🔍 [AGENT] Generating keyword sets...")
+    keyword_request_response = ""
+    keyword_parser = IncrementalJSONParser()
+    emitted = 0
 
-    keyword_request_response = call_llm(
+    for delta in stream_llm(
         system_prompt=KEYWORD_GEN_SYSTEM_PROMPT,
         user_prompt=KEYWORD_GEN_USER_PROMPT.format(
-            work_history=user_data.get("work_history", ""),
+            work_history=work_history,
             main_job_search_focus=main_job_search_focus,
             k=k,
         ),
         provider=provider,
+        ollama_model=ollama_model,
         openai_model=openai_model,
+        response_schema=KEYWORD_SETS_SCHEMA,
+    ):
+        keyword_request_response += delta
+
+        partial_output = keyword_parser.feed(delta)
+        partial_sets = []
+        if isinstance(partial_output, dict):
+            partial_sets = partial_output.get("keyword_sets", [])
+        if len(partial_sets) > emitted:
+            emitted = len(partial_sets)
+            yield list(partial_sets)
+
+    yield parse_mhop_keywords_sets(keyword_request_response)
+
+
+def stream_info_and_keywords(
+    resume_text: str,
+    k: int = 20,
+    provider: str = "openai",
+    ollama_model: str = "llama3.2",
+    openai_model: str = "gpt-4",
+    main_job_search_focus: str = "Software Engineering",
+    use_cache: bool = True,
+    routed_sections: Union[Dict[str, str], None] = None,
+    cancel_event: Union[threading.Event, None] = None,
+) -> Iterator[Dict[str, any]]:
+    """
+    Streaming version of `extract_info_and_keywords`.
+
+    Yields the same result dict after every step of the pipeline, so callers can
+    display the location and work history as soon as they are extracted, and the
+    keyword sets one by one while the LLM is still generating them. Every yielded
+    dict also carries a "stage" key: "location", "work_history", "keywords" or
+    "done". The last yielded dict is the complete result.
+
+    Each stage is memoized (see agent/cache.py): location and work history are
+    keyed by the resume content and the models, the keyword sets by the work
+    history, k, the search focus and the models. Changing only k or the focus therefore
+    re-runs just the keyword generation. Empty results (a failed LLM call or
+    output that could not be parsed) are not cached, so they are retried.
+
+    With provider="local" no LLM is called: the deterministic lexicon/RAKE
+    extractors return the same structure in milliseconds, and nothing is cached.
+
+    `routed_sections` maps "location" and "work_history" to the resume section
+    that stage's prompt should get (see automation/sections.py); stages that
+    are missing get the whole resume text.
+
+    Setting `cancel_event` ends the generator between work history chunks
+    (without caching the partial work history); between the other stages,
+    the caller stops by closing the generator.
+    """
+    routed_sections = routed_sections or {}
+    location_text = routed_sections.get("location") or resume_text
+    work_history_text = routed_sections.get("work_history") or resume_text
+
+    cache = default_stage_cache() if use_cache and provider != "local" else None
+    model_inputs = {
+        "provider": provider,
+        "ollama_model": ollama_model,
+        "openai_model": openai_model,
+    }
+
+    user_data = {}
+    result = {
+        "stage": "location",
+        "user_data": user_data,
+        "keyword_sets": [],
+        "keyword_urls": [],
+    }
+    print("\n🔍 [AGENT] Extracting resume fields...")
+
+    location_inputs = {
+        **model_inputs,
+        "resume": content_hash(location_text),
+        "prompts": _prompt_version(
+            SMALL_LOCATION_EXTRACTOR_SYSTEM_PROMPT, SMALL_LOCATION_EXTRACTOR_USER_PROMPT
+        ),
+    }
+    current_location = cache.get("location", location_inputs) if cache else None
+    if current_location is None:
+        current_location = extract_location(
+            location_text, provider=provider, ollama_model=ollama_model
+        )
+        # An empty location means the LLM call or its parsing failed: leave
+        # it uncached so the next run retries the stage
+        if cache and current_location:
+            cache.set("location", location_inputs, current_location)
+    user_data["current_location"] = current_location
+
+    print("\n📝  [AGENT] Location extracted")
+    yield result
+
+    work_history_inputs = {
+        **model_inputs,
+        "resume": content_hash(work_history_text),
+        "prompts": _prompt_version(
+            SMALL_INFO_EXTRACTOR_SYSTEM_PROMPT, SMALL_INFO_EXTRACTOR_USER_PROMPT
+        ),
+    }
+    cached_work_history = (
+        cache.get("work_history", work_history_inputs) if cache else None
     )
+    if cached_work_history is None:
+        work_history, total_experience = extract_work_history(
+            work_history_text,
+            provider=provider,
+            ollama_model=ollama_model,
+            openai_model=openai_model,
+            cancel_event=cancel_event,
+        )
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        if cache and work_history:
+            cache.set(
+                "work_history",
+                work_history_inputs,
+                {"work_history": work_history, "years_experience": total_experience},
+            )
+    else:
+        work_history = cached_work_history["work_history"]
+        total_experience = cached_work_history["years_experience"]
 
-    # Parse the k sets
-    keyword_sets = parse_mhop_keywords_sets(keyword_request_response)
+    user_data["work_history"] = work_history
+    print("\n📝  [AGENT] Work history extracted")
+    user_data["years_experience"] = total_experience
+    print("\n📝  [AGENT] Years of experience extracted")
 
-    print("\n📝  [AGENT] Keyword sets generated")
+    # Debug
+    print("\n📝  [AGENT] User info extracted")
+    result["stage"] = "work_history"
+    yield result
+
+    print("\n🔍 [AGENT] Generating keyword sets...")
+    result["stage"] = "keywords"
 
     posted_in_days = 7
+    keyword_inputs = {
+        **model_inputs,
+        "work_history": work_history,
+        "k": k,
+        "main_job_search_focus": main_job_search_focus,
+        "prompts": _prompt_version(KEYWORD_GEN_SYSTEM_PROMPT, KEYWORD_GEN_USER_PROMPT),
+    }
+    keyword_sets = cache.get("keywords", keyword_inputs) if cache else None
+    if keyword_sets is None:
+        keyword_sets = []
+        for keyword_sets in stream_keyword_sets(
+            work_history,
+            k=k,
+            provider=provider,
+            openai_model=openai_model,
+            main_job_search_focus=main_job_search_focus,
+            resume_text=resume_text,
+            ollama_model=ollama_model,
+        ):
+            # Emit the URLs of the new keyword sets right away
+            for keyword_set in keyword_sets[len(result["keyword_sets"]) :]:
+                result["keyword_sets"].append(keyword_set)
+                result["keyword_urls"].append(
+                    build_linkedin_url(
+                        keyword_set,
+                        location=current_location,
+                        posted_in_days=posted_in_days,
+                    )
+                )
+            yield result
+        if cache and keyword_sets:
+            cache.set("keywords", keyword_inputs, keyword_sets)
+
+    print("\n📝  [AGENT] Keyword sets generated")
 
     print("\n🔗  [AGENT] Generating LinkedIn URLs...")
     keyword_urls = []
@@ -365,8 +814,51 @@ def extract_info_and_keywords(
 
     print("\n🔗  [AGENT] LinkedIn URLs generated")
 
-    return {
-        "user_data": user_data,
-        "keyword_sets": keyword_sets,
-        "keyword_urls": keyword_urls,
-    }
+    result["stage"] = "done"
+    result["keyword_sets"] = keyword_sets
+    result["keyword_urls"] = keyword_urls
+    yield result
+
+
+def extract_info_and_keywords(
+    resume_text: str,
+    k: int = 20,
+    provider: str = "openai",
+    ollama_model: str = "llama3.2",
+    openai_model: str = "gpt-4",
+    main_job_search_focus: str = "Software Engineering",
+    use_cache: bool = True,
+    routed_sections: Union[Dict[str, str], None] = None,
+) -> Dict[str, any]:
+    """
+    Single-pass LLM call:
+      - Extract the 4 fields from the resume
+      - Generate exactly k sets of keyword combos
+      - Build LinkedIn URLs for each set
+
+    Returns a dict with:
+      {
+        "user_data": {
+           "work_history": List[Dict[str, str]],
+           "current_location": str,
+           "years_experience": str,
+        },
+        "keyword_sets": [list of str],  # e.g. ["1) Software Engineer, Python", "2) ..."]
+        "keyword_urls": [list of str],  # corresponding LinkedIn URLs
+      }
+    """
+    results = {}
+    for results in stream_info_and_keywords(
+        resume_text=resume_text,
+        k=k,
+        provider=provider,
+        ollama_model=ollama_model,
+        openai_model=openai_model,
+        main_job_search_focus=main_job_search_focus,
+        use_cache=use_cache,
+        routed_sections=routed_sections,
+    ):
+        pass
+
+    results.pop("stage", None)
+    return results
@@ -0,0 +1,199 @@
+import json
+from typing import Any, Dict, List, Union
+
+# Counters for every JSON document parsed out of an LLM response.
+#   total:    documents we tried to parse
+#   repaired: documents that were not valid JSON as-is but could be recovered
+#   failed:   documents nothing could be recovered from
+PARSE_METRICS: Dict[str, int] = {"total": 0, "repaired": 0, "failed": 0}
+
+# How many opening brackets `parse_json_lenient` tries as the document start
+MAX_START_ATTEMPTS = 5
+
+
+def parse_failure_rate() -> float:
+    """Share of parsed LLM outputs from which no JSON could be recovered."""
+    if not PARSE_METRICS["total"]:
+        return 0.0
+    return PARSE_METRICS["failed"] / PARSE_METRICS["total"]
+
+
+def reset_parse_metrics():
+    for key in PARSE_METRICS:
+        PARSE_METRICS[key] = 0
+
+
+class IncrementalJSONParser:
+    """
+    Tolerant JSON parser for LLM output that can be fed one chunk at a time.
+
+    Everything before the first "{" or "[" (prose, code fences) and after the
+    matching closing bracket is ignored. Trailing commas are dropped and raw
+    newlines inside strings are accepted. While the document is incomplete,
+    `value()` returns the largest prefix that is valid JSON once the open
+    containers are closed, so e.g. a half-streamed list only contains the items
+    whose closing quote has already arrived.
+    """
+
+    def __init__(self):
+        self._out: List[str] = []
+        # One [bracket, expect_key] entry per open container
+        self._stack: List[list] = []
+        self._started = False
+        self._done = False
+        self._in_string = False
+        self._string_is_key = False
+        self._escape = False
+        self._pending_comma = False
+        # Length of `_out` at the last point where all values were complete,
+        # together with the brackets needed to close the document there
+        self._safe_len = 0
+        self._safe_closers = ""
+        self._cached_len = -1
+        self._cached_value: Any = None
+
+    @property
+    def done(self) -> bool:
+        """True once the top-level value has been closed."""
+        return self._done
+
+    def feed(self, chunk: str) -> Any:
+        """Consume the next chunk of text and return the current best value."""
+        for char in chunk:
+            if self._done:
+                break
+            self._consume(char)
+        return self.value()
+
+    def value(self) -> Any:
+        """Return the parsed document, or the valid part of it if incomplete."""
+        if not self._started:
+            return None
+        if self._safe_len == self._cached_len:
+            return self._cached_value
+
+        text = "".join(self._out[: self._safe_len]) + self._safe_closers
+        try:
+            self._cached_value = json.loads(text, strict=False)
+        except json.JSONDecodeError:
+            self._cached_value = None
+        self._cached_len = self._safe_len
+        return self._cached_value
+
+    def _mark_safe(self):
+        self._safe_len = len(self._out)
+        self._safe_closers = "".join(
+            "}" if bracket == "{" else "]" for bracket, _ in reversed(self._stack)
+        )
+
+    def _open(self, bracket: str):
+        self._stack.append([bracket, bracket == "{"])
+        self._out.append(bracket)
+        self._mark_safe()
+
+    def _emit_pending_comma(self):
+        if self._pending_comma:
+            self._out.append(",")
+            self._pending_comma = False
+
+    def _consume(self, char: str):
+        if not self._started:
+            if char in "{[":
+                self._started = True
+                self._open(char)
+            return
+
+        if self._in_string:
+            self._out.append(char)
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                if not self._string_is_key:
+                    self._mark_safe()
+            return
+
+        if char.isspace():
+            return
+
+        if char in "}]":
+            # A trailing comma before the closing bracket is simply dropped
+            self._pending_comma = False
+            self._out.append("}" if self._stack[-1][0] == "{" else "]")
+            self._stack.pop()
+            if not self._stack:
+                self._done = True
+            self._mark_safe()
+            return
+
+        if char == ",":
+            self._mark_safe()
+            self._pending_comma = True
+            if self._stack[-1][0] == "{":
+                self._stack[-1][1] = True
+            return
+
+        if char == ":":
+            self._out.append(char)
+            self._stack[-1][1] = False
+            return
+
+        self._emit_pending_comma()
+        if char in "{[":
+            self._open(char)
+        elif char == '"':
+            self._out.append(char)
+            self._in_string = True
+            self._string_is_key = self._stack[-1][0] == "{" and self._stack[-1][1]
+        else:
+            # Part of a number or a true/false/null literal
+            self._out.append(char)
+
+
+def parse_json_lenient(text: str) -> Union[Any, None]:
+    """
+    Parse the first JSON object (or array of objects) found in `text`,
+    recovering from surrounding prose, trailing commas and truncated output.
+    Returns None if there is nothing to recover. Every call is counted in
+    PARSE_METRICS.
+    """
+    PARSE_METRICS["total"] += 1
+
+    # Prose before the JSON can contain stray brackets ("[1]", "[sic]"), so if
+    # parsing from the first bracket fails or gives something other than an
+    # object, retry from the next few candidates.
+    starts = [i for i, char in enumerate(text) if char in "{["][:MAX_START_ATTEMPTS]
+    for start in starts:
+        parser = IncrementalJSONParser()
+        value = parser.feed(text[start:])
+        if not _is_document(value):
+            continue
+
+        if not parser.done or _needed_repair(text):
+            PARSE_METRICS["repaired"] += 1
+        return value
+
+    PARSE_METRICS["failed"] += 1
+    return None
+
+
+def _is_document(value: Any) -> bool:
+    """Whether `value` is an LLM answer: an object or a non-empty list of objects."""
+    if isinstance(value, list):
+        return bool(value) and all(isinstance(item, dict) for item in value)
+    return isinstance(value, dict)
+
+
+def _needed_repair(text: str) -> bool:
+    """Whether the outermost {...} slice of `text` is not valid JSON by itself."""
+    json_start = text.find("{")
+    json_end = text.rfind("}")
+    if json_start == -1 or json_end == -1:
+        return True
+    try:
+        json.loads(text[json_start : json_end + 1])
+    except json.JSONDecodeError:
+        return True
+    return False
@@ -0,0 +1,312 @@
+# Bundled job-title and skills lexicon for the offline keyword extractor
+# (provider="local" in agent/intelligence.py). Terms are written in their
+# display form; matching is case-insensitive and respects word boundaries, so
+# "Go" does not match inside "Google". ALIASES map alternative spellings to
+# their display form.
+
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+JOB_TITLES = [
+    "Software Engineer",
+    "Software Developer",
+    "Backend Engineer",
+    "Backend Developer",
+    "Frontend Engineer",
+    "Frontend Developer",
+    "Full Stack Engineer",
+    "Full Stack Developer",
+    "Mobile Developer",
+    "iOS Developer",
+    "Android Developer",
+    "Web Developer",
+    "Embedded Software Engineer",
+    "Firmware Engineer",
+    "Game Developer",
+    "DevOps Engineer",
+    "Site Reliability Engineer",
+    "Platform Engineer",
+    "Cloud Engineer",
+    "Cloud Architect",
+    "Solutions Architect",
+    "Software Architect",
+    "Infrastructure Engineer",
+    "Systems Engineer",
+    "Network Engineer",
+    "Security Engineer",
+    "Security Analyst",
+    "QA Engineer",
+    "Test Automation Engineer",
+    "Data Scientist",
+    "Data Analyst",
+    "Data Engineer",
+    "Analytics Engineer",
+    "Business Intelligence Analyst",
+    "Business Analyst",
+    "Machine Learning Engineer",
+    "ML Engineer",
+    "MLOps Engineer",
+    "AI Engineer",
+    "Research Scientist",
+    "Research Engineer",
+    "Applied Scientist",
+    "Computer Vision Engineer",
+    "NLP Engineer",
+    "Statistician",
+    "Quantitative Analyst",
+    "Database Administrator",
+    "Product Manager",
+    "Technical Product Manager",
+    "Project Manager",
+    "Program Manager",
+    "Engineering Manager",
+    "Technical Lead",
+    "Tech Lead",
+    "Team Lead",
+    "Head of Engineering",
+    "CTO",
+    "Scrum Master",
+    "Agile Coach",
+    "UX Designer",
+    "UI Designer",
+    "Product Designer",
+    "Technical Writer",
+    "IT Support Specialist",
+    "System Administrator",
+    "Consultant",
+    "Data Consultant",
+    "Research Assistant",
+    "Teaching Assistant",
+    "Intern",
+]
+
+SKILLS = [
+    # Languages
+    "Python",
+    "Java",
+    "JavaScript",
+    "TypeScript",
+    "C",
+    "C++",
+    "C#",
+    "Go",
+    "Rust",
+    "Kotlin",
+    "Swift",
+    "Scala",
+    "Ruby",
+    "PHP",
+    "R",
+    "MATLAB",
+    "Julia",
+    "SQL",
+    "Bash",
+    "Perl",
+    "Dart",
+    "Haskell",
+    "Elixir",
+    # Web & backend
+    "React",
+    "Angular",
+    "Vue",
+    "Next.js",
+    "Node.js",
+    "Express",
+    "Django",
+    "Flask",
+    "FastAPI",
+    "Spring",
+    "Spring Boot",
+    ".NET",
+    "Ruby on Rails",
+    "GraphQL",
+    "REST",
+    "gRPC",
+    "HTML",
+    "CSS",
+    "Tailwind",
+    "Microservices",
+    # Data & ML
+    "Machine Learning",
+    "Deep Learning",
+    "Computer Vision",
+    "NLP",
+    "Natural Language Processing",
+    "LLM",
+    "Generative AI",
+    "Reinforcement Learning",
+    "Time Series",
+    "Forecasting",
+    "Statistics",
+    "A/B Testing",
+    "Data Analysis",
+    "Data Visualization",
+    "Data Modeling",
+    "ETL",
+    "Data Warehousing",
+    "PyTorch",
+    "TensorFlow",
+    "Keras",
+    "scikit-learn",
+    "XGBoost",
+    "LightGBM",
+    "Pandas",
+    "NumPy",
+    "SciPy",
+    "Matplotlib",
+    "Hugging Face",
+    "LangChain",
+    "OpenCV",
+    "spaCy",
+    "MLflow",
+    "Kubeflow",
+    "Airflow",
+    "dbt",
+    "Spark",
+    "PySpark",
+    "Hadoop",
+    "Kafka",
+    "Flink",
+    "Databricks",
+    "Snowflake",
+    "BigQuery",
+    "Redshift",
+    "Tableau",
+    "Power BI",
+    "Looker",
+    "Excel",
+    # Databases
+    "PostgreSQL",
+    "MySQL",
+    "SQLite",
+    "MongoDB",
+    "Redis",
+    "Elasticsearch",
+    "Cassandra",
+    "DynamoDB",
+    "Neo4j",
+    "Oracle",
+    # Cloud & ops
+    "AWS",
+    "Azure",
+    "GCP",
+    "Docker",
+    "Kubernetes",
+    "Terraform",
+    "Ansible",
+    "Helm",
+    "Jenkins",
+    "GitHub Actions",
+    "GitLab CI",
+    "CI/CD",
+    "Linux",
+    "Prometheus",
+    "Grafana",
+    "Serverless",
+    "Lambda",
+    # Practices & tools
+    "Git",
+    "Agile",
+    "Scrum",
+    "TDD",
+    "Unit Testing",
+    "System Design",
+    "Distributed Systems",
+    "Cloud Computing",
+    "Big Data",
+    "Data Engineering",
+    "MLOps",
+    "DevOps",
+    "Security",
+    "Networking",
+    "Embedded Systems",
+    "Jira",
+    "Figma",
+]
+
+ALIASES = {
+    "golang": "Go",
+    "js": "JavaScript",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "postgres": "PostgreSQL",
+    "k8s": "Kubernetes",
+    "google cloud": "GCP",
+    "google cloud platform": "GCP",
+    "amazon web services": "AWS",
+    "microsoft azure": "Azure",
+    "reactjs": "React",
+    "react.js": "React",
+    "nodejs": "Node.js",
+    "vue.js": "Vue",
+    "ml": "Machine Learning",
+    "genai": "Generative AI",
+    "large language models": "LLM",
+    "llms": "LLM",
+    "ci cd": "CI/CD",
+    "apache spark": "Spark",
+    "apache kafka": "Kafka",
+    "apache airflow": "Airflow",
+    "huggingface": "Hugging Face",
+    "powerbi": "Power BI",
+    "software development engineer": "Software Engineer",
+    "sde": "Software Engineer",
+    "sre": "Site Reliability Engineer",
+    "data science": "Data Scientist",
+}
+
+
+def _compile(terms: List[str]) -> Tuple[re.Pattern, Dict[str, str]]:
+    """
+    One alternation regex per lexicon (longest terms first, so "Spring Boot"
+    wins over "Spring"), plus a map from the lowercase match to the display
+    form.
+    """
+    display_forms = {term.lower(): term for term in terms}
+    display_forms.update(
+        {alias: term for alias, term in ALIASES.items() if term in terms}
+    )
+    alternatives = sorted(display_forms, key=len, reverse=True)
+    pattern = re.compile(
+        r"(?<![\w+#.])(?:"
+        + "|".join(re.escape(term) for term in alternatives)
+        + r")(?![\w+#]|\.\w)",
+        re.IGNORECASE,
+    )
+    return pattern, display_forms
+
+
+TITLE_PATTERN, TITLE_FORMS = _compile(JOB_TITLES)
+SKILL_PATTERN, SKILL_FORMS = _compile(SKILLS)
+
+# Skills that are also common words or letters; they only count in a list
+# context such as "Python, R, SQL", not in sentences like "ready to go"
+AMBIGUOUS_SKILLS = {"C", "R", "Go", "REST", "Lambda", "Security", "Networking"}
+
+
+def find_titles(text: str) -> Counter:
+    """Count the lexicon job titles mentioned in `text`."""
+    return Counter(
+        TITLE_FORMS[match.group(0).lower()] for match in TITLE_PATTERN.finditer(text)
+    )
+
+
+def find_skills(text: str) -> Counter:
+    """Count the lexicon skills mentioned in `text`."""
+    skills = Counter()
+    for match in SKILL_PATTERN.finditer(text):
+        skill = SKILL_FORMS[match.group(0).lower()]
+        if skill in AMBIGUOUS_SKILLS and not _in_list_context(text, match):
+            continue
+        skills[skill] += 1
+    return skills
+
+
+def _in_list_context(text: str, match: re.Match) -> bool:
+    before = text[max(match.start() - 2, 0) : match.start()]
+    after = text[match.end() : match.end() + 2]
+    separators = (",", "|", "/", ";", "•", ":", "(", ")", "\n")
+    return any(sep in before for sep in separators) or any(
+        sep in after for sep in separators
+    )
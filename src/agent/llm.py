@@ -1,10 +1,13 @@
-import json
 import os
-from typing import Union
+import time
+from typing import Iterator, Union
 
 # Third-party imports
 from ollama import chat, ChatResponse, AsyncClient
 import openai
+from agent.json_parser import parse_json_lenient
+from agent.metrics import current_run, prompt_name_for
+from agent.schemas import WORK_HISTORY_SCHEMA, supports_structured_output
 from agent.prompts import (
     SMALL_EXTRACTOR_SYSTEM_PROPMPT,
     SMALL_EXTRACTOR_USER_PROPMPT,
@@ -24,31 +27,96 @@ if not OPENAI_AVAILABLE:
     print("OpenAI API key not found. Only Ollama will be used.")
 
 
+class LLMProviderError(RuntimeError):
+    """A request to an LLM provider failed (network, API or model error)."""
+
+    def __init__(self, provider: str, error: Exception):
+        super().__init__(f"[{provider}] {error}")
+        self.provider = provider
+        self.error = error
+
+
+def _build_messages(system_prompt: Union[str, None], user_prompt: str) -> list:
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": user_prompt})
+    return messages
+
+
+def _openai_format_kwargs(
+    response_schema: Union[dict, None], openai_model: str
+) -> dict:
+    if response_schema and supports_structured_output(openai_model):
+        return {
+            "response_format": {"type": "json_schema", "json_schema": response_schema}
+        }
+    return {}
+
+
+def _ollama_format_kwargs(response_schema: Union[dict, None]) -> dict:
+    if response_schema:
+        return {"format": response_schema["schema"]}
+    return {}
+
+
 def call_llm(
     system_prompt: Union[str, None],
     user_prompt: str,
     provider: str = "ollama",
     ollama_model: str = "mistral",
     openai_model: str = "gpt-4o-mini",
+    response_schema: Union[dict, None] = None,
+    prompt_name: Union[str, None] = None,
 ) -> str:
     """
     Generic LLM caller that can use either Ollama or OpenAI based on `provider`.
 
+    Every call is recorded in the current metrics run (see agent/metrics.py)
+    with its latency, token usage and cost, and is refused with a
+    BudgetExceededError once the run's budget is used up.
+
     Args:
                 system_prompt (str): The system-level prompt (instructions, context).
                 user_prompt (str): The user-level prompt (main content).
-                provider (str): "ollama" or "openai".
+                provider (str): "ollama", "openai", or "auto" to let the router in
+                    agent/router.py pick a provider and fall back on errors.
                 ollama_model (str): Name of the Ollama model to use (if provider=ollama).
                 openai_model (str): Name of the OpenAI model to use (if provider=openai).
+                response_schema (dict): Optional JSON schema (see agent/schemas.py) the
+                    response must follow. Sent as structured output to OpenAI models that
+                    support it and as `format=` to Ollama.
+                prompt_name (str): Name the call is reported under. Defaults to the name
+                    of `system_prompt` in agent/prompts.py.
 
     Returns:
                 str: The raw text response from the LLM.
+
+    Raises:
+                LLMProviderError: If the provider request fails.
     """
 
-    messages = []
-    if system_prompt:
-        messages.append({"role": "system", "content": system_prompt})
-    messages.append({"role": "user", "content": user_prompt})
+    if provider.lower() == "auto":
+        from agent.router import default_router
+
+        return default_router().call(
+            system_prompt,
+            user_prompt,
+            ollama_model=ollama_model,
+            openai_model=openai_model,
+            response_schema=response_schema,
+            prompt_name=prompt_name,
+        )
+
+    messages = _build_messages(system_prompt, user_prompt)
+    run = current_run()
+    run.check_budget()
+    call_info = {
+        "prompt_name": prompt_name or prompt_name_for(system_prompt),
+        "provider": provider.lower(),
+        "model": openai_model if provider.lower() == "openai" else ollama_model,
+    }
+    started = time.perf_counter()
 
     if provider.lower() == "openai":
         if not OPENAI_AVAILABLE:
@@ -60,35 +128,186 @@ def call_llm(
             response = openai.chat.completions.create(
                 model=openai_model,
                 messages=messages,
+                **_openai_format_kwargs(response_schema, openai_model),
+            )
+            run.record(
+                latency_s=time.perf_counter() - started,
+                **call_info,
+                **_openai_usage(response.usage),
             )
             return response.choices[0].message.content
 
         except Exception as e:
             print(f"[OpenAI Error] {e}")
-            return f"Error: {str(e)}"
+            run.record(
+                latency_s=time.perf_counter() - started, error=str(e), **call_info
+            )
+            raise LLMProviderError("openai", e) from e
 
     elif provider.lower() == "ollama":
-        response: ChatResponse = chat(
-            model=ollama_model,
-            messages=messages,
+        try:
+            response: ChatResponse = chat(
+                model=ollama_model,
+                messages=messages,
+                **_ollama_format_kwargs(response_schema),
+            )
+        except Exception as e:
+            print(f"[Ollama Error] {e}")
+            run.record(
+                latency_s=time.perf_counter() - started, error=str(e), **call_info
+            )
+            raise LLMProviderError("ollama", e) from e
+
+        run.record(
+            latency_s=time.perf_counter() - started,
+            **call_info,
+            **_ollama_usage(response),
         )
         return response["message"]["content"]
 
     else:
         raise ValueError(
-            f"Unknown provider '{provider}'. Must be 'ollama' or 'openai'."
+            f"Unknown provider '{provider}'. Must be 'ollama', 'openai' or 'auto'."
         )
 
 
-def main():
-    import pymupdf as fitz
-    import nltk
+def stream_llm(
+    system_prompt: Union[str, None],
+    user_prompt: str,
+    provider: str = "ollama",
+    ollama_model: str = "mistral",
+    openai_model: str = "gpt-4o-mini",
+    response_schema: Union[dict, None] = None,
+    prompt_name: Union[str, None] = None,
+) -> Iterator[str]:
+    """
+    Streaming variant of `call_llm`: yields the response piece by piece as the
+    provider generates it, instead of waiting for the full completion.
+
+    Args:
+                system_prompt (str): The system-level prompt (instructions, context).
+                user_prompt (str): The user-level prompt (main content).
+                provider (str): "ollama", "openai" or "auto", see `call_llm`.
+                ollama_model (str): Name of the Ollama model to use (if provider=ollama).
+                openai_model (str): Name of the OpenAI model to use (if provider=openai).
+                response_schema (dict): Optional JSON schema, see `call_llm`.
+                prompt_name (str): Name the call is reported under, see `call_llm`.
+
+    Yields:
+                str: Text deltas in the order they were generated.
+    """
+
+    if provider.lower() == "auto":
+        from agent.router import default_router
+
+        yield from default_router().stream(
+            system_prompt,
+            user_prompt,
+            ollama_model=ollama_model,
+            openai_model=openai_model,
+            response_schema=response_schema,
+            prompt_name=prompt_name,
+        )
+        return
+
+    messages = _build_messages(system_prompt, user_prompt)
+    run = current_run()
+    run.check_budget()
+    call_info = {
+        "prompt_name": prompt_name or prompt_name_for(system_prompt),
+        "provider": provider.lower(),
+        "model": openai_model if provider.lower() == "openai" else ollama_model,
+        "streamed": True,
+    }
+    started = time.perf_counter()
+
+    if provider.lower() == "openai":
+        if not OPENAI_AVAILABLE:
+            raise ValueError(
+                "OpenAI API key not found. Please set OPENAI_API_KEY environment variable."
+            )
+
+        try:
+            stream = openai.chat.completions.create(
+                model=openai_model,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True},
+                **_openai_format_kwargs(response_schema, openai_model),
+            )
+            usage = {}
+            for chunk in stream:
+                # The last chunk has no choices and carries the token usage
+                if chunk.usage:
+                    usage = _openai_usage(chunk.usage)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
+            run.record(latency_s=time.perf_counter() - started, **call_info, **usage)
+
+        except Exception as e:
+            print(f"[OpenAI Error] {e}")
+            run.record(
+                latency_s=time.perf_counter() - started, error=str(e), **call_info
+            )
+            raise LLMProviderError("openai", e) from e
 
-    nltk.download("punkt")
+    elif provider.lower() == "ollama":
+        try:
+            stream = chat(
+                model=ollama_model,
+                messages=messages,
+                stream=True,
+                **_ollama_format_kwargs(response_schema),
+            )
+            usage = {}
+            for chunk in stream:
+                # The final chunk (done=True) carries the token counts
+                if chunk.get("done"):
+                    usage = _ollama_usage(chunk)
+                delta = chunk["message"]["content"]
+                if delta:
+                    yield delta
 
-    word_tokenizer = nltk.tokenize.TreebankWordTokenizer()
+        except Exception as e:
+            print(f"[Ollama Error] {e}")
+            run.record(
+                latency_s=time.perf_counter() - started, error=str(e), **call_info
+            )
+            raise LLMProviderError("ollama", e) from e
+
+        run.record(latency_s=time.perf_counter() - started, **call_info, **usage)
+
+    else:
+        raise ValueError(
+            f"Unknown provider '{provider}'. Must be 'ollama', 'openai' or 'auto'."
+        )
 
-    MAX_WORDS = 300
+
+def _openai_usage(usage) -> dict:
+    if usage is None:
+        return {}
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": usage.prompt_tokens or 0,
+        "completion_tokens": usage.completion_tokens or 0,
+        "cached_tokens": (getattr(details, "cached_tokens", 0) or 0) if details else 0,
+    }
+
+
+def _ollama_usage(response) -> dict:
+    return {
+        "prompt_tokens": response.get("prompt_eval_count") or 0,
+        "completion_tokens": response.get("eval_count") or 0,
+    }
+
+
+def main():
+    from agent.chunking import token_budget_for_model
+    from automation.pdf_extract import iter_pdf_chunks
 
     current_dir = os.path.dirname(os.path.abspath(__file__))
     resume_file = os.path.join(current_dir, "..", "data", "resume.pdf")
@@ -96,29 +315,10 @@ def main():
     if not resume_file:
         return ""
 
-    filetype = os.path.splitext(resume_file)[-1]
-    if filetype.lower() != ".pdf":
-        raise ValueError(f"Only PDF files are supported at the moment. Got: {filetype}")
-
-    doc = fitz.open(filename=resume_file)
-    resume_text = ""
-    resume_chunks = []
-    for page_num in range(len(doc)):
-        page = doc.load_page(page_num)
-        page_text = page.get_text(option="text")
-
-        tokenized_spans = word_tokenizer.span_tokenize(page_text)
-        tokenized_spans = list(tokenized_spans)
-        num_chunks = len(tokenized_spans) // MAX_WORDS
-        for i in range(num_chunks):
-            start, end = (
-                tokenized_spans[i * MAX_WORDS][0],
-                tokenized_spans[(i + 1) * MAX_WORDS][1],
-            )
-            resume_chunks.append(page_text[start:end])
-
-        # Add the last chunk
-        resume_chunks.append(page_text[end:])
+    # Chunks stream out while later pages are still being parsed
+    resume_chunks = iter_pdf_chunks(
+        resume_file, max_tokens=token_budget_for_model("llama3.2")
+    )
 
     # summary = await call_llm(
     #     SMALL_SUMMARIZER_SYSTEM_PROMPT,
@@ -157,17 +357,15 @@ def main():
             SMALL_INFO_EXTRACTOR_USER_PROMPT.format(chunk),
             provider="ollama",
             ollama_model="llama3.2",
+            response_schema=WORK_HISTORY_SCHEMA,
         )
         print("#" * 20 + "\nWORK EXPERIENCE\n" + "#" * 20)
         print(response)
-        
-        json_start = response.find("{")
-        json_end = response.rfind("}")
-        if json_start == -1 or json_end == -1:
+
+        extracted_dict = parse_json_lenient(response)
+        if extracted_dict is None:
             continue
-        extracted_dict: str = response[json_start : json_end + 1]
-        extracted_dict: dict = json.loads(extracted_dict)
-        
+
         print(extracted_dict)
 
     # company_response = await call_llm(
@@ -0,0 +1,301 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Union
+
+from agent import prompts
+from agent.json_parser import PARSE_METRICS
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+METRICS_DIR = os.path.join(CURRENT_DIR, "..", "data", "metrics")
+
+# USD per 1M (prompt, completion) tokens, matched by model prefix (longest
+# prefix first). Local Ollama models are free.
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-4": (30.00, 60.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+}
+
+# Map the prompt texts in agent/prompts.py back to their constant names, so
+# every call can be attributed to a prompt without callers naming it
+PROMPT_NAMES = {
+    value: name
+    for name, value in vars(prompts).items()
+    if name.isupper() and isinstance(value, str)
+}
+
+# Call records kept by the process-wide run that collects calls made outside
+# `llm_run`; a long-running app would otherwise keep every call forever
+DEFAULT_RUN_MAX_CALLS = 1000
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised before an LLM call when the run's token or cost budget is used up."""
+
+
+def prompt_name_for(system_prompt: Union[str, None]) -> str:
+    if not system_prompt:
+        return "UNKNOWN_PROMPT"
+    return PROMPT_NAMES.get(system_prompt, "UNKNOWN_PROMPT")
+
+
+def estimate_cost(
+    provider: str, model: str, prompt_tokens: int, completion_tokens: int
+) -> float:
+    if provider != "openai":
+        return 0.0
+    for prefix in sorted(MODEL_PRICES, key=len, reverse=True):
+        if model.startswith(prefix):
+            prompt_price, completion_price = MODEL_PRICES[prefix]
+            return (
+                prompt_tokens * prompt_price + completion_tokens * completion_price
+            ) / 1_000_000
+    return 0.0
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of already sorted values (`fraction=0.95` for
+    p95), or 0.0 when there are none.
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class LLMRunMetrics:
+    """
+    Collects one record per LLM call made during a run (e.g. one resume
+    analysis) and enforces the run's optional token/cost budget.
+
+    With `max_calls`, only the most recent call records are kept (and
+    summarized); the token and cost totals the budget is checked against
+    still count every call.
+    """
+
+    def __init__(
+        self,
+        run_id: Union[str, None] = None,
+        max_tokens: Union[int, None] = None,
+        max_cost_usd: Union[float, None] = None,
+        max_calls: Union[int, None] = None,
+    ):
+        self.run_id = run_id or time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        self.max_tokens = max_tokens
+        self.max_cost_usd = max_cost_usd
+        self.started_at = time.time()
+        self.calls: deque = deque(maxlen=max_calls)
+        # Call records dropped to stay within `max_calls`
+        self.dropped_calls = 0
+        self.total_tokens = 0
+        self.total_cost_usd = 0.0
+        # Hits and misses of the memoized analysis stages, see agent/cache.py
+        self.stage_cache: Dict[str, Dict[str, int]] = {}
+        # Resume tokens per prompt stage before/after section routing
+        self.section_routing: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._parse_metrics_at_start = dict(PARSE_METRICS)
+
+    def check_budget(self):
+        if self.max_tokens is not None and self.total_tokens >= self.max_tokens:
+            raise BudgetExceededError(
+                f"Token budget of {self.max_tokens} exhausted "
+                f"({self.total_tokens} tokens used in run {self.run_id})."
+            )
+        if self.max_cost_usd is not None and self.total_cost_usd >= self.max_cost_usd:
+            raise BudgetExceededError(
+                f"Cost budget of ${self.max_cost_usd:.2f} exhausted "
+                f"(${self.total_cost_usd:.4f} spent in run {self.run_id})."
+            )
+
+    def record(
+        self,
+        prompt_name: str,
+        provider: str,
+        model: str,
+        latency_s: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached_tokens: int = 0,
+        streamed: bool = False,
+        error: Union[str, None] = None,
+    ) -> Dict[str, Any]:
+        cost_usd = estimate_cost(provider, model, prompt_tokens, completion_tokens)
+        call = {
+            "timestamp": time.time(),
+            "prompt_name": prompt_name,
+            "provider": provider,
+            "model": model,
+            "latency_s": round(latency_s, 4),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached_tokens": cached_tokens,
+            "cache_hit": cached_tokens > 0,
+            "cost_usd": cost_usd,
+            "streamed": streamed,
+            "error": error,
+        }
+        with self._lock:
+            if len(self.calls) == self.calls.maxlen:
+                self.dropped_calls += 1
+            self.calls.append(call)
+            self.total_tokens += prompt_tokens + completion_tokens
+            self.total_cost_usd += cost_usd
+        return call
+
+    def record_stage_cache(self, stage: str, hit: bool):
+        with self._lock:
+            counts = self.stage_cache.setdefault(stage, {"hits": 0, "misses": 0})
+            counts["hits" if hit else "misses"] += 1
+
+    def record_section_routing(self, report: Dict[str, Dict[str, int]]):
+        """Add one resume's routing report (see automation/sections.py)."""
+        with self._lock:
+            for stage, tokens in report.items():
+                totals = self.section_routing.setdefault(stage, {})
+                for key, value in tokens.items():
+                    totals[key] = totals.get(key, 0) + value
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate the calls of this run, overall and per prompt."""
+        with self._lock:
+            calls = list(self.calls)
+            stage_cache = {stage: dict(counts) for stage, counts in self.stage_cache.items()}
+            section_routing = {
+                stage: dict(tokens) for stage, tokens in self.section_routing.items()
+            }
+
+        by_prompt: Dict[str, List[Dict[str, Any]]] = {}
+        for call in calls:
+            by_prompt.setdefault(call["prompt_name"], []).append(call)
+
+        parse_metrics = {
+            key: PARSE_METRICS[key] - self._parse_metrics_at_start.get(key, 0)
+            for key in PARSE_METRICS
+        }
+        parse_metrics["failure_rate"] = (
+            parse_metrics["failed"] / parse_metrics["total"]
+            if parse_metrics["total"]
+            else 0.0
+        )
+
+        return {
+            "run_id": self.run_id,
+            "duration_s": round(time.time() - self.started_at, 2),
+            "dropped_calls": self.dropped_calls,
+            "overall": _aggregate(calls),
+            "by_prompt": {name: _aggregate(group) for name, group in by_prompt.items()},
+            "json_parse": parse_metrics,
+            "stage_cache": stage_cache,
+            "section_routing": section_routing,
+            "budget": {
+                "max_tokens": self.max_tokens,
+                "max_cost_usd": self.max_cost_usd,
+            },
+        }
+
+    def print_summary(self):
+        summary = self.summary()
+        print(f"\n📊 [METRICS] LLM run {self.run_id}")
+        print(
+            f"{'prompt':<45} {'calls':>5} {'p50 s':>7} {'p95 s':>7} "
+            f"{'tokens':>8} {'cost $':>8}"
+        )
+        rows = list(summary["by_prompt"].items()) + [("TOTAL", summary["overall"])]
+        for name, stats in rows:
+            print(
+                f"{name:<45} {stats['calls']:>5} {stats['latency_p50_s']:>7.2f} "
+                f"{stats['latency_p95_s']:>7.2f} {stats['total_tokens']:>8} "
+                f"{stats['cost_usd']:>8.4f}"
+            )
+        for stage, counts in summary["stage_cache"].items():
+            print(
+                f"stage cache {stage:<33} {counts['hits']:>5} hits, "
+                f"{counts['misses']} misses"
+            )
+        for stage, tokens in summary["section_routing"].items():
+            print(
+                f"section routing {stage:<29} {tokens['routed_tokens']:>5} of "
+                f"{tokens['full_tokens']} resume tokens sent, "
+                f"{tokens['saved_tokens']} saved"
+            )
+
+    def export(self, path: Union[str, None] = None) -> str:
+        """Write the summary and every call record to a JSON file."""
+        if path is None:
+            os.makedirs(METRICS_DIR, exist_ok=True)
+            path = os.path.join(METRICS_DIR, f"llm_{self.run_id}.json")
+
+        with self._lock:
+            calls = list(self.calls)
+        with open(path, "w") as f:
+            json.dump({"summary": self.summary(), "calls": calls}, f, indent=2)
+        return path
+
+
+def _aggregate(calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+    latencies = sorted(call["latency_s"] for call in calls)
+    prompt_tokens = sum(call["prompt_tokens"] for call in calls)
+    completion_tokens = sum(call["completion_tokens"] for call in calls)
+    return {
+        "calls": len(calls),
+        "errors": sum(1 for call in calls if call["error"]),
+        "cache_hits": sum(1 for call in calls if call["cache_hit"]),
+        "latency_total_s": round(sum(latencies), 3),
+        "latency_p50_s": percentile(latencies, 0.50),
+        "latency_p95_s": percentile(latencies, 0.95),
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "cost_usd": round(sum(call["cost_usd"] for call in calls), 6),
+    }
+
+
+# Calls made outside of an explicit run are collected in this process-wide run
+_DEFAULT_RUN = LLMRunMetrics(run_id="default", max_calls=DEFAULT_RUN_MAX_CALLS)
+_CURRENT_RUN: contextvars.ContextVar = contextvars.ContextVar("llm_run", default=None)
+
+
+def current_run() -> LLMRunMetrics:
+    return _CURRENT_RUN.get() or _DEFAULT_RUN
+
+
+@contextmanager
+def llm_run(
+    run_id: Union[str, None] = None,
+    max_tokens: Union[int, None] = None,
+    max_cost_usd: Union[float, None] = None,
+) -> Iterator[LLMRunMetrics]:
+    """
+    Attribute every LLM call made inside the `with` block (in this thread or
+    in tasks/threads that copy its context) to a new run with an optional
+    budget. Once the budget is used up, further calls raise BudgetExceededError.
+    """
+    run = LLMRunMetrics(run_id=run_id, max_tokens=max_tokens, max_cost_usd=max_cost_usd)
+    with activate_run(run):
+        yield run
+
+
+@contextmanager
+def activate_run(run: LLMRunMetrics) -> Iterator[LLMRunMetrics]:
+    """
+    Make an existing run current for the `with` block. Generators that are
+    resumed from different threads (e.g. by Gradio) should activate their run
+    around each step instead of holding `llm_run` open across yields.
+    """
+    token = _CURRENT_RUN.set(run)
+    try:
+        yield run
+    finally:
+        _CURRENT_RUN.reset(token)
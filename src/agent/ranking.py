@@ -0,0 +1,171 @@
+import re
+import zlib
+from typing import Any, Dict, List, Union
+
+import numpy as np
+
+# Size of the hashed feature space (unigrams and bigrams of every text field)
+N_FEATURES = 2**18
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+# How much each job field contributes to the job's term weights
+JOB_FIELD_WEIGHTS = {"title": 3.0, "footer_tags": 1.0, "company": 0.5}
+
+# How much each user_data field contributes to the profile's term weights
+PROFILE_FIELD_WEIGHTS = {"positions": 3.0, "skills": 1.5, "keyword_combinations": 1.0}
+
+
+class HashedFeaturizer:
+    """
+    Maps text to hashed unigram + bigram feature indices. Results are cached
+    per text, since job postings repeat the same titles, companies and tags
+    over and over.
+    """
+
+    def __init__(self, n_features: int = N_FEATURES):
+        self.n_features = n_features
+        self._cache: Dict[str, np.ndarray] = {}
+
+    def indices(self, text: str) -> np.ndarray:
+        """Feature indices of `text`; repeated terms appear repeatedly."""
+        cached = self._cache.get(text)
+        if cached is not None:
+            return cached
+
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        features = tokens + [
+            first + " " + second for first, second in zip(tokens, tokens[1:])
+        ]
+        indices = np.fromiter(
+            (zlib.crc32(feature.encode()) % self.n_features for feature in features),
+            dtype=np.int64,
+            count=len(features),
+        )
+        self._cache[text] = indices
+        return indices
+
+    def weighted_counts(
+        self, texts_per_doc: List[List[str]], weights: List[float]
+    ) -> tuple:
+        """
+        Featurize documents made of several weighted text fields. Returns
+        (rows, cols, vals) arrays with one entry per distinct (doc, feature).
+        """
+        index_arrays = []
+        doc_ids = []
+        field_weights = []
+        for doc_id, texts in enumerate(texts_per_doc):
+            for text, weight in zip(texts, weights):
+                indices = self.indices(text)
+                if len(indices):
+                    index_arrays.append(indices)
+                    doc_ids.append(doc_id)
+                    field_weights.append(weight)
+
+        if not index_arrays:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0, dtype=np.float32)
+
+        lengths = np.fromiter((len(a) for a in index_arrays), dtype=np.int64)
+        cols = np.concatenate(index_arrays)
+        rows = np.repeat(np.asarray(doc_ids, dtype=np.int64), lengths)
+        vals = np.repeat(np.asarray(field_weights, dtype=np.float32), lengths)
+
+        # Sum the weights of repeated (doc, feature) pairs
+        keys, inverse = np.unique(rows * self.n_features + cols, return_inverse=True)
+        summed = np.bincount(inverse, weights=vals).astype(np.float32)
+        return keys // self.n_features, keys % self.n_features, summed
+
+
+def _field_text(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(item) for item in value)
+    return str(value or "")
+
+
+class JobRanker:
+    """
+    Scores scraped jobs against the user profile (user_data.json) with
+    TF-IDF weighted hashed n-grams and cosine similarity.
+
+    All jobs are featurized into flat sparse (row, column, value) arrays, and the
+    scores of every job are computed with a single vectorized gather and
+    `np.bincount` over those arrays, so ranking tens of thousands of jobs
+    takes a fraction of a second on CPU.
+    """
+
+    def __init__(self, user_data: Dict[str, Any], n_features: int = N_FEATURES):
+        self.featurizer = HashedFeaturizer(n_features)
+        self.n_features = n_features
+
+        profile_texts = [
+            _field_text(user_data.get(field, "")) for field in PROFILE_FIELD_WEIGHTS
+        ]
+        _, self.profile_cols, self.profile_vals = self.featurizer.weighted_counts(
+            [profile_texts], list(PROFILE_FIELD_WEIGHTS.values())
+        )
+
+    def score(self, jobs: List[Dict[str, Any]]) -> np.ndarray:
+        """Return one cosine similarity in [0, 1] per job, in input order."""
+        n_jobs = len(jobs)
+        if n_jobs == 0 or not len(self.profile_cols):
+            return np.zeros(n_jobs, dtype=np.float32)
+
+        rows, cols, vals = self.featurizer.weighted_counts(
+            [
+                [_field_text(job.get(field, "")) for field in JOB_FIELD_WEIGHTS]
+                for job in jobs
+            ],
+            list(JOB_FIELD_WEIGHTS.values()),
+        )
+
+        # Inverse document frequency over the job set (each (row, col) pair is
+        # unique because the weights were aggregated per job)
+        doc_freq = np.bincount(cols, minlength=self.n_features)
+        idf = np.log((1.0 + n_jobs) / (1.0 + doc_freq)).astype(np.float32) + 1.0
+
+        # Sublinear term frequency, weighted by idf
+        job_weights = (1.0 + np.log(vals)) * idf[cols]
+
+        profile = np.zeros(self.n_features, dtype=np.float32)
+        profile[self.profile_cols] = (1.0 + np.log(self.profile_vals)) * idf[
+            self.profile_cols
+        ]
+        profile_norm = float(np.linalg.norm(profile))
+
+        dots = np.bincount(rows, weights=job_weights * profile[cols], minlength=n_jobs)
+        job_norms = np.sqrt(np.bincount(rows, weights=job_weights**2, minlength=n_jobs))
+        denominators = job_norms * profile_norm
+        scores = np.divide(
+            dots, denominators, out=np.zeros(n_jobs), where=denominators > 0
+        )
+        return scores.astype(np.float32)
+
+    def rank(
+        self, jobs: List[Dict[str, Any]], top_k: Union[int, None] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Return copies of the jobs sorted by descending relevance, each with a
+        "score" key added. Ties keep the scrape order.
+        """
+        scores = self.score(jobs)
+        order = np.argsort(-scores, kind="stable")
+        if top_k is not None:
+            order = order[:top_k]
+
+        ranked = []
+        for index in order:
+            job = dict(jobs[index])
+            job["score"] = round(float(scores[index]), 4)
+            ranked.append(job)
+        return ranked
+
+
+def rank_jobs(
+    jobs: List[Dict[str, Any]],
+    user_data: Dict[str, Any],
+    top_k: Union[int, None] = None,
+) -> List[Dict[str, Any]]:
+    """Rank scraped jobs by how well they match the user profile."""
+    return JobRanker(user_data).rank(jobs, top_k=top_k)
@@ -0,0 +1,328 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Union
+
+from agent import llm
+from agent.metrics import BudgetExceededError, percentile, prompt_name_for
+
+# Prompts whose answer is on the critical path of the UI (the first thing the
+# user waits for); with `hedge_latency_critical` these get hedged requests.
+LATENCY_CRITICAL_PROMPTS = {"SMALL_LOCATION_EXTRACTOR_SYSTEM_PROMPT"}
+
+# Relative cost of each provider, used by the "cost" policy
+PROVIDER_COST_RANK = {"ollama": 0, "openai": 1}
+
+# Number of recent calls per provider the latency percentiles are computed over
+LATENCY_WINDOW = 50
+
+# After this many consecutive failures a provider is tried last until the
+# cooldown has passed
+MAX_CONSECUTIVE_FAILURES = 3
+FAILURE_COOLDOWN_S = 60
+
+
+class ProviderStats:
+    """Rolling latency window and failure tracking for one provider."""
+
+    def __init__(self):
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.calls = 0
+        self.failures = 0
+        self.abandoned = 0
+        self.consecutive_failures = 0
+        self.last_failure_at = 0.0
+        self._lock = threading.Lock()
+
+    def record_success(self, latency_s: float):
+        with self._lock:
+            self.latencies.append(latency_s)
+            self.calls += 1
+            self.consecutive_failures = 0
+
+    def record_abandoned(self, latency_s: float):
+        """A call answered after the router stopped waiting for it."""
+        with self._lock:
+            self.latencies.append(latency_s)
+            self.calls += 1
+            self.abandoned += 1
+
+    def record_failure(self):
+        with self._lock:
+            self.calls += 1
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_failure_at = time.monotonic()
+
+    def percentile(self, fraction: float) -> Union[float, None]:
+        with self._lock:
+            latencies = sorted(self.latencies)
+        return percentile(latencies, fraction) if latencies else None
+
+    @property
+    def healthy(self) -> bool:
+        return (
+            self.consecutive_failures < MAX_CONSECUTIVE_FAILURES
+            or time.monotonic() - self.last_failure_at > FAILURE_COOLDOWN_S
+        )
+
+    def snapshot(self) -> Dict[str, Union[float, int, None]]:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "abandoned": self.abandoned,
+            "p50_s": self.percentile(0.50),
+            "p95_s": self.percentile(0.95),
+            "healthy": self.healthy,
+        }
+
+
+class LLMRouter:
+    """
+    Sends each request to the preferred provider and falls back to the next
+    one on errors or timeouts.
+
+    Providers are ordered by the routing policy:
+      - "latency": lowest observed p50 latency first (providers without data
+        keep their configured order and are tried first, so they get measured)
+      - "cost": cheapest provider first (local Ollama before OpenAI)
+    Providers that keep failing are moved to the end of the list for a while.
+
+    Hedging: when enabled for a call, the request is also sent to the second
+    provider if the first one has not answered after `hedge_delay_s` (by
+    default the first provider's observed p95 latency), and whichever answer
+    arrives first is used.
+
+    Every call is recorded once, by the pool thread that ran it. Calls the
+    router stopped waiting for (timed out, or lost a hedge) are still
+    finished in the pool and recorded as abandoned, with their real latency,
+    rather than as failures.
+    """
+
+    def __init__(
+        self,
+        providers: Union[List[str], None] = None,
+        policy: str = "latency",
+        timeout_s: float = 120.0,
+        hedge_delay_s: Union[float, None] = None,
+        hedge_latency_critical: bool = False,
+        max_workers: int = 8,
+    ):
+        if policy not in ("latency", "cost"):
+            raise ValueError(f"Unknown routing policy '{policy}'.")
+
+        if providers is None:
+            providers = ["openai", "ollama"] if llm.OPENAI_AVAILABLE else ["ollama"]
+        self.providers = providers
+        self.policy = policy
+        self.timeout_s = timeout_s
+        self.hedge_delay_s = hedge_delay_s
+        self.hedge_latency_critical = hedge_latency_critical
+        self.stats = {provider: ProviderStats() for provider in providers}
+        # Timed-out requests cannot be cancelled, so they finish in the pool
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="llm-router"
+        )
+
+    def ranked_providers(self) -> List[str]:
+        def sort_key(provider: str):
+            stats = self.stats[provider]
+            if self.policy == "cost":
+                preference = PROVIDER_COST_RANK.get(provider, len(PROVIDER_COST_RANK))
+            else:
+                preference = stats.percentile(0.50) or 0.0
+            return (not stats.healthy, preference, self.providers.index(provider))
+
+        return sorted(self.providers, key=sort_key)
+
+    def call(
+        self,
+        system_prompt: Union[str, None],
+        user_prompt: str,
+        ollama_model: str = "mistral",
+        openai_model: str = "gpt-4o-mini",
+        response_schema: Union[dict, None] = None,
+        prompt_name: Union[str, None] = None,
+        hedge: Union[bool, None] = None,
+    ) -> str:
+        """
+        Route a `call_llm` request. Raises the last LLMProviderError if every
+        provider failed.
+        """
+        prompt_name = prompt_name or prompt_name_for(system_prompt)
+        if hedge is None:
+            hedge = (
+                self.hedge_latency_critical
+                and prompt_name in LATENCY_CRITICAL_PROMPTS
+            )
+
+        request = {
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "ollama_model": ollama_model,
+            "openai_model": openai_model,
+            "response_schema": response_schema,
+            "prompt_name": prompt_name,
+        }
+
+        providers = self.ranked_providers()
+        last_error: Union[Exception, None] = None
+
+        while providers:
+            primary = providers.pop(0)
+            # Set once this attempt is over, so calls still running are
+            # recorded as abandoned when they finish
+            abandoned = threading.Event()
+            pending = {self._submit(primary, request, abandoned): primary}
+            deadline = time.monotonic() + self.timeout_s
+
+            try:
+                if hedge and providers:
+                    hedge_delay = self._hedge_delay(primary)
+                    done, _ = wait(pending, timeout=hedge_delay)
+                    if not done:
+                        secondary = providers.pop(0)
+                        print(
+                            f"\n🔀 [ROUTER] {primary} slower than "
+                            f"{hedge_delay:.1f}s, hedging with {secondary}"
+                        )
+                        pending[self._submit(secondary, request, abandoned)] = (
+                            secondary
+                        )
+
+                while pending:
+                    remaining = deadline - time.monotonic()
+                    done, _ = wait(
+                        pending,
+                        timeout=max(remaining, 0),
+                        return_when=FIRST_COMPLETED,
+                    )
+                    if not done:
+                        for provider in pending.values():
+                            print(
+                                f"\n⏱️  [ROUTER] {provider} timed out after "
+                                f"{self.timeout_s}s"
+                            )
+                        last_error = TimeoutError(
+                            f"LLM request timed out after {self.timeout_s}s"
+                        )
+                        break
+
+                    for future in done:
+                        provider = pending.pop(future)
+                        try:
+                            return future.result()
+                        except BudgetExceededError:
+                            raise
+                        except Exception as e:
+                            last_error = e
+                            print(f"\n🔀 [ROUTER] {provider} failed: {e}")
+            finally:
+                abandoned.set()
+
+        if isinstance(last_error, llm.LLMProviderError):
+            raise last_error
+        raise llm.LLMProviderError("router", last_error or RuntimeError("No providers"))
+
+    def stream(
+        self,
+        system_prompt: Union[str, None],
+        user_prompt: str,
+        ollama_model: str = "mistral",
+        openai_model: str = "gpt-4o-mini",
+        response_schema: Union[dict, None] = None,
+        prompt_name: Union[str, None] = None,
+    ) -> Iterator[str]:
+        """
+        Route a `stream_llm` request. Falls back to the next provider only if
+        the current one fails before producing any output; streams are not
+        hedged.
+        """
+        last_error: Union[Exception, None] = None
+        for provider in self.ranked_providers():
+            started = time.perf_counter()
+            produced = False
+            try:
+                for delta in llm.stream_llm(
+                    system_prompt,
+                    user_prompt,
+                    provider=provider,
+                    ollama_model=ollama_model,
+                    openai_model=openai_model,
+                    response_schema=response_schema,
+                    prompt_name=prompt_name,
+                ):
+                    produced = True
+                    yield delta
+            except BudgetExceededError:
+                raise
+            except Exception as e:
+                self.stats[provider].record_failure()
+                if produced:
+                    raise
+                last_error = e
+                print(f"\n🔀 [ROUTER] {provider} failed: {e}")
+                continue
+
+            self.stats[provider].record_success(time.perf_counter() - started)
+            return
+
+        if isinstance(last_error, llm.LLMProviderError):
+            raise last_error
+        raise llm.LLMProviderError("router", last_error or RuntimeError("No providers"))
+
+    def latency_report(self) -> Dict[str, Dict[str, Union[float, int, None]]]:
+        return {provider: stats.snapshot() for provider, stats in self.stats.items()}
+
+    def _hedge_delay(self, provider: str) -> float:
+        if self.hedge_delay_s is not None:
+            return self.hedge_delay_s
+        p95 = self.stats[provider].percentile(0.95)
+        # Without history, hedge after a fixed delay
+        return p95 if p95 is not None else 5.0
+
+    def _submit(self, provider: str, request: dict, abandoned: threading.Event):
+        # Copy the context so the call is recorded in the caller's metrics run
+        context = contextvars.copy_context()
+        return self._executor.submit(
+            context.run, self._timed_call, provider, request, abandoned
+        )
+
+    def _timed_call(
+        self, provider: str, request: dict, abandoned: threading.Event
+    ) -> str:
+        started = time.perf_counter()
+        try:
+            response = llm.call_llm(provider=provider, **request)
+        except BudgetExceededError:
+            raise
+        except Exception:
+            self.stats[provider].record_failure()
+            raise
+        latency_s = time.perf_counter() - started
+        if abandoned.is_set():
+            self.stats[provider].record_abandoned(latency_s)
+        else:
+            self.stats[provider].record_success(latency_s)
+        return response
+
+
+_DEFAULT_ROUTER: Union[LLMRouter, None] = None
+_DEFAULT_ROUTER_LOCK = threading.Lock()
+
+
+def default_router() -> LLMRouter:
+    """The router used by `call_llm(provider="auto")`."""
+    global _DEFAULT_ROUTER
+    with _DEFAULT_ROUTER_LOCK:
+        if _DEFAULT_ROUTER is None:
+            _DEFAULT_ROUTER = LLMRouter(hedge_latency_critical=True)
+        return _DEFAULT_ROUTER
+
+
+def set_default_router(router: LLMRouter):
+    global _DEFAULT_ROUTER
+    with _DEFAULT_ROUTER_LOCK:
+        _DEFAULT_ROUTER = router
@@ -0,0 +1,72 @@
+# JSON schemas for the structured LLM outputs. Each entry follows the OpenAI
+# `json_schema` response format ({"name", "schema", "strict"}); for Ollama only
+# the "schema" part is passed as `format=`.
+
+LOCATION_SCHEMA = {
+    "name": "current_location",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "current_location": {"type": "string"},
+        },
+        "required": ["current_location"],
+        "additionalProperties": False,
+    },
+}
+
+# Company names are the keys of "company_names", so this schema cannot be
+# strict (OpenAI strict mode does not allow free-form keys).
+WORK_HISTORY_SCHEMA = {
+    "name": "work_history",
+    "strict": False,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "company_names": {
+                "type": "object",
+                "additionalProperties": {
+                    "type": "object",
+                    "properties": {
+                        "Positions": {"type": "array", "items": {"type": "string"}},
+                        "Start Date": {"type": "string"},
+                        "End Date": {"type": "string"},
+                        "Relevant Skills": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                        },
+                    },
+                    "required": [
+                        "Positions",
+                        "Start Date",
+                        "End Date",
+                        "Relevant Skills",
+                    ],
+                },
+            },
+        },
+        "required": ["company_names"],
+    },
+}
+
+KEYWORD_SETS_SCHEMA = {
+    "name": "keyword_sets",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "keyword_sets": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["keyword_sets"],
+        "additionalProperties": False,
+    },
+}
+
+# OpenAI model families that accept `response_format={"type": "json_schema"}`.
+# Older models (e.g. plain "gpt-4") get no response format and rely on the
+# tolerant parser in agent/json_parser.py instead.
+STRUCTURED_OUTPUT_MODEL_PREFIXES = ("gpt-4o", "gpt-4.1", "gpt-5", "o1", "o3", "o4")
+
+
+def supports_structured_output(openai_model: str) -> bool:
+    return openai_model.startswith(STRUCTURED_OUTPUT_MODEL_PREFIXES)
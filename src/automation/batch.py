@@ -0,0 +1,363 @@
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Union
+
+from agent.intelligence import extract_info_and_keywords
+from agent.metrics import current_run, llm_run
+from automation.resume_parser import build_user_data, pdf_to_text
+from automation.sections import route_sections, segment_text
+
+# How often (in seconds) a progress line is printed while a batch is running
+PROGRESS_INTERVAL = 10
+
+
+def find_resumes(input_dir: str, recursive: bool = True) -> List[str]:
+    """Return the sorted paths of all PDF files in `input_dir`."""
+    pdf_paths = []
+    if recursive:
+        for root, _, files in os.walk(input_dir):
+            for name in files:
+                if name.lower().endswith(".pdf"):
+                    pdf_paths.append(os.path.join(root, name))
+    else:
+        for name in os.listdir(input_dir):
+            path = os.path.join(input_dir, name)
+            if name.lower().endswith(".pdf") and os.path.isfile(path):
+                pdf_paths.append(path)
+
+    return sorted(pdf_paths)
+
+
+class ResultWriter:
+    """
+    Append-only sink for batch results. The format is picked from the output
+    file extension: ".db"/".sqlite" writes to a SQLite table, anything else is
+    written as JSON lines.
+    """
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.use_sqlite = os.path.splitext(output_path)[-1].lower() in (
+            ".db",
+            ".sqlite",
+            ".sqlite3",
+        )
+
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(output_dir, exist_ok=True)
+
+        if self.use_sqlite:
+            self.conn = sqlite3.connect(output_path)
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS resumes (
+                    path TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    error TEXT,
+                    user_data TEXT,
+                    processed_at REAL NOT NULL
+                )
+                """
+            )
+            self.conn.commit()
+        else:
+            self.file = open(output_path, "a", encoding="utf-8")
+
+    def processed_paths(self) -> set:
+        """Paths that already have a successful row, so reruns can skip them."""
+        if self.use_sqlite:
+            rows = self.conn.execute("SELECT path FROM resumes WHERE status = 'ok'")
+            return {row[0] for row in rows}
+
+        done = set()
+        with open(self.output_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if row.get("status") == "ok":
+                    done.add(row["path"])
+        return done
+
+    def write(
+        self,
+        path: str,
+        user_data: Union[Dict[str, Any], None],
+        error: Union[str, None] = None,
+    ):
+        status = "ok" if error is None else "error"
+        processed_at = time.time()
+
+        if self.use_sqlite:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO resumes VALUES (?, ?, ?, ?, ?)",
+                (
+                    path,
+                    status,
+                    error,
+                    json.dumps(user_data) if user_data is not None else None,
+                    processed_at,
+                ),
+            )
+            self.conn.commit()
+        else:
+            row = {
+                "path": path,
+                "status": status,
+                "error": error,
+                "user_data": user_data,
+                "processed_at": processed_at,
+            }
+            self.file.write(json.dumps(row) + "\n")
+            self.file.flush()
+
+    def close(self):
+        if self.use_sqlite:
+            self.conn.close()
+        else:
+            self.file.close()
+
+
+class BatchProgress:
+    """Counts processed files and prints throughput at a fixed interval."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.succeeded = 0
+        self.failed = 0
+        self.started_at = time.perf_counter()
+        self.last_report = self.started_at
+
+    @property
+    def processed(self) -> int:
+        return self.succeeded + self.failed
+
+    def update(self, ok: bool):
+        if ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+        now = time.perf_counter()
+        if now - self.last_report >= PROGRESS_INTERVAL or self.processed == self.total:
+            self.last_report = now
+            self.report()
+
+    def report(self):
+        elapsed = time.perf_counter() - self.started_at
+        rate = self.processed / elapsed if elapsed > 0 else 0.0
+        remaining = (self.total - self.processed) / rate if rate > 0 else 0.0
+        print(
+            f"\n📦 [BATCH] {self.processed}/{self.total} resumes "
+            f"({self.succeeded} ok, {self.failed} failed) - "
+            f"{rate * 60:.1f} resumes/min, ~{remaining / 60:.1f} min left"
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started_at
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "elapsed_s": round(elapsed, 2),
+            "resumes_per_min": round(self.processed / elapsed * 60, 2)
+            if elapsed > 0
+            else 0.0,
+        }
+
+
+async def _run_batch(
+    pdf_paths: List[str],
+    writer: ResultWriter,
+    progress: BatchProgress,
+    pdf_workers: int,
+    llm_concurrency: int,
+    analysis_kwargs: Dict[str, Any],
+):
+    loop = asyncio.get_running_loop()
+    # Parsed texts wait here for a free LLM slot. Bounding the queue keeps the
+    # PDF stage from racing ahead and holding thousands of resumes in memory.
+    text_queue: asyncio.Queue = asyncio.Queue(maxsize=llm_concurrency * 2)
+
+    async def parse_stage(pool: ProcessPoolExecutor):
+        in_flight = asyncio.Semaphore(pdf_workers * 2)
+
+        async def parse_one(path: str):
+            try:
+                text = await loop.run_in_executor(pool, pdf_to_text, path)
+                if not text.strip():
+                    raise ValueError("No text found in PDF.")
+                await text_queue.put((path, text, None))
+            except Exception as e:
+                await text_queue.put((path, None, f"PDF parsing failed: {e}"))
+            finally:
+                in_flight.release()
+
+        tasks = []
+        for path in pdf_paths:
+            await in_flight.acquire()
+            tasks.append(asyncio.create_task(parse_one(path)))
+        await asyncio.gather(*tasks)
+
+        for _ in range(llm_concurrency):
+            await text_queue.put(None)
+
+    async def llm_stage():
+        while True:
+            item = await text_queue.get()
+            if item is None:
+                return
+
+            path, text, error = item
+            user_data = None
+            if error is None:
+                try:
+                    routed_sections, routing_report = route_sections(
+                        segment_text(text), text
+                    )
+                    current_run().record_section_routing(routing_report)
+                    results = await asyncio.to_thread(
+                        extract_info_and_keywords,
+                        resume_text=text,
+                        routed_sections=routed_sections,
+                        **analysis_kwargs,
+                    )
+                    user_data = build_user_data(results)
+                except Exception as e:
+                    error = f"LLM analysis failed: {e}"
+
+            if error is not None:
+                print(f"\n❗  [BATCH] {path}: {error}")
+            writer.write(path, user_data, error=error)
+            progress.update(ok=error is None)
+
+    with ProcessPoolExecutor(max_workers=pdf_workers) as pool:
+        await asyncio.gather(
+            parse_stage(pool), *(llm_stage() for _ in range(llm_concurrency))
+        )
+
+
+def process_resume_directory(
+    input_dir: str,
+    output_path: str,
+    k: int = 20,
+    provider: str = "openai",
+    openai_model: str = "gpt-4",
+    main_job_search_focus: str = "Software Engineering",
+    pdf_workers: Union[int, None] = None,
+    llm_concurrency: int = 4,
+    recursive: bool = True,
+    skip_processed: bool = True,
+    max_tokens: Union[int, None] = None,
+    max_cost_usd: Union[float, None] = None,
+) -> Dict[str, Any]:
+    """
+    Analyze every PDF resume in a directory and store one row per resume.
+
+    PDFs are converted to text in a process pool, then passed to at most
+    `llm_concurrency` concurrent `extract_info_and_keywords` calls. Each
+    resume's user_data (same format as user_data.json) is written to
+    `output_path` as soon as it is ready. A failure in one resume is recorded
+    as an error row and never stops the batch.
+
+    Args:
+        input_dir (str): Directory to search for PDF resumes.
+        output_path (str): JSONL file, or SQLite database if it ends in .db/.sqlite.
+        k (int): Number of keyword sets to generate per resume.
+        provider (str): LLM provider passed to extract_info_and_keywords.
+        openai_model (str): OpenAI model passed to extract_info_and_keywords.
+        main_job_search_focus (str): Search focus used for keyword generation.
+        pdf_workers (int): Size of the PDF parsing process pool (default: CPU count).
+        llm_concurrency (int): Maximum number of resumes in the LLM stage at once.
+        recursive (bool): Whether to descend into subdirectories.
+        skip_processed (bool): Skip resumes that already have a successful row.
+        max_tokens (int): Optional LLM token budget for the whole batch.
+        max_cost_usd (float): Optional LLM cost budget for the whole batch.
+
+    Returns:
+        Dict[str, Any]: Counts, elapsed time and throughput of the batch, plus
+        the LLM metrics summary and the path of the exported metrics file.
+    """
+    pdf_paths = find_resumes(input_dir, recursive=recursive)
+    writer = ResultWriter(output_path)
+
+    if skip_processed:
+        done = writer.processed_paths()
+        pdf_paths = [path for path in pdf_paths if path not in done]
+
+    progress = BatchProgress(total=len(pdf_paths))
+    print(f"\n📦 [BATCH] Processing {len(pdf_paths)} resumes from {input_dir}")
+
+    try:
+        with llm_run(max_tokens=max_tokens, max_cost_usd=max_cost_usd) as run:
+            if pdf_paths:
+                asyncio.run(
+                    _run_batch(
+                        pdf_paths,
+                        writer,
+                        progress,
+                        pdf_workers=pdf_workers or os.cpu_count() or 1,
+                        llm_concurrency=llm_concurrency,
+                        analysis_kwargs={
+                            "k": k,
+                            "provider": provider,
+                            "openai_model": openai_model,
+                            "main_job_search_focus": main_job_search_focus,
+                        },
+                    )
+                )
+    finally:
+        writer.close()
+
+    summary = progress.summary()
+    print(f"\n📦 [BATCH] Done: {summary}")
+    run.print_summary()
+    summary["llm_metrics"] = run.summary()
+    summary["llm_metrics_path"] = run.export()
+    return summary
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Analyze a directory of PDF resumes in bulk."
+    )
+    arg_parser.add_argument("input_dir", help="Directory containing PDF resumes")
+    arg_parser.add_argument(
+        "output_path", help="Output file (.jsonl, or .db/.sqlite for SQLite)"
+    )
+    arg_parser.add_argument("-k", type=int, default=20, help="Keyword sets per resume")
+    arg_parser.add_argument("--provider", default="openai")
+    arg_parser.add_argument("--openai-model", default="gpt-4")
+    arg_parser.add_argument("--focus", default="Software Engineering")
+    arg_parser.add_argument("--pdf-workers", type=int, default=None)
+    arg_parser.add_argument("--llm-concurrency", type=int, default=4)
+    arg_parser.add_argument("--no-recursive", action="store_true")
+    arg_parser.add_argument("--reprocess", action="store_true")
+    arg_parser.add_argument("--max-tokens", type=int, default=None)
+    arg_parser.add_argument("--max-cost", type=float, default=None)
+    args = arg_parser.parse_args()
+
+    process_resume_directory(
+        input_dir=args.input_dir,
+        output_path=args.output_path,
+        k=args.k,
+        provider=args.provider,
+        openai_model=args.openai_model,
+        main_job_search_focus=args.focus,
+        pdf_workers=args.pdf_workers,
+        llm_concurrency=args.llm_concurrency,
+        recursive=not args.no_recursive,
+        skip_processed=not args.reprocess,
+        max_tokens=args.max_tokens,
+        max_cost_usd=args.max_cost,
+    )
+
+
+if __name__ == "__main__":
+    main()
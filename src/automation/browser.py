@@ -1,20 +1,44 @@
 from playwright.sync_api import sync_playwright
 
+# Remote debugging port of the Chrome instance the automation attaches to
+DEFAULT_CDP_PORT = 9222
+
 
 class BrowserManager:
-    def __init__(self, headless: bool = False):
+    def __init__(
+        self,
+        headless: bool = False,
+        cdp_port: int = DEFAULT_CDP_PORT,
+        launch_browser: bool = False,
+    ):
+        """
+        Args:
+            headless (bool): Run a launched browser without a window.
+            cdp_port (int): Port of the running Chrome to attach to.
+            launch_browser (bool): Launch Playwright's own Chromium (in a fresh
+                profile, e.g. for benchmarks) instead of attaching to Chrome.
+        """
         self.headless = headless
+        self.cdp_port = cdp_port
+        self.launch_browser = launch_browser
         self.playwright = None
+        self.browser = None
         self.browser_context = None
         self.page = None
 
     def launch(self):
         self.playwright = sync_playwright().start()
+        if self.launch_browser:
+            self.browser = self.playwright.chromium.launch(headless=self.headless)
+            self.browser_context = self.browser.new_context()
+            self.page = self.browser_context.new_page()
+            return self.page
+
         # self.browser_context = self.playwright.chromium.launch_persistent_context(
         #     user_data_dir="./playwright_user_data", headless=self.headless
         # )
         self.browser = self.playwright.chromium.connect_over_cdp(
-            endpoint_url="http://localhost:9222/"
+            endpoint_url=f"http://localhost:{self.cdp_port}/"
         )
         self.browser_context = self.browser.contexts[0]
         self.page = self.browser_context.new_page()
@@ -23,5 +47,7 @@ class BrowserManager:
     def close(self):
         if self.browser_context:
             self.browser_context.close()
+        if self.launch_browser and self.browser:
+            self.browser.close()
         if self.playwright:
             self.playwright.stop()
@@ -0,0 +1,196 @@
+import atexit
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Dict, List, Union
+
+from automation.browser import DEFAULT_CDP_PORT
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILES_DIR = os.path.join(CURRENT_DIR, "..", "data", "chrome_profiles")
+
+if sys.platform == "win32":
+    CHROME_PATH = "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe"
+elif sys.platform == "darwin":
+    CHROME_PATH = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+else:
+    CHROME_PATH = "google-chrome"
+
+# How long Chrome may take to accept DevTools connections after launch
+READY_TIMEOUT_S = 30.0
+# Delay between two readiness probes
+PROBE_INTERVAL_S = 0.1
+# Grace period for Chrome to exit after terminate() before it is killed
+STOP_TIMEOUT_S = 5.0
+
+
+def cdp_version(port: int, timeout_s: float = 0.5) -> Union[Dict[str, Any], None]:
+    """
+    The /json/version info of the DevTools endpoint on `port`, or None if
+    nothing (or not Chrome) is listening there yet.
+    """
+    try:
+        with urllib.request.urlopen(
+            f"http://127.0.0.1:{port}/json/version", timeout=timeout_s
+        ) as response:
+            return json.loads(response.read())
+    except (OSError, ValueError):
+        return None
+
+
+class ChromeSupervisor:
+    """
+    Starts and tracks the Chrome instances the automation attaches to over
+    CDP, one per remote debugging port.
+
+    - A Chrome that already listens on the port (e.g. started by the user) is
+      reused and never stopped by the supervisor.
+    - Readiness is detected by polling /json/version, so callers wait exactly
+      as long as Chrome needs instead of a fixed sleep.
+    - A launched instance that has exited (crashed or closed) is started again
+      the next time its port is requested.
+    - Instances launched by the supervisor are stopped on `shutdown`, which
+      also runs when the interpreter exits.
+
+    Instances on ports other than DEFAULT_CDP_PORT get their own profile
+    directory, since Chrome only runs one instance per profile; the default
+    port uses the normal profile, where the user is logged in to LinkedIn.
+    """
+
+    def __init__(
+        self,
+        chrome_command: Union[List[str], None] = None,
+        profiles_dir: str = PROFILES_DIR,
+    ):
+        self.chrome_command = chrome_command or [CHROME_PATH]
+        self.profiles_dir = profiles_dir
+        self._processes: Dict[int, subprocess.Popen] = {}
+        self._restarts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def start(self, port: int = DEFAULT_CDP_PORT) -> bool:
+        """
+        Make sure a Chrome instance is (being) started on `port` without
+        waiting for it to become ready, e.g. to overlap the startup with other
+        work. Returns True if a new process was launched.
+        """
+        with self._lock:
+            process = self._processes.get(port)
+            if process is not None and process.poll() is None:
+                return False
+            if cdp_version(port) is not None:
+                print(f"\n🎮  [CHROME] Reusing the Chrome instance on port {port}.")
+                return False
+
+            if process is not None:
+                self._restarts[port] = self._restarts.get(port, 0) + 1
+                print(
+                    f"\n🎮  [CHROME] Chrome on port {port} exited with code "
+                    f"{process.returncode}, restarting it."
+                )
+            self._processes[port] = self._launch(port)
+            return True
+
+    def wait_until_ready(
+        self, port: int = DEFAULT_CDP_PORT, timeout_s: float = READY_TIMEOUT_S
+    ) -> Dict[str, Any]:
+        """
+        Poll the DevTools endpoint on `port` until it answers.
+
+        Returns:
+            Dict[str, Any]: The /json/version info.
+
+        Raises:
+            RuntimeError: If the launched Chrome process exits before it is ready.
+            TimeoutError: If the endpoint does not answer within `timeout_s`.
+        """
+        started = time.perf_counter()
+        while True:
+            version = cdp_version(port)
+            if version is not None:
+                print(
+                    f"\n🎮  [CHROME] Port {port} ready after "
+                    f"{time.perf_counter() - started:.2f}s "
+                    f"({version.get('Browser', 'unknown browser')})."
+                )
+                return version
+
+            with self._lock:
+                process = self._processes.get(port)
+            if process is not None and process.poll() is not None:
+                raise RuntimeError(
+                    f"Chrome exited with code {process.returncode} before port "
+                    f"{port} was ready. If Chrome was already running with the "
+                    "same profile, close it or start it with "
+                    f"--remote-debugging-port={port}."
+                )
+            if time.perf_counter() - started > timeout_s:
+                raise TimeoutError(
+                    f"Chrome did not open port {port} within {timeout_s:.0f}s."
+                )
+            time.sleep(PROBE_INTERVAL_S)
+
+    def ensure_running(
+        self, port: int = DEFAULT_CDP_PORT, timeout_s: float = READY_TIMEOUT_S
+    ) -> Dict[str, Any]:
+        """Start Chrome on `port` if needed and wait until it is ready."""
+        self.start(port)
+        return self.wait_until_ready(port, timeout_s=timeout_s)
+
+    def restarts(self, port: int = DEFAULT_CDP_PORT) -> int:
+        return self._restarts.get(port, 0)
+
+    def stop(self, port: int = DEFAULT_CDP_PORT):
+        """Stop the Chrome instance launched on `port` (reused ones are left alone)."""
+        with self._lock:
+            process = self._processes.pop(port, None)
+        if process is None or process.poll() is not None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout=STOP_TIMEOUT_S)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        print(f"\n🎮  [CHROME] Stopped Chrome on port {port}.")
+
+    def shutdown(self):
+        """Stop every Chrome instance launched by this supervisor."""
+        for port in list(self._processes):
+            self.stop(port)
+
+    def _launch(self, port: int) -> subprocess.Popen:
+        command = self.chrome_command + [f"--remote-debugging-port={port}"]
+        if port != DEFAULT_CDP_PORT:
+            profile_dir = os.path.join(self.profiles_dir, str(port))
+            os.makedirs(profile_dir, exist_ok=True)
+            command.append(f"--user-data-dir={profile_dir}")
+
+        # No shell: the process handle is Chrome itself, so it can be polled
+        # and stopped
+        process = subprocess.Popen(
+            command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        print(
+            f"\n🎮  [CHROME] Chrome launched with remote debugging on port {port} "
+            f"(pid {process.pid})."
+        )
+        return process
+
+
+_DEFAULT_SUPERVISOR: Union[ChromeSupervisor, None] = None
+_DEFAULT_SUPERVISOR_LOCK = threading.Lock()
+
+
+def default_chrome_supervisor() -> ChromeSupervisor:
+    global _DEFAULT_SUPERVISOR
+    with _DEFAULT_SUPERVISOR_LOCK:
+        if _DEFAULT_SUPERVISOR is None:
+            _DEFAULT_SUPERVISOR = ChromeSupervisor()
+        return _DEFAULT_SUPERVISOR
@@ -0,0 +1,171 @@
+import re
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+
+# Fields that must match exactly (after normalization) for two jobs to be
+# reposts of the same role. Similar titles ("Senior Data Scientist" vs "Data
+# Scientist") or the same title at another company are different jobs.
+EXACT_FIELDS = ["company", "title"]
+
+# Fields compared by MinHash similarity among jobs with the same exact fields.
+# The scraper fills the location; the description only when it was scraped.
+SIGNATURE_FIELDS = ["location", "description"]
+
+# Legal-form suffixes ignored when comparing company names
+COMPANY_SUFFIXES = {"gmbh", "ag", "inc", "llc", "ltd", "limited", "corp", "se", "co"}
+
+# Gender tags of (mostly German) job titles, e.g. "(m/w/d)"
+GENDER_TAG_PATTERN = re.compile(r"\(\s*[mwfdx](?:\s*/\s*[mwfdx])+\s*\)")
+
+# Multipliers of the 64-bit finalizer (from splitmix64) that turns a shingle
+# hash xor-ed with a per-permutation seed into one MinHash permutation
+MIX_MULTIPLIERS = (np.uint64(0xBF58476D1CE4E5B9), np.uint64(0x94D049BB133111EB))
+
+WORD_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+
+def _exact_key(job: Dict[str, Any]) -> Tuple[str, str]:
+    """Normalized company and title of a job."""
+    company = WORD_PATTERN.findall(str(job.get("company", "") or "").lower())
+    while company and company[-1] in COMPANY_SUFFIXES:
+        company.pop()
+    title = GENDER_TAG_PATTERN.sub(" ", str(job.get("title", "") or "").lower())
+    return " ".join(company), " ".join(WORD_PATTERN.findall(title))
+
+
+def _shingles(job: Dict[str, Any]) -> set:
+    """Words and word bigrams of the job's normalized signature fields."""
+    shingles = set()
+    for field in SIGNATURE_FIELDS:
+        words = WORD_PATTERN.findall(str(job.get(field, "") or "").lower())
+        shingles.update(words)
+        shingles.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    return shingles
+
+
+class NearDuplicateIndex:
+    """
+    Incremental MinHash/LSH index that clusters near-duplicate job postings,
+    e.g. the same role reposted under a new job_id.
+
+    Only jobs with the same normalized company and title (EXACT_FIELDS) can
+    be duplicates. Among those, every added job gets a MinHash signature of
+    its SIGNATURE_FIELDS that is split into `bands` bands; jobs with the same
+    company and title that share any band land in the same bucket and become
+    candidates. Only candidates are compared, so an insert costs
+    O(bands + candidates) instead of a scan over every job seen so far.
+    Candidates whose estimated Jaccard similarity reaches `threshold` are
+    merged into one cluster (union-find), identified by the job_id of its
+    first job.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        num_perm: int = 64,
+        bands: int = 16,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands.")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+
+        rng = np.random.default_rng(seed)
+        self._seeds = rng.integers(
+            0, np.iinfo(np.uint64).max, size=(num_perm, 1), dtype=np.uint64
+        )
+
+        self._buckets: List[Dict[Tuple[Tuple[str, str], bytes], List[str]]] = [
+            defaultdict(list) for _ in range(bands)
+        ]
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._parent: Dict[str, str] = {}
+        self._insert_order: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, job: Dict[str, Any]) -> np.ndarray:
+        shingles = _shingles(job)
+        if not shingles:
+            return np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode()) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        # (num_perm x n_shingles) permuted hashes, minimum per permutation.
+        # uint64 multiplication wraps around, which the mixer relies on.
+        permuted = hashes ^ self._seeds
+        permuted ^= permuted >> np.uint64(30)
+        permuted *= MIX_MULTIPLIERS[0]
+        permuted ^= permuted >> np.uint64(27)
+        permuted *= MIX_MULTIPLIERS[1]
+        permuted ^= permuted >> np.uint64(31)
+        return permuted.min(axis=1)
+
+    def add(self, job: Dict[str, Any]) -> str:
+        """
+        Add a job and return the id of the cluster it belongs to. The cluster
+        id equals the job's own job_id unless it is a near-duplicate of a job
+        added before.
+        """
+        job_id = str(job.get("job_id", ""))
+        if job_id in self._signatures:
+            return self.cluster_of(job_id)
+
+        signature = self.signature(job)
+        exact_key = _exact_key(job)
+        self._signatures[job_id] = signature
+        self._parent[job_id] = job_id
+        self._insert_order[job_id] = len(self._insert_order)
+
+        candidates = set()
+        for band, buckets in enumerate(self._buckets):
+            start = band * self.rows_per_band
+            band_hash = signature[start : start + self.rows_per_band].tobytes()
+            key = (exact_key, band_hash)
+            candidates.update(buckets[key])
+            buckets[key].append(job_id)
+
+        for candidate in candidates:
+            similarity = float(np.mean(self._signatures[candidate] == signature))
+            if similarity >= self.threshold:
+                self._union(candidate, job_id)
+
+        return self.cluster_of(job_id)
+
+    def cluster_of(self, job_id: str) -> Union[str, None]:
+        if job_id not in self._parent:
+            return None
+        root = job_id
+        while self._parent[root] != root:
+            root = self._parent[root]
+        # Path compression
+        while self._parent[job_id] != root:
+            self._parent[job_id], job_id = root, self._parent[job_id]
+        return root
+
+    def clusters(self) -> Dict[str, List[str]]:
+        """Clusters with more than one job, keyed by cluster id."""
+        members = defaultdict(list)
+        for job_id in self._signatures:
+            members[self.cluster_of(job_id)].append(job_id)
+        return {root: ids for root, ids in members.items() if len(ids) > 1}
+
+    def _union(self, first: str, second: str):
+        first_root, second_root = self.cluster_of(first), self.cluster_of(second)
+        if first_root == second_root:
+            return
+        # Keep the job that was added first as the cluster id
+        if self._insert_order[first_root] > self._insert_order[second_root]:
+            first_root, second_root = second_root, first_root
+        self._parent[second_root] = first_root
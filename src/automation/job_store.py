@@ -0,0 +1,308 @@
+import json
+import re
+import sqlite3
+import time
+from typing import Any, Dict, List, Tuple
+
+from agent.ranking import JobRanker
+
+# File name of the store inside a workspace directory
+JOBS_DB_FILENAME = "jobs.db"
+
+# Columns the results view can be sorted by (each one is indexed together
+# with duplicate_of, so the default view is read in index order)
+SORT_COLUMNS = ("score", "title", "company", "location", "scraped_at")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    company TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    benefits TEXT NOT NULL DEFAULT '',
+    footer_tags TEXT NOT NULL DEFAULT '',
+    job_url TEXT NOT NULL DEFAULT '',
+    duplicate_of TEXT NOT NULL DEFAULT '',
+    score REAL NOT NULL DEFAULT 0,
+    scraped_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_score ON jobs (duplicate_of, score);
+CREATE INDEX IF NOT EXISTS jobs_scraped_at ON jobs (duplicate_of, scraped_at);
+CREATE INDEX IF NOT EXISTS jobs_title_nocase
+    ON jobs (duplicate_of, title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS jobs_company_nocase
+    ON jobs (duplicate_of, company COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS jobs_location_nocase
+    ON jobs (duplicate_of, location COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS job_tags (
+    job_id TEXT NOT NULL,
+    tag TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (tag, job_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS job_tags_job_id ON job_tags (job_id);
+"""
+
+# Full-text index over the displayed text columns, kept in sync by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5 (
+    title, company, location, benefits, footer_tags,
+    content='jobs', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts (rowid, title, company, location, benefits, footer_tags)
+    VALUES (new.rowid, new.title, new.company, new.location, new.benefits,
+            new.footer_tags);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, benefits,
+                          footer_tags)
+    VALUES ('delete', old.rowid, old.title, old.company, old.location,
+            old.benefits, old.footer_tags);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF
+    title, company, location, benefits, footer_tags ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, benefits,
+                          footer_tags)
+    VALUES ('delete', old.rowid, old.title, old.company, old.location,
+            old.benefits, old.footer_tags);
+    INSERT INTO jobs_fts (rowid, title, company, location, benefits, footer_tags)
+    VALUES (new.rowid, new.title, new.company, new.location, new.benefits,
+            new.footer_tags);
+END;
+"""
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Sorts after any character a prefix can be followed by
+MAX_CHARACTER = "\U0010ffff"
+
+
+def _prefix_range(value: str) -> Tuple[str, str]:
+    """
+    Bounds of the strings starting with `value`. Unlike LIKE, range
+    predicates can be answered from an index on the column.
+    """
+    return value, value + MAX_CHARACTER
+
+
+def _like_prefix(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+def _fts_query(text: str) -> str:
+    """Every word of `text` must appear (as a word prefix), in any column."""
+    return " ".join(f'"{token}"*' for token in TOKEN_PATTERN.findall(text))
+
+
+class JobStore:
+    """
+    Indexed SQLite store of all scraped jobs of a workspace, for a results
+    view that only ever loads the page it shows.
+
+    Filtering (text, company, location, tag), sorting and paging all run in
+    SQLite: text search uses an FTS5 index (or LIKE when SQLite was built
+    without FTS5), company/location filters are case-insensitive prefix
+    ranges read from (duplicate_of, column COLLATE NOCASE) indexes, and tags
+    live in their own indexed table. Every sort column is indexed after
+    duplicate_of as well, so a page of the default view (reposts hidden) is
+    read in index order instead of sorting all matching jobs.
+
+    Open a store per request or generator (opening is cheap) and close it
+    when done; a store may move between threads (Gradio resumes generators on
+    any worker thread) but must not be used by two threads at once.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        # Readers (the results view) are not blocked by a running scrape
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+        self.conn.commit()
+
+    def add_jobs(self, jobs: List[Dict[str, Any]]) -> int:
+        """
+        Insert or update scraped jobs (keyed by job_id). Scores of existing
+        jobs are kept until the next `rescore`.
+
+        Returns:
+            int: The number of jobs that were not in the store yet.
+        """
+        before = self.count(include_duplicates=True)
+        now = time.time()
+        with self.conn:
+            for job in jobs:
+                footer_tags = job.get("footer_tags", []) or []
+                self.conn.execute(
+                    """
+                    INSERT INTO jobs (job_id, title, company, location, benefits,
+                                      footer_tags, job_url, duplicate_of,
+                                      scraped_at, data)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (job_id) DO UPDATE SET
+                        title = excluded.title,
+                        company = excluded.company,
+                        location = excluded.location,
+                        benefits = excluded.benefits,
+                        footer_tags = excluded.footer_tags,
+                        job_url = excluded.job_url,
+                        duplicate_of = excluded.duplicate_of,
+                        scraped_at = excluded.scraped_at,
+                        data = excluded.data
+                    """,
+                    (
+                        job.get("job_id", ""),
+                        job.get("title", ""),
+                        job.get("company", ""),
+                        job.get("location", ""),
+                        job.get("benefits", ""),
+                        ", ".join(footer_tags),
+                        job.get("job_url", ""),
+                        job.get("duplicate_of", "") or "",
+                        now,
+                        json.dumps(job),
+                    ),
+                )
+                self.conn.execute(
+                    "DELETE FROM job_tags WHERE job_id = ?", (job.get("job_id", ""),)
+                )
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO job_tags (job_id, tag) VALUES (?, ?)",
+                    [(job.get("job_id", ""), tag) for tag in footer_tags if tag],
+                )
+        return self.count(include_duplicates=True) - before
+
+    def rescore(self, user_data: Dict[str, Any]):
+        """
+        Score every stored job against the user profile (see agent/ranking.py).
+        The whole store is scored at once, so the TF-IDF weights and therefore
+        the scores are comparable across scrapes.
+        """
+        rows = self.conn.execute("SELECT job_id, data FROM jobs").fetchall()
+        if not rows:
+            return
+        scores = JobRanker(user_data).score([json.loads(row["data"]) for row in rows])
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE jobs SET score = ? WHERE job_id = ?",
+                [
+                    (round(float(score), 4), row["job_id"])
+                    for row, score in zip(rows, scores)
+                ],
+            )
+
+    def job_ids(self) -> set:
+        """Ids of all stored jobs, so a later crawl can skip them."""
+        return {row[0] for row in self.conn.execute("SELECT job_id FROM jobs")}
+
+    def count(self, include_duplicates: bool = False) -> int:
+        where = "" if include_duplicates else "WHERE duplicate_of = ''"
+        return self.conn.execute(f"SELECT COUNT(*) FROM jobs {where}").fetchone()[0]
+
+    def query(
+        self,
+        text: str = "",
+        company: str = "",
+        location: str = "",
+        tag: str = "",
+        sort_by: str = "score",
+        descending: bool = True,
+        page: int = 1,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        include_duplicates: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        One page of jobs matching all given filters.
+
+        Args:
+            text (str): Words that must all appear in the job's text columns.
+            company (str): Company name prefix (case-insensitive).
+            location (str): Location prefix (case-insensitive).
+            tag (str): A footer tag the job must have (e.g. "Easy Apply").
+            sort_by (str): One of SORT_COLUMNS.
+            descending (bool): Sort order.
+            page (int): 1-based page number.
+            page_size (int): Jobs per page (at most MAX_PAGE_SIZE).
+            include_duplicates (bool): Also list reposts of the same role.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], int]: The jobs of the page (table
+            columns only) and the number of matching jobs.
+        """
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort_by!r}, use one of {SORT_COLUMNS}")
+        page_size = max(1, min(int(page_size), MAX_PAGE_SIZE))
+        page = max(1, int(page))
+
+        conditions = []
+        params: List[Any] = []
+        if not include_duplicates:
+            conditions.append("jobs.duplicate_of = ''")
+        for column, prefix in (("company", company), ("location", location)):
+            if prefix.strip():
+                conditions.append(
+                    f"jobs.{column} >= ? COLLATE NOCASE"
+                    f" AND jobs.{column} < ? COLLATE NOCASE"
+                )
+                params.extend(_prefix_range(prefix.strip()))
+        if tag.strip():
+            conditions.append(
+                "jobs.job_id IN (SELECT job_id FROM job_tags WHERE tag = ?)"
+            )
+            params.append(tag.strip())
+        if text.strip():
+            if self.has_fts and _fts_query(text):
+                conditions.append(
+                    "jobs.rowid IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)"
+                )
+                params.append(_fts_query(text))
+            else:
+                for token in TOKEN_PATTERN.findall(text) or [text.strip()]:
+                    conditions.append(
+                        "(jobs.title || ' ' || jobs.company || ' ' || jobs.location"
+                        " || ' ' || jobs.benefits || ' ' || jobs.footer_tags)"
+                        " LIKE ? ESCAPE '\\'"
+                    )
+                    params.append("%" + _like_prefix(token))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        total = self.conn.execute(
+            f"SELECT COUNT(*) FROM jobs {where}", params
+        ).fetchone()[0]
+
+        direction = "DESC" if descending else "ASC"
+        text_column = sort_by in ("title", "company", "location")
+        collate = "COLLATE NOCASE" if text_column else ""
+        rows = self.conn.execute(
+            f"""
+            SELECT score, job_id, title, company, location, benefits, footer_tags,
+                   job_url, duplicate_of, scraped_at
+            FROM jobs {where}
+            ORDER BY jobs.{sort_by} {collate} {direction}, jobs.rowid {direction}
+            LIMIT ? OFFSET ?
+            """,
+            params + [page_size, (page - 1) * page_size],
+        ).fetchall()
+        return [dict(row) for row in rows], total
+
+    def tags(self) -> List[str]:
+        """All footer tags in the store, most common first (for filter choices)."""
+        rows = self.conn.execute(
+            "SELECT tag FROM job_tags GROUP BY tag ORDER BY COUNT(*) DESC, tag"
+        )
+        return [row[0] for row in rows]
+
+    def close(self):
+        self.conn.close()
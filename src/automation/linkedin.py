@@ -1,28 +1,89 @@
+import hashlib
 import json
 import os
 import random
+import threading
 import time
 import urllib.parse
-from typing import Any, Dict, List
+from contextlib import nullcontext
+from typing import Any, Dict, Iterator, List, Union
 
 from playwright.sync_api import Page, TimeoutError
 
-from automation.browser import BrowserManager
+from automation.browser import DEFAULT_CDP_PORT, BrowserManager
+from automation.dedupe import NearDuplicateIndex
+from automation.perf import PageMetricsCollector
+from recording.trace_buffer import TraceBuffer
+from utils.helpers import atomic_write_json
+from utils.log import get_logger, log_context
+from utils.tracing import PROFILER, Tracer
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 USER_DATA_DIR = os.path.join(CURRENT_DIR, "..", "data")
 USER_DATA_PATH = os.path.join(USER_DATA_DIR, "user_data.json")
 JOBS_DATA_PATH = os.path.join(USER_DATA_DIR, "jobs_data.json")
 
+log = get_logger("linkedin", tag="JOB PARSER")
+
+
+def _search_id(url: str) -> str:
+    """Short id of a search URL, stable across runs (for log records)."""
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:8]
+
 
 class LinkedInAutomation:
-    def __init__(self, headless: bool = False):
+    def __init__(
+        self,
+        headless: bool = False,
+        user_data: Dict[str, Any] = None,
+        data_dir: str = USER_DATA_DIR,
+        cdp_port: int = DEFAULT_CDP_PORT,
+        record_failures: bool = True,
+        launch_browser: bool = False,
+        profiler: Union[str, None] = PROFILER,
+    ):
         self.headless: bool = headless
         self.base_platform_url: str = "https://www.linkedin.com/jobs/"
-        self.browser_mgr = BrowserManager(headless=self.headless)
+        # Where user_data.json is read from and jobs_data.json is written to
+        self.data_dir = data_dir
+        self.browser_mgr = BrowserManager(
+            headless=self.headless, cdp_port=cdp_port, launch_browser=launch_browser
+        )
+        # Keep recent frames/DOM snapshots of the tab and save them when a
+        # navigation, scroll or apply step fails (see recording/trace_buffer.py)
+        self.record_failures = record_failures
+        self.trace_buffer: Union[TraceBuffer, None] = None
+        # Load time, DOM size, JS heap and bytes of every page.goto, plus the
+        # time spent scrolling and parsing per search (see automation/perf.py)
+        self.page_metrics = PageMetricsCollector(
+            metrics_dir=os.path.join(self.data_dir, "metrics")
+        )
+        # Nested spans (navigate, scroll, extract, dedupe, persist) with the
+        # Playwright calls made in each, plus an optional cProfile/pyinstrument
+        # profile of the crawl (see utils/tracing.py)
+        self.tracer = Tracer(
+            run_id=self.page_metrics.run_id,
+            trace_dir=os.path.join(self.data_dir, "traces"),
+            profiler=profiler,
+        )
         self.search_url_list: list[str] = []
+        # Without explicit user data, use the saved user_data.json (if any yet)
+        if user_data is None:
+            user_data = self._load_user_data()
+        self.user_data: Dict[str, Any] = user_data
         self.build_search_list(days=7)
-        self.user_data = json.load(open(USER_DATA_PATH))
+
+    def _load_user_data(self) -> Dict[str, Any]:
+        user_data_path = os.path.join(self.data_dir, "user_data.json")
+        if not os.path.exists(user_data_path):
+            log.warning(
+                "No user data at %s yet. Analyze a resume first.",
+                user_data_path,
+                tag="AGENT",
+            )
+            return {}
+        with open(user_data_path) as f:
+            return json.load(f)
 
     def login_and_check(self):
         """User manually logs in, then we check something like the user profile icon.
@@ -31,7 +92,13 @@ class LinkedInAutomation:
             page: The Playwright page object after login.
         """
         page = self.browser_mgr.launch()
-        page.goto(self.base_platform_url)
+        self.tracer.instrument_playwright(page)
+        self._start_trace(page)
+        self.page_metrics.attach(page)
+        with self.tracer.span("navigate"), self._traced(
+            "navigation", url=self.base_platform_url
+        ), self.page_metrics.navigation(page, self.base_platform_url, kind="login"):
+            page.goto(self.base_platform_url)
 
         # logged_in = False
         # while not logged_in:
@@ -54,9 +121,33 @@ class LinkedInAutomation:
         #         print("\nUser is still logging in...")
         #         print(e)
 
-        print("\nUser is logged in successfully.")
+        log.info("User is logged in successfully.", tag="AGENT", emoji="🔑")
         return page
 
+    def _start_trace(self, page: Page):
+        if not self.record_failures:
+            return
+        trace_buffer = TraceBuffer(
+            page, output_dir=os.path.join(self.data_dir, "failures")
+        )
+        try:
+            trace_buffer.start()
+        except Exception as e:
+            log.warning("Could not start the failure recorder: %s", e, tag="TRACE")
+            return
+        self.trace_buffer = trace_buffer
+
+    def _traced(self, step: str, snapshot: bool = True, **info):
+        """Context manager that saves a failure trace if `step` raises."""
+        if self.trace_buffer is None:
+            return nullcontext()
+        return self.trace_buffer.step(step, snapshot=snapshot, **info)
+
+    def _record_failure(self, step: str):
+        """Save a failure trace for a step that failed without raising."""
+        if self.trace_buffer is not None:
+            self.trace_buffer.dump(step)
+
     def build_linkedin_url(
         self,
         keywords_line: str,
@@ -116,9 +207,8 @@ class LinkedInAutomation:
             None
         """
 
-        user_data = json.load(open(os.path.join(USER_DATA_DIR, "user_data.json")))
-        custom_keywords = user_data["keyword_combinations"]
-        location = user_data["location"]
+        custom_keywords = self.user_data.get("keyword_combinations", "")
+        location = self.user_data.get("location", "")
 
         for line in custom_keywords.split("\n"):
             line = line.strip()
@@ -145,8 +235,10 @@ class LinkedInAutomation:
         try:
             page.wait_for_selector(container_selector, timeout=5000)
         except TimeoutError:
-            print(
-                f"⚠️  >>> Scrollable container not found for selector: {container_selector}"
+            log.warning(
+                "Scrollable container not found for selector: %s",
+                container_selector,
+                tag="SCROLL",
             )
             return
 
@@ -156,14 +248,18 @@ class LinkedInAutomation:
         )
 
         if not has_scroll:
-            print(
-                f"⚠️  >>> Scrollable container not found for selector: {container_selector}"
+            log.warning(
+                "Scrollable container not found for selector: %s",
+                container_selector,
+                tag="SCROLL",
             )
             return
 
         if not scrollable_container:
-            print(
-                f"⚠️  >>> Scrollable container not found for selector: {container_selector}"
+            log.warning(
+                "Scrollable container not found for selector: %s",
+                container_selector,
+                tag="SCROLL",
             )
             return
 
@@ -175,21 +271,33 @@ class LinkedInAutomation:
 
             # Scroll down by a certain increment
             scrollable_container.evaluate("(el) => { el.scrollTop += 1000; }")
+            self.tracer.count("scroll_passes")
             time.sleep(2)  # Wait briefly to allow new content to load
 
             new_height = scrollable_container.evaluate("(el) => el.scrollHeight")
 
-            print(
-                f"⬇️  [SCROLL] Scrolled to {new_height} pixels from {current_height} pixels."
+            log.debug(
+                "Scrolled to %s pixels from %s pixels.",
+                new_height,
+                current_height,
+                tag="SCROLL",
+                emoji="⬇️",
             )
 
             if new_height == current_height:
-                print("\n⛔ [SCROLL] Reached bottom or no further content.")
+                log.debug(
+                    "Reached bottom or no further content.", tag="SCROLL", emoji="⛔"
+                )
                 break
 
             scroll_count += 1
 
-        print(f"\n✅ [SCROLL] Completed {scroll_count} scroll attempts in container.")
+        log.info(
+            "Completed %d scroll attempts in container.",
+            scroll_count,
+            tag="SCROLL",
+            emoji="✅",
+        )
 
     def _parse_single_card(self, card) -> Dict[str, Any]:
         """
@@ -256,7 +364,7 @@ class LinkedInAutomation:
         form_selector = "form"
         form_elm = page.query_selector(form_selector)
         if not form_elm:
-            print("\n[EXTRACT] No <form> found on this step.")
+            log.info("No <form> found on this step.", tag="EXTRACT")
             return []
 
         fields_info = []
@@ -272,7 +380,9 @@ class LinkedInAutomation:
 
             # If the label or placeholder is in our skip logic, we do NOT add it.
             if self._should_skip_field(label_txt, ftype):
-                print(f"\n[SKIP] Skipping field '{label_txt}' of type '{ftype}'.")
+                log.debug(
+                    "Skipping field '%s' of type '%s'.", label_txt, ftype, tag="SKIP"
+                )
                 continue
 
             fields_info.append(
@@ -382,7 +492,7 @@ class LinkedInAutomation:
         # TODO: Add LLM logic here for real answers
         if ftype == "text":
             if "years" in label.lower():
-                print("\n🔍 [ANSWER] Years of experience.")
+                log.info("Years of experience.", tag="ANSWER", emoji="🔍")
                 return self.user_data.get("years_experience", "0")
 
         elif ftype == "dropdown":
@@ -417,22 +527,35 @@ class LinkedInAutomation:
             page (Page): The currently active Playwright page.
         """
         # 1) Go to the job detail URL
-        print(f"\n[EASY APPLY] Navigating to job URL: {job_url}")
-        page.goto(job_url, timeout=60_000)
+        log.info("Navigating to job URL: %s", job_url, tag="EASY APPLY", emoji="🌐")
+        with self._traced("navigation", url=job_url), self.page_metrics.navigation(
+            page, job_url, kind="apply"
+        ):
+            page.goto(job_url, timeout=60_000)
         time.sleep(2)
 
+        with self._traced("apply", url=job_url):
+            self._fill_application(job_url, page)
+
+    def _fill_application(self, job_url: str, page: Page):
+        """Click through the Easy Apply form of the open job page."""
         # 2) Check for the Easy Apply button
         # Typical selectors might be 'button.jobs-apply-button' or a data-control-name
         easy_apply_btn_selector = "button.jobs-apply-button"
         try:
             page.wait_for_selector(easy_apply_btn_selector, timeout=5000)
         except TimeoutError:
-            print(f"\n⚠️  [EASY APPLY] No Easy Apply button found for job: {job_url}")
+            log.warning(
+                "No Easy Apply button found for job: %s", job_url, tag="EASY APPLY"
+            )
+            self._record_failure("apply")
             return
 
         easy_apply_btn = page.query_selector(easy_apply_btn_selector)
         if not easy_apply_btn:
-            print(f"\n⚠️  [EASY APPLY] No Easy Apply button found for job: {job_url}")
+            log.warning(
+                "No Easy Apply button found for job: %s", job_url, tag="EASY APPLY"
+            )
             return
 
         easy_apply_btn.click()
@@ -448,95 +571,300 @@ class LinkedInAutomation:
             submit_btn = page.query_selector("button[aria-label='Submit application']")
 
             if submit_btn:
-                print("\n✅ [EASY APPLY] Submitting application.")
+                log.info("Submitting application.", tag="EASY APPLY", emoji="✅")
                 submit_btn.click()
                 form_completed = True
                 time.sleep(2)
             elif review_btn:
-                print("\n🔄 [EASY APPLY] Reviewing application.")
+                log.info("Reviewing application.", tag="EASY APPLY", emoji="🔄")
                 review_btn.click()
                 time.sleep(2)
             elif next_btn:
-                print("\n➡️ [EASY APPLY] Moving to next step.")
+                log.info("Moving to next step.", tag="EASY APPLY", emoji="➡️")
                 next_btn.click()
                 time.sleep(2)
             else:
-                print(
-                    "\n⚠️  [EASY APPLY] No next/review/submit button. Possibly done or blocked."
+                log.warning(
+                    "No next/review/submit button. Possibly done or blocked.",
+                    tag="EASY APPLY",
                 )
                 form_completed = True
 
-    def gather_job_listings(self, search_rate_limit: int = 2) -> List[Dict[str, Any]]:
+    def iter_search_results(
+        self,
+        page: Page,
+        url: str,
+        scraped_job_ids: set,
+        duplicate_index: NearDuplicateIndex,
+        cancel_event: Union[threading.Event, None] = None,
+    ) -> Iterator[Dict[str, Any]]:
         """
-        For each URL in self.search_url_list:
-         1. Navigate to the page
-         2. Scrape job listings (title, company, location, link, easy apply presence, etc.)
-         3. Return a list of dictionaries, each containing job details
+        Navigate to one search URL and yield its new jobs one by one, as soon
+        as each job card is parsed.
 
         Args:
-            search_rate_limit (int): The number of URLs to scrape before stopping.
-
-        Returns:
-            List[Dict[str, Any]]: A list of dictionaries, each containing job details.
+            page (Page): The logged-in page to scrape with.
+            url (str): The LinkedIn search URL.
+            scraped_job_ids (set): Job ids scraped so far; updated in place and
+                used to skip jobs already seen on other search pages.
+            duplicate_index (NearDuplicateIndex): Index used to mark reposts of
+                the same role (see `gather_job_listings`).
+            cancel_event (threading.Event): Stops after the current card once set.
         """
-        page = self.login_and_check()  # ensure user is logged in
-        all_jobs_data = []
-        scraped_job_ids = set()
-
-        for i, url in enumerate(self.search_url_list):
-            print(f"\n🌐 [NAVIGATION] Navigating to {url}")
-            page.goto(url)
-            time.sleep(2)
+        # Records of this search carry its run and search ids. The context is
+        # entered around each step, never across a yield (see utils/log.py).
+        ids = {"run_id": self.page_metrics.run_id, "search_id": _search_id(url)}
+        with log_context(**ids):
+            log.info("Navigating to %s", url, tag="NAVIGATION", emoji="🌐")
+            with self.tracer.span("navigate"), self._traced(
+                "navigation", url=url
+            ), self.page_metrics.navigation(page, url, search=url):
+                page.goto(url)
+            with self.tracer.span("settle"), self.page_metrics.phase(
+                "settle", search=url
+            ):
+                time.sleep(2)
 
-            self._scroll_through_jobs(page, max_scroll_attempts=5)
+            with self.tracer.span("scroll"), self._traced(
+                "scroll", url=url
+            ), self.page_metrics.phase("scroll", search=url):
+                self._scroll_through_jobs(page, max_scroll_attempts=5)
 
             # Example job-card selectors (these are illustrative; check actual LinkedIn DOM)
             job_card_selector = ".job-card-container"
             # Wait for the job cards to load
             try:
-                page.wait_for_selector(job_card_selector, timeout=5000)
+                with self.tracer.span("wait_for_cards"), self.page_metrics.phase(
+                    "wait_for_cards", search=url
+                ):
+                    page.wait_for_selector(job_card_selector, timeout=5000)
             except TimeoutError:
-                print("\n⚠️  >>> Job cards not found on this page.")
-                continue
+                log.warning("Job cards not found on this page.")
+                self._record_failure("job_cards")
+                return
+
+            with self.tracer.span("list_cards"):
+                job_cards = page.query_selector_all(
+                    ".job-card-container"
+                )  # or .job-card-container
 
-            job_cards = page.query_selector_all(
-                ".job-card-container"
-            )  # or .job-card-container
+            log.info("Found %d job cards on this page.", len(job_cards), emoji="📃")
 
-            print(f"\n📃 >>> Found {len(job_cards)} job cards on this page.")
+        for j, card in enumerate(job_cards):
+            with log_context(**ids):
+                if cancel_event is not None and cancel_event.is_set():
+                    log.info("Scrape cancelled.", emoji="🛑")
+                    return
+
+                # Jobs seen before (on another search page, or in an earlier
+                # crawl, see `iter_job_listings`) are skipped before the card is
+                # parsed
+                with self.tracer.span("check_known"):
+                    job_id = card.get_attribute("data-job-id") or ""
+                if job_id and job_id in scraped_job_ids:
+                    log.debug("Skipping known job %s", job_id, emoji="⏭️")
+                    continue
 
-            for j, card in enumerate(job_cards):
-                card.evaluate("(el) => { el.style.outline = '3px solid red'; }")
-                # time.sleep(1)  # Optional short pause so the user can see the highlight
+                with self.tracer.span("extract"), self.page_metrics.phase(
+                    "parse", search=url
+                ):
+                    card.evaluate("(el) => { el.style.outline = '3px solid red'; }")
+                    # time.sleep(1)  # Optional short pause so the user can see the highlight
 
-                job_info = self._parse_single_card(card)
+                    job_info = self._parse_single_card(card)
 
                 if job_info["job_id"] in scraped_job_ids:
-                    print(
-                        f"\n⚠️  [JOB PARSER] Skipping duplicate job: {job_info['title']}"
-                    )
+                    log.debug("Skipping duplicate job: %s", job_info["title"])
                     continue
                 else:
                     scraped_job_ids.add(job_info["job_id"])
 
-                all_jobs_data.append(job_info)
+                with self.tracer.span("dedupe"):
+                    cluster_id = duplicate_index.add(job_info)
+                job_info["duplicate_of"] = (
+                    cluster_id if cluster_id != job_info["job_id"] else ""
+                )
+                if job_info["duplicate_of"]:
+                    log.debug(
+                        "%s looks like a repost of job %s",
+                        job_info["title"],
+                        cluster_id,
+                        emoji="🔁",
+                    )
 
-                print(
-                    f"\n✅ [JOB PARSER] Scraped job {j + 1}/{len(job_cards)}: {job_info['title']}"
+                log.debug(
+                    "Scraped job %d/%d: %s",
+                    j + 1,
+                    len(job_cards),
+                    job_info["title"],
+                    emoji="✅",
+                    extra={"job_id": job_info["job_id"]},
                 )
 
-            if i == search_rate_limit - 1:
-                break
+            yield job_info
+
+    def scrape_search_results(
+        self,
+        page: Page,
+        url: str,
+        scraped_job_ids: set,
+        duplicate_index: NearDuplicateIndex,
+        cancel_event: Union[threading.Event, None] = None,
+    ) -> List[Dict[str, Any]]:
+        """Scrape one search URL and return its new jobs. See `iter_search_results`."""
+        return list(
+            self.iter_search_results(
+                page, url, scraped_job_ids, duplicate_index, cancel_event
+            )
+        )
+
+    def save_jobs(self, jobs_data: List[Dict[str, Any]]):
+        atomic_write_json(
+            os.path.join(self.data_dir, "jobs_data.json"), jobs_data, indent=2
+        )
+
+    def iter_job_listings(
+        self,
+        search_rate_limit: int = 2,
+        cancel_event: Union[threading.Event, None] = None,
+        batch_size: int = 10,
+        known_job_ids: Union[set, None] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming version of `gather_job_listings`.
+
+        Yields a progress update every `batch_size` new jobs and at the end of
+        every search page. Setting `cancel_event` stops the crawl after the
+        current job card (or interrupts the pause between searches); the jobs
+        scraped so far are kept and saved to jobs_data.json either way.
+
+        Args:
+            search_rate_limit (int): The number of URLs to scrape before stopping.
+            cancel_event (threading.Event): Set it to stop the crawl cleanly.
+            batch_size (int): Number of new jobs per progress update.
+            known_job_ids (set): Job ids scraped by earlier crawls (e.g. all
+                ids in the job store); their cards are skipped unparsed, so a
+                periodic refresh only extracts the new postings.
+
+        Yields:
+            Dict[str, Any]: {"jobs": the new jobs since the last update,
+            "jobs_total", "search_index" (1-based), "searches_total",
+            "elapsed_s", "jobs_per_min", "cancelled", "done"}.
+        """
+        cancel_event = cancel_event or threading.Event()
+        search_urls = self.search_url_list[:search_rate_limit]
+        started = time.perf_counter()
+        all_jobs_data = []
+        scraped_job_ids = set(known_job_ids or ())
+        duplicate_index = NearDuplicateIndex()
+        batch = []
+
+        def progress(search_index: int, done: bool = False) -> Dict[str, Any]:
+            nonlocal batch
+            elapsed = time.perf_counter() - started
+            update = {
+                "jobs": batch,
+                "jobs_total": len(all_jobs_data),
+                "search_index": search_index,
+                "searches_total": len(search_urls),
+                "elapsed_s": round(elapsed, 1),
+                "jobs_per_min": round(len(all_jobs_data) / elapsed * 60, 1)
+                if elapsed > 0
+                else 0.0,
+                "cancelled": cancel_event.is_set(),
+                "done": done,
+            }
+            batch = []
+            return update
+
+        search_index = 0
+        run_id = self.page_metrics.run_id
+        self.tracer.start()
+        with self.tracer.span("crawl"):
+            try:
+                with self.tracer.span("login"), log_context(run_id=run_id):
+                    page = self.login_and_check()  # ensure user is logged in
+
+                for index, url in enumerate(search_urls, start=1):
+                    if cancel_event.is_set():
+                        break
+                    search_index = index
+
+                    with self.tracer.span("search"):
+                        for job_info in self.iter_search_results(
+                            page, url, scraped_job_ids, duplicate_index, cancel_event
+                        ):
+                            all_jobs_data.append(job_info)
+                            batch.append(job_info)
+                            if len(batch) >= batch_size:
+                                yield progress(search_index)
+
+                    update = progress(search_index)
+                    with log_context(run_id=run_id, search_id=_search_id(url)):
+                        log.info(
+                            "Search %d/%d done: %d jobs in %.1fs (%.1f jobs/min)",
+                            search_index,
+                            len(search_urls),
+                            update["jobs_total"],
+                            update["elapsed_s"],
+                            update["jobs_per_min"],
+                            emoji="🏁",
+                        )
+                    yield update
+
+                    if search_index < len(search_urls):
+                        # Sleep a random amount of time to avoid detection
+                        # (returns early when the crawl is cancelled)
+                        with self.tracer.span("pause"), self.page_metrics.phase(
+                            "pause", search=url
+                        ):
+                            cancel_event.wait(random.randint(2, 7))
+            finally:
+                with log_context(run_id=run_id):
+                    log.info(
+                        "%d clusters of near-duplicate postings among %d jobs",
+                        len(duplicate_index.clusters()),
+                        len(all_jobs_data),
+                        emoji="🔁",
+                    )
+                with self.tracer.span("persist"):
+                    self.save_jobs(all_jobs_data)
+
+        yield progress(search_index, done=True)
+
+    def gather_job_listings(self, search_rate_limit: int = 2) -> List[Dict[str, Any]]:
+        """
+        For each URL in self.search_url_list:
+         1. Navigate to the page
+         2. Scrape job listings (title, company, location, link, easy apply presence, etc.)
+         3. Return a list of dictionaries, each containing job details
 
-            # Sleep a random amount of time to avoid detection
-            time.sleep(random.randint(2, 7))
+        Reposts of the same role under other job_ids are kept, but marked with
+        "duplicate_of" set to the job_id of the first posting of their
+        near-duplicate cluster (empty for the first posting itself).
+
+        Args:
+            search_rate_limit (int): The number of URLs to scrape before stopping.
 
-        with open(JOBS_DATA_PATH, "w") as f:
-            json.dump(all_jobs_data, f, indent=2)
+        Returns:
+            List[Dict[str, Any]]: A list of dictionaries, each containing job details.
+        """
+        all_jobs_data = []
+        for update in self.iter_job_listings(search_rate_limit=search_rate_limit):
+            all_jobs_data.extend(update["jobs"])
 
         return all_jobs_data
 
     def close(self):
+        self.tracer.finish()
+        if self.page_metrics.navigations:
+            self.page_metrics.print_summary()
+            metrics_path = self.page_metrics.export()
+            log.info("Page metrics saved at: %s", metrics_path, tag="PERF", emoji="📈")
+        if self.trace_buffer is not None:
+            self.trace_buffer.print_summary()
+            self.trace_buffer.stop()
+            self.trace_buffer = None
         self.browser_mgr.close()
 
 
@@ -0,0 +1,126 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Union
+
+import fitz  # pymupdf
+
+from agent.cache import default_stage_cache, file_hash
+from agent.chunking import iter_chunks
+
+# Documents with at least this many pages are parsed in a process pool
+PARALLEL_PAGE_THRESHOLD = 32
+
+# Pages handed to one worker process at a time
+PAGES_PER_TASK = 8
+
+
+def _check_pdf_path(pdf_path: str):
+    filetype = os.path.splitext(pdf_path)[-1]
+    if filetype.lower() != ".pdf":
+        raise ValueError(f"Only PDF files are supported at the moment. Got: {filetype}")
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop). Runs in a worker process."""
+    with fitz.open(filename=pdf_path) as doc:
+        return [
+            doc.load_page(page_num).get_text(option="text")
+            for page_num in range(start, stop)
+        ]
+
+
+def _iter_parsed_pages(pdf_path: str, max_workers: Union[int, None]) -> Iterator[str]:
+    max_workers = max_workers or os.cpu_count() or 1
+    with fitz.open(filename=pdf_path) as doc:
+        page_count = len(doc)
+        # Starting worker processes only pays off for long documents
+        if page_count < PARALLEL_PAGE_THRESHOLD or max_workers < 2:
+            for page_num in range(page_count):
+                yield doc.load_page(page_num).get_text(option="text")
+            return
+
+    ranges = [
+        (start, min(start + PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, PAGES_PER_TASK)
+    ]
+    pool = ProcessPoolExecutor(max_workers=min(max_workers, len(ranges)))
+    try:
+        futures = [
+            pool.submit(_extract_page_range, pdf_path, start, stop)
+            for start, stop in ranges
+        ]
+        # Futures are consumed in page order, so pages stream out as soon as
+        # every earlier range is done
+        for future in futures:
+            yield from future.result()
+    finally:
+        # A consumer that stops early should not wait for the remaining pages
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_pdf_pages(
+    pdf_path: str,
+    use_cache: bool = True,
+    max_workers: Union[int, None] = None,
+) -> Iterator[str]:
+    """
+    Yield the text of each page of a PDF, in page order, as soon as it is parsed.
+
+    Small documents are parsed page by page in this process; on multi-core
+    machines, documents with PARALLEL_PAGE_THRESHOLD or more pages are split
+    into page ranges that are parsed in a process pool. Once every page has
+    been read, the page texts are cached by the file's content hash, so
+    parsing the same file again (e.g. on every click in the UI) is a cache
+    lookup.
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+        use_cache (bool): Whether to read and write the page cache.
+        max_workers (int): Process pool size for large documents (default: CPU
+            count); 1 parses every document in this process.
+    """
+    _check_pdf_path(pdf_path)
+
+    cache = default_stage_cache() if use_cache else None
+    cache_inputs = {"pdf": file_hash(pdf_path)} if cache else None
+    if cache:
+        cached_pages = cache.get("pdf_pages", cache_inputs)
+        if cached_pages is not None:
+            yield from cached_pages
+            return
+
+    pages = []
+    for page_text in _iter_parsed_pages(pdf_path, max_workers):
+        pages.append(page_text)
+        yield page_text
+
+    if cache:
+        cache.set("pdf_pages", cache_inputs, pages)
+
+
+def extract_pdf_text(
+    pdf_path: str,
+    use_cache: bool = True,
+    max_workers: Union[int, None] = None,
+) -> str:
+    """Read the whole text of a PDF. See `iter_pdf_pages`."""
+    return "".join(
+        iter_pdf_pages(pdf_path, use_cache=use_cache, max_workers=max_workers)
+    )
+
+
+def iter_pdf_chunks(
+    pdf_path: str,
+    max_tokens: int,
+    overlap_tokens: int = 0,
+    use_cache: bool = True,
+) -> Iterator[str]:
+    """
+    Stream token-budgeted chunks of a PDF (see agent/chunking.py). The first
+    chunks are ready before the last pages have been parsed.
+    """
+    return iter_chunks(
+        iter_pdf_pages(pdf_path, use_cache=use_cache),
+        max_tokens=max_tokens,
+        overlap_tokens=overlap_tokens,
+    )
@@ -0,0 +1,205 @@
+import json
+import os
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Union
+
+from agent.metrics import METRICS_DIR, percentile
+
+# CDP Performance.getMetrics values kept per navigation
+CDP_METRICS = {
+    "Nodes": "dom_nodes",
+    "JSHeapUsedSize": "js_heap_used_bytes",
+    "JSHeapTotalSize": "js_heap_total_bytes",
+    "Documents": "documents",
+    "LayoutCount": "layouts",
+    "ScriptDuration": "script_s",
+    "TaskDuration": "task_s",
+}
+
+# Navigation timing (ms since navigation start) and bytes over the network of
+# the document and all resources loaded so far
+NAVIGATION_TIMING_JS = """
+() => {
+    const nav = performance.getEntriesByType("navigation")[0];
+    const resources = performance.getEntriesByType("resource");
+    const resourceBytes = resources.reduce((sum, e) => sum + (e.transferSize || 0), 0);
+    if (!nav) {
+        return {resources: resources.length, transferred_bytes: resourceBytes};
+    }
+    return {
+        ttfb_ms: nav.responseStart,
+        dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+        load_ms: nav.loadEventEnd || null,
+        resources: resources.length,
+        transferred_bytes: (nav.transferSize || 0) + resourceBytes,
+    };
+}
+"""
+
+# Fields summarized with percentiles, per search
+SUMMARY_FIELDS = [
+    "goto_s",
+    "ttfb_ms",
+    "dom_content_loaded_ms",
+    "load_ms",
+    "dom_nodes",
+    "js_heap_used_bytes",
+    "transferred_bytes",
+]
+
+# Group of navigations that are not part of a search
+OTHER_GROUP = "other"
+
+
+class PageMetricsCollector:
+    """
+    Records browser-side performance metrics for every page.goto of a crawl:
+    the wall time of the goto, navigation timing (TTFB, DOMContentLoaded,
+    load), bytes transferred, and CDP Performance.getMetrics (DOM node count,
+    JS heap, layouts, script time). It also times the crawl phases between
+    navigations (scrolling, parsing job cards), so slow crawls can be
+    attributed to page loads, scroll waits or parsing.
+
+    Records are grouped by search (the search URL) and exported next to the
+    LLM run metrics, as data/metrics/crawl_<run_id>.json.
+    """
+
+    def __init__(
+        self, run_id: Union[str, None] = None, metrics_dir: str = METRICS_DIR
+    ):
+        self.run_id = run_id or time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        self.metrics_dir = metrics_dir
+        self.navigations: List[Dict[str, Any]] = []
+        self.phases: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        self.session = None
+
+    def attach(self, page):
+        """Enable the CDP Performance domain for `page`."""
+        try:
+            self.session = page.context.new_cdp_session(page)
+            self.session.send("Performance.enable")
+        except Exception as e:
+            print(f"\n⚠️  [PERF] CDP performance metrics unavailable: {e}")
+            self.session = None
+
+    @contextmanager
+    def navigation(
+        self, page, url: str, search: Union[str, None] = None, kind: str = "search"
+    ) -> Iterator[None]:
+        """Wrap a page.goto; its metrics are recorded when the block ends."""
+        record = {
+            "time": time.time(),
+            "search": search or OTHER_GROUP,
+            "kind": kind,
+            "url": url,
+        }
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            record["error"] = repr(e)
+            raise
+        finally:
+            record["goto_s"] = round(time.perf_counter() - started, 3)
+            record.update(self._page_metrics(page))
+            self.navigations.append(record)
+
+    @contextmanager
+    def phase(self, name: str, search: Union[str, None] = None) -> Iterator[None]:
+        """Add the time spent in the block to the search's `name` phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[search or OTHER_GROUP][name] += time.perf_counter() - started
+
+    def _page_metrics(self, page) -> Dict[str, Any]:
+        metrics = {}
+        try:
+            metrics.update(page.evaluate(NAVIGATION_TIMING_JS))
+        except Exception:
+            pass  # The page is gone or still navigating
+        if self.session is not None:
+            try:
+                response = self.session.send("Performance.getMetrics")
+            except Exception:
+                response = {"metrics": []}
+            for metric in response.get("metrics", []):
+                if metric["name"] in CDP_METRICS:
+                    metrics[CDP_METRICS[metric["name"]]] = metric["value"]
+        return metrics
+
+    def summary(self) -> Dict[str, Any]:
+        """p50/p95/max of the navigation metrics and phase totals, per search."""
+        groups = defaultdict(list)
+        for record in self.navigations:
+            groups[record["search"]].append(record)
+
+        searches = {}
+        for search in list(groups) + [s for s in self.phases if s not in groups]:
+            records = groups.get(search, [])
+            stats = {"navigations": len(records)}
+            stats["errors"] = sum(1 for record in records if "error" in record)
+            for field in SUMMARY_FIELDS:
+                values = sorted(
+                    record[field] for record in records if record.get(field) is not None
+                )
+                if values:
+                    stats[field] = {
+                        "p50": percentile(values, 0.50),
+                        "p95": percentile(values, 0.95),
+                        "max": values[-1],
+                    }
+            stats["phases_s"] = {
+                name: round(seconds, 3)
+                for name, seconds in self.phases.get(search, {}).items()
+            }
+            searches[search] = stats
+
+        return {
+            "run_id": self.run_id,
+            "navigations": len(self.navigations),
+            "searches": searches,
+        }
+
+    def print_summary(self):
+        summary = self.summary()
+        print(
+            f"\n📈 [PERF] {summary['navigations']} page loads in "
+            f"{len(summary['searches'])} groups"
+        )
+        for search, stats in summary["searches"].items():
+            goto = stats.get("goto_s", {})
+            nodes = stats.get("dom_nodes", {})
+            heap = stats.get("js_heap_used_bytes", {})
+            transferred = stats.get("transferred_bytes", {})
+            phases = ", ".join(
+                f"{name} {seconds:.1f}s" for name, seconds in stats["phases_s"].items()
+            )
+            print(
+                f"   - {search[:80]}\n"
+                f"     goto p50 {goto.get('p50', 0):.2f}s"
+                f" / p95 {goto.get('p95', 0):.2f}s"
+                f" · DOM nodes p95 {nodes.get('p95', 0):.0f}"
+                f" · JS heap p95 {heap.get('p95', 0) / 1e6:.1f} MB"
+                f" · transferred p95 {transferred.get('p95', 0) / 1e6:.2f} MB"
+                + (f"\n     phases: {phases}" if phases else "")
+            )
+
+    def export(self, path: Union[str, None] = None) -> str:
+        """Write the summary and every navigation record to a JSON file."""
+        if path is None:
+            os.makedirs(self.metrics_dir, exist_ok=True)
+            path = os.path.join(self.metrics_dir, f"crawl_{self.run_id}.json")
+        with open(path, "w") as f:
+            json.dump(
+                {"summary": self.summary(), "navigations": self.navigations},
+                f,
+                indent=2,
+            )
+        return path
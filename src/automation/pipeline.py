@@ -0,0 +1,235 @@
+import contextvars
+import queue
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Union
+
+from automation.browser import DEFAULT_CDP_PORT
+from automation.chrome import default_chrome_supervisor
+from automation.dedupe import NearDuplicateIndex
+from automation.linkedin import USER_DATA_DIR, LinkedInAutomation
+from automation.resume_parser import ResumeParser
+
+# Event kinds passed from the analysis thread to the scraping loop
+USER_DATA_EVENT = "user_data"
+URL_EVENT = "url"
+DONE_EVENT = "done"
+ERROR_EVENT = "error"
+
+# How long a stopped pipeline waits for the analysis thread to notice; an LLM
+# request that is already running cannot be interrupted
+ANALYSIS_JOIN_TIMEOUT_S = 5
+
+
+def _analysis_worker(
+    parser: ResumeParser,
+    li_auto: LinkedInAutomation,
+    events: queue.Queue,
+    analysis_kwargs: Dict[str, Any],
+    posted_in_days: int,
+    cancel_event: threading.Event,
+):
+    """
+    Run the resume analysis and publish every new user_data snapshot, plus one
+    URL event per keyword set as soon as the set has been parsed from the LLM
+    stream. Stops between stages once `cancel_event` is set.
+    """
+    queued_keyword_sets = set()
+    try:
+        for user_data in parser.iter_keywords_for_search(
+            **analysis_kwargs, cancel_event=cancel_event
+        ):
+            if cancel_event.is_set():
+                break
+            events.put((USER_DATA_EVENT, dict(user_data)))
+
+            for line in user_data.get("keyword_combinations", "").split("\n"):
+                line = line.strip()
+                if not line or line in queued_keyword_sets:
+                    continue
+                queued_keyword_sets.add(line)
+                url = li_auto.build_linkedin_url(
+                    line,
+                    location=user_data.get("location", ""),
+                    posted_in_days=posted_in_days,
+                )
+                events.put((URL_EVENT, url))
+    except Exception as e:
+        events.put((ERROR_EVENT, e))
+    finally:
+        events.put((DONE_EVENT, None))
+
+
+def run_pipeline(
+    resume_file,
+    num_search_queries: int = 20,
+    search_rate_limit: int = 2,
+    provider: str = "openai",
+    openai_model: str = "gpt-4",
+    main_job_search_focus: str = "Data Scientist",
+    posted_in_days: int = 7,
+    headless: bool = False,
+    launch_chrome: bool = False,
+    data_dir: str = USER_DATA_DIR,
+    cdp_port: int = DEFAULT_CDP_PORT,
+    cancel_event: Union[threading.Event, None] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    End-to-end mode: analyze the resume and scrape jobs at the same time.
+
+    The analysis runs in a background thread and streams keyword sets out of
+    the LLM; each set is turned into a search URL and queued for crawling as
+    soon as it is parsed. The scraping runs in the calling thread (Playwright's
+    sync API is bound to the thread that started it) and begins with the first
+    URL, so the first jobs show up while the remaining keyword sets are still
+    being generated. When the caller stops consuming (or the scrape fails),
+    the analysis is cancelled and its thread joined before returning.
+
+    Args:
+        resume_file: The uploaded PDF resume (anything with a `.name` path).
+        num_search_queries (int): Number of keyword sets to generate.
+        search_rate_limit (int): Number of search URLs to scrape.
+        provider (str): LLM provider for the analysis.
+        openai_model (str): OpenAI model for the analysis.
+        main_job_search_focus (str): Search focus for keyword generation.
+        posted_in_days (int): Only search jobs posted in the last N days.
+        headless (bool): Passed to LinkedInAutomation.
+        launch_chrome (bool): Start Chrome on `cdp_port` (unless it is already
+            running) while the analysis runs, and wait for it to be ready
+            before the first search.
+        data_dir (str): Where user_data.json and jobs_data.json are saved.
+        cdp_port (int): Remote debugging port of the Chrome instance to use.
+        cancel_event (threading.Event): Set it (e.g. from the Stop button) to
+            cancel the analysis and end the crawl after the current job card;
+            the jobs scraped so far are kept.
+
+    Yields:
+        Dict[str, Any]: Snapshots with the current "user_data" (user_data.json
+        format), the queued "search_urls", the scraped "jobs", the "stage"
+        ("analysis", "scraping", "done" or "stopped") and "time_to_first_job_s".
+    """
+    started = time.perf_counter()
+    parser = ResumeParser(resume_file, num_search_queries, data_dir=data_dir)
+    li_auto = LinkedInAutomation(
+        headless=headless, user_data={}, data_dir=data_dir, cdp_port=cdp_port
+    )
+    events: queue.Queue = queue.Queue()
+    cancel_event = cancel_event or threading.Event()
+
+    # Copy the context so the analysis sees the caller's context variables
+    context = contextvars.copy_context()
+    worker = threading.Thread(
+        target=context.run,
+        args=(
+            _analysis_worker,
+            parser,
+            li_auto,
+            events,
+            {
+                "provider": provider,
+                "openai_model": openai_model,
+                "main_job_search_focus": main_job_search_focus,
+            },
+            posted_in_days,
+            cancel_event,
+        ),
+        name="resume-analysis",
+        daemon=True,
+    )
+    worker.start()
+
+    chrome = default_chrome_supervisor() if launch_chrome else None
+    if chrome is not None:
+        chrome.start(cdp_port)
+
+    state = {
+        "stage": "analysis",
+        "user_data": {},
+        "search_urls": [],
+        "jobs": [],
+        "time_to_first_job_s": None,
+    }
+    scraped_job_ids = set()
+    duplicate_index = NearDuplicateIndex()
+    pending_urls: List[str] = []
+    scraped_urls = 0
+    analysis_done = False
+    error = None
+    stopped = False
+    page = None
+
+    try:
+        while not analysis_done or (pending_urls and scraped_urls < search_rate_limit):
+            if cancel_event.is_set():
+                break
+            if pending_urls and scraped_urls < search_rate_limit:
+                # Take whatever the analysis produced in the meantime first
+                try:
+                    kind, payload = events.get_nowait()
+                except queue.Empty:
+                    kind = None
+            else:
+                kind, payload = events.get()
+
+            if kind == USER_DATA_EVENT:
+                state["user_data"] = payload
+                li_auto.user_data = payload
+                yield state
+            elif kind == URL_EVENT:
+                state["search_urls"].append(payload)
+                pending_urls.append(payload)
+            elif kind == ERROR_EVENT:
+                error = payload
+                break
+            elif kind == DONE_EVENT:
+                analysis_done = True
+            elif kind is None:
+                url = pending_urls.pop(0)
+                if page is None:
+                    # Chrome has been starting up while the LLM was working
+                    if chrome is not None:
+                        chrome.wait_until_ready(cdp_port)
+                    page = li_auto.login_and_check()
+                if scraped_urls:
+                    # Sleep a random amount of time to avoid detection; a stop
+                    # interrupts the pause
+                    if cancel_event.wait(random.randint(2, 7)):
+                        break
+                state["stage"] = "scraping"
+                new_jobs = li_auto.scrape_search_results(
+                    page, url, scraped_job_ids, duplicate_index, cancel_event
+                )
+                scraped_urls += 1
+                state["jobs"].extend(new_jobs)
+                if new_jobs and state["time_to_first_job_s"] is None:
+                    state["time_to_first_job_s"] = round(
+                        time.perf_counter() - started, 2
+                    )
+                    print(
+                        "\n⏱️  [PIPELINE] First jobs scraped after "
+                        f"{state['time_to_first_job_s']}s"
+                    )
+                yield state
+        stopped = cancel_event.is_set()
+    finally:
+        cancel_event.set()
+        worker.join(timeout=ANALYSIS_JOIN_TIMEOUT_S)
+        if worker.is_alive():
+            print(
+                "\n⚠️  [PIPELINE] Resume analysis still running after "
+                f"{ANALYSIS_JOIN_TIMEOUT_S}s, leaving it to finish in the background"
+            )
+        if state["jobs"]:
+            li_auto.save_jobs(state["jobs"])
+        li_auto.close()
+
+    if error is not None:
+        raise error
+
+    state["stage"] = "stopped" if stopped else "done"
+    print(
+        f"\n{'🛑' if stopped else '🏁'} [PIPELINE] Scraped {len(state['jobs'])} "
+        f"jobs from {scraped_urls} searches in {time.perf_counter() - started:.1f}s"
+    )
+    yield state
@@ -1,9 +1,12 @@
-import json
 import os
+import threading
+from typing import Any, Dict, Iterator, Union
 
-import fitz  # pymupdf
-
-from agent.intelligence import extract_info_and_keywords
+from agent.intelligence import stream_info_and_keywords
+from agent.metrics import LLMRunMetrics, activate_run
+from automation.pdf_extract import extract_pdf_text, iter_pdf_pages
+from automation.sections import route_sections, segment_pdf
+from utils.helpers import atomic_write_json
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 SAVE_DIR = os.path.join(CURRENT_DIR, "../data")
@@ -12,10 +15,79 @@ if not os.path.exists(SAVE_DIR):
     os.makedirs(SAVE_DIR)
 
 
+def pdf_to_text(pdf_path: str) -> str:
+    """
+    Read the contents of the PDF at `pdf_path` into a text string, without
+    caching and in this process (used by the batch mode, which already parses
+    files in a process pool; nesting a page pool in each worker would only
+    oversubscribe the CPUs).
+    """
+    return "".join(iter_pdf_pages(pdf_path, use_cache=False, max_workers=1))
+
+
+def build_user_data(results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert the (possibly partial) output of the intelligence pipeline into
+    the flat user_data format shown in the UI and saved to user_data.json.
+    """
+    # {work_history, current_location, years_experience}
+    user_data = results["user_data"]
+    work_history = user_data.get("work_history", [])
+    current_location = user_data.get("current_location", "")
+
+    positions = []
+    skills = []
+
+    for job in work_history:
+        positions.extend(job["Positions"])
+        skills.extend(job["Relevant Skills"])
+
+    # Convert years experience to integer if possible
+    years_exp_str = user_data.get("years_experience", 0)
+    years_experience_int = 0
+    if isinstance(years_exp_str, str):
+        if " " in years_exp_str:
+            years_exp_str = years_exp_str.split()[0]
+        years_experience_int = int(years_exp_str.strip())
+    elif isinstance(years_exp_str, int):
+        years_experience_int = years_exp_str
+    else:
+        print(f"\n❗  [AGENT] Invalid years experience: {years_exp_str}")
+
+    # Convert the list of combos to a multiline string
+    keyword_sets = results["keyword_sets"]
+    combos_str = "\n".join(keyword_sets) if keyword_sets else ""
+
+    return {
+        "positions": ", ".join(positions),
+        "location": current_location,
+        "years_experience": years_experience_int,
+        "skills": ", ".join(skills),
+        "keyword_combinations": combos_str,
+    }
+
+
 class ResumeParser:
-    def __init__(self, resume_file, num_search_queries):
+    def __init__(
+        self,
+        resume_file,
+        num_search_queries,
+        max_tokens: Union[int, None] = None,
+        max_cost_usd: Union[float, None] = None,
+        use_cache: bool = True,
+        data_dir: str = SAVE_DIR,
+    ):
         self.resume_file = resume_file
         self.num_search_queries = num_search_queries
+        # Optional LLM budget per analysis, see agent/metrics.py
+        self.max_tokens = max_tokens
+        self.max_cost_usd = max_cost_usd
+        # Reuse the results of analysis stages whose inputs did not change
+        self.use_cache = use_cache
+        # Where user_data.json is saved
+        self.data_dir = data_dir
+        # Metrics of the latest analysis run
+        self.llm_metrics: Union[LLMRunMetrics, None] = None
 
     def parse_pdf_to_text(self):
         """Helper function to read PDF contents into a text string."""
@@ -24,100 +96,119 @@ class ResumeParser:
         if not resume_file:
             return ""
 
-        filetype = os.path.splitext(resume_file.name)[-1]
-        if filetype.lower() != ".pdf":
-            raise ValueError(
-                f"Only PDF files are supported at the moment. Got: {filetype}"
-            )
-
-        doc = fitz.open(filename=resume_file.name)
-        text_content = ""
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            page_text = page.get_text(option="text")
-            text_content += page_text
-
-        return text_content
+        # Cached by file content, large documents are parsed in parallel
+        return extract_pdf_text(resume_file.name, use_cache=self.use_cache)
 
-    def extract_keywords_for_search(
+    def iter_keywords_for_search(
         self,
         provider: str = "openai",
         openai_model: str = "gpt-4",
         main_job_search_focus: str = "Data Scientist",
-    ) -> None:
+        cancel_event: Union[threading.Event, None] = None,
+    ) -> Iterator[Dict[str, Any]]:
         """
-        1) Reads the PDF text from the uploaded file
-        2) Calls extract_info_and_keywords to do a single LLM pass:
-        - Extract {positions}, {current_location}, {years_experience}, {skills}
-        - Generate exactly `num_keywords` sets of job-search keywords
-        3) Returns the extracted fields plus the sets as a multiline string
+        Streaming version of `extract_keywords_for_search`.
+
+        Yields the user data (same keys as the saved user_data.json) every time
+        the intelligence pipeline produces new fields or keyword sets. The final
+        yielded dict is complete and is also saved to user_data.json, and the
+        LLM metrics of the run are printed and exported to data/metrics.
+
+        Setting `cancel_event` stops the analysis before its next stage or
+        keyword set; nothing is saved then.
         """
         resume_file = self.resume_file
         num_keywords = self.num_search_queries
 
         if not resume_file:
-            return "", "", 0, "", ""
+            return
 
-        doc_text = self.parse_pdf_to_text()
+        self.llm_metrics = LLMRunMetrics(
+            max_tokens=self.max_tokens, max_cost_usd=self.max_cost_usd
+        )
+        with activate_run(self.llm_metrics):
+            doc_text = self.parse_pdf_to_text()
         if not doc_text.strip():
             print("No text found in PDF.")
-            return "", "", 0, "", "No text found in PDF."
+            return
+        if cancel_event is not None and cancel_event.is_set():
+            return
+
+        # Send each prompt only the resume section it needs
+        with activate_run(self.llm_metrics):
+            sections = segment_pdf(resume_file.name, use_cache=self.use_cache)
+        routed_sections, routing_report = route_sections(sections, doc_text)
+        self.llm_metrics.record_section_routing(routing_report)
 
         # Single pass to get everything
         k = int(num_keywords) if num_keywords else 20
-        results = extract_info_and_keywords(
+        user_data = {}
+        pipeline = stream_info_and_keywords(
             resume_text=doc_text,
             k=k,
             provider=provider,
             openai_model=openai_model,
             main_job_search_focus=main_job_search_focus,
+            use_cache=self.use_cache,
+            routed_sections=routed_sections,
+            cancel_event=cancel_event,
         )
-
-        # Extract fields
-        user_data = results[
-            "user_data"
-        ]  # {positions, current_location, years_experience, skills}
-        work_history = user_data["work_history"]
-        current_location = user_data.get("current_location", "")
-
-        positions = []
-        skills = []
-
-        for job in work_history:
-            positions.extend(job["Positions"])
-            skills.extend(job["Relevant Skills"])
-
-        # Convert years experience to integer if possible
-        years_exp_str = user_data.get("years_experience", "")
-        if isinstance(years_exp_str, str):
-            if " " in years_exp_str:
-                years_exp_str = years_exp_str.split()[0]
-            years_experience_int = int(years_exp_str.strip())
-        elif isinstance(years_exp_str, int):
-            years_experience_int = years_exp_str
-        else:
-            print(f"\n❗  [AGENT] Invalid years experience: {years_exp_str}")
-
-        # Convert the list of combos to a multiline string
-        keyword_sets = results["keyword_sets"]
-        combos_str = "\n".join(keyword_sets) if keyword_sets else ""
-
-        user_data = {
-            "positions": ", ".join(positions),
-            "location": current_location,
-            "years_experience": years_experience_int,
-            "skills": ", ".join(skills),
-            "keyword_combinations": combos_str,
-        }
-
-        user_data_path = os.path.join(SAVE_DIR, "user_data.json")
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                # Closing the pipeline also closes a running LLM stream
+                pipeline.close()
+                break
+            # Gradio may resume this generator from another thread, so the run
+            # is activated around each step rather than across yields
+            with activate_run(self.llm_metrics):
+                results = next(pipeline, None)
+            if results is None:
+                break
+            user_data = build_user_data(results)
+            yield user_data
+
+        if cancel_event is not None and cancel_event.is_set():
+            print("\n🛑 [AGENT] Resume analysis cancelled")
+            return
+
+        self.llm_metrics.print_summary()
+        metrics_path = self.llm_metrics.export()
+        print(f"\n📊 [METRICS] LLM metrics saved at: {metrics_path}")
+
+        user_data_path = os.path.join(self.data_dir, "user_data.json")
 
         print(
             f"\n👤  [AGENT] All necessary user data has been obtained and saved at: {user_data_path}"
         )
 
         # Save the extracted data to a json file
-        with open(user_data_path, "w") as f:
-            json.dump(user_data, f)
+        atomic_write_json(user_data_path, user_data)
+
+    def extract_keywords_for_search(
+        self,
+        provider: str = "openai",
+        openai_model: str = "gpt-4",
+        main_job_search_focus: str = "Data Scientist",
+    ) -> None:
+        """
+        1) Reads the PDF text from the uploaded file
+        2) Calls extract_info_and_keywords to do a single LLM pass:
+        - Extract {positions}, {current_location}, {years_experience}, {skills}
+        - Generate exactly `num_keywords` sets of job-search keywords
+        3) Returns the extracted fields plus the sets as a multiline string
+        """
+        if not self.resume_file:
+            return "", "", 0, "", ""
+
+        user_data = None
+        for user_data in self.iter_keywords_for_search(
+            provider=provider,
+            openai_model=openai_model,
+            main_job_search_focus=main_job_search_focus,
+        ):
+            pass
+
+        if user_data is None:
+            return "", "", 0, "", "No text found in PDF."
 
         return user_data
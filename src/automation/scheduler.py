@@ -0,0 +1,414 @@
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Union
+
+from automation.browser import DEFAULT_CDP_PORT
+from automation.chrome import default_chrome_supervisor
+from automation.job_store import JOBS_DB_FILENAME, JobStore
+from automation.linkedin import LinkedInAutomation
+from ui.job_queue import PortPool
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(CURRENT_DIR, "..", "data")
+SCHEDULES_PATH = os.path.join(DATA_DIR, "schedules.json")
+# Default workspace of a profile: data/schedules/<name>/
+SCHEDULES_DIR = os.path.join(DATA_DIR, "schedules")
+
+# Crawls running at once, each in its own Chrome instance on its own port
+MAX_CONCURRENT_CRAWLS = int(os.getenv("SCHEDULER_MAX_CRAWLS", "1"))
+
+# The app's crawls take ports from DEFAULT_CDP_PORT (9222) on. The scheduler
+# may run next to the app, so its crawls start 100 ports higher and never
+# attach to (and share the pages and profile of) a Chrome the app is using.
+FIRST_CDP_PORT = int(os.getenv("SCHEDULER_FIRST_CDP_PORT", DEFAULT_CDP_PORT + 100))
+
+# Random delay (in seconds) added to every scheduled run, so searches that
+# share a schedule do not all hit LinkedIn in the same minute
+DEFAULT_JITTER_S = 300.0
+
+# Posting age filter of searches built from a profile's keywords. A refresh
+# only needs the postings since the previous run.
+DEFAULT_POSTED_IN_DAYS = 1
+
+# Longest sleep between two checks for due profiles
+TICK_S = 30.0
+
+INTERVAL_PATTERN = re.compile(r"^(?:every\s+)?(\d+(?:\.\d+)?)\s*([smhd]?)$")
+INTERVAL_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# minute, hour, day of month, month, day of week (0 or 7 = Sunday)
+CRON_FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+class IntervalSchedule:
+    """Run every `interval_s` seconds."""
+
+    def __init__(self, interval_s: float):
+        if interval_s <= 0:
+            raise ValueError(f"Schedule interval must be positive, got {interval_s}")
+        self.interval_s = interval_s
+
+    def next_after(self, t: float) -> float:
+        return t + self.interval_s
+
+
+def _parse_cron_field(field: str, low: int, high: int) -> set:
+    values = set()
+    for part in field.split(","):
+        range_part, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if range_part == "*":
+            start, end = low, high
+        elif "-" in range_part:
+            start, end = (int(value) for value in range_part.split("-", 1))
+        else:
+            start = end = int(range_part)
+            if step > 1:
+                end = high
+        if not low <= start <= end <= high or step < 1:
+            raise ValueError(f"Invalid cron field {field!r} (range {low}-{high})")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """
+    Five-field cron expression ("minute hour day month weekday", local time)
+    with `*`, `*/n`, `a-b`, `a-b/n` and comma-separated lists. As in cron, a
+    restricted day of month and day of week match when either one does.
+    """
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(
+                f"Cron expression {expression!r} must have 5 fields "
+                "(minute hour day month weekday)"
+            )
+        self.expression = expression
+        values = [
+            _parse_cron_field(field, low, high)
+            for field, (low, high) in zip(fields, CRON_FIELD_RANGES)
+        ]
+        self.minutes, self.hours, self.days, self.months = values[:4]
+        self.weekdays = {day % 7 for day in values[4]}
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        # datetime counts weekdays from Monday = 0, cron from Sunday = 0
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, t: float) -> float:
+        moment = datetime.fromtimestamp(t).replace(second=0, microsecond=0)
+        moment += timedelta(minutes=1)
+        # Skip whole months/days/hours that cannot match; 5 years covers any
+        # valid expression (e.g. Feb 29 on a given weekday)
+        limit = moment + timedelta(days=5 * 366)
+        while moment < limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1) + timedelta(days=32)).replace(
+                    day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment.timestamp()
+        raise ValueError(f"Cron expression {self.expression!r} never matches")
+
+
+def parse_schedule(
+    spec: Union[str, int, float]
+) -> Union[IntervalSchedule, CronSchedule]:
+    """
+    Parse a profile's schedule: a number of seconds, an interval such as
+    "every 30m", "6h" or "1d", or a five-field cron expression.
+    """
+    if isinstance(spec, (int, float)):
+        return IntervalSchedule(float(spec))
+    match = INTERVAL_PATTERN.match(spec.strip().lower())
+    if match:
+        value, unit = match.groups()
+        return IntervalSchedule(float(value) * INTERVAL_UNITS[unit])
+    return CronSchedule(spec)
+
+
+def load_profiles(path: str = SCHEDULES_PATH) -> List[Dict[str, Any]]:
+    """
+    Read the saved search profiles from a JSON file of the form
+    {"profiles": [{"name": ..., "schedule": ..., ...}, ...]}.
+
+    Raises:
+        ValueError: If a profile has no name or schedule, or a name is reused.
+    """
+    with open(path, "r") as f:
+        config = json.load(f)
+    profiles = config.get("profiles", []) if isinstance(config, dict) else config
+
+    names = set()
+    for profile in profiles:
+        name = profile.get("name")
+        if not name or "schedule" not in profile:
+            raise ValueError(f"Every profile needs a name and a schedule: {profile}")
+        if name in names:
+            raise ValueError(f"Duplicate profile name {name!r}")
+        names.add(name)
+        parse_schedule(profile["schedule"])  # Fail at startup, not at run time
+    return profiles
+
+
+def profile_data_dir(profile: Dict[str, Any]) -> str:
+    return profile.get("data_dir") or os.path.join(SCHEDULES_DIR, profile["name"])
+
+
+def profile_search_urls(
+    profile: Dict[str, Any], li_auto: LinkedInAutomation
+) -> List[str]:
+    """
+    The profile's search URLs: its "search_urls", searches built from its
+    "keywords" lines, or else the searches of the user_data.json in its
+    data directory.
+    """
+    if profile.get("search_urls"):
+        return list(profile["search_urls"])
+    if profile.get("keywords"):
+        return [
+            li_auto.build_linkedin_url(
+                line,
+                location=profile.get("location", ""),
+                posted_in_days=profile.get("posted_in_days", DEFAULT_POSTED_IN_DAYS),
+                easy_apply=profile.get("easy_apply", True),
+            )
+            for line in profile["keywords"]
+        ]
+    return li_auto.search_url_list
+
+
+def run_profile(
+    profile: Dict[str, Any],
+    cdp_port: int = FIRST_CDP_PORT,
+    cancel_event: Union[threading.Event, None] = None,
+) -> Dict[str, Any]:
+    """
+    Crawl a profile's searches into the job store of its data directory.
+
+    Jobs already in the store are skipped before their cards are parsed, and
+    new jobs are added batch by batch while the crawl runs, so a refresh only
+    costs the postings that appeared since the last run.
+
+    Returns:
+        Dict[str, Any]: {"new_jobs", "known_jobs", "searches", "elapsed_s",
+        "cancelled"}.
+    """
+    data_dir = profile_data_dir(profile)
+    os.makedirs(data_dir, exist_ok=True)
+    # Returns as soon as Chrome accepts connections
+    default_chrome_supervisor().ensure_running(cdp_port)
+
+    li_auto = LinkedInAutomation(data_dir=data_dir, cdp_port=cdp_port)
+    li_auto.search_url_list = profile_search_urls(profile, li_auto)
+    search_rate_limit = profile.get("search_rate_limit", len(li_auto.search_url_list))
+
+    store = JobStore(os.path.join(data_dir, JOBS_DB_FILENAME))
+    started = time.perf_counter()
+    new_jobs = 0
+    update = None
+    try:
+        known_job_ids = store.job_ids()
+        for update in li_auto.iter_job_listings(
+            search_rate_limit=search_rate_limit,
+            cancel_event=cancel_event,
+            known_job_ids=known_job_ids,
+        ):
+            if update["jobs"]:
+                new_jobs += store.add_jobs(update["jobs"])
+        if new_jobs and li_auto.user_data:
+            store.rescore(li_auto.user_data)
+    finally:
+        store.close()
+        li_auto.close()
+
+    return {
+        "new_jobs": new_jobs,
+        "known_jobs": len(known_job_ids),
+        "searches": update["search_index"] if update else 0,
+        "elapsed_s": round(time.perf_counter() - started, 2),
+        "cancelled": bool(update and update["cancelled"]),
+    }
+
+
+class CrawlScheduler:
+    """
+    Runs saved search profiles on their schedules, with at most
+    `max_concurrent_crawls` crawls at once.
+
+    Every run is due at the profile's next scheduled time plus a random
+    jitter of up to its "jitter_s" seconds. A profile that is due while its
+    previous run is still queued or running is not queued again: the
+    overlapping run is coalesced into the one in flight (and counted in
+    `coalesced`), since both would crawl the same new postings.
+
+    `crawl_fn(profile, cdp_port, cancel_event)` does the actual crawl
+    (`run_profile` by default); setting `stop_event` cancels running crawls
+    after their current job card.
+    """
+
+    def __init__(
+        self,
+        profiles: List[Dict[str, Any]],
+        max_concurrent_crawls: int = MAX_CONCURRENT_CRAWLS,
+        first_cdp_port: int = FIRST_CDP_PORT,
+        crawl_fn: Callable[..., Dict[str, Any]] = run_profile,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.profiles = {profile["name"]: profile for profile in profiles}
+        self.schedules = {
+            name: parse_schedule(profile["schedule"])
+            for name, profile in self.profiles.items()
+        }
+        self.crawl_fn = crawl_fn
+        self.clock = clock
+        self.stop_event = threading.Event()
+        self.next_run_at: Dict[str, float] = {}
+        self.in_flight: set = set()
+        self.runs: Counter = Counter()
+        self.coalesced: Counter = Counter()
+        self.failures: Counter = Counter()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_concurrent_crawls, thread_name_prefix="crawl"
+        )
+        # A crawl holds its worker while it uses a port, so one is always free
+        self._ports = PortPool(max_concurrent_crawls, first_port=first_cdp_port)
+
+        now = self.clock()
+        for name in self.profiles:
+            self.next_run_at[name] = self._next_run(name, now)
+
+    def _next_run(self, name: str, after: float) -> float:
+        jitter_s = self.profiles[name].get("jitter_s", DEFAULT_JITTER_S)
+        return self.schedules[name].next_after(after) + random.uniform(0, jitter_s)
+
+    def submit(self, name: str) -> bool:
+        """
+        Queue a run of profile `name` now, unless one is already in flight.
+
+        Returns:
+            bool: False if the run was coalesced into the one in flight.
+        """
+        with self._lock:
+            if name in self.in_flight:
+                self.coalesced[name] += 1
+                print(
+                    f"\n⏭️  [SCHEDULER] '{name}' is still queued or running, "
+                    "skipping this run."
+                )
+                return False
+            self.in_flight.add(name)
+        self._pool.submit(self._run, name)
+        return True
+
+    def tick(self) -> List[str]:
+        """Queue every profile that is due. Returns the names queued."""
+        now = self.clock()
+        queued = []
+        for name in self.profiles:
+            if now < self.next_run_at[name]:
+                continue
+            self.next_run_at[name] = self._next_run(name, now)
+            if self.submit(name):
+                queued.append(name)
+        return queued
+
+    def _run(self, name: str):
+        port = self._ports.acquire()
+        print(f"\n🗓️  [SCHEDULER] Running '{name}' on port {port}.")
+        try:
+            result = self.crawl_fn(self.profiles[name], port, self.stop_event)
+            print(f"\n🗓️  [SCHEDULER] '{name}' finished: {result}")
+        except Exception as e:
+            self.failures[name] += 1
+            print(f"\n❌ [SCHEDULER] '{name}' failed: {e}")
+        finally:
+            self._ports.release(port)
+            with self._lock:
+                self.in_flight.discard(name)
+                self.runs[name] += 1
+
+    def run_once(self):
+        """Run every profile once, now, and wait for the runs to finish."""
+        for name in self.profiles:
+            self.submit(name)
+        self.shutdown()
+
+    def run_forever(self):
+        """Queue due profiles until `stop_event` is set (e.g. by Ctrl+C)."""
+        print(
+            f"\n🗓️  [SCHEDULER] Scheduling {len(self.profiles)} profiles; next runs: "
+            + ", ".join(
+                f"{name} at {datetime.fromtimestamp(at):%Y-%m-%d %H:%M:%S}"
+                for name, at in self.next_run_at.items()
+            )
+        )
+        try:
+            while not self.stop_event.is_set():
+                self.tick()
+                wait_s = min(self.next_run_at.values(), default=0) - self.clock()
+                self.stop_event.wait(min(max(wait_s, 0.0), TICK_S))
+        except KeyboardInterrupt:
+            print("\n🛑 [SCHEDULER] Stopping, cancelling running crawls...")
+            self.stop_event.set()
+        self.shutdown()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Run saved LinkedIn searches on a schedule, without the UI."
+    )
+    arg_parser.add_argument(
+        "schedules_path",
+        nargs="?",
+        default=SCHEDULES_PATH,
+        help="JSON file with the search profiles (default: src/data/schedules.json)",
+    )
+    arg_parser.add_argument(
+        "--max-concurrent-crawls", type=int, default=MAX_CONCURRENT_CRAWLS
+    )
+    arg_parser.add_argument("--first-cdp-port", type=int, default=FIRST_CDP_PORT)
+    arg_parser.add_argument(
+        "--once", action="store_true", help="Run every profile once now and exit"
+    )
+    args = arg_parser.parse_args()
+
+    scheduler = CrawlScheduler(
+        load_profiles(args.schedules_path),
+        max_concurrent_crawls=args.max_concurrent_crawls,
+        first_cdp_port=args.first_cdp_port,
+    )
+    if args.once:
+        scheduler.run_once()
+    else:
+        scheduler.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterator, List, Tuple, Union
+
+import fitz  # pymupdf
+
+from agent.cache import default_stage_cache, file_hash
+from agent.chunking import estimate_tokens
+
+# Canonical section names and the headings that introduce them
+SECTION_ALIASES = {
+    "summary": [
+        "summary",
+        "profile",
+        "professional summary",
+        "about me",
+        "objective",
+        "career objective",
+    ],
+    "experience": [
+        "experience",
+        "work experience",
+        "professional experience",
+        "employment",
+        "employment history",
+        "work history",
+        "career history",
+        "relevant experience",
+    ],
+    "education": ["education", "academic background", "qualifications"],
+    "skills": [
+        "skills",
+        "technical skills",
+        "core skills",
+        "key skills",
+        "competencies",
+        "core competencies",
+        "technologies",
+        "tools",
+        "tech stack",
+    ],
+    "projects": ["projects", "personal projects", "selected projects"],
+    "certifications": ["certifications", "certificates", "licenses", "courses"],
+    "languages": ["languages"],
+    "contact": ["contact", "contact information", "personal information", "personal details"],
+}
+HEADING_SECTIONS = {
+    alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases
+}
+
+# Text before the first heading (name, contact details, location)
+HEADER_SECTION = "contact"
+# Sections with headings that are not in SECTION_ALIASES (volunteering, ...)
+OTHER_SECTION = "other"
+
+# The sections each LLM prompt needs; the first non-empty one is sent
+PROMPT_SECTIONS = {
+    "location": ["contact"],
+    "work_history": ["experience"],
+}
+
+# A line set at least this much larger than the body text is a heading
+HEADING_SIZE_RATIO = 1.15
+
+BOLD_FLAG = 16
+
+# Top/bottom share of a page where running headers and footers are printed
+PAGE_MARGIN_FRACTION = 0.08
+
+BOILERPLATE_PATTERNS = [
+    re.compile(r"^(?:page\s*)?\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?$", re.IGNORECASE),
+    re.compile(r"^(?:curriculum vitae|resume|résumé|cv)$", re.IGNORECASE),
+    re.compile(r"^references (?:are )?available (?:up)?on request\.?$", re.IGNORECASE),
+]
+WHITESPACE_PATTERN = re.compile(r"[ \t\u00a0\u2000-\u200b]+")
+
+
+def normalize_line(line: str) -> str:
+    return WHITESPACE_PATTERN.sub(" ", line).strip()
+
+
+def is_boilerplate(line: str) -> bool:
+    return any(pattern.match(line) for pattern in BOILERPLATE_PATTERNS)
+
+
+def heading_section(line: str) -> Union[str, None]:
+    """The canonical section a heading line introduces, or None."""
+    words = line.split()
+    # Letter-spaced headings such as "E X P E R I E N C E"
+    if len(words) > 3 and all(len(word) == 1 for word in words):
+        line = "".join(words)
+    key = re.sub(r"[^a-z ]", "", line.lower().replace("&", " ")).strip()
+    key = re.sub(r"\s+", " ", key)
+    return HEADING_SECTIONS.get(key)
+
+
+class ResumeSections:
+    """
+    Resume text split into canonical sections (contact, summary, experience,
+    education, skills, ...). Each section's lines are normalized, and page
+    numbers, running headers/footers and similar boilerplate are dropped.
+    """
+
+    def __init__(self, sections: Union[Dict[str, List[str]], None] = None):
+        # Section name -> lines, in document order
+        self.sections: Dict[str, List[str]] = dict(sections or {})
+
+    def add(self, section: str, line: str):
+        self.sections.setdefault(section, []).append(line)
+
+    def get(self, section: str) -> str:
+        return "\n".join(self.sections.get(section, []))
+
+    def names(self) -> List[str]:
+        return list(self.sections)
+
+    def text(self) -> str:
+        """The normalized text of all sections, in document order."""
+        return "\n".join(self.get(section) for section in self.sections)
+
+    def to_dict(self) -> Dict[str, str]:
+        return {section: self.get(section) for section in self.sections}
+
+
+def _iter_pdf_lines(doc) -> Iterator[Tuple[int, str, float, bool, bool]]:
+    """
+    (page number, text, font size, bold, in page margin) for every text line
+    of a PDF.
+    """
+    for page_num in range(len(doc)):
+        page_dict = doc.load_page(page_num).get_text("dict")
+        margin = page_dict["height"] * PAGE_MARGIN_FRACTION
+        for block in page_dict["blocks"]:
+            for line in block.get("lines", []):
+                spans = [span for span in line["spans"] if span["text"].strip()]
+                if not spans:
+                    continue
+                text = normalize_line("".join(span["text"] for span in line["spans"]))
+                size = max(span["size"] for span in spans)
+                bold = all(
+                    span["flags"] & BOLD_FLAG or "bold" in span["font"].lower()
+                    for span in spans
+                )
+                top, bottom = line["bbox"][1], line["bbox"][3]
+                in_margin = top < margin or bottom > page_dict["height"] - margin
+                yield page_num, text, size, bold, in_margin
+
+
+def segment_pdf(pdf_path: str, use_cache: bool = True) -> ResumeSections:
+    """
+    Split a PDF resume into sections using its layout: a line starts a new
+    section if it is a known heading (EXPERIENCE, Skills:, ...), or if it is
+    set clearly larger than the body text, or in bold capitals, after the
+    first heading (an unknown section such as "Volunteering", whose content
+    should not leak into the previous section).
+
+    Running headers/footers (lines in the top/bottom margin after the first
+    page that are repeated on several pages or set in small print) are
+    dropped. Lines repeated in the body, such as the same tools listed under
+    two jobs, are kept.
+
+    Reading the layout of every page is slow, so with `use_cache` the sections
+    are cached by the file's content hash, like the page texts in
+    pdf_extract.py.
+    """
+    cache = default_stage_cache() if use_cache else None
+    cache_inputs = {"pdf": file_hash(pdf_path)} if cache else None
+    if cache:
+        cached_sections = cache.get("pdf_sections", cache_inputs)
+        if cached_sections is not None:
+            return ResumeSections(cached_sections)
+
+    sections = _segment_pdf_layout(pdf_path)
+    if cache:
+        cache.set("pdf_sections", cache_inputs, sections.sections)
+    return sections
+
+
+def _segment_pdf_layout(pdf_path: str) -> ResumeSections:
+    with fitz.open(filename=pdf_path) as doc:
+        lines = list(_iter_pdf_lines(doc))
+
+    # The body font size is the size of most characters
+    size_counts = Counter()
+    for _, text, size, _, _ in lines:
+        size_counts[round(size, 1)] += len(text)
+    body_size = size_counts.most_common(1)[0][0] if size_counts else 0.0
+
+    margin_line_pages = defaultdict(set)
+    for page_num, text, _, _, in_margin in lines:
+        if in_margin:
+            margin_line_pages[text].add(page_num)
+    repeated_margin_lines = {
+        text for text, pages in margin_line_pages.items() if len(pages) > 1
+    }
+
+    sections = ResumeSections()
+    current = HEADER_SECTION
+    seen_heading = False
+    for page_num, text, size, bold, in_margin in lines:
+        if is_boilerplate(text):
+            continue
+        if (
+            page_num > 0
+            and in_margin
+            and (text in repeated_margin_lines or size < body_size)
+        ):
+            continue
+
+        section = heading_section(text)
+        styled = size >= body_size * HEADING_SIZE_RATIO or (bold and text.isupper())
+        if section is not None and len(text) <= 40:
+            current = section
+            seen_heading = True
+            continue
+        if seen_heading and styled and len(text.split()) <= 4:
+            current = OTHER_SECTION
+            continue
+
+        sections.add(current, text)
+
+    return sections
+
+
+def segment_text(text: str) -> ResumeSections:
+    """
+    Split plain resume text into sections, for callers that have no layout
+    information. Only standalone lines that are known headings start a section.
+    """
+    sections = ResumeSections()
+    current = HEADER_SECTION
+    for line in text.splitlines():
+        line = normalize_line(line)
+        if not line or is_boilerplate(line):
+            continue
+        section = heading_section(line)
+        if section is not None and len(line) <= 40:
+            current = section
+            continue
+        sections.add(current, line)
+    return sections
+
+
+def route_sections(
+    sections: ResumeSections, full_text: str
+) -> Tuple[Dict[str, str], Dict[str, Dict[str, int]]]:
+    """
+    Pick the text each prompt gets: its section from PROMPT_SECTIONS, or the
+    whole normalized resume if the section was not found.
+
+    Returns:
+        Tuple[Dict[str, str], Dict[str, Dict[str, int]]]: The text per prompt
+        stage, and the estimated tokens of the full resume vs. the routed text
+        per stage.
+    """
+    normalized_text = sections.text() or full_text
+    routed = {}
+    report = {}
+    for stage, section_names in PROMPT_SECTIONS.items():
+        stage_text = next(
+            (sections.get(name) for name in section_names if sections.get(name)),
+            normalized_text,
+        )
+        routed[stage] = stage_text
+        full_tokens = estimate_tokens(full_text)
+        routed_tokens = estimate_tokens(stage_text)
+        report[stage] = {
+            "full_tokens": full_tokens,
+            "routed_tokens": routed_tokens,
+            "saved_tokens": max(full_tokens - routed_tokens, 0),
+        }
+    return routed, report
@@ -0,0 +1,368 @@
+import argparse
+import contextlib
+import csv
+import json
+import os
+import signal
+import sys
+import threading
+import traceback
+from types import SimpleNamespace
+from typing import Any, Dict, List, Union
+
+from utils.log import (
+    LOG_FORMAT,
+    LOG_FORMATS,
+    LOG_LEVEL,
+    configure_logging,
+    flush_logging,
+)
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(CURRENT_DIR, "data")
+
+# Exit codes, for job runners
+EXIT_OK = 0
+EXIT_FAILED = 1  # unexpected error (the traceback is printed to stderr)
+EXIT_USAGE = 2  # invalid arguments (argparse's own exit code)
+EXIT_NO_INPUT = 3  # nothing to work on: no resume text, user data or searches
+EXIT_CANCELLED = 130  # stopped by SIGINT/SIGTERM; partial results are kept
+
+PROVIDERS = ["openai", "ollama", "auto", "local"]
+EXPORT_FORMATS = ["jsonl", "json", "csv"]
+
+
+class CommandError(Exception):
+    """An expected failure of a command, reported as JSON with `exit_code`."""
+
+    def __init__(self, message: str, exit_code: int = EXIT_NO_INPUT):
+        super().__init__(message)
+        self.exit_code = exit_code
+
+
+def _load_user_data(args: argparse.Namespace) -> Dict[str, Any]:
+    path = args.user_data or os.path.join(args.data_dir, "user_data.json")
+    if not os.path.exists(path):
+        raise CommandError(f"No user data at {path}. Run analyze-resume first.")
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _search_urls(args: argparse.Namespace, user_data: Dict[str, Any]) -> List[str]:
+    from agent.intelligence import build_linkedin_url
+
+    lines = user_data.get("keyword_combinations", "").split("\n")
+    return [
+        build_linkedin_url(
+            line.strip(),
+            location=user_data.get("location", ""),
+            posted_in_days=args.days,
+            easy_apply=not args.any_apply,
+        )
+        for line in lines
+        if line.strip()
+    ]
+
+
+def analyze_resume(args: argparse.Namespace) -> Dict[str, Any]:
+    """Analyze a PDF resume and save user_data.json in the data directory."""
+    from automation.resume_parser import ResumeParser
+
+    if not os.path.isfile(args.resume):
+        raise CommandError(f"No such resume file: {args.resume}")
+
+    parser = ResumeParser(
+        # The parser reads the path from `.name`, as on Gradio's uploaded files
+        SimpleNamespace(name=args.resume),
+        args.k,
+        max_tokens=args.max_tokens,
+        max_cost_usd=args.max_cost,
+        use_cache=not args.no_cache,
+        data_dir=args.data_dir,
+    )
+    user_data = None
+    for user_data in parser.iter_keywords_for_search(
+        provider=args.provider,
+        openai_model=args.openai_model,
+        main_job_search_focus=args.focus,
+    ):
+        pass
+    if user_data is None:
+        raise CommandError(f"No text found in {args.resume}.")
+
+    return {
+        "user_data": user_data,
+        "user_data_path": os.path.join(args.data_dir, "user_data.json"),
+        "llm": parser.llm_metrics.summary() if parser.llm_metrics else None,
+    }
+
+
+def build_searches(args: argparse.Namespace) -> Dict[str, Any]:
+    """List the LinkedIn search URLs of the saved user data."""
+    search_urls = _search_urls(args, _load_user_data(args))
+    if not search_urls:
+        raise CommandError("The user data has no keyword combinations.")
+    return {"search_urls": search_urls}
+
+
+def crawl(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Scrape the searches into the data directory's job store. SIGINT/SIGTERM
+    stop the crawl after the current job card; the jobs scraped so far are
+    kept and the result has "cancelled": true.
+    """
+    from automation.browser import DEFAULT_CDP_PORT
+    from automation.chrome import default_chrome_supervisor
+    from automation.job_store import JOBS_DB_FILENAME, JobStore
+    from automation.linkedin import LinkedInAutomation
+
+    user_data = _load_user_data(args) if not args.search_url else {}
+    search_urls = args.search_url or _search_urls(args, user_data)
+    if not search_urls:
+        raise CommandError("No searches to crawl.")
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    cdp_port = args.cdp_port or DEFAULT_CDP_PORT
+    if not args.launch_browser:
+        # Returns as soon as Chrome accepts connections
+        default_chrome_supervisor().ensure_running(cdp_port)
+    li_auto = LinkedInAutomation(
+        headless=args.headless,
+        user_data=user_data,
+        data_dir=args.data_dir,
+        cdp_port=cdp_port,
+        launch_browser=args.launch_browser,
+    )
+    li_auto.search_url_list = search_urls
+
+    cancel_event = threading.Event()
+
+    def cancel(signum, frame):
+        print(f"\n🛑 [CLI] Received signal {signum}, stopping the crawl...")
+        cancel_event.set()
+
+    previous_handlers = {
+        signum: signal.signal(signum, cancel)
+        for signum in (signal.SIGINT, signal.SIGTERM)
+    }
+    store = JobStore(os.path.join(args.data_dir, JOBS_DB_FILENAME))
+    new_jobs = 0
+    update = None
+    try:
+        known_job_ids = store.job_ids() if args.new_only else None
+        for update in li_auto.iter_job_listings(
+            search_rate_limit=args.search_rate_limit,
+            cancel_event=cancel_event,
+            known_job_ids=known_job_ids,
+        ):
+            if update["jobs"]:
+                new_jobs += store.add_jobs(update["jobs"])
+        if user_data:
+            store.rescore(user_data)
+        jobs_total = store.count()
+    finally:
+        store.close()
+        li_auto.close()
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+
+    return {
+        "new_jobs": new_jobs,
+        "jobs_scraped": update["jobs_total"] if update else 0,
+        "jobs_in_store": jobs_total,
+        "searches": update["search_index"] if update else 0,
+        "elapsed_s": update["elapsed_s"] if update else 0.0,
+        "cancelled": cancel_event.is_set(),
+        "jobs_db": os.path.join(args.data_dir, JOBS_DB_FILENAME),
+    }
+
+
+def _write_jobs(jobs: List[Dict[str, Any]], file, output_format: str):
+    if output_format == "json":
+        json.dump(jobs, file, indent=2)
+        file.write("\n")
+    elif output_format == "csv":
+        writer = csv.DictWriter(file, fieldnames=list(jobs[0]) if jobs else [])
+        writer.writeheader()
+        writer.writerows(jobs)
+    else:
+        for job in jobs:
+            file.write(json.dumps(job) + "\n")
+
+
+def export(args: argparse.Namespace) -> Union[Dict[str, Any], None]:
+    """
+    Write the stored jobs that match the filters to --output, or to stdout
+    (then without a JSON result).
+    """
+    from automation.job_store import JOBS_DB_FILENAME, MAX_PAGE_SIZE, JobStore
+
+    db_path = os.path.join(args.data_dir, JOBS_DB_FILENAME)
+    if not os.path.exists(db_path):
+        raise CommandError(f"No job store at {db_path}. Run crawl first.")
+
+    store = JobStore(db_path)
+    try:
+        filters = {
+            "text": args.text,
+            "company": args.company,
+            "location": args.location,
+            "tag": args.tag,
+            "sort_by": args.sort_by,
+            "include_duplicates": args.include_duplicates,
+        }
+        jobs, total = store.query(page_size=MAX_PAGE_SIZE, **filters)
+        page = 1
+        while len(jobs) < total:
+            page += 1
+            more, _ = store.query(page=page, page_size=MAX_PAGE_SIZE, **filters)
+            if not more:
+                break
+            jobs.extend(more)
+    finally:
+        store.close()
+
+    if args.output in (None, "-"):
+        _write_jobs(jobs, args.stdout, args.format)
+        return None
+    with open(args.output, "w", newline="", encoding="utf-8") as f:
+        _write_jobs(jobs, f, args.format)
+    return {"jobs": len(jobs), "output": args.output, "format": args.format}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Analyze resumes and crawl LinkedIn jobs without the UI. Every "
+            "command prints one JSON object to stdout (logs go to stderr) and "
+            f"exits with {EXIT_OK} on success, {EXIT_FAILED} on errors, "
+            f"{EXIT_NO_INPUT} when there is nothing to work on and "
+            f"{EXIT_CANCELLED} when a crawl was stopped."
+        )
+    )
+    parser.add_argument(
+        "--data-dir",
+        default=DATA_DIR,
+        help="Where user_data.json and jobs.db are read and written (src/data)",
+    )
+    parser.add_argument(
+        "--log-level", default=LOG_LEVEL, help="DEBUG logs every card and scroll"
+    )
+    parser.add_argument(
+        "--log-format",
+        choices=LOG_FORMATS,
+        default=LOG_FORMAT,
+        help="Format of the logs on stderr ('json' for JSON lines)",
+    )
+    parser.add_argument("--log-file", help="Also write the logs as JSON lines here")
+    commands = parser.add_subparsers(dest="command_name", required=True)
+
+    analyze = commands.add_parser("analyze-resume", help=analyze_resume.__doc__)
+    analyze.add_argument("resume", help="PDF resume")
+    analyze.add_argument("-k", type=int, default=20, help="Keyword sets to generate")
+    analyze.add_argument("--provider", choices=PROVIDERS, default="openai")
+    analyze.add_argument("--openai-model", default="gpt-4")
+    analyze.add_argument("--focus", default="Data Scientist")
+    analyze.add_argument("--max-tokens", type=int, default=None)
+    analyze.add_argument("--max-cost", type=float, default=None)
+    analyze.add_argument("--no-cache", action="store_true")
+    analyze.set_defaults(command=analyze_resume)
+
+    search_args = argparse.ArgumentParser(add_help=False)
+    search_args.add_argument(
+        "--user-data", help="user_data.json to use (default: the data directory's)"
+    )
+    search_args.add_argument("--days", type=int, default=7, help="Max posting age")
+    search_args.add_argument(
+        "--any-apply", action="store_true", help="Do not filter by Easy Apply"
+    )
+
+    searches = commands.add_parser(
+        "build-searches", parents=[search_args], help=build_searches.__doc__
+    )
+    searches.set_defaults(command=build_searches)
+
+    crawl_parser = commands.add_parser(
+        "crawl", parents=[search_args], help="Scrape the searches into jobs.db"
+    )
+    crawl_parser.add_argument(
+        "--search-url",
+        action="append",
+        help="Search URL to crawl instead of the user data's (repeatable)",
+    )
+    crawl_parser.add_argument("--search-rate-limit", type=int, default=2)
+    crawl_parser.add_argument(
+        "--new-only",
+        action="store_true",
+        help="Skip the cards of jobs that are already in jobs.db",
+    )
+    crawl_parser.add_argument(
+        "--cdp-port", type=int, default=None, help="Chrome's debugging port (9222)"
+    )
+    crawl_parser.add_argument(
+        "--launch-browser",
+        action="store_true",
+        help="Use Playwright's own Chromium instead of attaching to Chrome",
+    )
+    crawl_parser.add_argument("--headless", action="store_true")
+    crawl_parser.set_defaults(command=crawl)
+
+    export_parser = commands.add_parser("export", help="Write the stored jobs")
+    export_parser.add_argument("--output", "-o", help="Output file (default: stdout)")
+    export_parser.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl")
+    export_parser.add_argument("--text", default="")
+    export_parser.add_argument("--company", default="")
+    export_parser.add_argument("--location", default="")
+    export_parser.add_argument("--tag", default="")
+    export_parser.add_argument("--sort-by", default="score")
+    export_parser.add_argument("--include-duplicates", action="store_true")
+    export_parser.set_defaults(command=export)
+    return parser
+
+
+def main(argv: Union[List[str], None] = None) -> int:
+    args = build_parser().parse_args(argv)
+    args.stdout = sys.stdout
+
+    def emit(result: Dict[str, Any]):
+        args.stdout.write(json.dumps(result) + "\n")
+        args.stdout.flush()
+
+    configure_logging(
+        level=args.log_level.upper(),
+        console_format=args.log_format,
+        log_file=args.log_file,
+    )
+    try:
+        # Logs and the modules' print() output go to stderr; stdout is kept
+        # for the result
+        with contextlib.redirect_stdout(sys.stderr):
+            try:
+                result = args.command(args)
+            finally:
+                flush_logging()
+    except CommandError as e:
+        emit({"ok": False, "command": args.command_name, "error": str(e)})
+        return e.exit_code
+    except KeyboardInterrupt:
+        emit({"ok": False, "command": args.command_name, "error": "Interrupted"})
+        return EXIT_CANCELLED
+    except Exception as e:
+        traceback.print_exc()
+        emit(
+            {
+                "ok": False,
+                "command": args.command_name,
+                "error": f"{type(e).__name__}: {e}",
+            }
+        )
+        return EXIT_FAILED
+
+    if result is None:
+        return EXIT_OK
+    emit({"ok": True, "command": args.command_name, **result})
+    return EXIT_CANCELLED if result.get("cancelled") else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
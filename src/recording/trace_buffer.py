@@ -0,0 +1,221 @@
+import base64
+import json
+import os
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Union
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+FAILURES_DIR = os.path.join(CURRENT_DIR, "..", "data", "failures")
+
+# Ring buffer sizes per tab
+MAX_FRAMES = 40
+MAX_SNAPSHOTS = 5
+MAX_EVENTS = 200
+
+# Screencast settings: small JPEGs, and only every n-th frame Chrome renders
+FRAME_FORMAT = "jpeg"
+FRAME_QUALITY = 40
+FRAME_MAX_WIDTH = 960
+FRAME_MAX_HEIGHT = 720
+EVERY_NTH_FRAME = 3
+
+# DOM snapshots larger than this are truncated in the buffer
+MAX_SNAPSHOT_CHARS = 2_000_000
+
+
+class TraceBuffer:
+    """
+    Low-overhead "flight recorder" for one Playwright tab.
+
+    Chrome pushes sampled, downscaled JPEG frames of the tab over CDP
+    (Page.startScreencast); the latest MAX_FRAMES of them are kept in memory,
+    still base64 encoded, together with the latest DOM snapshots and a log of
+    the automation steps. Nothing is written to disk until a step fails: then
+    `dump` writes the buffered frames, snapshots and step log to
+    data/failures/<time>_<step>/.
+
+    The time spent in this process on buffering (frame callbacks and DOM
+    snapshots, as thread CPU time) is tracked in `stats()`, so the overhead
+    can be compared with the length of the crawl. Encoding the frames happens
+    in Chrome and is limited by the sampling settings.
+    """
+
+    def __init__(
+        self,
+        page,
+        max_frames: int = MAX_FRAMES,
+        max_snapshots: int = MAX_SNAPSHOTS,
+        every_nth_frame: int = EVERY_NTH_FRAME,
+        quality: int = FRAME_QUALITY,
+        output_dir: str = FAILURES_DIR,
+    ):
+        self.page = page
+        self.every_nth_frame = every_nth_frame
+        self.quality = quality
+        self.output_dir = output_dir
+        self.frames: deque = deque(maxlen=max_frames)
+        self.snapshots: deque = deque(maxlen=max_snapshots)
+        self.events: deque = deque(maxlen=MAX_EVENTS)
+        self.session = None
+        self.started_at = None
+        self._frames_received = 0
+        self._frame_cpu_s = 0.0
+        self._snapshot_cpu_s = 0.0
+        self._dumps = 0
+
+    def start(self):
+        """Start the screencast of the tab."""
+        self.session = self.page.context.new_cdp_session(self.page)
+        self.session.on("Page.screencastFrame", self._on_frame)
+        self.session.send(
+            "Page.startScreencast",
+            {
+                "format": FRAME_FORMAT,
+                "quality": self.quality,
+                "maxWidth": FRAME_MAX_WIDTH,
+                "maxHeight": FRAME_MAX_HEIGHT,
+                "everyNthFrame": self.every_nth_frame,
+            },
+        )
+        self.started_at = time.perf_counter()
+        print(
+            f"\n🎞️  [TRACE] Buffering the last {self.frames.maxlen} frames and "
+            f"{self.snapshots.maxlen} DOM snapshots of the tab"
+        )
+
+    def stop(self):
+        if self.session is None:
+            return
+        try:
+            self.session.send("Page.stopScreencast")
+            self.session.detach()
+        except Exception:
+            pass  # The page or browser is already gone
+        self.session = None
+
+    def _on_frame(self, params: Dict[str, Any]):
+        started = time.thread_time()
+        # Chrome only sends the next frame once this one is acknowledged
+        self.session.send(
+            "Page.screencastFrameAck", {"sessionId": params["sessionId"]}
+        )
+        self.frames.append(
+            (params.get("metadata", {}).get("timestamp", time.time()), params["data"])
+        )
+        self._frames_received += 1
+        self._frame_cpu_s += time.thread_time() - started
+
+    def mark(self, step: str, **info):
+        """Add an automation step (navigation, scroll, apply, ...) to the log."""
+        self.events.append({"time": time.time(), "step": step, **info})
+
+    def snapshot(self, label: str):
+        """Buffer the current DOM of the tab."""
+        started = time.thread_time()
+        try:
+            html = self.page.content()
+        except Exception as e:
+            html = f"<!-- DOM snapshot failed: {e} -->"
+        self.snapshots.append(
+            {
+                "time": time.time(),
+                "label": label,
+                "url": self.page.url,
+                "html": html[:MAX_SNAPSHOT_CHARS],
+            }
+        )
+        self._snapshot_cpu_s += time.thread_time() - started
+
+    @contextmanager
+    def step(self, name: str, snapshot: bool = True, **info) -> Iterator[None]:
+        """
+        Log a step and dump the buffers if it raises. A DOM snapshot is taken
+        after the step succeeded (and at the time of a failure).
+        """
+        self.mark(name, **info)
+        try:
+            yield
+        except Exception as e:
+            self.snapshot(f"{name} (failed)")
+            self.dump(name, error=e)
+            raise
+        if snapshot:
+            self.snapshot(name)
+
+    def dump(self, reason: str, error: Union[BaseException, None] = None) -> str:
+        """
+        Write the buffered frames, DOM snapshots and step log to a new
+        directory under `output_dir`.
+
+        Returns:
+            str: The directory path.
+        """
+        slug = re.sub(r"[^A-Za-z0-9_-]+", "_", reason).strip("_") or "failure"
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.output_dir, f"{stamp}_{self._dumps:03d}_{slug}")
+        os.makedirs(os.path.join(path, "frames"), exist_ok=True)
+        os.makedirs(os.path.join(path, "snapshots"), exist_ok=True)
+
+        for i, (_, data) in enumerate(list(self.frames)):
+            frame_path = os.path.join(path, "frames", f"{i:03d}.{FRAME_FORMAT}")
+            with open(frame_path, "wb") as f:
+                f.write(base64.b64decode(data))
+
+        snapshots = []
+        for i, snapshot in enumerate(list(self.snapshots)):
+            file_name = f"{i:03d}.html"
+            with open(os.path.join(path, "snapshots", file_name), "w") as f:
+                f.write(snapshot["html"])
+            snapshots.append(
+                {key: value for key, value in snapshot.items() if key != "html"}
+                | {"file": file_name}
+            )
+
+        with open(os.path.join(path, "trace.json"), "w") as f:
+            json.dump(
+                {
+                    "reason": reason,
+                    "error": repr(error) if error is not None else None,
+                    "url": self.page.url,
+                    "frame_times": [frame_time for frame_time, _ in self.frames],
+                    "snapshots": snapshots,
+                    "events": list(self.events),
+                    "stats": self.stats(),
+                },
+                f,
+                indent=2,
+            )
+
+        self._dumps += 1
+        print(f"\n🎞️  [TRACE] {reason} failed, trace saved at: {path}")
+        return path
+
+    def stats(self) -> Dict[str, Any]:
+        """Buffer sizes and the CPU time spent on buffering in this process."""
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        overhead_s = self._frame_cpu_s + self._snapshot_cpu_s
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "frames_received": self._frames_received,
+            "frames_buffered": len(self.frames),
+            # base64 takes 4 characters per 3 bytes
+            "buffered_frame_bytes": sum(len(data) for _, data in self.frames) * 3 // 4,
+            "snapshots_buffered": len(self.snapshots),
+            "frame_cpu_s": round(self._frame_cpu_s, 4),
+            "snapshot_cpu_s": round(self._snapshot_cpu_s, 4),
+            "overhead_pct": round(overhead_s / elapsed * 100, 3) if elapsed else 0.0,
+            "dumps": self._dumps,
+        }
+
+    def print_summary(self):
+        stats = self.stats()
+        print(
+            f"\n🎞️  [TRACE] {stats['frames_received']} frames in "
+            f"{stats['elapsed_s']:.0f}s, {stats['buffered_frame_bytes'] / 1e6:.1f} MB "
+            f"buffered, {stats['overhead_pct']:.2f}% CPU overhead "
+            f"({stats['frame_cpu_s']:.2f}s frames, {stats['snapshot_cpu_s']:.2f}s "
+            f"DOM snapshots), {stats['dumps']} failure traces"
+        )
@@ -1,103 +1,452 @@
 import json
+import math
 import os
-import subprocess
-import sys
+import threading
 import time
 
 import gradio as gr
 
+from automation.chrome import default_chrome_supervisor
+from automation.job_store import (
+    DEFAULT_PAGE_SIZE,
+    JOBS_DB_FILENAME,
+    SORT_COLUMNS,
+    JobStore,
+)
 from automation.linkedin import USER_DATA_DIR, LinkedInAutomation
+from automation.pipeline import run_pipeline
 from automation.resume_parser import ResumeParser
-
-
-def open_chrome_with_remote_debugging():
-    # Define the command based on the operating system
-    if sys.platform == "win32":
-        # Windows
-        chrome_path = "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe"
-        command = f'"{chrome_path}" --remote-debugging-port=9222'
-    elif sys.platform == "darwin":
-        # macOS
-        chrome_path = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
-        command = f'"{chrome_path}" --remote-debugging-port=9222'
-    else:
-        # Linux and other platforms
-        chrome_path = "google-chrome"
-        command = f"{chrome_path} --remote-debugging-port=9222"
-
-    try:
-        # Launch Chrome with remote debugging
-        subprocess.Popen(command, shell=True)
-        print("\n🎮  [AGENT] Chrome launched with remote debugging on port 9222.")
-    except Exception as e:
-        print(f"\n🎮  [AGENT] Failed to launch Chrome: {e}")
+from ui.job_queue import ANALYSIS_JOB, CDP_PORTS, CRAWL_JOB, JOB_QUEUE, workspace_dir
 
 
 USER_DATA_PATH = os.path.join(USER_DATA_DIR, "user_data.json")
 
-LI_AUTO = LinkedInAutomation(headless=False)
+
+def _queue_status(kind, position):
+    return f"**🕒 Queued:** position {position} in the {kind} queue"
 
 
-def handle_resume_with_resumeparser(resume_file, num_keywords, main_job_search_focus):
+def handle_resume_with_resumeparser(
+    resume_file, num_keywords, main_job_search_focus, provider, request: gr.Request
+):
     """
-    1. Create a ResumeParser instance
-    2. Call extract_keywords_for_search() => writes user_data.json
-    3. Read user_data.json and return fields for display
+    1. Wait for a free analysis slot (showing the queue position)
+    2. Create a ResumeParser instance for the session's workspace
+    3. Stream iter_keywords_for_search() => writes user_data.json when done
+    4. Yield the fields for display as soon as each of them is available
     """
     if not resume_file:
-        return "", "", 0, "", ""
+        yield "", "", 0, "", "", ""
+        return
 
-    parser = ResumeParser(resume_file, num_keywords)
-    parser.extract_keywords_for_search(
-        main_job_search_focus=main_job_search_focus
-    )  # saves user_data.json
+    for position in JOB_QUEUE.wait_turn(ANALYSIS_JOB):
+        yield "", "", 0, "", "", _queue_status(ANALYSIS_JOB, position)
 
-    # read user_data.json
-    if not os.path.exists(USER_DATA_PATH):
-        return "", "", 0, "", "No data found after parsing."
+    try:
+        parser = ResumeParser(
+            resume_file, num_keywords, data_dir=workspace_dir(request.session_hash)
+        )
+        user_data = None
+        for user_data in parser.iter_keywords_for_search(
+            provider=provider, main_job_search_focus=main_job_search_focus
+        ):  # saves user_data.json after the last update
+            yield (
+                user_data.get("positions", ""),
+                user_data.get("location", ""),
+                user_data.get("years_experience", 0),
+                user_data.get("skills", ""),
+                user_data.get("keyword_combinations", ""),
+                "**⏳ Analyzing...**",
+            )
+    finally:
+        JOB_QUEUE.release(ANALYSIS_JOB)
+
+    if user_data is None:
+        yield "", "", 0, "", "No data found after parsing.", ""
+    else:
+        yield (
+            user_data.get("positions", ""),
+            user_data.get("location", ""),
+            user_data.get("years_experience", 0),
+            user_data.get("skills", ""),
+            user_data.get("keyword_combinations", ""),
+            "**🏁 Done**",
+        )
 
-    with open(USER_DATA_PATH, "r") as f:
-        user_data = json.load(f)
 
-    positions_str = user_data.get("positions", "")
-    location_str = user_data.get("location", "")
-    years_experience_int = user_data.get("years_experience", 0)
-    skills_str = user_data.get("skills", "")
-    combos_str = user_data.get("keyword_combinations", "")
+# Columns of the jobs table, in display order
+RESULT_COLUMNS = [
+    "score",
+    "job_id",
+    "title",
+    "company",
+    "location",
+    "benefits",
+    "footer_tags",
+    "job_url",
+]
 
-    return positions_str, location_str, years_experience_int, skills_str, combos_str
+# Minimum time between two re-rankings of all stored jobs while scraping
+RESCORE_INTERVAL_S = 2.0
 
 
-def handle_scrape_jobs(search_rate_limit):
-    """
-    Instantiate LinkedInAutomation and gather job listings up to 'search_rate_limit' URLs.
-    Return results in a 2D list for display in a DataFrame.
+def _open_job_store(request: gr.Request) -> JobStore:
+    """The session's store of all jobs scraped so far."""
+    workspace = workspace_dir(request.session_hash)
+    return JobStore(os.path.join(workspace, JOBS_DB_FILENAME))
+
+
+def _results_page(
+    store, text, company, location, tag, sort_by, descending, page, page_size
+):
     """
-    open_chrome_with_remote_debugging()
-    time.sleep(3)
+    Query one page of the results view. Only this page is sent to the
+    browser; filtering, sorting and paging run in the store.
 
-    li_auto = LinkedInAutomation(headless=False)  # or True if you prefer headless
-    initial_search_urls = li_auto.search_url_list
-    job_data = li_auto.gather_job_listings(search_rate_limit=search_rate_limit)
+    Returns:
+        The table rows, the (clamped) page number and a page summary line.
+    """
+    page_size = int(page_size or DEFAULT_PAGE_SIZE)
+    page = max(int(page or 1), 1)
+    query = dict(
+        text=text or "",
+        company=company or "",
+        location=location or "",
+        tag=tag or "",
+        sort_by=sort_by or "score",
+        descending=bool(descending),
+        page_size=page_size,
+    )
+    jobs, total = store.query(page=page, **query)
+    page_count = max(math.ceil(total / page_size), 1)
+    if page > page_count:
+        page = page_count
+        jobs, total = store.query(page=page, **query)
+
+    rows = [[job[column] for column in RESULT_COLUMNS] for job in jobs]
+    return rows, page, f"Page {page} of {page_count} · {total} jobs"
+
+
+def _store_jobs(store, new_jobs, user_data, last_rescore, force_rescore=False):
+    """
+    Add newly scraped jobs to the store and re-rank all stored jobs, at most
+    every RESCORE_INTERVAL_S (ranking tens of thousands of jobs takes a few
+    hundred ms). Returns the time of the last re-ranking.
+    """
+    if new_jobs:
+        store.add_jobs(new_jobs)
+    now = time.perf_counter()
+    if force_rescore or now - last_rescore >= RESCORE_INTERVAL_S:
+        store.rescore(user_data)
+        return now
+    return last_rescore
+
+
+def handle_results_view(
+    text,
+    company,
+    location,
+    tag,
+    sort_by,
+    descending,
+    page,
+    page_size,
+    request: gr.Request,
+):
+    """Show a page of the stored jobs."""
+    store = _open_job_store(request)
+    try:
+        return _results_page(
+            store, text, company, location, tag, sort_by, descending, page, page_size
+        )
+    finally:
+        store.close()
+
+
+def handle_new_results_query(
+    text, company, location, tag, sort_by, descending, page_size, request: gr.Request
+):
+    """Filters or sort order changed: start again from the first page."""
+    filters = (text, company, location, tag, sort_by, descending)
+    return handle_results_view(*filters, 1, page_size, request)
+
+
+def handle_previous_results_page(
+    text,
+    company,
+    location,
+    tag,
+    sort_by,
+    descending,
+    page,
+    page_size,
+    request: gr.Request,
+):
+    filters = (text, company, location, tag, sort_by, descending)
+    return handle_results_view(*filters, int(page or 1) - 1, page_size, request)
+
+
+def handle_next_results_page(
+    text,
+    company,
+    location,
+    tag,
+    sort_by,
+    descending,
+    page,
+    page_size,
+    request: gr.Request,
+):
+    filters = (text, company, location, tag, sort_by, descending)
+    return handle_results_view(*filters, int(page or 1) + 1, page_size, request)
+
+
+# Stop flags of the running scrapes and pipelines, keyed by Gradio session
+SCRAPE_CANCEL_EVENTS = {}
+
+
+def handle_pipeline(
+    resume_file,
+    num_keywords,
+    main_job_search_focus,
+    provider,
+    search_rate_limit,
+    text,
+    company,
+    location,
+    tag,
+    sort_by,
+    descending,
+    page,
+    page_size,
+    request: gr.Request,
+):
+    """
+    Analyze the resume and scrape jobs in one go: every keyword set is
+    searched as soon as the LLM has produced it, and the fields, URLs and jobs
+    tables update while both are running. Holds a crawl and an analysis slot.
+    The Stop button leaves the queue, or cancels the analysis and ends the
+    crawl after the current job card; the jobs scraped so far stay in the store.
+    """
+    view = (text, company, location, tag, sort_by, descending, page, page_size)
+    if not resume_file:
+        yield "", "", 0, "", "", [], [], "", gr.update(), ""
+        return
+
+    cancel_event = threading.Event()
+    SCRAPE_CANCEL_EVENTS[request.session_hash] = cancel_event
+    left_queue = (
+        *("", "", 0, "", "", gr.update(), []),
+        "**🛑 Left the queue**",
+        gr.update(),
+        gr.update(),
+    )
+    crawl_slot = analysis_slot = False
 
-    li_auto.close()
+    try:
+        # Always queue for a crawl before an analysis (as the only job that
+        # holds both), so two jobs can never wait on each other's slot
+        for position in JOB_QUEUE.wait_turn(CRAWL_JOB):
+            if cancel_event.is_set():
+                yield left_queue
+                return
+            yield (
+                *("", "", 0, "", "", gr.update(), []),
+                _queue_status(CRAWL_JOB, position),
+                gr.update(),
+                gr.update(),
+            )
+        crawl_slot = True
+        for position in JOB_QUEUE.wait_turn(ANALYSIS_JOB):
+            if cancel_event.is_set():
+                yield left_queue
+                return
+            yield (
+                *("", "", 0, "", "", gr.update(), []),
+                _queue_status(ANALYSIS_JOB, position),
+                gr.update(),
+                gr.update(),
+            )
+        analysis_slot = True
+
+        store = _open_job_store(request)
+        try:
+            cdp_port = CDP_PORTS.acquire()
+            try:
+                stored_jobs = 0
+                last_rescore = 0.0
+                for state in run_pipeline(
+                    resume_file,
+                    num_search_queries=int(num_keywords) if num_keywords else 20,
+                    search_rate_limit=int(search_rate_limit),
+                    provider=provider,
+                    main_job_search_focus=main_job_search_focus,
+                    launch_chrome=True,
+                    data_dir=workspace_dir(request.session_hash),
+                    cdp_port=cdp_port,
+                    cancel_event=cancel_event,
+                ):
+                    user_data = state["user_data"]
+                    finished = state["stage"] in ("done", "stopped")
+                    last_rescore = _store_jobs(
+                        store,
+                        state["jobs"][stored_jobs:],
+                        user_data,
+                        last_rescore,
+                        force_rescore=finished,
+                    )
+                    stored_jobs = len(state["jobs"])
+                    rows, page, info = _results_page(store, *view)
+                    if state["stage"] == "stopped":
+                        status = "🛑 Stopped"
+                    elif state["stage"] == "done":
+                        status = "🏁 Done"
+                    else:
+                        status = f"⏳ {state['stage'].capitalize()}"
+                    yield (
+                        user_data.get("positions", ""),
+                        user_data.get("location", ""),
+                        user_data.get("years_experience", 0),
+                        user_data.get("skills", ""),
+                        user_data.get("keyword_combinations", ""),
+                        rows,
+                        [[search_url] for search_url in state["search_urls"]],
+                        f"**{status}** · {len(state['jobs'])} jobs",
+                        page,
+                        info,
+                    )
+            finally:
+                CDP_PORTS.release(cdp_port)
+        finally:
+            store.close()
+    finally:
+        if analysis_slot:
+            JOB_QUEUE.release(ANALYSIS_JOB)
+        if crawl_slot:
+            JOB_QUEUE.release(CRAWL_JOB)
+        if SCRAPE_CANCEL_EVENTS.get(request.session_hash) is cancel_event:
+            del SCRAPE_CANCEL_EVENTS[request.session_hash]
+
+
+# Concurrent event handlers per button (most of them just wait in the job queue)
+MAX_UI_SESSIONS = 16
+
+
+def _scrape_status(update):
+    """One-line progress and throughput summary of a scrape update."""
+    if update["cancelled"] and update["done"]:
+        state = "🛑 Stopped"
+    elif update["done"]:
+        state = "🏁 Done"
+    else:
+        state = "⏳ Scraping"
+    return (
+        f"**{state}** · search {update['search_index']}/{update['searches_total']}"
+        f" · {update['jobs_total']} jobs · {update['jobs_per_min']} jobs/min"
+        f" · {update['elapsed_s']}s"
+    )
+
+
+def handle_scrape_jobs(
+    search_rate_limit,
+    text,
+    company,
+    location,
+    tag,
+    sort_by,
+    descending,
+    page,
+    page_size,
+    request: gr.Request,
+):
+    """
+    Instantiate LinkedInAutomation and gather job listings up to 'search_rate_limit' URLs.
+    New jobs are added to the session's job store in batches as they are
+    parsed, and the current page of the results view is refreshed together
+    with the crawl progress. The Stop button ends the crawl after the current
+    job card (or leaves the queue); the jobs scraped so far stay in the store
+    and in the session's jobs_data.json.
+    """
+    search_rate_limit = int(search_rate_limit)
+    view = (text, company, location, tag, sort_by, descending, page, page_size)
+    cancel_event = threading.Event()
+    SCRAPE_CANCEL_EVENTS[request.session_hash] = cancel_event
+    queued = True
+    cdp_port = None
 
-    # Convert job_data (list of dicts) => list of rows
-    rows = []
-    # columns: [job_id, title, company, location, benefits, footer_tags, job_url]
-    for job in job_data:
-        job_id = job.get("job_id", "")
-        title = job.get("title", "")
-        company = job.get("company", "")
-        location = job.get("location", "")
-        benefits = job.get("benefits", "")
-        footer_tags = ", ".join(job.get("footer_tags", []))
-        job_url = job.get("job_url", "")
-        rows.append([job_id, title, company, location, benefits, footer_tags, job_url])
+    try:
+        for position in JOB_QUEUE.wait_turn(CRAWL_JOB):
+            if cancel_event.is_set():
+                yield (
+                    gr.update(),
+                    [],
+                    "**🛑 Left the queue**",
+                    gr.update(),
+                    gr.update(),
+                )
+                return
+            yield (
+                gr.update(),
+                [],
+                _queue_status(CRAWL_JOB, position),
+                gr.update(),
+                gr.update(),
+            )
+        queued = False
+
+        cdp_port = CDP_PORTS.acquire()
+        # Returns as soon as Chrome accepts connections
+        default_chrome_supervisor().ensure_running(cdp_port)
+
+        li_auto = LinkedInAutomation(
+            headless=False,  # or True if you prefer headless
+            data_dir=workspace_dir(request.session_hash),
+            cdp_port=cdp_port,
+        )
+        url_rows = [
+            [search_url] for search_url in li_auto.search_url_list[:search_rate_limit]
+        ]
+        yield (
+            gr.update(),
+            url_rows,
+            "**⏳ Connecting to the browser...**",
+            gr.update(),
+            gr.update(),
+        )
 
-    return rows, [
-        [search_url] for search_url in initial_search_urls[:search_rate_limit]
-    ]
+        store = _open_job_store(request)
+        try:
+            last_rescore = 0.0
+            for update in li_auto.iter_job_listings(
+                search_rate_limit=search_rate_limit, cancel_event=cancel_event
+            ):
+                last_rescore = _store_jobs(
+                    store,
+                    update["jobs"],
+                    li_auto.user_data,
+                    last_rescore,
+                    force_rescore=update["done"],
+                )
+                rows, page, info = _results_page(store, *view)
+                yield rows, url_rows, _scrape_status(update), page, info
+        finally:
+            store.close()
+            li_auto.close()
+    finally:
+        if cdp_port is not None:
+            CDP_PORTS.release(cdp_port)
+        if not queued:
+            JOB_QUEUE.release(CRAWL_JOB)
+        if SCRAPE_CANCEL_EVENTS.get(request.session_hash) is cancel_event:
+            del SCRAPE_CANCEL_EVENTS[request.session_hash]
+
+
+def handle_stop_scrape(request: gr.Request):
+    """Ask the running scrape (or pipeline) of this session to stop."""
+    cancel_event = SCRAPE_CANCEL_EVENTS.get(request.session_hash)
+    if cancel_event is not None:
+        print("\n🛑 [UI] Stopping the scrape...")
+        cancel_event.set()
 
 
 def gradio_app():
@@ -124,14 +473,24 @@ def gradio_app():
                 num_keywords_box = gr.Number(
                     label="How many keyword combos?", value=5, precision=0
                 )
+                # "local" skips the LLM and extracts keywords in milliseconds
+                provider_box = gr.Dropdown(
+                    label="Analysis Provider",
+                    choices=["openai", "ollama", "auto", "local"],
+                    value="openai",
+                )
                 parse_btn = gr.Button("Analyze & Generate (ResumeParser)")
+                analysis_status = gr.Markdown()
                 gr.Markdown("### Scrape Job Listings")
 
                 # Let user specify how many URLs from search_url_list to process
                 scrape_limit_box = gr.Number(
                     label="Number of URLs to process", value=2, precision=0
                 )
-                scrape_btn = gr.Button("Scrape Jobs")
+                with gr.Row():
+                    scrape_btn = gr.Button("Scrape Jobs")
+                    stop_btn = gr.Button("Stop", variant="stop")
+                pipeline_btn = gr.Button("Analyze & Scrape (Pipeline)")
 
                 urls_df = gr.DataFrame(
                     headers=["Search URLs"],
@@ -142,29 +501,115 @@ def gradio_app():
         # Callback: parse resume => user_data.json => display fields
         parse_btn.click(
             fn=handle_resume_with_resumeparser,
-            inputs=[resume_in, num_keywords_box, main_job_search_focus],
-            outputs=[positions_box, location_box, years_box, skills_box, combos_out],
+            inputs=[resume_in, num_keywords_box, main_job_search_focus, provider_box],
+            outputs=[
+                positions_box,
+                location_box,
+                years_box,
+                skills_box,
+                combos_out,
+                analysis_status,
+            ],
         )
 
         job_table_out = gr.DataFrame(
-            headers=[
-                "job_id",
-                "title",
-                "company",
-                "location",
-                "benefits",
-                "footer_tags",
-                "job_url",
-            ],
+            headers=RESULT_COLUMNS,
             label="Scraped Jobs",
             interactive=False,
         )
+        scrape_status = gr.Markdown()
 
-        # Callback: run LinkedInAutomation => gather_job_listings => show
+        # --- Results view: filtered, sorted and paged in the job store ---
+        with gr.Row():
+            results_text = gr.Textbox(label="Search", placeholder="e.g. python remote")
+            results_company = gr.Textbox(label="Company")
+            results_location = gr.Textbox(label="Location")
+            results_tag = gr.Textbox(label="Tag", placeholder="e.g. Easy Apply")
+            results_sort = gr.Dropdown(
+                label="Sort by", choices=list(SORT_COLUMNS), value="score"
+            )
+            results_descending = gr.Checkbox(label="Descending", value=True)
+        with gr.Row():
+            prev_page_btn = gr.Button("◀ Previous")
+            results_page = gr.Number(label="Page", value=1, precision=0, minimum=1)
+            results_page_size = gr.Dropdown(
+                label="Jobs per page",
+                choices=[25, 50, 100, 200],
+                value=DEFAULT_PAGE_SIZE,
+            )
+            next_page_btn = gr.Button("Next ▶")
+            results_info = gr.Markdown()
+
+        results_filters = [
+            results_text,
+            results_company,
+            results_location,
+            results_tag,
+            results_sort,
+            results_descending,
+        ]
+        results_view = results_filters + [results_page, results_page_size]
+        results_outputs = [job_table_out, results_page, results_info]
+
+        for textbox in (results_text, results_company, results_location, results_tag):
+            textbox.submit(
+                fn=handle_new_results_query,
+                inputs=results_filters + [results_page_size],
+                outputs=results_outputs,
+            )
+        for control in (results_sort, results_descending, results_page_size):
+            control.change(
+                fn=handle_new_results_query,
+                inputs=results_filters + [results_page_size],
+                outputs=results_outputs,
+            )
+        results_page.submit(
+            fn=handle_results_view, inputs=results_view, outputs=results_outputs
+        )
+        prev_page_btn.click(
+            fn=handle_previous_results_page,
+            inputs=results_view,
+            outputs=results_outputs,
+        )
+        next_page_btn.click(
+            fn=handle_next_results_page, inputs=results_view, outputs=results_outputs
+        )
+        # Jobs from earlier scrapes of this session's workspace
+        demo.load(
+            fn=handle_results_view, inputs=results_view, outputs=results_outputs
+        )
+
+        # Callback: run LinkedInAutomation => job store => show the current page
         scrape_btn.click(
             fn=handle_scrape_jobs,
-            inputs=[scrape_limit_box],
-            outputs=[job_table_out, urls_df],
+            inputs=[scrape_limit_box] + results_view,
+            outputs=[job_table_out, urls_df, scrape_status, results_page, results_info],
+        )
+        stop_btn.click(fn=handle_stop_scrape, inputs=None, outputs=None)
+
+        # Callback: stream keyword sets straight into the scraper
+        pipeline_btn.click(
+            fn=handle_pipeline,
+            inputs=[
+                resume_in,
+                num_keywords_box,
+                main_job_search_focus,
+                provider_box,
+                scrape_limit_box,
+            ]
+            + results_view,
+            outputs=[
+                positions_box,
+                location_box,
+                years_box,
+                skills_box,
+                combos_out,
+                job_table_out,
+                urls_df,
+                scrape_status,
+                results_page,
+                results_info,
+            ],
         )
 
     return demo
@@ -172,4 +617,8 @@ def gradio_app():
 
 if __name__ == "__main__":
     app = gradio_app()
+    # Let queued jobs of several users wait in ui/job_queue.py (where they see
+    # their position) instead of in Gradio's per-event queue; the job queue
+    # enforces the real crawl and analysis limits
+    app.queue(default_concurrency_limit=MAX_UI_SESSIONS)
     app.launch()
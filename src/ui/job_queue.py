@@ -0,0 +1,139 @@
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterator, List
+
+from automation.browser import DEFAULT_CDP_PORT
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+WORKSPACES_DIR = os.path.join(CURRENT_DIR, "..", "data", "workspaces")
+
+# Job kinds and how many of each may run at once across all users. Crawls
+# each drive their own Chrome instance; analyses share the LLM provider.
+CRAWL_JOB = "crawl"
+ANALYSIS_JOB = "analysis"
+MAX_CONCURRENT_CRAWLS = int(os.getenv("MAX_CONCURRENT_CRAWLS", "1"))
+MAX_CONCURRENT_ANALYSES = int(os.getenv("MAX_CONCURRENT_ANALYSES", "2"))
+
+# How often a waiting job re-checks (and reports) its place in the queue
+QUEUE_POLL_S = 1.0
+
+
+def workspace_dir(session_id: str) -> str:
+    """
+    The private data directory of one UI session (user_data.json,
+    jobs_data.json), created on first use.
+    """
+    safe_id = re.sub(r"[^A-Za-z0-9_-]", "_", session_id or "default")
+    path = os.path.join(WORKSPACES_DIR, safe_id)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class JobQueue:
+    """
+    First-come, first-served admission of jobs with a global limit per job
+    kind. A job waits in line until it is among the first free slots of its
+    kind, and reports its position in the queue while waiting.
+
+    Usage from a Gradio generator:
+
+        for position in JOB_QUEUE.wait_turn(CRAWL_JOB):
+            yield ..., f"Queued: position {position}"
+        try:
+            ...  # run the job
+        finally:
+            JOB_QUEUE.release(CRAWL_JOB)
+
+    If the caller stops iterating while still waiting (e.g. the browser tab
+    was closed), its place in the line is given up.
+    """
+
+    def __init__(self, limits: Dict[str, int]):
+        self.limits = dict(limits)
+        self._running = Counter()
+        self._waiting: Dict[str, List[object]] = {kind: [] for kind in limits}
+        self._cond = threading.Condition()
+
+    def wait_turn(self, kind: str, poll_s: float = QUEUE_POLL_S) -> Iterator[int]:
+        """
+        Yield the 1-based queue position at least every `poll_s` seconds while
+        waiting, and return once the job may start (it then holds a slot until
+        `release`).
+        """
+        ticket = object()
+        acquired = False
+        with self._cond:
+            self._waiting[kind].append(ticket)
+        try:
+            while True:
+                with self._cond:
+                    position = self._position(kind, ticket)
+                    if position == 0:
+                        self._waiting[kind].remove(ticket)
+                        self._running[kind] += 1
+                        acquired = True
+                        return
+                yield position
+                with self._cond:
+                    # Sleep until a slot is released or a job leaves the line
+                    if self._position(kind, ticket) == position:
+                        self._cond.wait(poll_s)
+        finally:
+            if not acquired:
+                with self._cond:
+                    self._waiting[kind].remove(ticket)
+                    self._cond.notify_all()
+
+    def release(self, kind: str):
+        with self._cond:
+            self._running[kind] -= 1
+            self._cond.notify_all()
+
+    def status(self) -> Dict[str, Dict[str, int]]:
+        """Running and waiting jobs per kind."""
+        with self._cond:
+            return {
+                kind: {
+                    "running": self._running[kind],
+                    "waiting": len(self._waiting[kind]),
+                    "limit": limit,
+                }
+                for kind, limit in self.limits.items()
+            }
+
+    def _position(self, kind: str, ticket: object) -> int:
+        """0 if the ticket may start, else its place among the waiting jobs."""
+        free_slots = max(self.limits[kind] - self._running[kind], 0)
+        index = self._waiting[kind].index(ticket)
+        return 0 if index < free_slots else index - free_slots + 1
+
+
+class PortPool:
+    """
+    Remote debugging ports for concurrent crawls, so every crawl attaches to
+    its own Chrome instance instead of sharing port 9222.
+    """
+
+    def __init__(self, size: int, first_port: int = DEFAULT_CDP_PORT):
+        self._free = list(range(first_port, first_port + size))
+        self._lock = threading.Lock()
+
+    def acquire(self) -> int:
+        with self._lock:
+            if not self._free:
+                raise RuntimeError("No free remote debugging port.")
+            return self._free.pop(0)
+
+    def release(self, port: int):
+        with self._lock:
+            self._free.append(port)
+            self._free.sort()
+
+
+JOB_QUEUE = JobQueue(
+    {CRAWL_JOB: MAX_CONCURRENT_CRAWLS, ANALYSIS_JOB: MAX_CONCURRENT_ANALYSES}
+)
+# A crawl holds its queue slot while it uses a port, so there is always one free
+CDP_PORTS = PortPool(MAX_CONCURRENT_CRAWLS)
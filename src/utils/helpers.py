@@ -1,7 +1,10 @@
+import json
+import os
+import threading
 import time
-import logging
 import random
-from pathlib import Path
+
+from utils.log import LOG_FORMAT, LOG_LEVEL, LOGS_DIR, configure_logging, get_logger
 
 
 # Simple random sleep function for simulating human-like pauses
@@ -10,12 +13,28 @@ def random_sleep(min_s=1, max_s=3):
     time.sleep(duration)
 
 
-def setup_logging(log_file: str = "data/logs/app.log"):
-    """Set up the logging configuration."""
-    Path("data/logs").mkdir(parents=True, exist_ok=True)
-    logging.basicConfig(
-        filename=log_file,
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s",
-    )
-    logging.info("Logging initialized.")
+def setup_logging(
+    log_file: str = os.path.join(LOGS_DIR, "app.log"),
+    level: str = LOG_LEVEL,
+    console_format: str = LOG_FORMAT,
+):
+    """
+    Set up the logging configuration: the scraper's records are written as
+    JSON lines to `log_file` and shown on the console, from a background
+    thread (see utils/log.py).
+    """
+    configure_logging(level=level, console_format=console_format, log_file=log_file)
+    get_logger("helpers").info("Logging initialized.", tag="LOG", emoji="📝")
+
+
+def atomic_write_json(path: str, data, indent=None):
+    """
+    Write `data` as JSON to `path` via a temporary file and os.replace, so
+    concurrent readers see either the old or the new file, never half a file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp_path, path)
@@ -0,0 +1,264 @@
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Union
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+LOGS_DIR = os.path.join(CURRENT_DIR, "..", "data", "logs")
+
+# Parent of every logger returned by `get_logger`; it does not propagate to
+# the root logger, so library logs (httpx, gradio, ...) are left alone
+LOGGER_NAME = "scraper"
+
+# Defaults of `configure_logging`. The console shows the scraper's familiar
+# "⚠️  [TAG] message" lines ("emoji"), JSON lines ("json") or nothing ("none");
+# SCRAPER_LOG_FILE additionally writes JSON lines to a file.
+LOG_LEVEL = os.getenv("SCRAPER_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("SCRAPER_LOG_FORMAT", "emoji")
+LOG_FILE = os.getenv("SCRAPER_LOG_FILE") or None
+LOG_FORMATS = ("emoji", "json", "none")
+
+# Emoji of records logged without one
+LEVEL_EMOJI = {
+    logging.DEBUG: "🔹",
+    logging.INFO: "ℹ️",
+    logging.WARNING: "⚠️",
+    logging.ERROR: "❌",
+    logging.CRITICAL: "❌",
+}
+
+# Ids attached to every record logged inside `log_context`
+RUN_ID: contextvars.ContextVar = contextvars.ContextVar("run_id", default=None)
+SEARCH_ID: contextvars.ContextVar = contextvars.ContextVar("search_id", default=None)
+
+# LogRecord attributes that are not structured fields passed with `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {
+    "message",
+    "asctime",
+    "run_id",
+    "search_id",
+    "tag",
+    "emoji",
+}
+
+_LISTENER: Union[logging.handlers.QueueListener, None] = None
+_QUEUE_HANDLER: Union[logging.Handler, None] = None
+_CONFIGURE_LOCK = threading.Lock()
+
+
+@contextmanager
+def log_context(
+    run_id: Union[str, None] = None, search_id: Union[str, None] = None
+) -> Iterator[None]:
+    """
+    Attach `run_id` and/or `search_id` to the records logged in the block
+    (by this thread or task). Inside generators that may be resumed on other
+    threads (Gradio), enter it around each step rather than across a yield.
+    """
+    tokens = []
+    if run_id is not None:
+        tokens.append((RUN_ID, RUN_ID.set(run_id)))
+    if search_id is not None:
+        tokens.append((SEARCH_ID, SEARCH_ID.set(search_id)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class TaggedLogger(logging.LoggerAdapter):
+    """
+    Logger that takes the console tag and emoji of a record as keyword
+    arguments: `log.info("Found %d cards", n, tag="JOB PARSER", emoji="📃")`.
+    Structured fields go in `extra` as usual.
+    """
+
+    def __init__(self, logger: logging.Logger, tag: Union[str, None] = None):
+        super().__init__(logger, {"tag": tag})
+
+    def process(self, msg, kwargs):
+        extra = dict(self.extra)
+        for key in ("tag", "emoji"):
+            if key in kwargs:
+                extra[key] = kwargs.pop(key)
+        extra.update(kwargs.pop("extra", None) or {})
+        kwargs["extra"] = extra
+        return msg, kwargs
+
+
+def get_logger(name: str, tag: Union[str, None] = None) -> TaggedLogger:
+    """
+    Logger `scraper.<name>` with a default console `tag`. Logging is set up
+    with the defaults (see `configure_logging`) on first use.
+    """
+    if _LISTENER is None:
+        configure_logging()
+    return TaggedLogger(logging.getLogger(f"{LOGGER_NAME}.{name}"), tag=tag)
+
+
+class _ContextFilter(logging.Filter):
+    """Adds the ids of the current `log_context`, in the thread that logs."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "run_id", None) is None:
+            record.run_id = RUN_ID.get()
+        if getattr(record, "search_id", None) is None:
+            record.search_id = SEARCH_ID.get()
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message now (its arguments may change after the call),
+        # but leave formatting to the listener thread, and keep the record's
+        # structured fields instead of merging everything into `msg`
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class EmojiFormatter(logging.Formatter):
+    """The scraper's console style: a blank line, then "✅ [TAG] message"."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        emoji = getattr(record, "emoji", None) or LEVEL_EMOJI.get(record.levelno, "")
+        # Emoji with a variation selector render two cells wide in one column
+        if emoji.endswith("\ufe0f"):
+            emoji += " "
+        tag = getattr(record, "tag", None)
+        line = f"\n{emoji} [{tag}] " if tag else f"\n{emoji} "
+        line += record.getMessage()
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with its context ids and `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "tag": getattr(record, "tag", None),
+            "message": record.getMessage(),
+            "run_id": getattr(record, "run_id", None),
+            "search_id": getattr(record, "search_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """Writes to the current sys.stdout, which the CLI redirects to stderr."""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def configure_logging(
+    level: Union[str, int] = LOG_LEVEL,
+    console_format: str = LOG_FORMAT,
+    log_file: Union[str, None] = LOG_FILE,
+) -> logging.handlers.QueueListener:
+    """
+    Send the scraper's log records through a queue to a listener thread, so
+    the crawl loop only pays for putting a record on the queue; formatting
+    and writing happen in the background. Calling it again replaces the
+    previous configuration.
+
+    Args:
+        level: Lowest level logged, e.g. "DEBUG" for every card and scroll.
+        console_format (str): "emoji", "json" or "none".
+        log_file (str): Also append JSON lines to this file.
+
+    Returns:
+        logging.handlers.QueueListener: The running listener.
+    """
+    global _LISTENER, _QUEUE_HANDLER
+    if console_format not in LOG_FORMATS:
+        raise ValueError(
+            f"Unknown log format {console_format!r}, use one of {LOG_FORMATS}"
+        )
+
+    handlers = []
+    if console_format != "none":
+        console = _ConsoleHandler()
+        console.setFormatter(
+            EmojiFormatter() if console_format == "emoji" else JsonFormatter()
+        )
+        handlers.append(console)
+    if log_file:
+        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    with _CONFIGURE_LOCK:
+        logger = logging.getLogger(LOGGER_NAME)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        if _LISTENER is not None:
+            _LISTENER.stop()  # Writes out the records still in the queue
+            for handler in _LISTENER.handlers:
+                handler.close()
+
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        _QUEUE_HANDLER = _QueueHandler(records)
+        _QUEUE_HANDLER.addFilter(_ContextFilter())
+        logger.addHandler(_QUEUE_HANDLER)
+        logger.setLevel(level)
+        logger.propagate = False
+
+        _LISTENER = logging.handlers.QueueListener(records, *handlers)
+        _LISTENER.start()
+    return _LISTENER
+
+
+def flush_logging():
+    """Block until every record queued so far has been written."""
+    with _CONFIGURE_LOCK:
+        if _LISTENER is not None:
+            # stop() drains the queue and joins the thread; start() a new one
+            _LISTENER.stop()
+            _LISTENER.start()
+
+
+def shutdown_logging():
+    """Write out the queued records and stop the listener thread."""
+    global _LISTENER, _QUEUE_HANDLER
+    with _CONFIGURE_LOCK:
+        if _LISTENER is None:
+            return
+        logging.getLogger(LOGGER_NAME).removeHandler(_QUEUE_HANDLER)
+        _LISTENER.stop()
+        for handler in _LISTENER.handlers:
+            handler.close()
+        _LISTENER = None
+        _QUEUE_HANDLER = None
+
+
+atexit.register(shutdown_logging)
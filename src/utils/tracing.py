@@ -0,0 +1,318 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+TRACES_DIR = os.path.join(CURRENT_DIR, "..", "data", "traces")
+
+# Opt-in profiler for whole crawls: "cprofile", "pyinstrument" or unset
+PROFILER = os.getenv("SCRAPER_PROFILER") or None
+PROFILERS = ("cprofile", "pyinstrument")
+
+# Counter of the messages sent to the Playwright driver (one per page/element
+# API call, i.e. one browser round trip)
+PROTOCOL_COUNTER = "playwright_calls"
+
+# Rows of the printed summary table and of the printed cProfile stats
+SUMMARY_ROWS = 25
+PROFILE_ROWS = 20
+
+# Tracers that count protocol messages, by the Playwright connection they watch
+_TRACED_CONNECTIONS: Dict[int, "Tracer"] = {}
+# Per-method counts of the open `count_protocol_messages` blocks (all connections)
+_MESSAGE_COUNTERS: List[Counter] = []
+_PROTOCOL_HOOK_LOCK = threading.Lock()
+
+
+def _install_protocol_hook() -> bool:
+    """
+    Wrap Playwright's Connection._send_message_to_server with the one hook
+    that feeds every tracer and message counter. Wraps again if something
+    replaced the hook since. Call with _PROTOCOL_HOOK_LOCK held.
+
+    Returns:
+        bool: False when Playwright's internals have changed.
+    """
+    try:
+        from playwright._impl._connection import Connection
+
+        send = Connection._send_message_to_server
+    except (ImportError, AttributeError):
+        return False
+    if getattr(send, "_protocol_hook", None) is _TRACED_CONNECTIONS:
+        return True
+
+    def counting_send(connection, object, method, *args, **kwargs):
+        tracer = _TRACED_CONNECTIONS.get(id(connection))
+        if tracer is not None:
+            tracer.count(PROTOCOL_COUNTER)
+        for counts in _MESSAGE_COUNTERS:
+            counts[method] += 1
+        return send(connection, object, method, *args, **kwargs)
+
+    # Tagged with this module's registry (the module may be imported twice,
+    # as utils.tracing and src.utils.tracing)
+    counting_send._protocol_hook = _TRACED_CONNECTIONS
+    counting_send.__wrapped__ = send
+    Connection._send_message_to_server = counting_send
+    return True
+
+
+def _remove_protocol_hook_if_unused():
+    """Restore the original method once nothing counts messages any more."""
+    if _TRACED_CONNECTIONS or _MESSAGE_COUNTERS:
+        return
+    try:
+        from playwright._impl._connection import Connection
+    except ImportError:
+        return
+    send = Connection._send_message_to_server
+    # Leave it alone if something else has wrapped the hook in the meantime
+    if getattr(send, "_protocol_hook", None) is _TRACED_CONNECTIONS:
+        Connection._send_message_to_server = send.__wrapped__
+
+
+@contextmanager
+def count_protocol_messages() -> Iterator[Union[Counter, None]]:
+    """
+    Count the messages the Playwright client sends to its driver in the block,
+    by method, over every connection. Every sync API call (goto,
+    query_selector, evaluate, inner_text, ...) is at least one of them. Yields
+    None when Playwright's internals have changed.
+    """
+    counts: Counter = Counter()
+    with _PROTOCOL_HOOK_LOCK:
+        if not _install_protocol_hook():
+            counts = None
+        else:
+            _MESSAGE_COUNTERS.append(counts)
+    try:
+        yield counts
+    finally:
+        if counts is not None:
+            with _PROTOCOL_HOOK_LOCK:
+                _MESSAGE_COUNTERS.remove(counts)
+                _remove_protocol_hook_if_unused()
+
+
+class _SpanStats:
+    __slots__ = ("count", "total_s", "child_s", "max_s", "counters")
+
+    def __init__(self):
+        self.count = 0
+        self.total_s = 0.0
+        self.child_s = 0.0
+        self.max_s = 0.0
+        self.counters: Counter = Counter()
+
+
+class Tracer:
+    """
+    Lightweight span tracer for one crawl (or any other run).
+
+    Spans nest (`with tracer.span("search"): with tracer.span("navigate"):`)
+    and are aggregated by their path ("crawl;search;navigate"), so a span on
+    the per-card hot path costs two perf_counter calls and a dict update, and
+    memory does not grow with the number of cards. Counters (`count`) are
+    added to the innermost open span; `instrument_playwright` counts every
+    Playwright call (a round trip to the browser) that way.
+
+    `finish` prints a summary table and writes data/traces/trace_<run_id>.json
+    plus a collapsed-stack file (trace_<run_id>.folded, self time in µs per
+    path) that flamegraph.pl, speedscope or inferno render as a flame graph.
+
+    With `profiler="cprofile"` or `"pyinstrument"` (or SCRAPER_PROFILER set),
+    the code run between `start` and `finish` is also profiled; the profile is
+    saved next to the trace. The span stack belongs to the tracer, not to a
+    thread, so spans may stay open across generator yields; a tracer must not
+    be used by two threads at once.
+    """
+
+    def __init__(
+        self,
+        run_id: Union[str, None] = None,
+        trace_dir: str = TRACES_DIR,
+        profiler: Union[str, None] = PROFILER,
+    ):
+        if profiler is not None and profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler {profiler!r}, use one of {PROFILERS}")
+        self.run_id = run_id or time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        self.trace_dir = trace_dir
+        self.profiler = profiler
+        self.stats: Dict[Tuple[str, ...], _SpanStats] = defaultdict(_SpanStats)
+        self._stack: List[Tuple[Tuple[str, ...], float]] = []
+        self._profile = None
+        self._started_at = None
+        self._connection_id = None
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the block as `name`, nested in the currently open span."""
+        path = (self._stack[-1][0] if self._stack else ()) + (name,)
+        self._stack.append((path, time.perf_counter()))
+        try:
+            yield
+        finally:
+            _, started = self._stack.pop()
+            elapsed = time.perf_counter() - started
+            stats = self.stats[path]
+            stats.count += 1
+            stats.total_s += elapsed
+            stats.max_s = max(stats.max_s, elapsed)
+            if self._stack:
+                self.stats[self._stack[-1][0]].child_s += elapsed
+
+    def count(self, counter: str, n: int = 1):
+        """Add `n` to `counter` of the innermost open span."""
+        path = self._stack[-1][0] if self._stack else ()
+        self.stats[path].counters[counter] += n
+
+    def instrument_playwright(self, page):
+        """
+        Count the Playwright calls made over `page`'s connection, until
+        `finish`. Shares one hook with other tracers and
+        `count_protocol_messages`.
+        """
+        try:
+            connection = page._impl_obj._connection
+        except AttributeError as e:
+            print(f"\n⚠️  [SPANS] Cannot count Playwright calls: {e}")
+            return
+
+        with _PROTOCOL_HOOK_LOCK:
+            if not _install_protocol_hook():
+                print("\n⚠️  [SPANS] Cannot count Playwright calls")
+                return
+            _TRACED_CONNECTIONS[id(connection)] = self
+        self._connection_id = id(connection)
+
+    def start(self):
+        """Start the run (and the profiler, if one is configured)."""
+        self._started_at = time.perf_counter()
+        if self.profiler == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self.profiler == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                print("\n⚠️  [SPANS] pyinstrument is not installed, not profiling")
+                return
+            self._profile = Profiler()
+            self._profile.start()
+
+    def _stop_profiler(self) -> Union[str, None]:
+        if self._profile is None:
+            return None
+        os.makedirs(self.trace_dir, exist_ok=True)
+        if self.profiler == "cprofile":
+            self._profile.disable()
+            path = os.path.join(self.trace_dir, f"profile_{self.run_id}.prof")
+            self._profile.dump_stats(path)
+            output = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=output)
+            stats.sort_stats("cumulative").print_stats(PROFILE_ROWS)
+            print(f"\n🔬 [PROFILE] Top {PROFILE_ROWS} functions by cumulative time:")
+            print(output.getvalue())
+        else:
+            self._profile.stop()
+            path = os.path.join(self.trace_dir, f"profile_{self.run_id}.html")
+            with open(path, "w") as f:
+                f.write(self._profile.output_html())
+        self._profile = None
+        return path
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """One row per span path: count, total/self/avg/max time and counters."""
+        rows = []
+        for path, stats in sorted(self.stats.items()):
+            if not path:
+                continue
+            self_s = max(stats.total_s - stats.child_s, 0.0)
+            rows.append(
+                {
+                    "span": ";".join(path),
+                    "count": stats.count,
+                    "total_s": round(stats.total_s, 4),
+                    "self_s": round(self_s, 4),
+                    "avg_ms": round(stats.total_s / stats.count * 1000, 3)
+                    if stats.count
+                    else 0.0,
+                    "max_ms": round(stats.max_s * 1000, 3),
+                    "counters": dict(stats.counters),
+                }
+            )
+        return rows
+
+    def collapsed_stacks(self) -> List[str]:
+        """Self time per span path, in the collapsed-stack flame graph format."""
+        return [
+            f"{row['span']} {int(row['self_s'] * 1_000_000)}"
+            for row in self.summary()
+            if row["self_s"] > 0
+        ]
+
+    def print_summary(self):
+        rows = sorted(self.summary(), key=lambda row: row["self_s"], reverse=True)
+        total_s = sum(row["self_s"] for row in rows) or 1.0
+        print(f"\n⏱️  [SPANS] Spans of run {self.run_id} by self time:")
+        print(
+            f"   {'span':<44} {'count':>7} {'self s':>8} {'self %':>7} "
+            f"{'avg ms':>9} {'calls':>7}"
+        )
+        for row in rows[:SUMMARY_ROWS]:
+            span = row["span"]
+            if len(span) > 44:
+                span = "…" + span[-43:]
+            print(
+                f"   {span:<44} {row['count']:>7} {row['self_s']:>8.3f} "
+                f"{row['self_s'] / total_s * 100:>6.1f}% {row['avg_ms']:>9.1f} "
+                f"{row['counters'].get(PROTOCOL_COUNTER, 0):>7}"
+            )
+
+    def finish(self) -> Union[str, None]:
+        """
+        Stop profiling, print the summary and write the trace files.
+
+        Returns:
+            str: Path of the JSON report, or None when no span was recorded.
+        """
+        profile_path = self._stop_profiler()
+        with _PROTOCOL_HOOK_LOCK:
+            if _TRACED_CONNECTIONS.get(self._connection_id) is self:
+                del _TRACED_CONNECTIONS[self._connection_id]
+                _remove_protocol_hook_if_unused()
+        if not any(path for path in self.stats):
+            return None
+
+        self.print_summary()
+        os.makedirs(self.trace_dir, exist_ok=True)
+        folded_path = os.path.join(self.trace_dir, f"trace_{self.run_id}.folded")
+        with open(folded_path, "w") as f:
+            f.write("\n".join(self.collapsed_stacks()) + "\n")
+        path = os.path.join(self.trace_dir, f"trace_{self.run_id}.json")
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "run_id": self.run_id,
+                    "elapsed_s": round(time.perf_counter() - self._started_at, 3)
+                    if self._started_at
+                    else None,
+                    "spans": self.summary(),
+                    "unattributed_counters": dict(self.stats[()].counters),
+                    "folded": os.path.basename(folded_path),
+                    "profile": profile_path,
+                },
+                f,
+                indent=2,
+            )
+        print(f"\n⏱️  [SPANS] Trace saved at: {path} (flame graph: {folded_path})")
+        return path
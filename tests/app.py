@@ -0,0 +1,166 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.ui import app
+from src.ui.job_queue import JobQueue, PortPool
+
+REQUEST = SimpleNamespace(session_hash="session-1")
+VIEW = ("", "", "", "", "score", True, 1, 50)
+
+
+class StubParser:
+    def __init__(self, resume_file, num_keywords, data_dir=None):
+        pass
+
+    def iter_keywords_for_search(self, provider, main_job_search_focus):
+        user_data = {"positions": "Data Scientist", "location": "Berlin"}
+        yield dict(user_data)
+        user_data["keyword_combinations"] = "Data Scientist, Python"
+        yield dict(user_data)
+
+
+class StubScraper:
+    """Yields one crawl update per search until the cancel event is set."""
+
+    instances = []
+
+    def __init__(self, headless, data_dir, cdp_port):
+        self.cdp_port = cdp_port
+        self.user_data = {}
+        self.search_url_list = [f"https://example.com/search/{i}" for i in range(5)]
+        self.closed = False
+        StubScraper.instances.append(self)
+
+    def iter_job_listings(self, search_rate_limit, cancel_event):
+        for i in range(search_rate_limit):
+            cancelled = cancel_event.is_set()
+            yield {
+                "jobs": [] if cancelled else [{"job_id": str(i), "title": "Job"}],
+                "search_index": i + 1,
+                "searches_total": search_rate_limit,
+                "jobs_total": i + 1,
+                "jobs_per_min": 60.0,
+                "elapsed_s": 1.0,
+                "cancelled": cancelled,
+                "done": cancelled or i == search_rate_limit - 1,
+            }
+            if cancelled:
+                return
+
+    def close(self):
+        self.closed = True
+
+
+def stub_run_pipeline(resume_file, cdp_port, cancel_event, **kwargs):
+    """Scrapes one job per search until the cancel event is set."""
+    state = {"stage": "scraping", "user_data": {}, "search_urls": [], "jobs": []}
+    for i in range(5):
+        if cancel_event.is_set():
+            break
+        state["search_urls"].append(f"https://example.com/search/{i}")
+        state["jobs"].append({"job_id": str(i), "title": "Job"})
+        yield state
+    state["stage"] = "stopped" if cancel_event.is_set() else "done"
+    yield state
+
+
+@pytest.fixture(autouse=True)
+def stubs(monkeypatch, tmp_path):
+    StubScraper.instances.clear()
+    monkeypatch.setattr(app, "ResumeParser", StubParser)
+    monkeypatch.setattr(app, "LinkedInAutomation", StubScraper)
+    monkeypatch.setattr(app, "run_pipeline", stub_run_pipeline)
+    monkeypatch.setattr(
+        app,
+        "default_chrome_supervisor",
+        lambda: SimpleNamespace(ensure_running=lambda port: None),
+    )
+    monkeypatch.setattr(app, "workspace_dir", lambda session_id: str(tmp_path))
+    monkeypatch.setattr(app, "JOB_QUEUE", JobQueue({"crawl": 1, "analysis": 1}))
+    monkeypatch.setattr(app, "CDP_PORTS", PortPool(1))
+
+
+def test_resume_analysis_streams_every_update():
+    updates = list(
+        app.handle_resume_with_resumeparser(
+            "resume.pdf", 5, "Data Science", "openai", REQUEST
+        )
+    )
+    assert [update[1] for update in updates] == ["Berlin", "Berlin", "Berlin"]
+    assert [update[4] for update in updates] == [
+        "",
+        "Data Scientist, Python",
+        "Data Scientist, Python",
+    ]
+    assert [update[5] for update in updates] == [
+        "**⏳ Analyzing...**",
+        "**⏳ Analyzing...**",
+        "**🏁 Done**",
+    ]
+    assert app.JOB_QUEUE.status()["analysis"]["running"] == 0
+
+
+def test_stop_ends_the_scrape_after_the_current_update():
+    updates = app.handle_scrape_jobs(5, *VIEW, REQUEST)
+    assert next(updates)[2] == "**⏳ Connecting to the browser...**"
+    rows, url_rows, status, _, _ = next(updates)
+    assert [row[1] for row in rows] == ["0"]
+    assert len(url_rows) == 5
+    assert status.startswith("**⏳ Scraping** · search 1/5")
+
+    app.handle_stop_scrape(REQUEST)
+    *_, (rows, _, status, _, _) = updates
+    assert status.startswith("**🛑 Stopped** · search 2/5")
+    # The jobs scraped before the stop stay in the store
+    assert [row[1] for row in rows] == ["0"]
+
+    # The port, the queue slot and the stop flag are released
+    assert StubScraper.instances[0].closed
+    assert app.CDP_PORTS.acquire() == StubScraper.instances[0].cdp_port
+    assert app.JOB_QUEUE.status()["crawl"]["running"] == 0
+    assert REQUEST.session_hash not in app.SCRAPE_CANCEL_EVENTS
+
+
+def test_stop_while_queued_leaves_the_queue():
+    # Another session's crawl holds the only slot
+    list(app.JOB_QUEUE.wait_turn("crawl"))
+
+    updates = app.handle_scrape_jobs(5, *VIEW, REQUEST)
+    assert next(updates)[2] == app._queue_status("crawl", 1)
+    app.handle_stop_scrape(REQUEST)
+    assert [update[2] for update in updates] == ["**🛑 Left the queue**"]
+
+    assert app.JOB_QUEUE.status()["crawl"] == {"running": 1, "waiting": 0, "limit": 1}
+    assert not StubScraper.instances
+    assert REQUEST.session_hash not in app.SCRAPE_CANCEL_EVENTS
+
+
+def test_stop_ends_the_pipeline():
+    updates = app.handle_pipeline("resume.pdf", 5, "Data", "openai", 5, *VIEW, REQUEST)
+    *_, rows, _, status, _, _ = next(updates)
+    assert status == "**⏳ Scraping** · 1 jobs"
+
+    app.handle_stop_scrape(REQUEST)
+    *_, (*_, rows, url_rows, status, _, _) = updates
+    assert status == "**🛑 Stopped** · 1 jobs"
+    assert [row[1] for row in rows] == ["0"]
+    assert len(url_rows) == 1
+
+    assert app.CDP_PORTS.acquire()
+    assert app.JOB_QUEUE.status()["crawl"]["running"] == 0
+    assert app.JOB_QUEUE.status()["analysis"]["running"] == 0
+    assert REQUEST.session_hash not in app.SCRAPE_CANCEL_EVENTS
+
+    # Stop while waiting for the crawl slot leaves the queue
+    list(app.JOB_QUEUE.wait_turn("crawl"))
+    updates = app.handle_pipeline("resume.pdf", 5, "Data", "openai", 5, *VIEW, REQUEST)
+    assert next(updates)[7] == app._queue_status("crawl", 1)
+    app.handle_stop_scrape(REQUEST)
+    assert [update[7] for update in updates] == ["**🛑 Left the queue**"]
+    assert app.JOB_QUEUE.status()["crawl"] == {"running": 1, "waiting": 0, "limit": 1}
+    assert REQUEST.session_hash not in app.SCRAPE_CANCEL_EVENTS
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,128 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+import fitz  # pymupdf
+import pytest
+
+from src.automation import batch
+
+RESUMES = {
+    "alice.pdf": "Alice Smith\nData Scientist, Berlin",
+    "bob.pdf": "Bob Jones\nML Engineer, Munich",
+    "carol.pdf": "Carol White\nData Analyst, Hamburg",
+}
+
+
+class StubAnalysis:
+    """Stands in for `extract_info_and_keywords`; fails for names in `failing`."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.names = []
+        self.lock = threading.Lock()
+
+    def __call__(self, resume_text, routed_sections=None, **kwargs):
+        name = resume_text.split()[0]
+        with self.lock:
+            self.names.append(name)
+        if name in self.failing:
+            raise TimeoutError("model unloaded")
+        return {
+            "user_data": {
+                "current_location": resume_text.split(", ")[-1].strip(),
+                "work_history": [
+                    {"Positions": [name + " role"], "Relevant Skills": ["Python"]}
+                ],
+                "years_experience": 3,
+            },
+            "keyword_sets": [f"{name}, Python"],
+        }
+
+
+@pytest.fixture
+def resume_dir(tmp_path, monkeypatch):
+    # Keep the exported LLM metrics out of src/data
+    metrics_module = sys.modules[batch.llm_run.__module__]
+    monkeypatch.setattr(metrics_module, "METRICS_DIR", str(tmp_path / "metrics"))
+
+    input_dir = tmp_path / "resumes"
+    input_dir.mkdir()
+    for name, text in RESUMES.items():
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), text)
+        doc.save(str(input_dir / name))
+        doc.close()
+    (input_dir / "broken.pdf").write_bytes(b"not a pdf")
+    return input_dir
+
+
+def run_batch(monkeypatch, input_dir, output_path, analysis):
+    monkeypatch.setattr(batch, "extract_info_and_keywords", analysis)
+    return batch.process_resume_directory(
+        str(input_dir), str(output_path), k=1, pdf_workers=1, llm_concurrency=2
+    )
+
+
+def read_jsonl(path):
+    with open(path) as f:
+        rows = [json.loads(line) for line in f]
+    # Later rows for the same path (reruns) replace earlier ones
+    return {row["path"]: (row["status"], row["user_data"]) for row in rows}
+
+
+def read_sqlite(path):
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT path, status, user_data FROM resumes").fetchall()
+    conn.close()
+    return {
+        path: (status, json.loads(user_data) if user_data else None)
+        for path, status, user_data in rows
+    }
+
+
+def test_failed_resumes_do_not_stop_the_batch(monkeypatch, resume_dir, tmp_path):
+    output_path = tmp_path / "results.jsonl"
+    summary = run_batch(
+        monkeypatch, resume_dir, output_path, StubAnalysis(failing={"Carol"})
+    )
+    assert (summary["total"], summary["succeeded"], summary["failed"]) == (4, 2, 2)
+
+    with open(output_path) as f:
+        rows = {os.path.basename(row["path"]): row for row in map(json.loads, f)}
+    assert rows["broken.pdf"]["error"].startswith("PDF parsing failed")
+    assert rows["carol.pdf"]["error"] == "LLM analysis failed: model unloaded"
+    assert rows["alice.pdf"]["status"] == "ok"
+    assert rows["alice.pdf"]["user_data"]["location"] == "Berlin"
+    assert rows["bob.pdf"]["user_data"]["keyword_combinations"] == "Bob, Python"
+
+
+def test_rerun_skips_resumes_that_already_succeeded(
+    monkeypatch, resume_dir, tmp_path
+):
+    output_path = tmp_path / "results.db"
+    run_batch(monkeypatch, resume_dir, output_path, StubAnalysis(failing={"Carol"}))
+
+    # After a restart, only the failed resumes are tried again
+    analysis = StubAnalysis()
+    summary = run_batch(monkeypatch, resume_dir, output_path, analysis)
+    assert analysis.names == ["Carol"]
+    assert (summary["total"], summary["succeeded"], summary["failed"]) == (2, 1, 1)
+
+    rows = read_sqlite(output_path)
+    assert sorted(status for status, _ in rows.values()) == ["error", "ok", "ok", "ok"]
+
+
+def test_jsonl_and_sqlite_outputs_match(monkeypatch, resume_dir, tmp_path):
+    run_batch(monkeypatch, resume_dir, tmp_path / "results.jsonl", StubAnalysis())
+    run_batch(monkeypatch, resume_dir, tmp_path / "results.sqlite", StubAnalysis())
+
+    jsonl_rows = read_jsonl(tmp_path / "results.jsonl")
+    assert len(jsonl_rows) == 4
+    assert jsonl_rows == read_sqlite(tmp_path / "results.sqlite")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+from src.agent.cache import StageCache
+
+
+def test_results_are_persisted_for_other_processes(tmp_path):
+    inputs = {"resume": "abc", "k": 5}
+    StageCache(cache_dir=str(tmp_path)).set("keywords", inputs, ["Data Scientist"])
+
+    # A new cache (e.g. in another process) reads the file written above
+    cache = StageCache(cache_dir=str(tmp_path))
+    assert cache.get("keywords", inputs) == ["Data Scientist"]
+    assert cache.get("keywords", {**inputs, "k": 6}) is None
+    # Only the result file is left behind, no temporary files
+    assert os.listdir(tmp_path / "keywords") == [
+        StageCache.key("keywords", inputs) + ".json"
+    ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,84 @@
+import socket
+import sys
+import textwrap
+
+import pytest
+
+from src.automation.chrome import ChromeSupervisor, cdp_version
+
+# Stands in for Chrome: serves /json/version on --remote-debugging-port after
+# a short startup delay
+FAKE_CHROME = textwrap.dedent(
+    """
+    import http.server, json, sys, time
+
+    port = int(next(a for a in sys.argv if a.startswith("--remote-debugging-port="))
+               .split("=")[1])
+    time.sleep(0.3)
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps({"Browser": "FakeChrome/1.0"}).encode()
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    http.server.HTTPServer(("127.0.0.1", port), Handler).serve_forever()
+    """
+)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def supervisor(tmp_path):
+    script = tmp_path / "fake_chrome.py"
+    script.write_text(FAKE_CHROME)
+    supervisor = ChromeSupervisor(
+        chrome_command=[sys.executable, str(script)],
+        profiles_dir=str(tmp_path / "profiles"),
+    )
+    yield supervisor
+    supervisor.shutdown()
+
+
+def test_waits_for_readiness_and_reuses_the_instance(supervisor):
+    port = free_port()
+    assert cdp_version(port) is None
+
+    assert supervisor.ensure_running(port)["Browser"] == "FakeChrome/1.0"
+    # Already running: nothing new is launched
+    assert supervisor.start(port) is False
+
+    supervisor.stop(port)
+    assert cdp_version(port) is None
+
+
+def test_restarts_a_crashed_instance(supervisor):
+    port = free_port()
+    supervisor.ensure_running(port)
+    supervisor._processes[port].kill()
+    supervisor._processes[port].wait()
+
+    supervisor.ensure_running(port)
+    assert supervisor.restarts(port) == 1
+
+
+def test_reports_an_instance_that_exits_before_it_is_ready(tmp_path):
+    supervisor = ChromeSupervisor(
+        chrome_command=[sys.executable, "-c", "import sys; sys.exit(3)"],
+        profiles_dir=str(tmp_path / "profiles"),
+    )
+    with pytest.raises(RuntimeError, match="exited with code 3"):
+        supervisor.ensure_running(free_port())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,95 @@
+import time
+
+from src.agent.chunking import chunk_text, estimate_tokens, iter_chunks
+
+
+RESUME_TEXT = (
+    "Jane Doe\nBerlin, Germany\n"
+    "SUMMARY\nData scientist with eight years of experience. Loves Python.\n"
+    "EXPERIENCE\n"
+    + "".join(
+        f"Acme {i} - Data Scientist - 01/2015 - 12/2016. Built models for churn.\n"
+        for i in range(30)
+    )
+    + "SKILLS\nPython, SQL, Spark\n"
+)
+
+
+def test_short_text_is_a_single_chunk():
+    # Fewer words than a chunk must not fail and must keep all the text
+    assert chunk_text("Jane Doe\nPython developer.", max_tokens=100) == [
+        "Jane Doe\nPython developer."
+    ]
+    assert chunk_text("", max_tokens=100) == []
+
+
+def chunk_spans(text, chunks):
+    """(start, end) offsets of each chunk in `text`."""
+    spans = []
+    start = 0
+    for chunk in chunks:
+        start = text.index(chunk, start)
+        spans.append((start, start + len(chunk)))
+        start += 1
+    return spans
+
+
+def test_chunks_respect_budget_and_sentence_boundaries():
+    chunks = chunk_text(RESUME_TEXT, max_tokens=200)
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert estimate_tokens(chunk) <= 200
+    # Every chunk ends at the end of a sentence or of a line, never mid-sentence
+    for _, end in chunk_spans(RESUME_TEXT, chunks)[:-1]:
+        assert RESUME_TEXT[end - 1] == "." or RESUME_TEXT[end] == "\n"
+        assert RESUME_TEXT[end] in " \n"
+    # Without overlap no text is lost or duplicated
+    assert "".join(chunks).replace("\n", "") == RESUME_TEXT.strip().replace("\n", "")
+
+
+def test_overlap_repeats_the_tail_of_the_previous_chunk():
+    chunks = chunk_text(RESUME_TEXT, max_tokens=200, overlap_tokens=40)
+    spans = chunk_spans(RESUME_TEXT, chunks)
+    for (_, previous_end), (start, _), current in zip(spans, spans[1:], chunks[1:]):
+        if current.startswith("SKILLS"):
+            # A section heading starts a fresh chunk, without overlap
+            assert start >= previous_end
+            continue
+        overlap = RESUME_TEXT[start:previous_end]
+        assert overlap.strip() and estimate_tokens(overlap) <= 40
+
+
+def test_section_heading_starts_a_new_chunk():
+    text = (
+        "EXPERIENCE\n"
+        + "Acme - Data Scientist - 01/2015 - 12/2016. Built models for churn.\n" * 3
+        + "SKILLS\nPython, SQL, Spark\n"
+    )
+    chunks = chunk_text(text, max_tokens=100)
+    assert len(chunks) == 2
+    assert chunks[0].startswith("EXPERIENCE")
+    assert chunks[1].startswith("SKILLS")
+
+
+def test_pieces_can_split_sentences():
+    pages = [RESUME_TEXT[:333], RESUME_TEXT[333:1000], RESUME_TEXT[1000:]]
+    assert list(iter_chunks(pages, max_tokens=200)) == chunk_text(
+        RESUME_TEXT, max_tokens=200
+    )
+
+
+def test_large_document_chunks_in_milliseconds():
+    text = RESUME_TEXT * 200
+    started = time.perf_counter()
+    chunks = chunk_text(text, model="llama3.2", overlap_tokens=100)
+    assert time.perf_counter() - started < 0.5
+    assert len(chunks) > 10
+
+
+if __name__ == "__main__":
+    test_short_text_is_a_single_chunk()
+    test_chunks_respect_budget_and_sentence_boundaries()
+    test_overlap_repeats_the_tail_of_the_previous_chunk()
+    test_section_heading_starts_a_new_chunk()
+    test_pieces_can_split_sentences()
+    test_large_document_chunks_in_milliseconds()
@@ -0,0 +1,77 @@
+import random
+import time
+
+from src.automation.dedupe import NearDuplicateIndex
+
+DESCRIPTION = (
+    "We are looking for a data scientist to build forecasting models in Python "
+    "and PyTorch, own the ML pipeline end to end and work closely with product."
+)
+
+
+def make_job(job_id, title, company="Acme", location="Berlin", description=""):
+    return {
+        "job_id": job_id,
+        "title": title,
+        "company": company,
+        "location": location,
+        "description": description,
+    }
+
+
+def test_reposts_are_clustered():
+    index = NearDuplicateIndex()
+    assert index.add(make_job("1", "Data Scientist", description=DESCRIPTION)) == "1"
+    assert index.add(make_job("2", "Accountant", description="Bookkeeping.")) == "2"
+    # Same role reposted under a new job_id, with a slightly edited description
+    repost = make_job("3", "Data Scientist", description=DESCRIPTION + " Apply now!")
+    assert index.add(repost) == "1"
+    assert index.clusters() == {"1": ["1", "3"]}
+
+
+def test_same_title_at_other_company_is_not_a_duplicate():
+    index = NearDuplicateIndex()
+    index.add(make_job("1", "Data Scientist", company="Acme Analytics GmbH"))
+    cluster_id = index.add(make_job("2", "Data Scientist", company="Globex Retail AG"))
+    assert cluster_id == "2"
+    assert index.clusters() == {}
+
+
+def test_similar_cards_in_the_same_city_are_not_merged():
+    # Cards as the scraper fills them: no description
+    location = "Berlin, Germany (Hybrid)"
+    index = NearDuplicateIndex()
+    assert index.add(make_job("1", "Data Scientist", location=location)) == "1"
+    assert index.add(make_job("2", "Senior Data Scientist", location=location)) == "2"
+    assert index.add(make_job("3", "Lead Data Scientist", location=location)) == "3"
+    other_company = make_job("4", "Data Scientist", "Randstad", location=location)
+    assert index.add(other_company) == "4"
+    other_city = make_job("5", "Data Scientist", location="Munich, Germany (Hybrid)")
+    assert index.add(other_city) == "5"
+    assert index.clusters() == {}
+
+    # The same card reposted under a new job_id is still found
+    repost = make_job("6", "Data Scientist (m/w/d)", "Acme GmbH", location=location)
+    assert index.add(repost) == "1"
+    assert index.clusters() == {"1": ["1", "6"]}
+
+
+def test_insert_is_fast_on_many_jobs():
+    rng = random.Random(0)
+    words = [f"word{i}" for i in range(2000)]
+    index = NearDuplicateIndex()
+    started = time.perf_counter()
+    for job_id in range(5000):
+        description = " ".join(rng.choices(words, k=40))
+        index.add(make_job(str(job_id), "Engineer", description=description))
+    elapsed = time.perf_counter() - started
+    assert len(index) == 5000
+    assert index.clusters() == {}
+    assert elapsed < 10
+
+
+if __name__ == "__main__":
+    test_reposts_are_clustered()
+    test_same_title_at_other_company_is_not_a_duplicate()
+    test_similar_cards_in_the_same_city_are_not_merged()
+    test_insert_is_fast_on_many_jobs()
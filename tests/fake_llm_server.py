@@ -0,0 +1,95 @@
+import json
+
+import ollama
+import openai
+import pytest
+
+from benchmarks.fake_llm_server import FakeLLMServer
+from src.agent import prompts
+
+
+@pytest.fixture
+def server():
+    server = FakeLLMServer(latency_ms=0, tokens_per_s=0).start()
+    yield server
+    server.stop()
+
+
+def keyword_messages(k):
+    return [
+        {"role": "system", "content": prompts.KEYWORD_GEN_SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": prompts.KEYWORD_GEN_USER_PROMPT.format(
+                work_history="[]", main_job_search_focus="Data Science", k=k
+            ),
+        },
+    ]
+
+
+def test_openai_api_answers_each_prompt_in_its_format(server):
+    client = openai.OpenAI(base_url=f"{server.url}/v1", api_key="fake", max_retries=0)
+
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {
+                "role": "system",
+                "content": prompts.SMALL_LOCATION_EXTRACTOR_SYSTEM_PROMPT,
+            },
+            {"role": "user", "content": "Jane Doe, Berlin"},
+        ],
+    )
+    assert "current_location" in json.loads(response.choices[0].message.content)
+    assert response.usage.completion_tokens > 0
+
+    stream = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=keyword_messages(k=7),
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    text = "".join(
+        chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices
+    )
+    assert len(json.loads(text)["keyword_sets"]) == 7
+    assert server.stats()["by_prompt"] == {
+        "SMALL_LOCATION_EXTRACTOR_SYSTEM_PROMPT": 1,
+        "KEYWORD_GEN_SYSTEM_PROMPT": 1,
+    }
+
+
+def test_ollama_api_streams_the_work_history(server):
+    server.tokens_per_s = 10_000
+    client = ollama.Client(host=server.url)
+    chunks = list(
+        client.chat(
+            model="llama3.2",
+            messages=[
+                {
+                    "role": "system",
+                    "content": prompts.SMALL_INFO_EXTRACTOR_SYSTEM_PROMPT,
+                },
+                {"role": "user", "content": "resume"},
+            ],
+            stream=True,
+        )
+    )
+    assert len(chunks) > 2 and chunks[-1]["done"]
+    text = "".join(chunk["message"]["content"] for chunk in chunks)
+    assert json.loads(text)["company_names"]
+
+
+def test_injects_errors(server):
+    server.error_rate = 1.0
+    server.error_status = 429
+    client = openai.OpenAI(base_url=f"{server.url}/v1", api_key="fake", max_retries=0)
+    with pytest.raises(openai.RateLimitError):
+        client.chat.completions.create(
+            model="gpt-4o-mini", messages=keyword_messages(3)
+        )
+    assert server.stats()["errors"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
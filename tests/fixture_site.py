@@ -0,0 +1,62 @@
+import re
+import urllib.request
+
+import pytest
+
+from benchmarks.fixture_site import SCROLL_CONTAINER_CLASS, FixtureSite
+
+
+@pytest.fixture
+def site():
+    site = FixtureSite(
+        cards_per_page=10, initial_cards=4, cards_per_load=3, latency_ms=0
+    ).start()
+    yield site
+    site.stop()
+
+
+def fetch(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.read().decode()
+
+
+def job_ids(html):
+    return re.findall(r'data-job-id="(\d+)"', html)
+
+
+def test_search_page_renders_the_first_cards_and_lazy_loads_the_rest(site):
+    url = site.search_urls(1)[0]
+    page = fetch(url)
+    assert SCROLL_CONTAINER_CLASS in page
+    assert "artdeco-pagination__pages" in page
+    first_cards = job_ids(page)
+    assert len(first_cards) == 4
+
+    loaded = list(first_cards)
+    while len(loaded) < site.cards_per_page:
+        more = job_ids(
+            fetch(
+                f"{site.url}/api/cards?keywords=benchmark+search+0&start=0"
+                f"&offset={len(loaded)}"
+            )
+        )
+        assert more
+        loaded += more
+
+    assert set(loaded) == site.expected_job_ids([url])
+    assert site.request_counts["search_page"] == 1
+    assert site.request_counts["card_api"] == 2
+
+
+def test_jobs_are_deterministic_and_partly_shared_between_searches(site):
+    first, second = site.search_urls(2)
+    assert site.expected_job_ids([first]) == site.expected_job_ids([first])
+
+    site.overlap = 1.0
+    assert site.expected_job_ids([first]) == site.expected_job_ids([second])
+    site.overlap = 0.0
+    assert not site.expected_job_ids([first]) & site.expected_job_ids([second])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,180 @@
+import time
+
+import pytest
+
+from src.agent import intelligence
+from src.agent.cache import StageCache
+
+RESUME = "Jane Doe, Berlin, Germany\nData Scientist at Acme, 2019 - Present"
+
+WORK_HISTORY_OUTPUT = (
+    '{"company_names": {"Acme": {"Positions": ["Data Scientist"], '
+    '"Start Date": "2019", "End Date": "2021", "Relevant Skills": ["Python"]}}}'
+)
+
+LOCAL_RESUME = """Jane Doe
+Berlin, Germany | jane@example.com | +49 151 234567
+EXPERIENCE
+Data Scientist | Acme GmbH
+2019 - Present
+Built forecasting models in Python, SQL and PyTorch on AWS.
+Data Analyst | Initech
+2016 - 2019
+Reporting with SQL, Tableau and Excel.
+EDUCATION
+MSc Statistics, TU Berlin
+2014 - 2016"""
+
+
+def test_failed_stages_are_retried_on_the_next_call(monkeypatch):
+    cache = StageCache(cache_dir=None)
+    monkeypatch.setattr(intelligence, "default_stage_cache", lambda: cache)
+
+    calls = []
+    responses = {"current_location": "not json", "work_history": ""}
+
+    def fake_call_llm(system_prompt, user_prompt, response_schema=None, **kwargs):
+        calls.append(response_schema["name"])
+        return responses[response_schema["name"]]
+
+    monkeypatch.setattr(intelligence, "call_llm", fake_call_llm)
+    monkeypatch.setattr(intelligence, "stream_llm", lambda **kwargs: iter(()))
+
+    def analyze():
+        *_, result = intelligence.stream_info_and_keywords(RESUME, provider="openai")
+        return result["user_data"]
+
+    user_data = analyze()
+    assert user_data["current_location"] == ""
+    assert user_data["work_history"] == []
+    assert calls == ["current_location", "work_history"]
+
+    # Both stages failed, so the second call asks the LLM again
+    responses["current_location"] = '{"current_location": "Berlin, Germany"}'
+    responses["work_history"] = WORK_HISTORY_OUTPUT
+    user_data = analyze()
+    assert user_data["current_location"] == "Berlin, Germany"
+    assert user_data["years_experience"] == 2
+    assert calls == ["current_location", "work_history"] * 2
+
+    # Now they succeeded and are served from the cache
+    analyze()
+    assert calls == ["current_location", "work_history"] * 2
+
+
+def test_changing_k_or_the_focus_only_reruns_the_keyword_stage(monkeypatch):
+    cache = StageCache(cache_dir=None)
+    monkeypatch.setattr(intelligence, "default_stage_cache", lambda: cache)
+
+    calls = []
+    responses = {
+        "current_location": '{"current_location": "Berlin, Germany"}',
+        "work_history": WORK_HISTORY_OUTPUT,
+    }
+
+    def fake_call_llm(system_prompt, user_prompt, response_schema=None, **kwargs):
+        calls.append(response_schema["name"])
+        return responses[response_schema["name"]]
+
+    def fake_stream_llm(system_prompt, user_prompt, openai_model="gpt-4", **kwargs):
+        calls.append("keywords")
+        yield '{"keyword_sets": ["Data Scientist, Python", '
+        yield f'"{openai_model}"]}}'
+
+    monkeypatch.setattr(intelligence, "call_llm", fake_call_llm)
+    monkeypatch.setattr(intelligence, "stream_llm", fake_stream_llm)
+
+    def analyze(**kwargs):
+        calls.clear()
+        *_, result = intelligence.stream_info_and_keywords(
+            RESUME, **{"provider": "openai", "k": 2, **kwargs}
+        )
+        return result
+
+    result = analyze()
+    assert calls == ["current_location", "work_history", "keywords"]
+    assert result["keyword_sets"] == ["Data Scientist, Python", "gpt-4"]
+
+    analyze()
+    assert calls == []
+    analyze(k=3)
+    assert calls == ["keywords"]
+    result = analyze(main_job_search_focus="Machine Learning")
+    assert calls == ["keywords"]
+    assert result["user_data"]["current_location"] == "Berlin, Germany"
+    assert result["user_data"]["years_experience"] == 2
+
+    # Another model's keyword sets are never reused
+    result = analyze(openai_model="gpt-4o-mini")
+    assert calls == ["current_location", "work_history", "keywords"]
+    assert result["keyword_sets"][-1] == "gpt-4o-mini"
+    analyze(provider="ollama", ollama_model="llama3.2")
+    analyze(provider="ollama", ollama_model="mistral")
+    assert calls == ["current_location", "work_history", "keywords"]
+
+
+def test_keyword_sets_use_the_selected_ollama_model(monkeypatch):
+    models = []
+
+    def fake_stream_llm(system_prompt, user_prompt, ollama_model="mistral", **kwargs):
+        models.append(ollama_model)
+        yield '{"keyword_sets": ["Data Scientist, Python"]}'
+
+    monkeypatch.setattr(intelligence, "call_llm", lambda **kwargs: "")
+    monkeypatch.setattr(intelligence, "stream_llm", fake_stream_llm)
+    list(
+        intelligence.stream_info_and_keywords(
+            RESUME, provider="ollama", ollama_model="qwen2.5", use_cache=False
+        )
+    )
+    *_, keyword_sets = intelligence.stream_keyword_sets([], provider="ollama")
+    assert keyword_sets == ["Data Scientist, Python"]
+    assert models == ["qwen2.5", "llama3.2"]
+
+
+def test_local_provider_extracts_everything_without_an_llm(monkeypatch):
+    def no_llm(*args, **kwargs):
+        raise AssertionError("the local provider called an LLM")
+
+    monkeypatch.setattr(intelligence, "call_llm", no_llm)
+    monkeypatch.setattr(intelligence, "stream_llm", no_llm)
+
+    *_, result = intelligence.stream_info_and_keywords(
+        LOCAL_RESUME, k=5, provider="local", main_job_search_focus="Data Science"
+    )
+    user_data = result["user_data"]
+    assert user_data["current_location"] == "Berlin, Germany"
+
+    acme, initech = user_data["work_history"]
+    assert (acme["Company"], acme["Positions"]) == ("Acme GmbH", ["Data Scientist"])
+    assert (acme["Start Date"], acme["End Date"]) == ("2019", "Present")
+    assert {"Python", "SQL", "PyTorch", "AWS"} <= set(acme["Relevant Skills"])
+    assert (initech["Company"], initech["Positions"]) == ("Initech", ["Data Analyst"])
+    assert (initech["Start Date"], initech["End Date"]) == ("2016", "2019")
+    # Skills of a job do not leak into the next one
+    assert "PyTorch" not in initech["Relevant Skills"]
+    assert "Tableau" in initech["Relevant Skills"]
+    assert user_data["years_experience"] == time.localtime().tm_year - 2016
+
+    keyword_sets = result["keyword_sets"]
+    assert len(keyword_sets) == len(set(keyword_sets)) == 5
+    assert all(keyword_set.strip() for keyword_set in keyword_sets)
+    assert keyword_sets[0].startswith("Data Science, ")
+    assert len(result["keyword_urls"]) == 5
+
+
+def test_rake_ranks_phrases_by_word_degree():
+    phrases = intelligence.rake_phrases(
+        "Built forecasting models. Deployed forecasting pipelines with Airflow. "
+        "Designed real time pricing systems"
+    )
+    # Runs longer than max_words (3) are not candidates
+    assert phrases == [
+        ("Built forecasting models", 9.0),
+        ("Deployed forecasting pipelines", 9.0),
+        ("Airflow", 1.0),
+    ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,82 @@
+import threading
+
+from src.ui.job_queue import JobQueue, PortPool
+
+
+def test_jobs_wait_in_line_until_a_slot_is_released():
+    job_queue = JobQueue({"crawl": 1})
+
+    # The first job starts right away
+    assert list(job_queue.wait_turn("crawl")) == []
+
+    second = job_queue.wait_turn("crawl", poll_s=0.01)
+    third = job_queue.wait_turn("crawl", poll_s=0.01)
+    assert next(second) == 1
+    assert next(third) == 2
+    assert job_queue.status()["crawl"] == {"running": 1, "waiting": 2, "limit": 1}
+
+    job_queue.release("crawl")
+    # The second job gets the slot, the third one moves up
+    assert list(second) == []
+    assert next(third) == 1
+
+    job_queue.release("crawl")
+    assert list(third) == []
+    job_queue.release("crawl")
+    assert job_queue.status()["crawl"]["running"] == 0
+
+
+def test_abandoned_waiters_leave_the_line():
+    job_queue = JobQueue({"analysis": 1})
+    list(job_queue.wait_turn("analysis"))
+
+    leaving = job_queue.wait_turn("analysis", poll_s=0.01)
+    staying = job_queue.wait_turn("analysis", poll_s=0.01)
+    assert next(leaving) == 1
+    assert next(staying) == 2
+
+    leaving.close()
+    assert next(staying) == 1
+    assert job_queue.status()["analysis"]["waiting"] == 1
+
+
+def test_concurrency_limit_holds_under_load():
+    job_queue = JobQueue({"crawl": 2})
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def job():
+        for _ in job_queue.wait_turn("crawl", poll_s=0.01):
+            pass
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        threading.Event().wait(0.01)
+        with lock:
+            running.pop()
+        job_queue.release("crawl")
+
+    threads = [threading.Thread(target=job) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) <= 2
+    assert len(peak) == 10
+
+
+def test_port_pool_hands_out_distinct_ports():
+    ports = PortPool(2, first_port=9300)
+    first, second = ports.acquire(), ports.acquire()
+    assert {first, second} == {9300, 9301}
+    ports.release(first)
+    assert ports.acquire() == first
+
+
+if __name__ == "__main__":
+    test_jobs_wait_in_line_until_a_slot_is_released()
+    test_abandoned_waiters_leave_the_line()
+    test_concurrency_limit_holds_under_load()
+    test_port_pool_hands_out_distinct_ports()
@@ -0,0 +1,134 @@
+import time
+
+from src.automation.job_store import JobStore
+
+
+def make_job(job_id, title, company, location="Berlin", tags=(), duplicate_of=""):
+    return {
+        "job_id": job_id,
+        "title": title,
+        "company": company,
+        "location": location,
+        "benefits": "",
+        "footer_tags": list(tags),
+        "job_url": f"https://www.linkedin.com/jobs/view/{job_id}/",
+        "duplicate_of": duplicate_of,
+    }
+
+
+JOBS = [
+    make_job("1", "Senior Data Scientist", "Acme", tags=["Easy Apply"]),
+    make_job("2", "Data Engineer", "Acme Labs", location="Munich"),
+    make_job("3", "Frontend Developer", "Globex", tags=["Easy Apply", "Promoted"]),
+    make_job("4", "Data Scientist", "Initech", location="Berlin (Remote)"),
+    make_job("5", "Senior Data Scientist", "Acme", duplicate_of="1"),
+]
+
+
+def make_store(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    assert store.add_jobs(JOBS) == 5
+    store.rescore({"positions": "Data Scientist", "skills": "Python"})
+    return store
+
+
+def test_filters_run_in_the_store(tmp_path):
+    store = make_store(tmp_path)
+
+    jobs, total = store.query()
+    # Reposts are hidden, the best matches come first
+    assert total == 4
+    assert {job["job_id"] for job in jobs[:2]} == {"1", "4"}
+
+    assert store.query(company="acme")[1] == 2
+    assert store.query(location="berlin")[1] == 3
+    assert {job["job_id"] for job in store.query(tag="easy apply")[0]} == {"1", "3"}
+    assert {job["job_id"] for job in store.query(text="scien berl")[0]} == {"1", "4"}
+    assert store.query(text="100%_", company="a%")[1] == 0
+    assert store.query(include_duplicates=True)[1] == 5
+
+
+def test_pages_and_sorting(tmp_path):
+    store = make_store(tmp_path)
+
+    first, total = store.query(sort_by="title", descending=False, page_size=3)
+    second, _ = store.query(sort_by="title", descending=False, page=2, page_size=3)
+    assert total == 4
+    assert [job["title"] for job in first + second] == [
+        "Data Engineer",
+        "Data Scientist",
+        "Frontend Developer",
+        "Senior Data Scientist",
+    ]
+
+
+def test_updates_keep_one_row_per_job(tmp_path):
+    store = make_store(tmp_path)
+
+    renamed = make_job("3", "Frontend Engineer", "Globex", tags=["Promoted"])
+    assert store.add_jobs([renamed]) == 0
+    assert {job["job_id"] for job in store.query(text="engineer")[0]} == {"2", "3"}
+    assert store.query(tag="Easy Apply")[1] == 1
+    assert store.tags() == ["Easy Apply", "Promoted"]
+    assert store.job_ids() == {"1", "2", "3", "4", "5"}
+
+
+def query_plans(store, **filters):
+    """The query plans of the statements `store.query(**filters)` runs."""
+    statements = []
+    store.conn.set_trace_callback(statements.append)
+    rows, _ = store.query(**filters)
+    store.conn.set_trace_callback(None)
+
+    plans = []
+    for statement in statements:
+        if statement.lstrip().startswith("SELECT"):
+            plan = store.conn.execute(f"EXPLAIN QUERY PLAN {statement}")
+            plans.append(" / ".join(row[3] for row in plan))
+    return plans
+
+
+def test_filters_and_sorts_use_indexes(tmp_path):
+    store = make_store(tmp_path)
+
+    count_plan, page_plan = query_plans(store, sort_by="title")
+    assert "jobs_title_nocase" in page_plan and "TEMP B-TREE" not in page_plan
+    for column in ("company", "location"):
+        for plan in query_plans(store, **{column: "acme"}):
+            assert f"USING COVERING INDEX jobs_{column}_nocase" in plan or (
+                f"USING INDEX jobs_{column}_nocase" in plan
+            )
+            assert f"{column}>? AND {column}<?" in plan
+
+
+def test_pages_of_a_large_store_are_fast(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.add_jobs(
+        [
+            make_job(str(i), f"Data Scientist {i}", f"Company {i % 500}")
+            for i in range(20000)
+        ]
+    )
+
+    started = time.perf_counter()
+    jobs, total = store.query(
+        company="company 42", sort_by="company", page=2, page_size=20
+    )
+    # "Company 42" and "Company 420" to "Company 429"
+    assert total == 440 and len(jobs) == 20
+    assert time.perf_counter() - started < 0.5
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+
+    for test in (
+        test_filters_run_in_the_store,
+        test_pages_and_sorting,
+        test_filters_and_sorts_use_indexes,
+        test_updates_keep_one_row_per_job,
+        test_pages_of_a_large_store_are_fast,
+    ):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            test(pathlib.Path(tmp_dir))
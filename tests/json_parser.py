@@ -0,0 +1,54 @@
+from src.agent.json_parser import (
+    PARSE_METRICS,
+    IncrementalJSONParser,
+    parse_json_lenient,
+    reset_parse_metrics,
+)
+
+
+def test_parse_json_lenient_ignores_prose_and_fences():
+    output = 'Sure! Here [is] the JSON:\n```json\n{"current_location": "Berlin"}\n```\nDone.'
+    assert parse_json_lenient(output) == {"current_location": "Berlin"}
+
+
+def test_parse_json_lenient_skips_bracketed_values_in_the_prose():
+    output = 'See reference [1] and ["a"]: {"current_location": "Berlin"}'
+    assert parse_json_lenient(output) == {"current_location": "Berlin"}
+    assert parse_json_lenient('Jobs: [{"title": "ML Engineer"}]') == [
+        {"title": "ML Engineer"}
+    ]
+    assert parse_json_lenient("Only [1] here") is None
+
+
+def test_parse_json_lenient_repairs_trailing_commas_and_truncation():
+    reset_parse_metrics()
+    assert parse_json_lenient('{"keyword_sets": ["a", "b",],}') == {
+        "keyword_sets": ["a", "b"]
+    }
+    assert parse_json_lenient('{"keyword_sets": ["a", "b", "c') == {
+        "keyword_sets": ["a", "b"]
+    }
+    assert parse_json_lenient("no json here") is None
+    assert PARSE_METRICS == {"total": 3, "repaired": 2, "failed": 1}
+
+
+def test_incremental_parser_only_returns_complete_values():
+    parser = IncrementalJSONParser()
+    seen = []
+    for char in '{"keyword_sets": ["Data Scientist, Python", "ML \\"Engineer\\""]}':
+        value = parser.feed(char)
+        if value and value.get("keyword_sets") and value["keyword_sets"] not in seen:
+            seen.append(list(value["keyword_sets"]))
+
+    assert seen == [
+        ["Data Scientist, Python"],
+        ["Data Scientist, Python", 'ML "Engineer"'],
+    ]
+    assert parser.done
+
+
+if __name__ == "__main__":
+    test_parse_json_lenient_ignores_prose_and_fences()
+    test_parse_json_lenient_skips_bracketed_values_in_the_prose()
+    test_parse_json_lenient_repairs_trailing_commas_and_truncation()
+    test_incremental_parser_only_returns_complete_values()
@@ -0,0 +1,28 @@
+from src.agent.lexicon import find_skills, find_titles
+
+
+def test_skills_respect_word_boundaries_and_aliases():
+    text = "Worked at Google with Golang, k8s and Spring Boot. Python, R, SQL."
+    skills = find_skills(text)
+    assert skills["Go"] == 1
+    assert skills["Kubernetes"] == 1
+    assert skills["Spring Boot"] == 1
+    assert "Spring" not in skills
+    assert skills["R"] == 1
+
+
+def test_ambiguous_skills_need_a_list_context():
+    assert "Go" not in find_skills("Ready to go live with the product")
+    assert "C" not in find_skills("Reported to the C level management")
+    assert find_skills("Languages: C, C++, Go")["C"] == 1
+
+
+def test_titles_are_counted():
+    titles = find_titles("Senior Data Scientist\nData Scientist | ML Engineer")
+    assert titles == {"Data Scientist": 2, "ML Engineer": 1}
+
+
+if __name__ == "__main__":
+    test_skills_respect_word_boundaries_and_aliases()
+    test_ambiguous_skills_need_a_list_context()
+    test_titles_are_counted()
@@ -0,0 +1,170 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.agent import llm
+from src.agent.metrics import LLMRunMetrics
+from src.agent.prompts import KEYWORD_GEN_SYSTEM_PROMPT
+from src.agent.schemas import LOCATION_SCHEMA
+
+
+def openai_chunk(content=None, usage=None):
+    choices = []
+    if content is not None:
+        choices.append(SimpleNamespace(delta=SimpleNamespace(content=content)))
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class FakeOpenAI:
+    """Stands in for the `openai` module: records requests, returns `response`."""
+
+    def __init__(self, response):
+        self.requests = []
+        self.response = response
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+@pytest.fixture
+def run(monkeypatch):
+    run = LLMRunMetrics(run_id="test")
+    monkeypatch.setattr(llm, "current_run", lambda: run)
+    return run
+
+
+def use_openai(monkeypatch, response):
+    fake = FakeOpenAI(response)
+    monkeypatch.setattr(llm, "openai", fake)
+    monkeypatch.setattr(llm, "OPENAI_AVAILABLE", True)
+    return fake
+
+
+def test_stream_llm_yields_openai_deltas_and_records_usage(monkeypatch, run):
+    usage = SimpleNamespace(
+        prompt_tokens=40, completion_tokens=6, prompt_tokens_details=None
+    )
+    stream = [
+        openai_chunk('{"keyword_sets": '),
+        openai_chunk(""),
+        openai_chunk('["Data Scientist"]}'),
+        openai_chunk(usage=usage),
+    ]
+    fake = use_openai(monkeypatch, iter(stream))
+
+    deltas = list(llm.stream_llm(KEYWORD_GEN_SYSTEM_PROMPT, "Jane", provider="openai"))
+    assert deltas == ['{"keyword_sets": ', '["Data Scientist"]}']
+    assert fake.requests[0]["stream"] is True
+    assert fake.requests[0]["stream_options"] == {"include_usage": True}
+
+    (call,) = run.calls
+    assert call["prompt_name"] == "KEYWORD_GEN_SYSTEM_PROMPT"
+    assert call["streamed"] and call["error"] is None
+    assert (call["prompt_tokens"], call["completion_tokens"]) == (40, 6)
+
+
+def test_stream_llm_yields_ollama_deltas(monkeypatch, run):
+    def fake_chat(model, messages, stream=False, **kwargs):
+        assert stream
+        yield {"message": {"content": "Ber"}}
+        yield {"message": {"content": "lin"}}
+        yield {
+            "message": {"content": ""},
+            "done": True,
+            "prompt_eval_count": 12,
+            "eval_count": 2,
+        }
+
+    monkeypatch.setattr(llm, "chat", fake_chat)
+    assert "".join(llm.stream_llm(None, "Jane", provider="ollama")) == "Berlin"
+    assert run.calls[0]["completion_tokens"] == 2
+
+
+def test_provider_errors_are_wrapped_and_recorded(monkeypatch, run):
+    use_openai(monkeypatch, ConnectionError("connection reset"))
+    with pytest.raises(llm.LLMProviderError) as raised:
+        llm.call_llm(None, "Jane", provider="openai")
+    assert raised.value.provider == "openai"
+    assert isinstance(raised.value.error, ConnectionError)
+    assert str(raised.value) == "[openai] connection reset"
+
+    def failing_stream(model, messages, stream=False, **kwargs):
+        yield {"message": {"content": "Ber"}}
+        raise TimeoutError("model unloaded")
+
+    monkeypatch.setattr(llm, "chat", failing_stream)
+    stream = llm.stream_llm(None, "Jane", provider="ollama")
+    # Deltas produced before the failure still reach the caller
+    assert next(stream) == "Ber"
+    with pytest.raises(llm.LLMProviderError, match="model unloaded"):
+        next(stream)
+
+    assert [call["error"] for call in run.calls] == [
+        "connection reset",
+        "model unloaded",
+    ]
+
+
+def test_unknown_provider_and_missing_openai_key(monkeypatch, run):
+    with pytest.raises(ValueError, match="Unknown provider"):
+        llm.call_llm(None, "Jane", provider="claude")
+    with pytest.raises(ValueError, match="Unknown provider"):
+        list(llm.stream_llm(None, "Jane", provider="claude"))
+
+    monkeypatch.setattr(llm, "OPENAI_AVAILABLE", False)
+    with pytest.raises(ValueError, match="OPENAI_API_KEY"):
+        list(llm.stream_llm(None, "Jane", provider="openai"))
+
+
+def test_openai_format_kwargs_depend_on_the_model():
+    assert llm._openai_format_kwargs(LOCATION_SCHEMA, "gpt-4o-mini") == {
+        "response_format": {"type": "json_schema", "json_schema": LOCATION_SCHEMA}
+    }
+    # Older models rely on the tolerant JSON parser instead
+    assert llm._openai_format_kwargs(LOCATION_SCHEMA, "gpt-4") == {}
+    assert llm._openai_format_kwargs(None, "gpt-4o-mini") == {}
+
+
+def test_structured_output_is_sent_to_each_provider(monkeypatch, run):
+    message = SimpleNamespace(content='{"current_location": "Berlin"}')
+    response = SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+    fake = use_openai(monkeypatch, response)
+    for model in ("gpt-4.1-mini", "gpt-4"):
+        llm.call_llm(
+            None,
+            "Jane",
+            provider="openai",
+            openai_model=model,
+            response_schema=LOCATION_SCHEMA,
+        )
+    assert fake.requests[0]["response_format"]["json_schema"] is LOCATION_SCHEMA
+    assert "response_format" not in fake.requests[1]
+
+    # Ollama gets the bare JSON schema as `format=`, streaming or not
+    requests = []
+
+    def fake_chat(model, messages, stream=False, **kwargs):
+        requests.append(kwargs)
+        chunk = {"message": {"content": '{"current_location": "Berlin"}'}}
+        return iter([chunk]) if stream else chunk
+
+    monkeypatch.setattr(llm, "chat", fake_chat)
+    llm.call_llm(None, "Jane", provider="ollama", response_schema=LOCATION_SCHEMA)
+    stream = llm.stream_llm(
+        None, "Jane", provider="ollama", response_schema=LOCATION_SCHEMA
+    )
+    list(stream)
+    llm.call_llm(None, "Jane", provider="ollama")
+    assert requests == [
+        {"format": LOCATION_SCHEMA["schema"]},
+        {"format": LOCATION_SCHEMA["schema"]},
+        {},
+    ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
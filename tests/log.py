@@ -0,0 +1,83 @@
+import json
+import logging
+import threading
+
+import pytest
+
+from src.utils.log import (
+    EmojiFormatter,
+    configure_logging,
+    flush_logging,
+    get_logger,
+    log_context,
+)
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "scraper.log"
+    configure_logging(level="INFO", console_format="none", log_file=str(path))
+    yield path
+    configure_logging(console_format="none", log_file=None)
+
+
+def read_records(path):
+    flush_logging()
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_records_are_json_lines_with_context_ids(log_file):
+    log = get_logger("test", tag="JOB PARSER")
+    with log_context(run_id="run-1"):
+        with log_context(search_id="abc"):
+            log.info("Found %d job cards", 3, emoji="📃", extra={"cards": 3})
+        log.warning("No search", tag="SCROLL")
+    log.info("Outside")
+
+    found, no_search, outside = read_records(log_file)
+    assert found["message"] == "Found 3 job cards"
+    assert (found["run_id"], found["search_id"]) == ("run-1", "abc")
+    assert found["tag"] == "JOB PARSER" and found["cards"] == 3
+    assert "emoji" not in found
+    assert (no_search["run_id"], no_search["search_id"]) == ("run-1", None)
+    assert no_search["level"] == "WARNING" and no_search["tag"] == "SCROLL"
+    assert outside["run_id"] is None
+
+
+def test_level_filters_before_the_queue(log_file):
+    log = get_logger("test")
+    log.debug("every card")
+    assert read_records(log_file) == []
+
+    configure_logging(level="DEBUG", console_format="none", log_file=str(log_file))
+    log.debug("every card")
+    assert [record["message"] for record in read_records(log_file)] == ["every card"]
+
+
+def test_records_are_written_by_the_listener_thread(log_file):
+    writer_threads = []
+    handler = logging.Handler()
+    handler.emit = lambda record: writer_threads.append(threading.current_thread())
+    listener = configure_logging(console_format="none", log_file=str(log_file))
+    listener.handlers = listener.handlers + (handler,)
+
+    get_logger("test").info("hello")
+    flush_logging()
+    assert writer_threads and writer_threads[0] is not threading.current_thread()
+
+
+def test_emoji_formatter_keeps_the_console_style():
+    record = logging.makeLogRecord(
+        {"msg": "Scrolled %d times", "args": (3,), "levelno": logging.INFO}
+    )
+    record.tag = "SCROLL"
+    record.emoji = "✅"
+    assert EmojiFormatter().format(record) == "\n✅ [SCROLL] Scrolled 3 times"
+
+    record.emoji = "⚠️"
+    assert EmojiFormatter().format(record).startswith("\n⚠️  [SCROLL]")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
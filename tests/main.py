@@ -0,0 +1,106 @@
+import csv
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.automation.job_store import JobStore
+from src.main import EXIT_NO_INPUT, EXIT_OK, main
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+USER_DATA = {
+    "positions": "Data Scientist",
+    "location": "Berlin",
+    "years_experience": 5,
+    "skills": "Python, SQL",
+    "keyword_combinations": "Data Scientist, Python\nML Engineer, PyTorch\n",
+}
+
+
+def run(capsys, *argv):
+    exit_code = main(list(argv))
+    out = capsys.readouterr().out
+    return exit_code, out
+
+
+def test_build_searches_prints_json(tmp_path, capsys):
+    with open(tmp_path / "user_data.json", "w") as f:
+        json.dump(USER_DATA, f)
+
+    exit_code, out = run(
+        capsys, "--data-dir", str(tmp_path), "build-searches", "--days", "1"
+    )
+    result = json.loads(out)
+    assert exit_code == EXIT_OK and result["ok"]
+    assert len(result["search_urls"]) == 2
+    assert "location=Berlin" in result["search_urls"][0]
+    assert "f_TPR=r86400" in result["search_urls"][0]
+
+
+def test_missing_inputs_exit_with_no_input(tmp_path, capsys):
+    exit_code, out = run(capsys, "--data-dir", str(tmp_path), "build-searches")
+    assert exit_code == EXIT_NO_INPUT
+    assert not json.loads(out)["ok"]
+
+    exit_code, out = run(capsys, "--data-dir", str(tmp_path), "export")
+    assert exit_code == EXIT_NO_INPUT
+    assert "Run crawl first" in json.loads(out)["error"]
+
+
+def test_export_formats(tmp_path, capsys):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.add_jobs(
+        [
+            {"job_id": str(i), "title": f"Data Scientist {i}", "company": "Acme"}
+            for i in range(3)
+        ]
+    )
+    store.close()
+
+    exit_code, out = run(capsys, "--data-dir", str(tmp_path), "export")
+    assert exit_code == EXIT_OK
+    # Unscored jobs tie on the score, the most recently stored come first
+    assert [json.loads(line)["job_id"] for line in out.splitlines()] == ["2", "1", "0"]
+
+    output = tmp_path / "jobs.csv"
+    exit_code, out = run(
+        capsys,
+        "--data-dir",
+        str(tmp_path),
+        "export",
+        "--format",
+        "csv",
+        "-o",
+        str(output),
+    )
+    assert json.loads(out) == {
+        "ok": True,
+        "command": "export",
+        "jobs": 3,
+        "output": str(output),
+        "format": "csv",
+    }
+    with open(output, newline="") as f:
+        assert len(list(csv.DictReader(f))) == 3
+
+
+def test_does_not_import_gradio(tmp_path):
+    script = (
+        "import sys, main; main.main(['--data-dir', sys.argv[1], 'build-searches']); "
+        "print('gradio' in sys.modules)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script, str(tmp_path)],
+        cwd=SRC_DIR,
+        env={**os.environ, "PYTHONPATH": "."},
+        capture_output=True,
+        text=True,
+    ).stdout
+    assert out.splitlines()[-1] == "False"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from src.agent import llm
+from src.agent.metrics import BudgetExceededError, LLMRunMetrics, percentile
+from src.agent.prompts import SMALL_LOCATION_EXTRACTOR_SYSTEM_PROMPT
+
+
+def fake_chat(model, messages, **kwargs):
+    return {
+        "message": {"content": '{"current_location": "Berlin"}'},
+        "prompt_eval_count": 120,
+        "eval_count": 30,
+    }
+
+
+def test_calls_are_aggregated_per_prompt():
+    run = LLMRunMetrics(run_id="test")
+    for latency_s in (1.0, 2.0, 3.0):
+        run.record("LOCATION", "openai", "gpt-4o-mini", latency_s, 1000, 100)
+    run.record("KEYWORDS", "ollama", "llama3.2", 5.0, 500, 50, error="timeout")
+
+    summary = run.summary()
+    location = summary["by_prompt"]["LOCATION"]
+    assert location["calls"] == 3
+    assert location["latency_p50_s"] == 2.0
+    assert location["latency_p95_s"] == 3.0
+    assert location["total_tokens"] == 3300
+    # gpt-4o-mini: $0.15 / $0.60 per 1M prompt / completion tokens
+    assert location["cost_usd"] == pytest.approx(3 * (1000 * 0.15 + 100 * 0.60) / 1e6)
+    assert summary["by_prompt"]["KEYWORDS"]["errors"] == 1
+    assert summary["by_prompt"]["KEYWORDS"]["cost_usd"] == 0.0
+    assert summary["overall"]["calls"] == 4
+
+
+def test_calls_over_budget_are_refused(monkeypatch):
+    run = LLMRunMetrics(max_tokens=200)
+    monkeypatch.setattr(llm, "chat", fake_chat)
+    monkeypatch.setattr(llm, "current_run", lambda: run)
+
+    response = llm.call_llm(
+        SMALL_LOCATION_EXTRACTOR_SYSTEM_PROMPT, "Jane Doe, Berlin", "ollama"
+    )
+    assert json.loads(response) == {"current_location": "Berlin"}
+    llm.call_llm(SMALL_LOCATION_EXTRACTOR_SYSTEM_PROMPT, "Jane Doe", "ollama")
+    # 300 tokens used: the third call is refused before it is sent
+    with pytest.raises(BudgetExceededError, match="Token budget of 200"):
+        llm.call_llm(SMALL_LOCATION_EXTRACTOR_SYSTEM_PROMPT, "Jane", "ollama")
+
+    assert run.total_tokens == 300
+    by_prompt = run.summary()["by_prompt"]
+    assert by_prompt["SMALL_LOCATION_EXTRACTOR_SYSTEM_PROMPT"]["calls"] == 2
+
+
+def test_export_writes_summary_and_calls(tmp_path):
+    run = LLMRunMetrics(run_id="export")
+    run.record("LOCATION", "ollama", "llama3.2", 0.5, 10, 5)
+    run.record_stage_cache("location", hit=False)
+    run.record_stage_cache("location", hit=True)
+
+    path = run.export(str(tmp_path / "metrics.json"))
+    with open(path) as f:
+        exported = json.load(f)
+    assert exported["summary"]["run_id"] == "export"
+    assert exported["summary"]["stage_cache"] == {
+        "location": {"hits": 1, "misses": 1}
+    }
+    assert [call["prompt_name"] for call in exported["calls"]] == ["LOCATION"]
+
+
+def test_capped_run_keeps_the_latest_calls_and_all_totals():
+    run = LLMRunMetrics(max_calls=3)
+    for i in range(5):
+        run.record(f"PROMPT_{i}", "ollama", "llama3.2", 0.1, 10, 10)
+
+    assert [call["prompt_name"] for call in run.calls] == [
+        "PROMPT_2",
+        "PROMPT_3",
+        "PROMPT_4",
+    ]
+    assert run.total_tokens == 100
+    summary = run.summary()
+    assert summary["dropped_calls"] == 2
+    assert summary["overall"]["calls"] == 3
+
+
+def test_percentile_of_sorted_values():
+    values = [0.1, 0.2, 0.3, 0.4, 1.0]
+    assert percentile(values, 0.50) == 0.3
+    assert percentile(values, 0.95) == 1.0
+    assert percentile([], 0.50) == 0.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,96 @@
+import fitz  # pymupdf
+import pytest
+
+from src.agent.cache import StageCache
+from src.agent.chunking import estimate_tokens
+from src.automation import pdf_extract
+from src.automation.pdf_extract import extract_pdf_text, iter_pdf_chunks, iter_pdf_pages
+
+PAGE_COUNT = 40
+
+
+def write_pdf(path, page_count=PAGE_COUNT):
+    doc = fitz.open()
+    for page_num in range(page_count):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Sheet {page_num}. Built forecasting models.")
+        page.insert_text((72, 100), f"Shipped model {page_num} to production.")
+    doc.save(path)
+    doc.close()
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = str(tmp_path / "resume.pdf")
+    write_pdf(path)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def stage_cache(monkeypatch):
+    cache = StageCache(cache_dir=None)
+    monkeypatch.setattr(pdf_extract, "default_stage_cache", lambda: cache)
+    return cache
+
+
+class CountingPool(pdf_extract.ProcessPoolExecutor):
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingPool.created += 1
+        super().__init__(*args, **kwargs)
+
+
+def test_parallel_and_serial_pages_match(pdf_path, monkeypatch):
+    monkeypatch.setattr(pdf_extract, "ProcessPoolExecutor", CountingPool)
+    CountingPool.created = 0
+
+    serial = list(iter_pdf_pages(pdf_path, use_cache=False, max_workers=1))
+    assert CountingPool.created == 0
+    parallel = list(iter_pdf_pages(pdf_path, use_cache=False, max_workers=2))
+    assert CountingPool.created == 1
+
+    assert len(serial) == PAGE_COUNT
+    assert parallel == serial
+    for page_num, page_text in enumerate(serial):
+        assert page_text.startswith(f"Sheet {page_num}.")
+
+
+def test_second_read_is_served_from_the_cache(pdf_path, monkeypatch):
+    text = extract_pdf_text(pdf_path, max_workers=1)
+
+    def fail(pdf_path, max_workers):
+        raise AssertionError("the PDF was parsed again")
+
+    monkeypatch.setattr(pdf_extract, "_iter_parsed_pages", fail)
+    assert extract_pdf_text(pdf_path) == text
+    with pytest.raises(AssertionError):
+        extract_pdf_text(pdf_path, use_cache=False)
+
+
+def test_closing_the_stream_early_caches_nothing(pdf_path, stage_cache):
+    pages = iter_pdf_pages(pdf_path, max_workers=2)
+    assert next(pages).startswith("Sheet 0.")
+    # Returns without waiting for the remaining page ranges
+    pages.close()
+
+    cache_inputs = {"pdf": pdf_extract.file_hash(pdf_path)}
+    assert stage_cache.get("pdf_pages", cache_inputs) is None
+    assert len(list(iter_pdf_pages(pdf_path, max_workers=2))) == PAGE_COUNT
+
+
+def test_pdf_chunks_cover_every_page_in_order(pdf_path):
+    chunks = list(iter_pdf_chunks(pdf_path, max_tokens=60))
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 60 for chunk in chunks)
+
+    text = "".join(chunks)
+    positions = [text.index(f"Sheet {page_num}.") for page_num in range(PAGE_COUNT)]
+    assert positions == sorted(positions)
+
+    with pytest.raises(ValueError, match="Only PDF files"):
+        list(iter_pdf_pages(pdf_path[:-4] + ".docx"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
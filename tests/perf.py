@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from src.automation.perf import PageMetricsCollector
+
+
+class FakeSession:
+    def __init__(self, page):
+        self.page = page
+
+    def send(self, method, params=None):
+        if method == "Performance.getMetrics":
+            return {
+                "metrics": [
+                    {"name": "Nodes", "value": 1000 * self.page.loads},
+                    {"name": "JSHeapUsedSize", "value": 5e6},
+                    {"name": "Timestamp", "value": 1.0},
+                ]
+            }
+        return {}
+
+
+class FakeContext:
+    def __init__(self, page):
+        self.page = page
+
+    def new_cdp_session(self, page):
+        return FakeSession(page)
+
+
+class FakePage:
+    def __init__(self):
+        self.context = FakeContext(self)
+        self.loads = 0
+
+    def goto(self, url):
+        self.loads += 1
+        if "broken" in url:
+            raise TimeoutError("Navigation timeout")
+
+    def evaluate(self, script):
+        return {
+            "ttfb_ms": 100.0 * self.loads,
+            "dom_content_loaded_ms": 300.0,
+            "load_ms": 900.0,
+            "resources": 10,
+            "transferred_bytes": 250_000,
+        }
+
+
+def test_records_every_navigation_and_summarizes_per_search(tmp_path):
+    page = FakePage()
+    collector = PageMetricsCollector(run_id="test", metrics_dir=str(tmp_path))
+    collector.attach(page)
+
+    search = "https://www.linkedin.com/jobs/search/?keywords=data"
+    for _ in range(3):
+        with collector.navigation(page, search, search=search):
+            page.goto(search)
+        with collector.phase("parse", search=search):
+            pass
+    with pytest.raises(TimeoutError):
+        with collector.navigation(page, "https://broken", kind="apply"):
+            page.goto("https://broken")
+
+    summary = collector.summary()
+    stats = summary["searches"][search]
+    assert stats["navigations"] == 3 and stats["errors"] == 0
+    assert stats["dom_nodes"] == {"p50": 2000, "p95": 3000, "max": 3000}
+    assert stats["ttfb_ms"]["max"] == 300.0
+    assert stats["transferred_bytes"]["p50"] == 250_000
+    assert "parse" in stats["phases_s"]
+    # Navigations outside a search are grouped together
+    assert summary["searches"]["other"]["errors"] == 1
+
+    path = collector.export()
+    assert path == str(tmp_path / "crawl_test.json")
+    with open(path) as f:
+        exported = json.load(f)
+    assert len(exported["navigations"]) == 4
+    assert exported["navigations"][-1]["kind"] == "apply"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+from src.automation import pipeline
+
+
+class StubParser:
+    """Yields two keyword sets, then keeps "generating" until cancelled."""
+
+    instances = []
+
+    def __init__(self, resume_file, num_search_queries, data_dir=None):
+        self.finish = threading.Event()
+        self.stopped = threading.Event()
+        self.stages = 0
+        StubParser.instances.append(self)
+
+    def iter_keywords_for_search(self, cancel_event=None, **kwargs):
+        try:
+            user_data = {"location": "Berlin", "keyword_combinations": "a\nb"}
+            yield user_data
+            while not self.finish.is_set():
+                if cancel_event.wait(0.01):
+                    return
+                self.stages += 1
+                yield user_data
+        finally:
+            self.stopped.set()
+
+
+class StubScraper:
+    instances = []
+
+    def __init__(self, headless, user_data, data_dir, cdp_port):
+        self.saved = []
+        self.closed = False
+        StubScraper.instances.append(self)
+
+    def build_linkedin_url(self, keywords, location="", posted_in_days=7):
+        return f"https://www.linkedin.com/jobs/search/?keywords={keywords}"
+
+    def login_and_check(self):
+        return "page"
+
+    def scrape_search_results(
+        self, page, url, scraped_job_ids, duplicate_index, cancel_event=None
+    ):
+        job_id = url.rsplit("=", 1)[1]
+        return [{"job_id": job_id, "title": f"Job {job_id}"}]
+
+    def save_jobs(self, jobs):
+        self.saved = list(jobs)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def stubs(monkeypatch):
+    StubParser.instances.clear()
+    StubScraper.instances.clear()
+    monkeypatch.setattr(pipeline, "ResumeParser", StubParser)
+    monkeypatch.setattr(pipeline, "LinkedInAutomation", StubScraper)
+    # No pause between searches
+    monkeypatch.setattr(pipeline.random, "randint", lambda a, b: 0)
+
+
+def test_scrapes_while_the_analysis_runs():
+    states = pipeline.run_pipeline("resume.pdf", search_rate_limit=2)
+    for state in states:
+        if len(state["jobs"]) == 2:
+            break
+    # Both searches were scraped before the analysis finished
+    parser = StubParser.instances[0]
+    assert not parser.stopped.is_set()
+    parser.finish.set()
+
+    *_, last = states
+    assert last["stage"] == "done"
+    assert [job["job_id"] for job in last["jobs"]] == ["a", "b"]
+    assert StubScraper.instances[0].closed
+    assert parser.stopped.is_set()
+
+
+def test_stopping_the_pipeline_cancels_the_analysis():
+    states = pipeline.run_pipeline("resume.pdf", search_rate_limit=1)
+    for state in states:
+        if state["jobs"]:
+            break
+    parser = StubParser.instances[0]
+    assert not parser.stopped.is_set()
+
+    # The consumer stops (e.g. the Stop button): the analysis thread is
+    # cancelled and joined before close() returns
+    states.close()
+    assert parser.stopped.is_set()
+    assert not any(t.name == "resume-analysis" for t in threading.enumerate())
+    scraper = StubScraper.instances[0]
+    assert scraper.closed
+    assert [job["job_id"] for job in scraper.saved] == ["a"]
+
+
+def test_cancel_event_stops_the_pipeline():
+    cancel_event = threading.Event()
+    states = pipeline.run_pipeline(
+        "resume.pdf", search_rate_limit=2, cancel_event=cancel_event
+    )
+    for state in states:
+        if state["jobs"]:
+            break
+    # Set from another thread, e.g. by the Stop button
+    cancel_event.set()
+
+    *_, last = states
+    assert last["stage"] == "stopped"
+    assert [job["job_id"] for job in last["jobs"]] == ["a"]
+    assert StubParser.instances[0].stopped.is_set()
+    assert StubScraper.instances[0].closed
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,63 @@
+import random
+import time
+
+from src.agent.ranking import JobRanker, rank_jobs
+
+USER_DATA = {
+    "positions": "Data Scientist, Machine Learning Engineer",
+    "location": "Berlin, Germany",
+    "years_experience": 6,
+    "skills": "Python, PyTorch, SQL",
+    "keyword_combinations": "Data Scientist, Python, PyTorch\nML Engineer, MLOps",
+}
+
+
+def make_job(job_id, title, company="Acme", tags=()):
+    return {
+        "job_id": job_id,
+        "title": title,
+        "company": company,
+        "location": "Berlin",
+        "benefits": "",
+        "footer_tags": list(tags),
+        "job_url": f"https://www.linkedin.com/jobs/view/{job_id}/",
+    }
+
+
+def test_relevant_jobs_rank_first():
+    jobs = [
+        make_job("1", "Accountant", tags=["Easy Apply"]),
+        make_job("2", "Senior Data Scientist (Python)"),
+        make_job("3", "Machine Learning Engineer - PyTorch"),
+        make_job("4", "Office Manager"),
+    ]
+    ranked = rank_jobs(jobs, USER_DATA)
+    assert {job["job_id"] for job in ranked[:2]} == {"2", "3"}
+    assert ranked[-1]["score"] == 0.0
+    assert all(0.0 <= job["score"] <= 1.0 for job in ranked)
+    # The input is not modified
+    assert "score" not in jobs[0]
+
+
+def test_empty_inputs():
+    assert rank_jobs([], USER_DATA) == []
+    assert JobRanker({}).score([make_job("1", "Data Scientist")]).tolist() == [0.0]
+
+
+def test_ranks_tens_of_thousands_of_jobs_quickly():
+    words = ["Data", "Scientist", "Engineer", "Python", "Sales", "Manager", "Senior"]
+    rng = random.Random(0)
+    jobs = [
+        make_job(str(i), " ".join(rng.choices(words, k=4)), company=f"Company {i % 500}")
+        for i in range(30_000)
+    ]
+    started = time.perf_counter()
+    ranked = JobRanker(USER_DATA).rank(jobs, top_k=100)
+    assert time.perf_counter() - started < 1.0
+    assert len(ranked) == 100
+
+
+if __name__ == "__main__":
+    test_relevant_jobs_rank_first()
+    test_empty_inputs()
+    test_ranks_tens_of_thousands_of_jobs_quickly()
@@ -0,0 +1,112 @@
+import threading
+
+import pytest
+
+from src.agent import router as router_module
+from src.agent.router import LLMRouter
+
+
+class StubProviders:
+    """Stands in for `llm.call_llm`: each provider answers, fails or blocks."""
+
+    def __init__(self, behaviours):
+        self.behaviours = behaviours
+        self.calls = []
+        self.release = threading.Event()
+
+    def __call__(self, provider, **request):
+        self.calls.append(provider)
+        behaviour = self.behaviours[provider]
+        if behaviour == "fail":
+            raise router_module.llm.LLMProviderError(provider, OSError("down"))
+        if behaviour.startswith("block"):
+            self.release.wait(timeout=5)
+            if behaviour == "block-then-fail":
+                raise router_module.llm.LLMProviderError(provider, OSError("late"))
+        return f"answer from {provider}"
+
+
+def finish_pending_calls(router):
+    # Calls the router stopped waiting for still finish in its pool
+    router._executor.shutdown(wait=True)
+
+
+def make_router(monkeypatch, behaviours, **kwargs):
+    stub = StubProviders(behaviours)
+    monkeypatch.setattr(router_module.llm, "call_llm", stub)
+    return LLMRouter(providers=list(behaviours), **kwargs), stub
+
+
+def test_falls_back_to_the_next_provider(monkeypatch):
+    router, stub = make_router(monkeypatch, {"openai": "fail", "ollama": "answer"})
+    assert router.call(None, "Hello") == "answer from ollama"
+    finish_pending_calls(router)
+    assert stub.calls == ["openai", "ollama"]
+    report = router.latency_report()
+    assert report["openai"]["failures"] == 1
+    assert report["ollama"]["calls"] == 1 and report["ollama"]["failures"] == 0
+
+
+def test_raises_when_every_provider_fails(monkeypatch):
+    router, _ = make_router(monkeypatch, {"openai": "fail", "ollama": "fail"})
+    with pytest.raises(router_module.llm.LLMProviderError):
+        router.call(None, "Hello")
+
+
+def test_hedged_call_uses_the_first_answer(monkeypatch):
+    router, stub = make_router(
+        monkeypatch, {"openai": "block", "ollama": "answer"}, hedge_delay_s=0.05
+    )
+    assert router.call(None, "Hello", hedge=True) == "answer from ollama"
+
+    # The slow primary finishes in the pool and is recorded once, as abandoned
+    stub.release.set()
+    finish_pending_calls(router)
+    report = router.latency_report()
+    assert report["openai"]["calls"] == 1
+    assert report["openai"]["abandoned"] == 1
+    assert report["openai"]["failures"] == 0
+    assert report["ollama"]["abandoned"] == 0
+
+
+def test_timed_out_calls_are_counted_once(monkeypatch):
+    router, stub = make_router(
+        monkeypatch,
+        {"openai": "block-then-fail", "ollama": "block"},
+        timeout_s=0.05,
+        hedge_delay_s=0.01,
+    )
+    with pytest.raises(router_module.llm.LLMProviderError, match="timed out"):
+        router.call(None, "Hello", hedge=True)
+
+    stub.release.set()
+    finish_pending_calls(router)
+    report = router.latency_report()
+    assert report["openai"]["calls"] == 1 and report["openai"]["failures"] == 1
+    assert report["ollama"]["calls"] == 1 and report["ollama"]["failures"] == 0
+    assert report["ollama"]["abandoned"] == 1
+
+
+def test_routing_policies(monkeypatch):
+    behaviours = {"openai": "answer", "ollama": "answer"}
+    router, _ = make_router(monkeypatch, behaviours, policy="cost")
+    assert router.ranked_providers() == ["ollama", "openai"]
+
+    router, _ = make_router(monkeypatch, behaviours, policy="latency")
+    # Unmeasured providers keep their order, then the faster one goes first
+    assert router.ranked_providers() == ["openai", "ollama"]
+    router.stats["openai"].record_success(2.0)
+    router.stats["ollama"].record_success(0.5)
+    assert router.ranked_providers() == ["ollama", "openai"]
+
+    # A provider that keeps failing is tried last
+    for _ in range(router_module.MAX_CONSECUTIVE_FAILURES):
+        router.stats["ollama"].record_failure()
+    assert router.ranked_providers() == ["openai", "ollama"]
+
+    with pytest.raises(ValueError):
+        LLMRouter(providers=["openai"], policy="fastest")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,116 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+from src.automation.scheduler import (
+    CronSchedule,
+    CrawlScheduler,
+    IntervalSchedule,
+    parse_schedule,
+)
+from src.ui.job_queue import CDP_PORTS
+
+
+def test_parse_schedule_intervals_and_cron():
+    assert parse_schedule("every 30m").interval_s == 1800
+    assert parse_schedule("6h").interval_s == 6 * 3600
+    assert parse_schedule(90).interval_s == 90
+    assert isinstance(parse_schedule("*/15 8-18 * * 1-5"), CronSchedule)
+    with pytest.raises(ValueError):
+        parse_schedule("61 * * * *")
+    with pytest.raises(ValueError):
+        IntervalSchedule(0)
+
+
+def test_cron_next_run():
+    # Monday 2024-01-01 10:07
+    start = datetime(2024, 1, 1, 10, 7).timestamp()
+
+    every_quarter = CronSchedule("*/15 * * * *")
+    assert datetime.fromtimestamp(every_quarter.next_after(start)) == datetime(
+        2024, 1, 1, 10, 15
+    )
+
+    weekday_mornings = CronSchedule("30 8 * * 1-5")
+    friday = datetime(2024, 1, 5, 9, 0).timestamp()
+    assert datetime.fromtimestamp(weekday_mornings.next_after(friday)) == datetime(
+        2024, 1, 8, 8, 30
+    )
+
+    # Restricted day of month and weekday: either one matches, as in cron
+    first_or_sunday = CronSchedule("0 0 1 * 0")
+    assert datetime.fromtimestamp(first_or_sunday.next_after(start)) == datetime(
+        2024, 1, 7, 0, 0
+    )
+
+    leap_day = CronSchedule("0 12 29 2 *")
+    assert datetime.fromtimestamp(leap_day.next_after(start)) == datetime(
+        2024, 2, 29, 12, 0
+    )
+
+
+def test_jitter_delays_runs_within_bounds():
+    now = [1_000.0]
+    scheduler = CrawlScheduler(
+        [{"name": "a", "schedule": "every 60s", "jitter_s": 10}],
+        crawl_fn=lambda profile, port, cancel_event: {},
+        clock=lambda: now[0],
+    )
+    assert 1_060.0 <= scheduler.next_run_at["a"] <= 1_070.0
+    scheduler.shutdown()
+
+
+def test_overlapping_runs_are_coalesced():
+    release = threading.Event()
+    calls = []
+
+    def crawl(profile, port, cancel_event):
+        calls.append((profile["name"], port))
+        release.wait(5)
+        return {}
+
+    now = [0.0]
+    scheduler = CrawlScheduler(
+        [
+            {"name": "slow", "schedule": "every 10s", "jitter_s": 0},
+            {"name": "other", "schedule": "every 10s", "jitter_s": 0},
+        ],
+        max_concurrent_crawls=1,
+        first_cdp_port=9300,
+        crawl_fn=crawl,
+        clock=lambda: now[0],
+    )
+
+    now[0] = 10.0
+    assert scheduler.tick() == ["slow", "other"]
+    # Both are still in flight ("other" waits for the only crawl slot)
+    now[0] = 20.0
+    assert scheduler.tick() == []
+    assert scheduler.coalesced == {"slow": 1, "other": 1}
+
+    release.set()
+    scheduler.shutdown()
+    assert calls == [("slow", 9300), ("other", 9300)]
+    assert scheduler.runs == {"slow": 1, "other": 1}
+    assert not scheduler.in_flight
+
+
+def test_default_ports_do_not_collide_with_the_app():
+    app_ports = set()
+    while True:
+        try:
+            app_ports.add(CDP_PORTS.acquire())
+        except RuntimeError:
+            break
+    for port in app_ports:
+        CDP_PORTS.release(port)
+
+    scheduler = CrawlScheduler([], max_concurrent_crawls=4)
+    scheduler_ports = {scheduler._ports.acquire() for _ in range(4)}
+    scheduler.shutdown()
+    assert app_ports and not app_ports & scheduler_ports
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
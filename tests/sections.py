@@ -0,0 +1,129 @@
+import fitz  # pymupdf
+import pytest
+
+from src.agent.cache import StageCache
+from src.automation import sections as sections_module
+from src.automation.sections import route_sections, segment_pdf, segment_text
+
+HEADER = "Jane Doe - Data Scientist"
+TOOLS = "Tools: Python, SQL, Docker"
+
+
+def write_resume_pdf(path):
+    """
+    Two A4 pages with a running header and footer, and the same tools line
+    in the body of both pages.
+    """
+    doc = fitz.open()
+    pages = [
+        [
+            (18, "Jane Doe"),
+            (11, "Berlin, Germany | jane@example.com"),
+            (14, "EXPERIENCE"),
+            (11, "Data Scientist, Acme GmbH, 2021 - Present"),
+            (11, "Built demand forecasting models"),
+            (11, TOOLS),
+        ],
+        [
+            (11, "Data Analyst, Initech, 2018 - 2021"),
+            (11, TOOLS),
+            (14, "SKILLS"),
+            (11, "Forecasting, A/B testing"),
+        ],
+    ]
+    for page_num, lines in enumerate(pages):
+        page = doc.new_page(width=595, height=842)
+        if page_num > 0:
+            page.insert_text((72, 30), HEADER, fontsize=9)
+        y = 100
+        for size, text in lines:
+            page.insert_text((72, y), text, fontsize=size)
+            y += size * 2
+        page.insert_text((280, 820), f"Page {page_num + 1} of 2", fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+@pytest.fixture(autouse=True)
+def stage_cache(monkeypatch):
+    cache = StageCache(cache_dir=None)
+    monkeypatch.setattr(sections_module, "default_stage_cache", lambda: cache)
+    return cache
+
+
+def test_segment_pdf_drops_running_headers_but_keeps_repeated_body_lines(tmp_path):
+    path = str(tmp_path / "resume.pdf")
+    write_resume_pdf(path)
+
+    sections = segment_pdf(path)
+    assert sections.names() == ["contact", "experience", "skills"]
+    assert sections.get("contact") == "Jane Doe\nBerlin, Germany | jane@example.com"
+    experience = sections.sections["experience"]
+    assert experience == [
+        "Data Scientist, Acme GmbH, 2021 - Present",
+        "Built demand forecasting models",
+        TOOLS,
+        "Data Analyst, Initech, 2018 - 2021",
+        TOOLS,
+    ]
+    assert HEADER not in sections.text()
+    assert "Page" not in sections.text()
+
+
+def test_segment_pdf_is_cached_by_file_content(tmp_path, monkeypatch):
+    path = str(tmp_path / "resume.pdf")
+    write_resume_pdf(path)
+    sections = segment_pdf(path)
+
+    def fail(pdf_path):
+        raise AssertionError("the layout was parsed again")
+
+    monkeypatch.setattr(sections_module, "_segment_pdf_layout", fail)
+    # Same bytes under another name: served from the cache, in the same order
+    copy_path = tmp_path / "copy.pdf"
+    copy_path.write_bytes((tmp_path / "resume.pdf").read_bytes())
+    cached = segment_pdf(str(copy_path))
+    assert cached.names() == sections.names()
+    assert cached.to_dict() == sections.to_dict()
+
+    with pytest.raises(AssertionError):
+        segment_pdf(path, use_cache=False)
+
+
+def test_segment_text_splits_on_known_headings():
+    text = (
+        "Jane Doe\nMunich, Germany\n\nPage 1 of 2\n"
+        "Work Experience\nML Engineer at Globex\n"
+        "Education\nMSc Computer Science\n"
+        "Projects:\nHouse price model"
+    )
+    sections = segment_text(text)
+    assert sections.to_dict() == {
+        "contact": "Jane Doe\nMunich, Germany",
+        "experience": "ML Engineer at Globex",
+        "education": "MSc Computer Science",
+        "projects": "House price model",
+    }
+
+
+def test_route_sections_falls_back_to_the_whole_resume():
+    full_text = "Jane Doe\nMunich, Germany\nExperience\nML Engineer at Globex"
+    routed, report = route_sections(segment_text(full_text), full_text)
+    assert routed == {
+        "location": "Jane Doe\nMunich, Germany",
+        "work_history": "ML Engineer at Globex",
+    }
+    assert report["work_history"]["routed_tokens"] < (
+        report["work_history"]["full_tokens"]
+    )
+
+    # No headings: every prompt gets the normalized resume
+    routed, _ = route_sections(segment_text("ML Engineer  at Globex"), "")
+    assert routed == {
+        "location": "ML Engineer at Globex",
+        "work_history": "ML Engineer at Globex",
+    }
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
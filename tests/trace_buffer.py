@@ -0,0 +1,108 @@
+import base64
+import json
+import os
+
+import pytest
+
+from src.recording.trace_buffer import TraceBuffer
+
+
+class FakeSession:
+    def __init__(self):
+        self.handlers = {}
+        self.sent = []
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def send(self, method, params=None):
+        self.sent.append(method)
+
+    def detach(self):
+        pass
+
+    def push_frame(self, i):
+        self.handlers["Page.screencastFrame"](
+            {
+                "sessionId": i,
+                "data": base64.b64encode(f"frame {i}".encode()).decode(),
+                "metadata": {"timestamp": float(i)},
+            }
+        )
+
+
+class FakeContext:
+    def __init__(self, session):
+        self.session = session
+
+    def new_cdp_session(self, page):
+        return self.session
+
+
+class FakePage:
+    def __init__(self):
+        self.session = FakeSession()
+        self.context = FakeContext(self.session)
+        self.url = "https://www.linkedin.com/jobs/search/"
+
+    def content(self):
+        return "<html><body>jobs</body></html>"
+
+
+def test_buffers_are_bounded_and_only_written_on_failure(tmp_path):
+    page = FakePage()
+    trace = TraceBuffer(
+        page, max_frames=3, max_snapshots=2, output_dir=str(tmp_path)
+    )
+    trace.start()
+
+    for i in range(10):
+        page.session.push_frame(i)
+    for i in range(3):
+        with trace.step("navigation", url=f"https://example.com/{i}"):
+            pass
+
+    # Every frame is acknowledged, only the latest ones are kept
+    assert page.session.sent.count("Page.screencastFrameAck") == 10
+    assert [frame_time for frame_time, _ in trace.frames] == [7.0, 8.0, 9.0]
+    assert len(trace.snapshots) == 2
+    assert os.listdir(tmp_path) == []
+
+    with pytest.raises(TimeoutError):
+        with trace.step("scroll"):
+            raise TimeoutError("container not found")
+
+    (dump_dir,) = os.listdir(tmp_path)
+    dump_dir = tmp_path / dump_dir
+    frames = sorted(os.listdir(dump_dir / "frames"))
+    assert frames == ["000.jpeg", "001.jpeg", "002.jpeg"]
+    assert (dump_dir / "frames" / "002.jpeg").read_bytes() == b"frame 9"
+    trace_info = json.loads((dump_dir / "trace.json").read_text())
+    assert trace_info["reason"] == "scroll"
+    assert "container not found" in trace_info["error"]
+    assert trace_info["snapshots"][-1]["label"] == "scroll (failed)"
+    assert [event["step"] for event in trace_info["events"]][-2:] == [
+        "navigation",
+        "scroll",
+    ]
+
+
+def test_overhead_is_measured():
+    page = FakePage()
+    trace = TraceBuffer(page)
+    trace.start()
+    for i in range(100):
+        page.session.push_frame(i)
+    trace.snapshot("search results")
+
+    stats = trace.stats()
+    assert stats["frames_received"] == 100
+    assert stats["frames_buffered"] == trace.frames.maxlen
+    assert stats["frame_cpu_s"] >= 0 and stats["overhead_pct"] >= 0
+
+    trace.stop()
+    assert page.session.sent[-1] == "Page.stopScreencast"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
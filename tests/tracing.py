@@ -0,0 +1,101 @@
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from playwright._impl._connection import Connection
+
+from src.utils.tracing import Tracer, count_protocol_messages
+
+
+def test_nested_spans_are_aggregated_by_path(tmp_path):
+    tracer = Tracer(run_id="test", trace_dir=str(tmp_path))
+    tracer.start()
+    with tracer.span("crawl"):
+        for _ in range(3):
+            with tracer.span("search"):
+                tracer.count("playwright_calls", 2)
+                with tracer.span("extract"):
+                    time.sleep(0.01)
+                    tracer.count("playwright_calls")
+
+    rows = {row["span"]: row for row in tracer.summary()}
+    assert rows["crawl;search"]["count"] == 3
+    assert rows["crawl;search"]["counters"] == {"playwright_calls": 6}
+    assert rows["crawl;search;extract"]["counters"] == {"playwright_calls": 3}
+    assert rows["crawl;search;extract"]["total_s"] >= 0.03
+    # Time spent in children is not self time of the parent
+    assert rows["crawl;search"]["self_s"] < rows["crawl;search;extract"]["self_s"]
+
+    path = tracer.finish()
+    with open(path) as f:
+        report = json.load(f)
+    assert report["folded"] == "trace_test.folded"
+    folded = (tmp_path / "trace_test.folded").read_text().splitlines()
+    assert any(line.startswith("crawl;search;extract ") for line in folded)
+
+
+def test_cprofile_hook_saves_a_profile(tmp_path):
+    tracer = Tracer(run_id="profiled", trace_dir=str(tmp_path), profiler="cprofile")
+    tracer.start()
+    with tracer.span("work"):
+        sum(i * i for i in range(10_000))
+    with open(tracer.finish()) as f:
+        report = json.load(f)
+    assert report["profile"].endswith("profile_profiled.prof")
+    assert (tmp_path / "profile_profiled.prof").exists()
+
+
+def fake_page():
+    connection = object()
+    impl = SimpleNamespace(_connection=connection)
+    return connection, SimpleNamespace(_impl_obj=impl)
+
+
+def send(connection, method):
+    Connection._send_message_to_server(connection, None, method, {})
+
+
+def test_tracers_and_message_counters_share_the_playwright_hook(monkeypatch, tmp_path):
+    sent = []
+
+    def driver_send(connection, object, method, params):
+        sent.append(method)
+
+    monkeypatch.setattr(Connection, "_send_message_to_server", driver_send)
+    connection, page = fake_page()
+    tracer = Tracer(run_id="hook", trace_dir=str(tmp_path))
+    tracer.instrument_playwright(page)
+
+    with tracer.span("crawl"):
+        # A benchmark counting messages in the middle of a traced crawl
+        with count_protocol_messages() as counts:
+            send(connection, "goto")
+            send(connection, "evaluate")
+        send(connection, "evaluate")
+    assert counts == {"goto": 1, "evaluate": 1}
+    assert tracer.summary()[0]["counters"] == {"playwright_calls": 3}
+
+    # Something replaced the hook: the next tracer wraps the method again
+    monkeypatch.setattr(Connection, "_send_message_to_server", driver_send)
+    other_connection, other_page = fake_page()
+    other = Tracer(run_id="other", trace_dir=str(tmp_path))
+    other.instrument_playwright(other_page)
+    with other.span("crawl"):
+        send(other_connection, "goto")
+    assert other.summary()[0]["counters"] == {"playwright_calls": 1}
+
+    tracer.finish()
+    other.finish()
+    # The original method is back once nothing counts
+    assert Connection._send_message_to_server is driver_send
+    assert sent == ["goto", "evaluate", "evaluate", "goto"]
+
+
+def test_rejects_unknown_profilers():
+    with pytest.raises(ValueError):
+        Tracer(profiler="perf")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])